@@ -2,12 +2,18 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-"""Hatch build hook for localization."""
+"""Hatch build hook for localization and generated modules."""
 
+import ast
+import marshal
+import shutil
 import sys
+import tempfile
 from pathlib import Path
+from typing import Optional
 
 from babel.messages.frontend import OptionError
+from babel.messages.pofile import read_po
 from babel.messages.setuptools_frontend import compile_catalog
 from hatchling.builders.config import BuilderConfigBound
 from hatchling.builders.hooks.plugin.interface import BuildHookInterface
@@ -19,6 +25,34 @@
     from typing import override
 
 
+PACKAGE = "whiteprints"
+"""The name of the package being built."""
+
+COMMAND_PACKAGE = f"{PACKAGE}.cli.command"
+"""The package holding the command line commands."""
+
+COMMAND_MANIFEST = f"{PACKAGE}/cli/_command_manifest.py"
+"""The path of the generated command manifest, relative to the wheel root."""
+
+BUILD_INFO = f"{PACKAGE}/_build_info.py"
+"""The path of the generated build information, relative to the wheel root."""
+
+GENERATED_HEADER = '''\
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""{docstring}
+
+This module is generated by the build hook (hatch_build.py). Do not edit.
+"""
+
+from typing import Final
+
+'''
+"""The header of every generated module."""
+
+
 def _compile(locale_path: Path) -> None:
     """Compile a localization file."""
     cmd = compile_catalog()
@@ -33,8 +67,133 @@ def _compile(locale_path: Path) -> None:
         pass
 
 
+def _marshal(locale_path: Path) -> None:
+    """Dump the messages of the localization files, next to the `.mo` files.
+
+    The dump maps each (singular) message to its translation and is loaded
+    in place of the `.mo` file at runtime (see whiteprints.loc).
+    """
+    for po_path in locale_path.glob("*/LC_MESSAGES/*.po"):
+        with po_path.open("rb") as po_file:
+            catalog = read_po(po_file)
+
+        messages = {
+            message.id: message.string
+            for message in catalog
+            if message.id
+            and isinstance(message.id, str)
+            and isinstance(message.string, str)
+            and message.string
+        }
+        po_path.with_suffix(".marshal").write_bytes(marshal.dumps(messages))
+
+
+def _literal(node: Optional[ast.expr]) -> Optional[str]:
+    """Extract a string literal, possibly wrapped in a gettext call."""
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in {"_", "N_"}
+        and node.args
+    ):
+        node = node.args[0]
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+
+    return None
+
+
+def _command_decorator(function: ast.FunctionDef) -> Optional[ast.Call]:
+    """Find the `click.command` or `click.group` decorator of a function.
+
+    Subcommands, decorated with `<group>.command`, are not top-level commands.
+    """
+    for decorator in function.decorator_list:
+        if not isinstance(decorator, ast.Call):
+            continue
+        if isinstance(decorator.func, ast.Name):
+            name = decorator.func.id
+        elif isinstance(decorator.func, ast.Attribute) and (
+            isinstance(decorator.func.value, ast.Name)
+            and decorator.func.value.id == "click"
+        ):
+            name = decorator.func.attr
+        else:
+            continue
+        if name in {"command", "group"}:
+            return decorator
+
+    return None
+
+
+def _command_entries(module_path: Path) -> dict[str, dict[str, str]]:
+    """Statically find the commands defined in a command module."""
+    module = f"{COMMAND_PACKAGE}.{module_path.stem}"
+    entries: dict[str, dict[str, str]] = {}
+    for function in ast.parse(module_path.read_text("utf-8")).body:
+        if not isinstance(function, ast.FunctionDef):
+            continue
+        if (decorator := _command_decorator(function)) is None:
+            continue
+        keywords = {keyword.arg: keyword.value for keyword in decorator.keywords}
+        name = _literal(keywords.get("name")) or function.name.lower().replace(
+            "_", "-"
+        )
+        short_help = (
+            _literal(keywords.get("short_help"))
+            or _literal(keywords.get("help"))
+            or ast.get_docstring(function)
+            or ""
+        )
+        entries[name] = {
+            "module": module,
+            "function_name": function.name,
+            "short_help": short_help,
+        }
+
+    return entries
+
+
+def _write_command_manifest(command_path: Path, destination: Path) -> None:
+    """Write a static manifest of the commands found in a directory."""
+    commands: dict[str, dict[str, str]] = {}
+    for module_path in sorted(command_path.glob("*.py")):
+        if module_path.stem != "__init__":
+            commands.update(_command_entries(module_path))
+    destination.write_text(
+        GENERATED_HEADER.format(docstring="Static manifest of the commands.")
+        + f"\nCOMMANDS: Final = {commands!r}\n"
+        + '"""A mapping from a command name to its location and short help."""\n',
+        encoding="utf-8",
+    )
+
+
+def _write_build_info(
+    destination: Path,
+    *,
+    version: str,
+    license_expression: str,
+    license_files: list[str],
+) -> None:
+    """Write the package metadata known at build time."""
+    destination.write_text(
+        GENERATED_HEADER.format(docstring="Package metadata known at build time.")
+        + f"\nVERSION: Final = {version!r}\n"
+        + '"""The package version number."""\n'
+        + f"\nLICENSE_EXPRESSION: Final = {license_expression!r}\n"
+        + '"""The package code license."""\n'
+        + f"\nLICENSE_FILES: Final = {license_files!r}\n"
+        + '"""The license files, relative to the installation directory."""\n',
+        encoding="utf-8",
+    )
+
+
 class CustomBuildHook(BuildHookInterface[BuilderConfigBound]):
-    """Custom Hatch builld hook for localization using PyBabel."""
+    """Custom Hatch builld hook for localization using PyBabel.
+
+    When building a (non editable) wheel, the hook also generates modules
+    holding information that is otherwise discovered at runtime.
+    """
 
     @override
     def initialize(
@@ -52,3 +211,47 @@ def initialize(
         ):
             if locale_path.is_dir():
                 _compile(locale_path)
+                _marshal(locale_path)
+
+        if self.target_name != "wheel" or version == "editable":
+            return
+
+        self._generated = Path(tempfile.mkdtemp(prefix=f"{PACKAGE}-build-"))
+        force_include = build_data.setdefault("force_include", {})
+        for command_path in map(
+            Path,
+            (
+                "src/whiteprints/cli/command",
+                "whiteprints/cli/command",
+            ),
+        ):
+            if command_path.is_dir():
+                manifest = self._generated / Path(COMMAND_MANIFEST).name
+                _write_command_manifest(command_path, manifest)
+                force_include[str(manifest)] = COMMAND_MANIFEST  # type: ignore[index]
+
+        metadata_directory = (
+            f"{self.build_config.builder.artifact_project_id}.dist-info"
+        )
+        build_info = self._generated / Path(BUILD_INFO).name
+        _write_build_info(
+            build_info,
+            version=self.metadata.version,
+            license_expression=self.metadata.core.license_expression,
+            license_files=[
+                f"{metadata_directory}/licenses/{license_file}"
+                for license_file in self.metadata.core.license_files
+            ],
+        )
+        force_include[str(build_info)] = BUILD_INFO  # type: ignore[index]
+
+    @override
+    def finalize(
+        self,
+        version: str,
+        build_data: dict[str, object],
+        artifact_path: str,
+    ) -> None:
+        """Remove the generated modules once the wheel is built."""
+        if (generated := getattr(self, "_generated", None)) is not None:
+            shutil.rmtree(generated, ignore_errors=True)
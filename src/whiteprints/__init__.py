@@ -2,16 +2,51 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-"""Top-level module."""
+"""Top-level module.
 
-from typing import Final
+Importing the package has no side effect: the package metadata is only read
+when one of its attributes is first accessed, and the dotenv file is loaded
+by the command line interface (see whiteprints.environment.initialize).
+"""
 
-from whiteprints.environment import ENVIRONMENT_FILE, load_dotenv
-from whiteprints.package_metadata import __version__
+import importlib
+from typing import TYPE_CHECKING, Final
 
 
-__all__: Final = ["__version__"]
+if TYPE_CHECKING:
+    from email.message import Message
+
+
+__all__: Final = ["__license__", "__metadata__", "__version__"]
 """Public module attributes."""
 
 
-load_dotenv(ENVIRONMENT_FILE)
+__version__: str
+"""The version of the package, read on first access."""
+
+__license__: str
+"""The license expression of the package, read on first access."""
+
+__metadata__: "Message"
+"""The full metadata of the package, read on first access."""
+
+
+def __getattr__(name: str) -> object:
+    """Lazily read the package metadata.
+
+    Args:
+        name: the name of the module attribute.
+
+    Raises:
+        AttributeError: the module has no such attribute.
+
+    Returns:
+        The attribute, read from whiteprints.package_metadata.
+    """
+    if name in __all__:
+        return getattr(
+            importlib.import_module("whiteprints.package_metadata"),
+            name,
+        )
+
+    raise AttributeError(name)
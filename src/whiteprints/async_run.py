@@ -0,0 +1,511 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Run commands asynchronously.
+
+UVX runs one blocking command at a time, inheriting the standard streams.
+AsyncRunner instead starts commands with pipes, drains their standard output
+and error concurrently, line by line, into a log file per invocation and
+optional callbacks, and limits the number of commands running at once. Each
+command runs in its own process group, under its wall-clock and inactivity
+timeouts (see whiteprints.supervision), the signals terminating whiteprints
+are forwarded to it, and it returns a structured result.
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Mapping,
+    Sequence,
+)
+from contextlib import nullcontext
+from functools import cached_property
+from pathlib import Path
+from subprocess import CalledProcessError  # nosec
+from typing import IO, Final, Optional, TypedDict, Union
+
+from whiteprints.supervision import (
+    GRACE_PERIOD,
+    ProcessTimeoutError,
+    Timeouts,
+    group_options,
+    kill_group,
+    stop_group,
+    supervised,
+)
+from whiteprints.uvx_run import UVX
+
+
+if sys.version_info >= (3, 11):
+    from typing import Unpack
+else:
+    from typing_extensions import Unpack
+
+
+__all__: Final = [
+    "DEFAULT_LIMIT",
+    "AsyncRunner",
+    "AsyncUVX",
+    "OutputCallback",
+    "OutputCallbacks",
+    "ProcessResult",
+    "check_returncode",
+]
+"""Public module attributes."""
+
+
+DEFAULT_LIMIT: Final = 4
+"""The default maximum number of commands running at once."""
+
+CHUNK_SIZE: Final = 1 << 16
+"""The size of the output read at once, a longer line is split."""
+
+
+OutputCallback = Callable[[bytes], None]
+"""A callback receiving each line of an output stream."""
+
+
+class OutputCallbacks(TypedDict, total=False):
+    """The callbacks receiving the output of a command."""
+
+    on_stdout: Optional[OutputCallback]
+    on_stderr: Optional[OutputCallback]
+
+
+class ProcessResult(TypedDict):
+    """The result of a command."""
+
+    command: list[str]
+    returncode: int
+    duration: float
+    stdout: Optional[Path]
+    stderr: Optional[Path]
+
+
+def check_returncode(result: ProcessResult) -> ProcessResult:
+    """Check that a command succeeded.
+
+    Args:
+        result: the result of the command.
+
+    Returns:
+        The result of the command.
+
+    Raises:
+        CalledProcessError: the command exited with a non zero status.
+    """
+    if result["returncode"]:
+        raise CalledProcessError(result["returncode"], result["command"])
+
+    return result
+
+
+def _split(buffer: bytes) -> tuple[list[bytes], bytes]:
+    r"""Split the complete lines of an output buffer.
+
+    Args:
+        buffer: the output read and not passed on yet.
+
+    Returns:
+        The complete lines, and the rest of the buffer. A rest of at least
+        `CHUNK_SIZE` bytes is passed on as a line.
+
+    Example:
+        >>> _split(b"first\nsecond\nthi")
+        ([b'first\n', b'second\n'], b'thi')
+        >>> _split(b"0" * CHUNK_SIZE)[1]
+        b''
+    """
+    *lines, rest = buffer.split(b"\n")
+    lines = [line + b"\n" for line in lines]
+    if len(rest) >= CHUNK_SIZE:
+        return [*lines, rest], b""
+
+    return lines, rest
+
+
+async def _lines(
+    stream: asyncio.StreamReader,
+) -> AsyncGenerator[bytes, None]:
+    """Read the lines of an output stream, by chunks.
+
+    Unlike iterating the stream, a line longer than the limit of the stream
+    does not fail: it is split.
+
+    Args:
+        stream: the output stream of the command.
+
+    Yields:
+        The lines of the stream, the last one may miss its newline.
+    """
+    rest = b""
+    while chunk := await stream.read(CHUNK_SIZE):
+        lines, rest = _split(rest + chunk)
+        for line in lines:
+            yield line
+
+    if rest:
+        yield rest
+
+
+async def _drain(
+    stream: Optional[asyncio.StreamReader],
+    log: Optional[Path],
+    callback: Optional[OutputCallback],
+    activity: list[float],
+) -> None:
+    """Drain an output stream.
+
+    Args:
+        stream: the output stream of the command.
+        log: the file the stream is written to, if any.
+        callback: the callback receiving each line of the stream, if any.
+        activity: holds the time of the last output, updated on each line.
+    """
+    if stream is None:
+        return
+
+    with log.open("wb") if log else nullcontext() as file:
+        async for line in _lines(stream):
+            activity[0] = asyncio.get_running_loop().time()
+            _write(file, line)
+            if callback is not None:
+                callback(line)
+
+
+def _write(file: Optional[IO[bytes]], line: bytes) -> None:
+    """Write a line to a log file.
+
+    Args:
+        file: the log file, if any.
+        line: the line to write.
+    """
+    if file is not None:
+        file.write(line)
+
+
+def _expired(
+    start: float,
+    activity: list[float],
+    timeouts: Timeouts,
+) -> Optional[ProcessTimeoutError]:
+    """Check the timeouts of a command.
+
+    Args:
+        start: the time the command started.
+        activity: holds the time of the last output.
+        timeouts: the timeouts of the command.
+
+    Returns:
+        The timeout exceeded, None if none is.
+    """
+    now = asyncio.get_running_loop().time()
+    timeout = timeouts.get("timeout")
+    if timeout is not None and now - start >= timeout:
+        return ProcessTimeoutError(kind="wall-clock", seconds=timeout)
+
+    inactivity_timeout = timeouts.get("inactivity_timeout")
+    if inactivity_timeout is not None and now - activity[0] >= (
+        inactivity_timeout
+    ):
+        return ProcessTimeoutError(
+            kind="inactivity", seconds=inactivity_timeout
+        )
+
+    return None
+
+
+def _next_check(
+    start: float,
+    activity: list[float],
+    timeouts: Timeouts,
+) -> Optional[float]:
+    """The delay before the next timeouts check.
+
+    Args:
+        start: the time the command started.
+        activity: holds the time of the last output.
+        timeouts: the timeouts of the command.
+
+    Returns:
+        The delay before the earliest timeout, None without timeouts.
+    """
+    deadlines = [
+        origin + timeout - asyncio.get_running_loop().time()
+        for origin, timeout in (
+            (start, timeouts.get("timeout")),
+            (activity[0], timeouts.get("inactivity_timeout")),
+        )
+        if timeout is not None
+    ]
+    return max(min(deadlines), 0) if deadlines else None
+
+
+async def _supervise(
+    work: "Awaitable[int]",
+    activity: list[float],
+    timeouts: Timeouts,
+) -> int:
+    """Wait for a command, under its timeouts.
+
+    Args:
+        work: the draining of the output and the wait for the command.
+        activity: holds the time of the last output.
+        timeouts: the timeouts of the command.
+
+    Returns:
+        The exit code of the command.
+
+    Raises:
+        ProcessTimeoutError: the command exceeded one of its timeouts.
+    """
+    task = asyncio.ensure_future(work)
+    start = asyncio.get_running_loop().time()
+    while not task.done():
+        await asyncio.wait(
+            {task}, timeout=_next_check(start, activity, timeouts)
+        )
+        if not task.done() and (error := _expired(start, activity, timeouts)):
+            task.cancel()
+            raise error
+
+    return task.result()
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    """Terminate a command group, gracefully then forcibly.
+
+    Args:
+        process: the command process, leader of its process group.
+    """
+    stop_group(process.pid)
+    try:
+        await asyncio.wait_for(process.wait(), GRACE_PERIOD)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        kill_group(process.pid)
+
+
+class AsyncRunner:
+    """Run commands asynchronously, with a concurrency limit."""
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_LIMIT,
+        log_directory: Optional[Path] = None,
+    ) -> None:
+        """Initialize the runner.
+
+        Args:
+            limit: the maximum number of commands running at once.
+            log_directory: the directory of the log files, None to keep the
+                output only for the callbacks.
+        """
+        self.limit = limit
+        self.log_directory = log_directory
+        self._semaphores: dict[asyncio.AbstractEventLoop, asyncio.Semaphore]
+        self._semaphores = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """The semaphore limiting the commands of the running event loop.
+
+        Returns:
+            The semaphore of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores = {loop: asyncio.Semaphore(self.limit)}
+
+        return self._semaphores[loop]
+
+    def _logs(self, name: str) -> tuple[Optional[Path], Optional[Path]]:
+        """The log files of an invocation.
+
+        Args:
+            name: the name of the invocation.
+
+        Returns:
+            The standard output and error log files, if logged.
+        """
+        if self.log_directory is None:
+            return None, None
+
+        self.log_directory.mkdir(parents=True, exist_ok=True)
+        return (
+            self.log_directory / f"{name}.stdout.log",
+            self.log_directory / f"{name}.stderr.log",
+        )
+
+    async def run(
+        self,
+        command: Sequence[Union[str, Path]],
+        *,
+        name: str,
+        cwd: Optional[Path] = None,
+        env: Optional[Mapping[str, str]] = None,
+        timeouts: Optional[Timeouts] = None,
+        **callbacks: Unpack[OutputCallbacks],
+    ) -> ProcessResult:
+        """Run a command.
+
+        Args:
+            command: the command to run.
+            name: the name of the invocation, naming its log files.
+            cwd: the working directory of the command.
+            env: the environment of the command, None to inherit it.
+            timeouts: the timeouts of the command.
+            callbacks: the callbacks receiving the output (`on_stdout`,
+                `on_stderr`).
+
+        Returns:
+            The result of the command.
+
+        Raises:
+            ProcessTimeoutError: the command exceeded one of its timeouts.
+        """
+        arguments = [str(argument) for argument in command]
+        stdout, stderr = self._logs(name)
+        async with self._semaphore():
+            start = time.perf_counter()
+            process = await asyncio.create_subprocess_exec(
+                *arguments,
+                cwd=cwd,
+                env=env,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **group_options(),
+            )
+            activity = [asyncio.get_running_loop().time()]
+            try:
+                with supervised(process.pid):
+                    returncode = await _supervise(
+                        self._communicate(
+                            process,
+                            (stdout, stderr),
+                            activity,
+                            callbacks,
+                        ),
+                        activity,
+                        timeouts or Timeouts(),
+                    )
+            except (ProcessTimeoutError, asyncio.CancelledError):
+                await _terminate(process)
+                raise
+
+        return ProcessResult(
+            command=arguments,
+            returncode=returncode,
+            duration=time.perf_counter() - start,
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+    @staticmethod
+    async def _communicate(
+        process: asyncio.subprocess.Process,
+        logs: tuple[Optional[Path], Optional[Path]],
+        activity: list[float],
+        callbacks: OutputCallbacks,
+    ) -> int:
+        """Drain the output of a command, and wait for it.
+
+        Args:
+            process: the command process.
+            logs: the standard output and error log files, if logged.
+            activity: holds the time of the last output.
+            callbacks: the callbacks receiving the output.
+
+        Returns:
+            The exit code of the command.
+        """
+        await asyncio.gather(
+            _drain(
+                process.stdout, logs[0], callbacks.get("on_stdout"), activity
+            ),
+            _drain(
+                process.stderr, logs[1], callbacks.get("on_stderr"), activity
+            ),
+        )
+        return await process.wait()
+
+
+class AsyncUVX:
+    """Manage the uv program, asynchronously."""
+
+    def __init__(self, runner: Optional[AsyncRunner] = None) -> None:
+        """Initialize the uv manager.
+
+        Args:
+            runner: the runner of the uv commands, None for a default runner.
+        """
+        self.runner = runner or AsyncRunner()
+
+    @cached_property
+    def bin(self) -> Path:
+        """The uv binary path.
+
+        Returns:
+            a path to the uv binary.
+        """
+        return UVX().bin
+
+    async def uv(
+        self,
+        command: Sequence[str],
+        *,
+        name: str,
+        timeouts: Optional[Timeouts] = None,
+        **callbacks: Unpack[OutputCallbacks],
+    ) -> ProcessResult:
+        """Run a uv command.
+
+        Args:
+            command: the uv command to execute.
+            name: the name of the invocation, naming its log files.
+            timeouts: the timeouts of the command.
+            callbacks: the callbacks receiving the output (`on_stdout`,
+                `on_stderr`).
+
+        Returns:
+            The result of the command.
+        """
+        return await self.runner.run(
+            [self.bin, *command], name=name, timeouts=timeouts, **callbacks
+        )
+
+    async def run(
+        self,
+        command: Sequence[str],
+        *,
+        name: str,
+        timeouts: Optional[Timeouts] = None,
+        **callbacks: Unpack[OutputCallbacks],
+    ) -> ProcessResult:
+        """Run `uv tool run`.
+
+        Note:
+            `uv tool run` is equivalent to `uvx`
+
+        Args:
+            command: the `uv tool run` command to execute.
+            name: the name of the invocation, naming its log files.
+            timeouts: the timeouts of the command.
+            callbacks: the callbacks receiving the output (`on_stdout`,
+                `on_stderr`).
+
+        Returns:
+            The result of the command.
+        """
+        return await self.uv(
+            ["tool", "run", *command],
+            name=name,
+            timeouts=timeouts,
+            **callbacks,
+        )
@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Locate the user cache directory."""
+
+import os
+import sys
+from pathlib import Path
+from typing import Final
+
+
+__all__: Final = ["CACHE_DIRECTORY_VARIABLE", "cache_directory"]
+"""Public module attributes."""
+
+
+CACHE_DIRECTORY_VARIABLE: Final = "WHITEPRINTS_CACHE_DIR"
+"""The environment variable overriding the user cache directory."""
+
+
+def _platform_cache_directory() -> Path:
+    """The platform specific user cache directory.
+
+    Returns:
+        The user cache directory of the platform.
+    """
+    if sys.platform == "win32":
+        return Path(
+            os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")
+        )
+
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches"
+
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+
+
+def cache_directory(*names: str) -> Path:
+    """The whiteprints user cache directory.
+
+    The directory is not created.
+
+    Args:
+        names: the names of the subdirectories of the cache directory.
+
+    Example:
+        >>> import os
+        >>>
+        >>> os.environ[CACHE_DIRECTORY_VARIABLE] = "/tmp/whiteprints"
+        >>> cache_directory("help").as_posix()
+        '/tmp/whiteprints/help'
+        >>> del os.environ[CACHE_DIRECTORY_VARIABLE]
+
+    Returns:
+        The path to the cache (sub)directory.
+    """
+    if (directory := os.environ.get(CACHE_DIRECTORY_VARIABLE)) is None:
+        return _platform_cache_directory().joinpath("whiteprints", *names)
+
+    return Path(directory).joinpath(*names)
@@ -0,0 +1,167 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Serve a remote tier of the render cache over HTTP.
+
+A reference server of the HTTP remote tier (see whiteprints.remote_cache),
+to test it locally, without an external service:
+
+    python -m whiteprints.cache_server --directory cache --port 8000
+    whiteprints init --remote-cache http://localhost:8000 project
+
+It serves `GET`, `HEAD` and `PUT` on the keys of the remote tier only, the
+files are stored in a directory. An uploaded file must match its digest, it
+is written atomically: the concurrent uploads of a file are safe. The server
+neither authenticates nor bounds its directory, it is not meant to be
+exposed.
+"""
+
+import argparse
+import logging
+from collections.abc import Sequence
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Final, Optional
+from urllib.parse import unquote, urlparse
+
+from whiteprints.remote_cache import KEY_PATTERN, DirectoryBackend, is_valid
+
+
+__all__: Final = ["CacheRequestHandler", "main", "serve"]
+"""Public module attributes."""
+
+
+DEFAULT_HOST: Final = "127.0.0.1"
+"""The default address the server listens on."""
+
+DEFAULT_PORT: Final = 8000
+"""The default port the server listens on."""
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """Serve the files of a remote tier."""
+
+    def __init__(
+        self,
+        *args: Any,  # noqa: ANN401
+        root: Path,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Initialize the handler.
+
+        Args:
+            args: the arguments of the base handler.
+            root: the directory of the files.
+            kwargs: the keyword arguments of the base handler.
+        """
+        self.backend = DirectoryBackend(root)
+        super().__init__(*args, **kwargs)
+
+    def _key(self) -> Optional[str]:
+        """The key of the request.
+
+        Returns:
+            The key of the file requested, None if it is not a key of the
+            remote tier.
+        """
+        key = unquote(urlparse(self.path).path).lstrip("/")
+        return key if KEY_PATTERN.fullmatch(key) else None
+
+    def _send(self, status: HTTPStatus, body: bytes = b"") -> None:
+        """Send the headers of a response.
+
+        Args:
+            status: the status of the response.
+            body: the body of the response, its length is sent.
+        """
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+    def _get(self) -> bytes:
+        """Send the headers of the response to a `GET` or `HEAD` request.
+
+        Returns:
+            The body of the response.
+        """
+        key = self._key()
+        data = None if key is None else self.backend.get(key)
+        if data is None:
+            self._send(HTTPStatus.NOT_FOUND)
+            return b""
+
+        self._send(HTTPStatus.OK, data)
+        return data
+
+    def do_GET(self) -> None:
+        """Download a file."""
+        self.wfile.write(self._get())
+
+    def do_HEAD(self) -> None:
+        """Check that a file is stored."""
+        self._get()
+
+    def do_PUT(self) -> None:
+        """Upload a file, checking its digest."""
+        key = self._key()
+        data = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        if key is None or not is_valid(key, data):
+            self._send(HTTPStatus.BAD_REQUEST)
+            return
+
+        self.backend.put(key, data)
+        self._send(HTTPStatus.CREATED)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Log a request.
+
+        Args:
+            format: the format of the message.
+            args: the arguments of the message.
+        """
+        logging.getLogger(__name__).info(format, *args)
+
+
+def serve(
+    root: Path,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+) -> ThreadingHTTPServer:
+    """Create the server of a remote tier.
+
+    Args:
+        root: the directory of the files.
+        host: the address the server listens on.
+        port: the port the server listens on, 0 for any free port.
+
+    Returns:
+        The server, listening: serve it with `serve_forever`.
+    """
+    return ThreadingHTTPServer(
+        (host, port), partial(CacheRequestHandler, root=root)
+    )
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> None:
+    """Run the server of a remote tier.
+
+    Args:
+        arguments: the command line arguments, None for `sys.argv`.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m whiteprints.cache_server", description=__doc__
+    )
+    parser.add_argument("--directory", type=Path, default=Path.cwd())
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    options = parser.parse_args(arguments)
+    logging.basicConfig(level=logging.INFO)
+    with serve(options.directory, options.host, options.port) as server:
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Checkpoint the layers applied to a project, to resume a failed init.
+
+A checkpoint is recorded in the user cache directory after each successful
+layer (or batch of concurrent layers). It holds:
+
+- the layers completed, and the commit of their template.
+- a digest of the answers: the layers and the copier arguments.
+- a digest of the project when the init started (its base), and of the
+  rendered tree after the last completed layer.
+- a snapshot of the rendered tree, when rendering in a staging directory
+  (see whiteprints.staging): the staging directory is discarded on failure.
+
+Resuming checks the checkpoint against the disk before skipping any layer:
+the answers must be the same, the project must still match its base (or,
+rendering in place, the rendered tree) and the snapshot its digest.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Final, Optional, TypedDict
+
+from whiteprints.cache_directory import cache_directory
+from whiteprints.file_tree import copy_tree, tree_digests
+from whiteprints.layers import Layer
+
+
+__all__: Final = [
+    "CHECKPOINTS_DIRECTORY",
+    "Checkpoint",
+    "CheckpointError",
+    "answers_digest",
+    "checkpoint_directory",
+    "clear",
+    "load",
+    "record",
+    "resume",
+    "start",
+    "template_commits",
+    "tree_digest",
+]
+"""Public module attributes."""
+
+
+CHECKPOINTS_DIRECTORY: Final = "checkpoints"
+"""The user cache subdirectory holding the checkpoints."""
+
+CHECKPOINT_FILE: Final = "checkpoint.json"
+"""The file holding a checkpoint."""
+
+SNAPSHOT_DIRECTORY: Final = "tree"
+"""The directory holding the snapshot of the rendered tree."""
+
+ANSWERS_FILES: Final = ".copier-answers*.yml"
+"""The answers files copier writes at the root of the project."""
+
+KEY_LENGTH: Final = 16
+"""The number of hexadecimal digits of a checkpoint key."""
+
+
+class Checkpoint(TypedDict):
+    """The layers applied to a project."""
+
+    answers: str
+    base: str
+    tree: str
+    layers: list[str]
+    commits: dict[str, Optional[str]]
+
+
+class CheckpointError(ValueError):
+    """A project cannot be resumed from its checkpoint."""
+
+    def __init__(self, project: Path, reason: str) -> None:
+        """Initialize the exception.
+
+        Args:
+            project: the project directory.
+            reason: why the project cannot be resumed.
+        """
+        super().__init__(f"Cannot resume '{project}': {reason}.")
+
+
+def checkpoint_directory(project: Path) -> Path:
+    """The directory holding the checkpoint of a project.
+
+    Args:
+        project: the project directory.
+
+    Returns:
+        The checkpoint directory, in the user cache directory.
+    """
+    return cache_directory(
+        CHECKPOINTS_DIRECTORY,
+        hashlib.sha256(str(project.resolve()).encode()).hexdigest()[
+            :KEY_LENGTH
+        ],
+    )
+
+
+def answers_digest(layers: Sequence[Layer], copier_args: Iterable[str]) -> str:
+    """Identify the answers given to the layers.
+
+    Args:
+        layers: the layers selected.
+        copier_args: the arguments forwarded to copier.
+
+    Returns:
+        A digest of the templates of the layers and of the copier arguments.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            {
+                "layers": [
+                    [layer["name"], layer["template"]] for layer in layers
+                ],
+                "copier_args": list(copier_args),
+            }
+        ).encode()
+    ).hexdigest()
+
+
+def tree_digest(root: Path) -> str:
+    """Identify the content of a directory tree.
+
+    Args:
+        root: the root of the tree.
+
+    Returns:
+        A digest of the paths of the tree and of their content.
+    """
+    return hashlib.sha256(json.dumps(tree_digests(root)).encode()).hexdigest()
+
+
+def template_commits(root: Path) -> dict[str, Optional[str]]:
+    """The commit of each template rendered in a tree.
+
+    Args:
+        root: the root of the rendered tree.
+
+    Returns:
+        The source of each template, mapped to its commit (None if the
+        template is not versioned).
+    """
+    commits: dict[str, Optional[str]] = {}
+    for answers_file in sorted(root.glob(ANSWERS_FILES)):
+        answers = {
+            key: value.strip()
+            for key, _, value in (
+                line.partition(":")
+                for line in answers_file.read_text(
+                    encoding="utf-8"
+                ).splitlines()
+            )
+            if key.startswith("_")
+        }
+        if "_src_path" in answers:
+            commits[answers["_src_path"]] = answers.get("_commit")
+
+    return commits
+
+
+def load(project: Path) -> Optional[Checkpoint]:
+    """Load the checkpoint of a project.
+
+    Args:
+        project: the project directory.
+
+    Returns:
+        The checkpoint of the project, None if it has none.
+    """
+    path = checkpoint_directory(project) / CHECKPOINT_FILE
+    if not path.is_file():
+        return None
+
+    checkpoint: Checkpoint = json.loads(path.read_text(encoding="utf-8"))
+    return checkpoint
+
+
+def _write(project: Path, checkpoint: Checkpoint) -> None:
+    """Write the checkpoint of a project, atomically.
+
+    Args:
+        project: the project directory.
+        checkpoint: the checkpoint.
+    """
+    path = checkpoint_directory(project) / CHECKPOINT_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(checkpoint, indent=2), encoding="utf-8")
+    temporary.replace(path)
+
+
+def _snapshot(project: Path, tree: Path) -> None:
+    """Replace the snapshot of the rendered tree of a project.
+
+    Args:
+        project: the project directory.
+        tree: the rendered tree.
+    """
+    snapshot = checkpoint_directory(project) / SNAPSHOT_DIRECTORY
+    shutil.rmtree(snapshot, ignore_errors=True)
+    copy_tree(tree, snapshot)
+
+
+def clear(project: Path) -> None:
+    """Remove the checkpoint of a project.
+
+    Args:
+        project: the project directory.
+    """
+    shutil.rmtree(checkpoint_directory(project), ignore_errors=True)
+
+
+def start(project: Path, answers: str) -> Checkpoint:
+    """Start the checkpoint of a project, no layer completed.
+
+    Args:
+        project: the project directory.
+        answers: the digest of the answers.
+
+    Returns:
+        The new checkpoint.
+    """
+    clear(project)
+    base = tree_digest(project)
+    return Checkpoint(
+        answers=answers, base=base, tree=base, layers=[], commits={}
+    )
+
+
+def record(
+    project: Path,
+    checkpoint: Checkpoint,
+    layers: Iterable[Layer],
+    tree: Path,
+) -> None:
+    """Record layers completed in the checkpoint of a project.
+
+    Args:
+        project: the project directory.
+        checkpoint: the checkpoint, updated.
+        layers: the layers completed.
+        tree: the rendered tree, snapshot unless it is the project.
+    """
+    commits = template_commits(tree)
+    for layer in layers:
+        checkpoint["layers"].append(layer["name"])
+        checkpoint["commits"][layer["name"]] = commits.get(layer["template"])
+
+    checkpoint["tree"] = tree_digest(tree)
+    if os.path.realpath(tree) != os.path.realpath(project):
+        _snapshot(project, tree)
+
+    _write(project, checkpoint)
+
+
+def _expected(
+    project: Path,
+    checkpoint: Checkpoint,
+    *,
+    in_place: bool,
+) -> list[tuple[Path, str]]:
+    """The trees a checkpoint expects on the disk.
+
+    Args:
+        project: the project directory.
+        checkpoint: the checkpoint of the project.
+        in_place: whether the layers were rendered in the project.
+
+    Returns:
+        The trees, with their expected digest.
+    """
+    if in_place:
+        return [(project, checkpoint["tree"])]
+
+    snapshot = checkpoint_directory(project) / SNAPSHOT_DIRECTORY
+    return [(project, checkpoint["base"])] + (
+        [(snapshot, checkpoint["tree"])] if checkpoint["layers"] else []
+    )
+
+
+def _snapshot_tree(
+    project: Path,
+    checkpoint: Checkpoint,
+    *,
+    in_place: bool,
+) -> Optional[Path]:
+    """Check the disk against a checkpoint.
+
+    Args:
+        project: the project directory.
+        checkpoint: the checkpoint of the project.
+        in_place: whether the layers were rendered in the project.
+
+    Returns:
+        The snapshot of the rendered tree, None when rendering in place or
+        when no layer was completed.
+
+    Raises:
+        CheckpointError: the project or the snapshot changed.
+    """
+    expected = _expected(project, checkpoint, in_place=in_place)
+    for tree, digest in expected:
+        if tree_digest(tree) != digest:
+            raise CheckpointError(project, reason=f"'{tree}' changed")
+
+    return expected[1][0] if len(expected) > 1 else None
+
+
+def resume(
+    project: Path,
+    answers: str,
+    *,
+    in_place: bool,
+) -> tuple[Checkpoint, Optional[Path]]:
+    """Check the checkpoint of a project, to resume it.
+
+    Args:
+        project: the project directory.
+        answers: the digest of the answers.
+        in_place: whether the layers were rendered in the project.
+
+    Returns:
+        The checkpoint and the snapshot of the rendered tree (None when
+        rendering in place).
+
+    Raises:
+        CheckpointError: the checkpoint is missing, or does not match the
+            answers.
+    """
+    checkpoint = load(project)
+    if checkpoint is None:
+        raise CheckpointError(project, reason="it has no checkpoint")
+
+    if checkpoint["answers"] != answers:
+        raise CheckpointError(project, reason="the answers changed")
+
+    return checkpoint, _snapshot_tree(project, checkpoint, in_place=in_place)
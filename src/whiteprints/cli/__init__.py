@@ -4,17 +4,49 @@
 
 """Everything related to the command line interface."""
 
+import importlib
+from functools import cache
 from typing import Final
 
-from whiteprints.cli import exception
-
 
 __all__: Final = ["APP_NAME", "__app_name__"]
 
 __app_name__: Final = "whiteprints"
 """The name of the application."""
 
-APP_NAME: Final = (
-    exception.check_app_name(__app_name__).replace("-", "_").upper()
-)
-"""The name of the application in capital letters."""
+APP_NAME: str
+"""The name of the application in capital letters, checked on first access."""
+
+
+@cache
+def _app_name() -> str:
+    """Check the name of the application and put it in capital letters.
+
+    Returns:
+        The name of the application in capital letters.
+    """
+    return (
+        importlib.import_module("whiteprints.cli.exception")
+        .check_app_name(__app_name__)
+        .replace("-", "_")
+        .upper()
+    )
+
+
+def __getattr__(name: str) -> str:
+    """Lazily compute the name of the application in capital letters.
+
+    Args:
+        name: the name of the module attribute.
+
+    Raises:
+        AttributeError: the module has no such attribute.
+
+    Returns:
+        The name of the application in capital letters, for the `APP_NAME`
+        attribute.
+    """
+    if name == "APP_NAME":
+        return _app_name()
+
+    raise AttributeError(name)
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""The 'completion' command."""
+
+import importlib
+import os
+from pathlib import Path
+from typing import Optional
+
+import rich_click as click
+
+from whiteprints.cli.localized import LocalizedCommand, LocalizedGroup
+from whiteprints.loc import N_, _
+
+
+@click.group(
+    cls=LocalizedGroup,
+    name="completion",
+    help=N_("Manage the shell completion."),
+)
+def completion() -> None:
+    """Manage the shell completion."""
+
+
+@completion.command(
+    cls=LocalizedCommand,
+    name="install",
+    help=N_(
+        """Install the shell completion.
+
+The completion script answers from a static index of the commands and options,
+without starting Python.
+"""
+    ),
+)
+@click.option(
+    "-s",
+    "--shell",
+    type=click.Choice(["bash", "zsh"]),
+    help=N_("The shell to complete."),
+    default=(
+        "zsh"
+        if Path(os.environ.get("SHELL", "bash")).name == "zsh"
+        else "bash"
+    ),
+    show_default=True,
+)
+@click.option(
+    "-p",
+    "--path",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help=N_("Where to write the completion script."),
+    default=None,
+)
+@click.pass_context
+def install(ctx: click.Context, shell: str, path: Optional[Path]) -> None:
+    """Install the shell completion.
+
+    Args:
+        ctx: the click context.
+        shell: the shell to complete.
+        path: where to write the completion script.
+    """
+    completion_module = importlib.import_module("whiteprints.cli.completion")
+    console = importlib.import_module("whiteprints.console")
+    script = completion_module.install(
+        ctx.find_root().command,
+        shell=shell,
+        path=path or completion_module.default_script_path(shell),
+    )
+    console.STDOUT.print(
+        _("Completion script written to '{}'.").format(script)
+    )
+    if shell == "zsh" or path is not None:
+        console.STDOUT.print(
+            _("Add `source '{}'` to your shell startup file.").format(script)
+        )
+
+
+@completion.command(
+    cls=LocalizedCommand,
+    name="index",
+    help=N_("Regenerate the completion index."),
+    hidden=True,
+)
+@click.pass_context
+def index(ctx: click.Context) -> None:
+    """Regenerate the completion index.
+
+    Args:
+        ctx: the click context.
+    """
+    importlib.import_module("whiteprints.cli.completion").write_index(
+        ctx.find_root().command
+    )
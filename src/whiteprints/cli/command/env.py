@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""The 'env' command."""
+
+import importlib
+import os
+from pathlib import Path
+from typing import Optional
+
+import rich_click as click
+
+from whiteprints.cli import APP_NAME
+from whiteprints.cli.localized import LocalizedCommand, LocalizedGroup
+from whiteprints.loc import N_, _
+
+
+@click.group(
+    cls=LocalizedGroup,
+    name="env",
+    help=N_(
+        """Manage the tool environment running copier.
+
+The environment holds copier and the template context. It is created in the
+user cache directory on first use, and reused by every later project.
+"""
+    ),
+)
+def env() -> None:
+    """Manage the tool environment running copier."""
+
+
+wheelhouse_option = click.option(
+    "--wheelhouse",
+    help=N_(
+        "Install the environment offline, from the wheels of a wheelhouse "
+        "built by `whiteprints wheelhouse build`."
+    ),
+    type=click.Path(
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        resolve_path=True,
+        path_type=Path,
+    ),
+    default=os.environ.get(f"{APP_NAME}_WHEELHOUSE"),
+)
+"""The wheelhouse the environment is installed from."""
+
+
+@env.command(
+    cls=LocalizedCommand,
+    name="warm",
+    help=N_("Create the tool environment running copier, if needed."),
+)
+@wheelhouse_option
+def warm(wheelhouse: Optional[Path]) -> None:
+    """Create the tool environment running copier.
+
+    Args:
+        wheelhouse: the wheelhouse the environment is installed from.
+    """
+    console = importlib.import_module("whiteprints.console")
+    path = importlib.import_module("whiteprints.cli.env").warm(wheelhouse)
+    console.STDOUT.print(_("Environment ready in '{}'.").format(path))
+
+
+@env.command(
+    cls=LocalizedCommand,
+    name="prune",
+    help=N_("Remove the tool environments no longer used."),
+)
+@click.option(
+    "--all",
+    "prune_all",
+    help=N_("Also remove the environment in use."),
+    type=bool,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@wheelhouse_option
+def prune(*, prune_all: bool, wheelhouse: Optional[Path]) -> None:
+    """Remove the tool environments no longer used.
+
+    Args:
+        prune_all: also remove the environment in use.
+        wheelhouse: the wheelhouse the environment in use is installed from.
+    """
+    console = importlib.import_module("whiteprints.console")
+    for path in importlib.import_module("whiteprints.cli.env").prune(
+        prune_all=prune_all, wheelhouse=wheelhouse
+    ):
+        console.STDOUT.print(_("Removed '{}'.").format(path))
@@ -5,14 +5,19 @@
 """The 'init' command."""
 
 import importlib
+import os
 import sys
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from pathlib import Path
+from typing import get_args
 
 import rich_click as click
 
+from whiteprints.cli import APP_NAME
 from whiteprints.cli.init_interface import InitKwargs
-from whiteprints.loc import _
+from whiteprints.cli.localized import LocalizedCommand
+from whiteprints.loc import N_
+from whiteprints.lockfile import LOCK_FILE
 
 
 if sys.version_info >= (3, 11):
@@ -21,9 +26,40 @@
     from typing_extensions import Unpack
 
 
+class _LazyChoice(click.Choice):
+    """A choice among the values of a literal type, imported on first use."""
+
+    def __init__(self, module: str, alias: str) -> None:
+        """Initialize the choice.
+
+        Args:
+            module: the module defining the literal type.
+            alias: the name of the literal type.
+        """
+        super().__init__(())
+        self.module = module
+        self.alias = alias
+
+    @property
+    def choices(self) -> Sequence[str]:  # pyright: ignore[reportIncompatibleVariableOverride]
+        """The values of the literal type.
+
+        Returns:
+            The choices.
+        """
+        return get_args(
+            getattr(importlib.import_module(self.module), self.alias)
+        )
+
+    @choices.setter
+    def choices(self, _choices: Sequence[str]) -> None:
+        """Ignore the choices set by click, read from the literal type."""
+
+
 @click.command(
-    name=_("init"),
-    help=_(
+    cls=LocalizedCommand,
+    name="init",
+    help=N_(
         """Initialize a Python project.
 
 COPIER_ARGS are additional arguments forwarded to each copier command line
@@ -53,7 +89,7 @@
 @click.option(
     "-cl",
     "--command-line",
-    help=_("Add a command-line to the project"),
+    help=N_("Add a command-line to the project"),
     type=bool,
     default=False,
     is_flag=True,
@@ -62,7 +98,7 @@
     "-gh",
     "--github",
     "--GitHub",
-    help=_("Push to GitHub."),
+    help=N_("Push to GitHub."),
     type=bool,
     default=False,
     show_default=True,
@@ -72,7 +108,7 @@
     "-pp",
     "--pypi",
     "--PyPI",
-    help=_(
+    help=N_(
         "Configure GitHub to publish package to PyPI. This imply `--github`."
     ),
     type=bool,
@@ -84,7 +120,7 @@
     "-cc",
     "--codecov",
     "--CodeCov",
-    help=_(
+    help=N_(
         "Configure GitHub to publish coverage to CodeCov."
         " This imply `--github`."
     ),
@@ -97,7 +133,7 @@
     "-rd",
     "--readthedocs",
     "--ReadTheDocs",
-    help=_(
+    help=N_(
         "Configure GitHub to publish documentation to ReadTheDocs."
         " This imply `--github`."
     ),
@@ -109,7 +145,7 @@
 @click.option(
     "-pr",
     "--protect-repository",
-    help=_(
+    help=N_(
         "Configure GitHub to protect branches and tags. This imply `--github`."
     ),
     type=bool,
@@ -120,7 +156,7 @@
 @click.option(
     "-ga",
     "--github-all",
-    help=_(
+    help=N_(
         "This imply "
         "`--github`, `--codecov`, `--pypi` and `--protect-repository`."
     ),
@@ -129,6 +165,187 @@
     show_default=True,
     is_flag=True,
 )
+@click.option(
+    "--copier-engine",
+    help=N_(
+        "Run copier in a cached tool environment (`subprocess`), or inside "
+        "whiteprints (`in-process`) when copier is installed alongside it."
+    ),
+    type=_LazyChoice("whiteprints.copier_run", "CopierEngine"),
+    default=os.environ.get(f"{APP_NAME}_COPIER_ENGINE", "subprocess"),
+    show_default=True,
+)
+@click.option(
+    "--compose",
+    help=N_(
+        "Compose the selected templates into one template rendered in a "
+        "single pass, instead of applying them one after another. Requires "
+        "copier installed alongside whiteprints."
+    ),
+    type=bool,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@click.option(
+    "-j",
+    "--jobs",
+    help=N_(
+        "Render up to JOBS independent templates concurrently, each one in "
+        "its own staging copy of the project. The prompts of concurrent "
+        "templates interleave, use it with copier's `--defaults` or "
+        "`--data`."
+    ),
+    type=click.IntRange(min=1),
+    default=os.environ.get(f"{APP_NAME}_JOBS", "1"),
+    show_default=True,
+)
+@click.option(
+    "--wheelhouse",
+    help=N_(
+        "Install copier's tool environment offline, from the wheels of a "
+        "wheelhouse built by `whiteprints wheelhouse build`."
+    ),
+    type=click.Path(
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        resolve_path=True,
+        path_type=Path,
+    ),
+    default=os.environ.get(f"{APP_NAME}_WHEELHOUSE"),
+)
+@click.option(
+    "--timeout",
+    help=N_(
+        "Terminate a template still running after TIMEOUT seconds, with "
+        "every process it started."
+    ),
+    type=click.FloatRange(min=0, min_open=True),
+    default=os.environ.get(f"{APP_NAME}_TIMEOUT"),
+)
+@click.option(
+    "--inactivity-timeout",
+    help=N_(
+        "Terminate a template printing nothing for INACTIVITY_TIMEOUT "
+        "seconds. Its output is then captured, so it cannot prompt, use it "
+        "with copier's `--defaults` or `--data`."
+    ),
+    type=click.FloatRange(min=0, min_open=True),
+    default=os.environ.get(f"{APP_NAME}_INACTIVITY_TIMEOUT"),
+)
+@click.option(
+    "--in-place/--staged",
+    help=N_(
+        "Render the templates directly into PROJECT_DIRECTORY, or in a "
+        "staging directory on a fast local filesystem, the finished project "
+        "being then moved into place. The tasks of staged templates are "
+        "deferred, and run in PROJECT_DIRECTORY once it is in place. The "
+        "templates render in place when the tasks of one of them cannot be "
+        "deferred, or when copier is not installed alongside whiteprints."
+    ),
+    type=bool,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@click.option(
+    "--check",
+    help=N_(
+        "Only run the pre-flight checks: the tools, the target directory, "
+        "the free space and the template sources."
+    ),
+    type=bool,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@click.option(
+    "--skip-checks",
+    help=N_("Create the project without running the pre-flight checks."),
+    type=bool,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@click.option(
+    "--mirror-ttl",
+    help=N_(
+        "Refresh the local mirror of a template repository when it is older "
+        "than MIRROR_TTL seconds, 0 to always refresh it. Defaults to one "
+        "day."
+    ),
+    type=click.FloatRange(min=0),
+    default=os.environ.get(f"{APP_NAME}_MIRROR_TTL"),
+)
+@click.option(
+    "--render-cache",
+    help=N_(
+        "Materialise a template rendered before, with the same answers, "
+        "from the render cache instead of rendering it again: by cloning "
+        "(`reflink`), copying (`copy`) or hard linking (`hardlink`) its "
+        "files, or disable the cache (`off`). Requires copier's "
+        "`--defaults`, and `--defer-tasks` or `--staged`: only the templates "
+        "whose tasks are deferred are cached. The answers copier derives "
+        "from the environment, such as the git user or the date, are those "
+        "of the run which cached the template."
+    ),
+    type=_LazyChoice("whiteprints.render_cache", "RenderCacheMode"),
+    default=os.environ.get(f"{APP_NAME}_RENDER_CACHE", "off"),
+    show_default=True,
+)
+@click.option(
+    "--remote-cache",
+    help=N_(
+        "Share the render cache with other machines: a directory (or a "
+        "`file://` URL) or an `http://` URL serving GET, HEAD and PUT, such "
+        "as `python -m whiteprints.cache_server`."
+    ),
+    type=str,
+    default=os.environ.get(f"{APP_NAME}_REMOTE_CACHE"),
+)
+@click.option(
+    "--locked",
+    help=N_(
+        "Render each template at the commit of the lockfile (see `lock`), "
+        "without resolving it."
+    ),
+    type=bool,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@click.option(
+    "--lockfile",
+    help=N_("The lockfile read with `--locked`."),
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=LOCK_FILE,
+    show_default=True,
+)
+@click.option(
+    "--resume",
+    help=N_(
+        "Resume a failed initialization, from the last template rendered. "
+        "The project and the arguments must not have changed since."
+    ),
+    type=bool,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+@click.option(
+    "--defer-tasks",
+    help=N_(
+        "Run the tasks of the templates once every template rendered, "
+        "skipping the tasks identical to an earlier one. The templated "
+        "tasks still run as their template renders. Requires copier "
+        "installed alongside whiteprints."
+    ),
+    type=bool,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
 def init(
     project_directory: Path,
     copier_args: Iterable[str],
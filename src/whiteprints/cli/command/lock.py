@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""The 'lock' command."""
+
+import importlib
+from pathlib import Path
+
+import rich_click as click
+
+from whiteprints.cli.localized import LocalizedCommand
+from whiteprints.loc import N_, _
+from whiteprints.lockfile import LOCK_FILE
+
+
+@click.command(
+    cls=LocalizedCommand,
+    name="lock",
+    help=N_(
+        """Lock the template of every layer at its latest commit.
+
+The commits are resolved concurrently, and written to the lockfile with the
+whiteprints-template-context version (see `init --locked`).
+"""
+    ),
+)
+@click.option(
+    "--lockfile",
+    help=N_("The lockfile to write."),
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=LOCK_FILE,
+    show_default=True,
+)
+def lock(lockfile: Path) -> None:
+    """Lock the template of every layer at its latest commit.
+
+    Args:
+        lockfile: the lockfile to write.
+    """
+    console = importlib.import_module("whiteprints.console")
+    templates_lock = importlib.import_module("whiteprints.cli.lock").lock(
+        lockfile
+    )
+    for template, commit in templates_lock["templates"].items():
+        console.STDOUT.print(_("Locked '{}' at {}.").format(template, commit))
+
+    console.STDOUT.print(_("Lockfile written to '{}'.").format(lockfile))
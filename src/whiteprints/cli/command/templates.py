@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""The 'templates' command."""
+
+import importlib
+
+import rich_click as click
+
+from whiteprints.cli.localized import LocalizedCommand, LocalizedGroup
+from whiteprints.loc import N_, _
+
+
+@click.group(
+    cls=LocalizedGroup,
+    name="templates",
+    help=N_(
+        """Manage the local mirrors of the template repositories.
+
+The templates are cloned from mirrors kept in the user cache directory. A
+mirror is refreshed by `init` once it is older than its time to live.
+"""
+    ),
+)
+def templates() -> None:
+    """Manage the local mirrors of the template repositories."""
+
+
+@templates.command(
+    cls=LocalizedCommand,
+    name="sync",
+    help=N_("Clone or refresh the mirrors of every template."),
+)
+def sync() -> None:
+    """Clone or refresh the mirrors of every template."""
+    console = importlib.import_module("whiteprints.console")
+    for source, path in (
+        importlib.import_module("whiteprints.cli.templates").sync().items()
+    ):
+        console.STDOUT.print(
+            _("Synchronized '{}' in '{}'.").format(source, path)
+        )
+
+
+@templates.command(
+    cls=LocalizedCommand,
+    name="list",
+    help=N_("List the mirrors of the templates."),
+)
+def list_mirrors() -> None:
+    """List the mirrors of the templates."""
+    console = importlib.import_module("whiteprints.console")
+    datetime = importlib.import_module("datetime").datetime
+    for mirror in importlib.import_module("whiteprints.mirrors").mirrors():
+        console.STDOUT.print(
+            _("'{}' in '{}', refreshed {}.").format(
+                mirror["source"],
+                mirror["path"],
+                datetime.fromtimestamp(mirror["refreshed"]).isoformat(
+                    sep=" ", timespec="seconds"
+                ),
+            )
+        )
+
+
+@templates.command(
+    cls=LocalizedCommand,
+    name="gc",
+    help=N_("Remove the mirrors no longer used, and the partial ones."),
+)
+@click.option(
+    "--all",
+    "gc_all",
+    help=N_("Also remove the mirrors of the templates in use."),
+    type=bool,
+    default=False,
+    show_default=True,
+    is_flag=True,
+)
+def gc(*, gc_all: bool) -> None:
+    """Remove the mirrors no longer used.
+
+    Args:
+        gc_all: also remove the mirrors of the templates in use.
+    """
+    console = importlib.import_module("whiteprints.console")
+    for path in importlib.import_module("whiteprints.cli.templates").gc(
+        gc_all=gc_all
+    ):
+        console.STDOUT.print(_("Removed '{}'.").format(path))
@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""The 'wheelhouse' command."""
+
+import importlib
+from pathlib import Path
+
+import rich_click as click
+
+from whiteprints.cli.localized import LocalizedCommand, LocalizedGroup
+from whiteprints.loc import N_, _
+
+
+@click.group(
+    cls=LocalizedGroup,
+    name="wheelhouse",
+    help=N_(
+        """Manage the wheelhouse of the tool environment running copier.
+
+A wheelhouse holds every wheel of the environment, so that it is installed
+without contacting a package index (see `init --wheelhouse`).
+"""
+    ),
+)
+def wheelhouse() -> None:
+    """Manage the wheelhouse of the tool environment running copier."""
+
+
+@wheelhouse.command(
+    cls=LocalizedCommand,
+    name="build",
+    help=N_(
+        """Lock the tool environment running copier, and download its wheels
+in DIRECTORY.
+"""
+    ),
+)
+@click.argument(
+    "directory",
+    type=click.Path(
+        file_okay=False,
+        dir_okay=True,
+        writable=True,
+        resolve_path=True,
+        path_type=Path,
+    ),
+)
+def build(directory: Path) -> None:
+    """Build the wheelhouse of the tool environment running copier.
+
+    Args:
+        directory: the wheelhouse directory.
+    """
+    console = importlib.import_module("whiteprints.console")
+    lock = importlib.import_module("whiteprints.cli.wheelhouse").build(
+        directory
+    )
+    console.STDOUT.print(_("Wheelhouse locked in '{}'.").format(lock))
@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Shell completion for whiteprints, generated by `whiteprints completion
+# install`. Completions are answered from a static index of the commands and
+# options, regenerated when the installed version of whiteprints changes.
+
+_whiteprints_completion() {
+    if [[ -n ${ZSH_VERSION-} ]]; then
+        setopt local_options ksh_arrays
+    fi
+    local index=@INDEX@
+    local stamp=""
+    [[ -f $index ]] && read -r stamp < "$index"
+    stamp=${stamp#\# }
+    if [[ ! -e $stamp || $stamp -nt $index ]]; then
+        "${COMP_WORDS[0]}" completion index > /dev/null 2>&1 || return 0
+    fi
+
+    local cur=${COMP_WORDS[COMP_CWORD]}
+    local prev=${COMP_WORDS[COMP_CWORD - 1]}
+    local scope=@ROOT@ entry_scope kind word i
+    local -a commands=() options=() choices=()
+    local paths=0
+
+    for ((i = 1; i < COMP_CWORD; i++)); do
+        while IFS=$'\t' read -r entry_scope kind word; do
+            if [[ $entry_scope == "$scope" && $kind == command && \
+                $word == "${COMP_WORDS[i]}" ]]; then
+                scope="$scope $word"
+                break
+            fi
+        done < "$index"
+    done
+
+    while IFS=$'\t' read -r entry_scope kind word; do
+        [[ $entry_scope == "$scope" ]] || continue
+        case $kind in
+            command) commands+=("$word") ;;
+            option) options+=("$word") ;;
+            path) paths=1 ;;
+            "choice $prev") choices+=("$word") ;;
+        esac
+    done < "$index"
+
+    if ((${#choices[@]})); then
+        COMPREPLY=($(compgen -W "${choices[*]}" -- "$cur"))
+    elif [[ $cur == -* ]]; then
+        COMPREPLY=($(compgen -W "${options[*]}" -- "$cur"))
+    else
+        COMPREPLY=($(compgen -W "${commands[*]}" -- "$cur"))
+        if ((paths)); then
+            COMPREPLY+=($(compgen -d -- "$cur"))
+        fi
+    fi
+    return 0
+}
+
+complete -F _whiteprints_completion @ROOT@
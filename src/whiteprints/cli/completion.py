@@ -0,0 +1,225 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Import-free shell completion.
+
+The completion script answers from a static index of the commands, options
+and option choices, so that completing a command line does not start Python.
+The index is regenerated by the script when the installed distribution of
+whiteprints changes.
+"""
+
+import os
+import shlex
+import sys
+from collections.abc import Iterator
+from importlib import metadata
+from pathlib import Path
+from typing import Final, Literal
+
+from click import Choice, Command, Context, Group, Option
+from click import Path as PathType
+
+from whiteprints import package_metadata
+from whiteprints.cache_directory import cache_directory
+from whiteprints.cli import __app_name__
+
+
+if sys.version_info >= (3, 10):
+    from typing import TypeAlias
+else:
+    from typing_extensions import TypeAlias
+
+
+__all__: Final = [
+    "SCRIPT_TEMPLATE",
+    "Shell",
+    "default_script_path",
+    "index_file",
+    "install",
+    "render_script",
+    "write_index",
+]
+"""Public module attributes."""
+
+
+Shell: TypeAlias = Literal["bash", "zsh"]
+"""The supported shells."""
+
+SCRIPT_TEMPLATE: Final = Path(__file__).parent / "completion.bash"
+"""The completion script template."""
+
+
+def index_file() -> Path:
+    """The completion index file.
+
+    Returns:
+        The path to the completion index.
+    """
+    return cache_directory("completion") / "index.tsv"
+
+
+def _stamp() -> Path:
+    """The path identifying the installed distribution.
+
+    The distribution metadata directory is named after the version, and is
+    rewritten when the distribution is reinstalled.
+
+    Returns:
+        The path to the distribution metadata directory, or to the package
+        when it cannot be found.
+    """
+    for path in metadata.files(__app_name__) or []:
+        if path.parent.name.endswith(".dist-info"):
+            return Path(str(path.locate())).parent
+
+    return Path(__file__).parent.parent
+
+
+def _option_entries(scope: str, option: Option) -> Iterator[str]:
+    """The index entries of an option.
+
+    Args:
+        scope: the command path of the command holding the option.
+        option: the option.
+
+    Yields:
+        The index entries.
+    """
+    for name in (*option.opts, *option.secondary_opts):
+        yield f"{scope}\toption\t{name}"
+        if isinstance(option.type, Choice):
+            for choice in option.type.choices:
+                yield f"{scope}\tchoice {name}\t{choice}"
+
+
+def _parameter_entries(
+    scope: str,
+    command: Command,
+    ctx: Context,
+) -> Iterator[str]:
+    """The index entries of the parameters of a command.
+
+    Args:
+        scope: the command path of the command.
+        command: the command.
+        ctx: the click context of the command.
+
+    Yields:
+        The index entries.
+    """
+    for parameter in command.get_params(ctx):
+        if isinstance(parameter, Option):
+            yield from _option_entries(scope, parameter)
+        elif isinstance(parameter.type, PathType):
+            yield f"{scope}\tpath\t{parameter.name}"
+
+
+def _entries(scope: str, command: Command, ctx: Context) -> Iterator[str]:
+    """The index entries of a command and of its subcommands.
+
+    Args:
+        scope: the command path of the command.
+        command: the command.
+        ctx: the click context of the command.
+
+    Yields:
+        The index entries.
+    """
+    yield from _parameter_entries(scope, command, ctx)
+    if not isinstance(command, Group):
+        return
+
+    for name in command.list_commands(ctx):
+        subcommand = command.get_command(ctx, name)
+        if subcommand is not None and not subcommand.hidden:
+            yield f"{scope}\tcommand\t{name}"
+            yield from _entries(
+                f"{scope} {name}",
+                subcommand,
+                Context(subcommand, info_name=name, parent=ctx),
+            )
+
+
+def write_index(command: Command) -> Path:
+    """Write the completion index of a command.
+
+    Args:
+        command: the root command.
+
+    Returns:
+        The path to the completion index.
+    """
+    index = index_file()
+    index.parent.mkdir(parents=True, exist_ok=True)
+    lines = [
+        f"# {_stamp()}",
+        f"# {__app_name__} {package_metadata.__version__}",
+        *_entries(
+            __app_name__,
+            command,
+            Context(command, info_name=__app_name__),
+        ),
+    ]
+    temporary = index.with_suffix(f".{os.getpid()}.tmp")
+    temporary.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    temporary.replace(index)
+    return index
+
+
+def render_script(shell: Shell) -> str:
+    """Render the completion script of a shell.
+
+    Args:
+        shell: the shell.
+
+    Returns:
+        The completion script.
+    """
+    script = (
+        SCRIPT_TEMPLATE.read_text(encoding="utf-8")
+        .replace("@INDEX@", shlex.quote(str(index_file())))
+        .replace("@ROOT@", __app_name__)
+    )
+    if shell == "zsh":
+        return "autoload -U +X bashcompinit && bashcompinit\n\n" + script
+
+    return script
+
+
+def default_script_path(shell: Shell) -> Path:
+    """The default path of the completion script of a shell.
+
+    The bash script is installed where bash-completion loads it on demand.
+
+    Args:
+        shell: the shell.
+
+    Returns:
+        The default path of the completion script.
+    """
+    if shell == "bash":
+        data_home = Path(
+            os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")
+        )
+        return data_home / "bash-completion" / "completions" / __app_name__
+
+    return cache_directory("completion") / f"{__app_name__}.{shell}"
+
+
+def install(command: Command, *, shell: Shell, path: Path) -> Path:
+    """Install the completion script of a shell, and its index.
+
+    Args:
+        command: the root command.
+        shell: the shell.
+        path: where to write the completion script.
+
+    Returns:
+        The path to the completion script.
+    """
+    write_index(command)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(render_script(shell), encoding="utf-8")
+    return path
@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Command Line Interface dispatcher.
+
+The dispatcher answers the trivial eager options (`--version`, `--copyright`
+and `--license`) with plain writes on the standard output, before importing
+the rich stack. Help screens are printed from a persistent cache when
+possible. Any other invocation is forwarded to the click entrypoint.
+
+The dotenv file is only loaded, and the help cache only imported, once the
+trivial eager options are ruled out.
+"""
+
+import importlib
+import sys
+from collections.abc import Callable, Sequence
+from typing import Final, Optional
+
+from whiteprints import environment
+from whiteprints.cli import __app_name__
+
+
+__all__: Final = ["main"]
+"""Public module attributes."""
+
+
+def _write(*lines: str) -> None:
+    """Write lines on the standard output.
+
+    Args:
+        lines: the lines to write.
+    """
+    sys.stdout.write("".join(f"{line}\n" for line in lines))
+
+
+def _is_interactive() -> bool:
+    """Whether the standard output is a terminal.
+
+    When the standard output is a terminal, rich renders colors, highlights
+    and panels. Otherwise, the plain text backend is used.
+
+    Returns:
+        True if the standard output is a terminal, False otherwise.
+    """
+    return sys.stdout.isatty()
+
+
+def _print_version() -> bool:
+    """Print the version, as click's version option does.
+
+    Returns:
+        True, the version is always printed.
+    """
+    package_metadata = importlib.import_module("whiteprints.package_metadata")
+    _write(f"{__app_name__}, version {package_metadata.__version__}")
+    return True
+
+
+def _print_copyright() -> bool:
+    """Print the copyright information in plain text.
+
+    Returns:
+        True if the copyright was printed, False otherwise.
+    """
+    if _is_interactive():
+        return False
+
+    notice = importlib.import_module("whiteprints.cli.notice")
+    _write(notice.copyright_notice())
+    return True
+
+
+def _print_license() -> bool:
+    """Print the license information in plain text.
+
+    Returns:
+        True if the license was printed, False otherwise.
+    """
+    if _is_interactive():
+        return False
+
+    notice = importlib.import_module("whiteprints.cli.notice")
+    package_metadata = importlib.import_module("whiteprints.package_metadata")
+    _write(
+        notice.license_notice(package_metadata.__license__),
+        notice.reuse_notice(),
+    )
+    for license_path in package_metadata.__license_file__:
+        _write(
+            license_path.stem,
+            license_path.read_text(),
+            f"{license_path}\n",
+        )
+
+    return True
+
+
+FAST_PATH: Final[dict[tuple[str, ...], Callable[[], bool]]] = {
+    ("--version",): _print_version,
+    ("--copyright",): _print_copyright,
+    ("--license",): _print_license,
+}
+"""Invocations answered without importing the rich stack."""
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the CLI.
+
+    Args:
+        argv: the command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    arguments = tuple(sys.argv[1:] if argv is None else argv)
+    if (print_fast := FAST_PATH.get(arguments)) is not None and print_fast():
+        return
+
+    environment.initialize()
+    help_cache = importlib.import_module("whiteprints.cli.help_cache")
+    if (screen := help_cache.HELP_SCREENS.get(arguments)) is None:
+        _run(argv)
+        return
+
+    if help_cache.print_cached(screen):
+        return
+
+    with help_cache.recording(screen):
+        _run(argv)
+
+
+def _run(argv: Optional[Sequence[str]]) -> None:
+    """Run the click entrypoint.
+
+    Args:
+        argv: the command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    importlib.import_module(
+        "whiteprints.cli.entrypoint",
+        __package__,
+    ).whiteprints(None if argv is None else list(argv))
@@ -14,12 +14,14 @@
 import rich_click as click
 from rich_click import Context, File, Option
 from rich_click.rich_command import RichCommand as Command
-from rich_click.rich_command import RichGroup as Group
+from rich_click.rich_context import RichContext
+from rich_click.rich_help_formatter import RichHelpFormatter
 
-from whiteprints import __version__
-from whiteprints.cli import APP_NAME, __app_name__
+from whiteprints import __version__, environment
+from whiteprints.cli import APP_NAME, __app_name__, notice
+from whiteprints.cli.localized import LocalizedGroup
 from whiteprints.cli.logs import LogLevel, configure_logging
-from whiteprints.loc import _
+from whiteprints.loc import N_, _
 
 
 if sys.version_info >= (3, 11):
@@ -40,12 +42,30 @@
 
 COMMAND_DIRECTORY_NAME: Final = "command"
 COMMAND_ROOT: Final = Path(__file__).parent / COMMAND_DIRECTORY_NAME
+COMMAND_MANIFEST: Final = "whiteprints.cli._command_manifest"
+"""The module holding the command manifest generated at build time."""
 
+_SUMMARY_ONLY: Final = "whiteprints.summary_only"
+"""Context meta key set while the commands are summarised in the help."""
 
-class LazyCommandLoader(Group):
+
+class CommandEntry(TypedDict):
+    """A command lookup table entry."""
+
+    module: str
+    function_name: str
+    short_help: str
+
+
+class LazyCommandLoader(LocalizedGroup):
     """Lazy commands loader.
 
     Loads lazily all the commands in the submodule .command.
+
+    The commands are looked up in a manifest generated at build time (see
+    hatch_build.py), so that a command module is only imported when its
+    command is actually needed. When the manifest is missing (e.g. editable
+    installs), the submodule .command is scanned instead.
     """
 
     @staticmethod
@@ -62,9 +82,40 @@ def _is_command(obj: object) -> bool:
         """
         return isinstance(obj, Command)
 
-    @cached_property
-    def command_lookup(self) -> dict[str, dict[str, str]]:
-        """A command lookup table."""
+    @staticmethod
+    def _top_level_commands(module: str) -> list[tuple[str, Command]]:
+        """Find the commands of a module that are not subcommands.
+
+        Args:
+            module: the name of the module.
+
+        Returns:
+            A list of (attribute name, command) pairs.
+        """
+        inspect = importlib.import_module("inspect")
+        commands: list[tuple[str, Command]] = inspect.getmembers(
+            importlib.import_module(module, __package__),
+            LazyCommandLoader._is_command,
+        )
+        subcommands = {
+            id(subcommand)
+            for _function_name, command in commands
+            if isinstance(command, click.Group)
+            for subcommand in command.commands.values()
+        }
+        return [
+            (function_name, command)
+            for function_name, command in commands
+            if id(command) not in subcommands
+        ]
+
+    @staticmethod
+    def scan_commands() -> dict[str, CommandEntry]:
+        """Build the command lookup table by importing the command modules.
+
+        Returns:
+            A mapping from a command name to its lookup table entry.
+        """
         pkgutil = importlib.import_module("pkgutil")
         commands_modules = [
             ".".join((__package__ or "", COMMAND_DIRECTORY_NAME, name))
@@ -72,20 +123,28 @@ def command_lookup(self) -> dict[str, dict[str, str]]:
                 path=map(str, [COMMAND_ROOT])
             )
         ]
-        inspect = importlib.import_module("inspect")
-        command_lookup: dict[str, dict[str, str]] = {}
+        command_lookup: dict[str, CommandEntry] = {}
         for module in commands_modules:
-            for command in inspect.getmembers(
-                importlib.import_module(module, __package__),
-                LazyCommandLoader._is_command,
-            ):
-                command_lookup[command[1].name] = {
-                    "module": module,
-                    "function_name": command[0],
-                }
+            for (
+                function_name,
+                command,
+            ) in LazyCommandLoader._top_level_commands(module):
+                command_lookup[command.name or function_name] = CommandEntry(
+                    module=module,
+                    function_name=function_name,
+                    short_help=command.short_help or command.help or "",
+                )
 
         return command_lookup
 
+    @cached_property
+    def command_lookup(self) -> dict[str, CommandEntry]:
+        """A command lookup table."""
+        try:
+            return importlib.import_module(COMMAND_MANIFEST).COMMANDS
+        except ModuleNotFoundError:
+            return self.scan_commands()
+
     @cached_property
     def _list_commands(self) -> list[str]:
         """A list all the commands."""
@@ -107,10 +166,13 @@ def list_commands(self, ctx: Context) -> list[str]:
     def get_command(self, ctx: Context, cmd_name: str) -> Optional[Command]:
         """Invoke a command.
 
-        The command must have the name of the module.
+        The command must have the name of the module. While the help of the
+        group is rendered, a lightweight summary of the command built from the
+        lookup table is returned instead, so that rendering the help does not
+        import the command modules.
 
         Args:
-            ctx: the click context (unused).
+            ctx: the click context.
             cmd_name: the name of the command to invoke.
 
         Returns:
@@ -119,6 +181,12 @@ def get_command(self, ctx: Context, cmd_name: str) -> Optional[Command]:
         if (command := self.command_lookup.get(cmd_name)) is None:
             return None
 
+        if ctx.meta.get(_SUMMARY_ONLY, False):
+            return Command(
+                name=cmd_name,
+                short_help=_(command["short_help"]),
+            )
+
         return getattr(
             importlib.import_module(
                 command["module"],
@@ -127,6 +195,24 @@ def get_command(self, ctx: Context, cmd_name: str) -> Optional[Command]:
             command["function_name"],
         )
 
+    @override
+    def format_help(
+        self,
+        ctx: RichContext,
+        formatter: RichHelpFormatter,
+    ) -> None:
+        """Format the help, summarizing the commands from the lookup table.
+
+        Args:
+            ctx: the click context.
+            formatter: the rich help formatter.
+        """
+        ctx.meta[_SUMMARY_ONLY] = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            del ctx.meta[_SUMMARY_ONLY]
+
 
 @override
 def print_copyright(ctx: Context, _param: Option, value: bool) -> None:
@@ -141,12 +227,7 @@ def print_copyright(ctx: Context, _param: Option, value: bool) -> None:
         return
 
     console = importlib.import_module("whiteprints.console")
-    console.STDOUT.print(
-        _(
-            'Copyright © 2024 The "Whiteprints" contributors'
-            " <whiteprints@pm.me>."
-        )
-    )
+    console.STDOUT.print(notice.copyright_notice())
     ctx.exit()
 
 
@@ -164,18 +245,8 @@ def print_license(ctx: Context, _param: Option, value: bool) -> None:
 
     console = importlib.import_module("whiteprints.console")
     package_metadata = importlib.import_module("whiteprints.package_metadata")
-    console.STDOUT.print(
-        _("Code released under license '{}'.").format(
-            package_metadata.__license__
-        )
-    )
-    console.STDOUT.print(
-        _(
-            "\nThis project is REUSE compliant ('https://reuse.software/')."
-            " Please check the SPDX header of each source code file for "
-            "detailed licensing information.\nSources located at '{}'.\n"
-        ).format(Path(__file__).parent.parent)
-    )
+    console.STDOUT.print(notice.license_notice(package_metadata.__license__))
+    console.STDOUT.print(notice.reuse_notice())
 
     panel = importlib.import_module("rich.panel")
     for license_path in package_metadata.__license_file__:
@@ -184,7 +255,7 @@ def print_license(ctx: Context, _param: Option, value: bool) -> None:
             title=license_path.stem,
         )
         console.STDOUT.print(license_panel)
-        console.STDOUT.print(str(license_path.locate()) + "\n")
+        console.STDOUT.print(f"{license_path}\n")
 
     ctx.exit()
 
@@ -211,6 +282,9 @@ def print_debug_info(ctx: Context, _param: Option, value: bool) -> None:
     ctx.exit()
 
 
+environment.initialize()
+
+
 class CLIArgsType(TypedDict):
     """The CLI arguments types."""
 
@@ -221,10 +295,10 @@ class CLIArgsType(TypedDict):
 @click.command(
     cls=LazyCommandLoader,
     name=__app_name__,
-    help=_(
+    help=N_(
         "A Copier-based cookiecutter for creating Python projects "
         "managed by uv."
-    ).format(__app_name__),
+    ),
     no_args_is_help=True,
 )
 @click.option(
@@ -234,7 +308,7 @@ class CLIArgsType(TypedDict):
         get_args(LogLevel),
         case_sensitive=False,
     ),
-    help=_("Logging verbosity."),
+    help=N_("Logging verbosity."),
     default=os.environ.get(f"{APP_NAME}_LOG_LEVEL", "ERROR"),
     show_default=True,
 )
@@ -246,7 +320,7 @@ class CLIArgsType(TypedDict):
         encoding="utf-8",
         lazy=True,
     ),
-    help=_("A file in which to write the log."),
+    help=N_("A file in which to write the log."),
     default=os.environ.get(f"{APP_NAME}_LOG_FILE", "-"),
     show_default=True,
 )
@@ -256,7 +330,7 @@ class CLIArgsType(TypedDict):
     callback=print_copyright,
     expose_value=False,
     is_eager=True,
-    help=_("Print the copyright information."),
+    help=N_("Print the copyright information."),
 )
 @click.option(
     "--license",
@@ -264,7 +338,7 @@ class CLIArgsType(TypedDict):
     callback=print_license,
     expose_value=False,
     is_eager=True,
-    help=_("Print the license information."),
+    help=N_("Print the license information."),
 )
 @click.option(
     "--debug-info",
@@ -272,7 +346,7 @@ class CLIArgsType(TypedDict):
     callback=print_debug_info,
     expose_value=False,
     is_eager=True,
-    help=_(
+    help=N_(
         "Print system information. Useful for reporting errors and debugging."
     ),
 )
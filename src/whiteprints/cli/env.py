@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Manage the tool environment running copier."""
+
+from pathlib import Path
+from typing import Final, Optional
+
+from click import ClickException
+
+from whiteprints import tool_environment
+from whiteprints.cli.init import TEMPLATE_CONTEXT
+from whiteprints.copier_run import copier_environment
+from whiteprints.wheelhouse import WheelhouseError
+
+
+__all__: Final = [
+    "ToolEnvironmentError",
+    "prune",
+    "template_environment",
+    "warm",
+]
+"""Public module attributes."""
+
+
+class ToolEnvironmentError(ClickException):
+    """The tool environment cannot be created."""
+
+    def __init__(self, reason: str) -> None:
+        """Create an exception instance.
+
+        Args:
+            reason: why the environment cannot be created.
+        """
+        super().__init__(f"The tool environment cannot be created. {reason}")
+
+
+def template_environment(
+    wheelhouse: Optional[Path] = None,
+) -> tool_environment.ToolEnvironment:
+    """The tool environment rendering the templates.
+
+    Args:
+        wheelhouse: the wheelhouse to install the environment from, None to
+            resolve it against the package indexes.
+
+    Returns:
+        The tool environment holding copier and the template context.
+    """
+    return copier_environment(TEMPLATE_CONTEXT, wheelhouse=wheelhouse)
+
+
+def warm(wheelhouse: Optional[Path] = None) -> Path:
+    """Create the tool environment rendering the templates.
+
+    Args:
+        wheelhouse: the wheelhouse to install the environment from, None to
+            resolve it against the package indexes.
+
+    Returns:
+        The directory of the environment.
+
+    Raises:
+        ToolEnvironmentError: the wheelhouse cannot install the environment.
+    """
+    try:
+        return template_environment(wheelhouse).create()
+    except WheelhouseError as error:
+        raise ToolEnvironmentError(reason=str(error)) from error
+
+
+def prune(
+    *,
+    prune_all: bool = False,
+    wheelhouse: Optional[Path] = None,
+) -> list[Path]:
+    """Remove the unused tool environments.
+
+    Args:
+        prune_all: also remove the environment rendering the templates.
+        wheelhouse: the wheelhouse the environment in use is installed from.
+
+    Returns:
+        The directories removed.
+
+    Raises:
+        ToolEnvironmentError: the wheelhouse cannot install the environment.
+    """
+    try:
+        keep = [] if prune_all else [template_environment(wheelhouse)]
+        return tool_environment.prune(keep=keep)
+    except WheelhouseError as error:
+        raise ToolEnvironmentError(reason=str(error)) from error
@@ -0,0 +1,201 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Persistent cache of the rendered help screens.
+
+Rendering the help through rich_click requires building the click command
+tree. The rendered screens only depend on the package version, the active
+catalog, the program name, the terminal width and its colors, and the
+environment variables of the application (the defaults of the options, read
+after the dotenv file is loaded), so they are cached on disk, keyed by these
+values.
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+from collections.abc import Generator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Final, TextIO
+
+from whiteprints import loc, package_metadata
+from whiteprints.cache_directory import cache_directory
+from whiteprints.cli import APP_NAME
+
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+__all__: Final = ["HELP_SCREENS", "print_cached", "recording"]
+"""Public module attributes."""
+
+
+HELP_SCREENS: Final[dict[tuple[str, ...], str]] = {
+    ("--help",): "whiteprints",
+    ("init", "--help"): "init",
+}
+"""A mapping from the help invocations to the name of their screen."""
+
+COLOR_VARIABLES: Final = ("NO_COLOR", "FORCE_COLOR", "TERM", "COLORTERM")
+"""The environment variables changing the colors of the rendered help."""
+
+
+def _key() -> str:
+    """The cache key of the help screens in the current environment.
+
+    Returns:
+        A digest of the values the rendered help screens depend on.
+    """
+    key = {
+        "version": package_metadata.__version__,
+        "catalogs": [
+            [str(catalog), catalog.stat().st_mtime_ns]
+            for catalog in loc.catalog_files()
+        ],
+        "program": sys.argv[0] if sys.argv else "",
+        "columns": shutil.get_terminal_size().columns,
+        "terminal": sys.stdout.isatty(),
+        "colors": [os.environ.get(name) for name in COLOR_VARIABLES],
+        "defaults": sorted(
+            (name, value)
+            for name, value in os.environ.items()
+            if name.startswith(f"{APP_NAME}_")
+        ),
+    }
+    return hashlib.sha256(
+        json.dumps(key, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def _cache_file(screen: str) -> Path:
+    """The cache file of a help screen in the current environment.
+
+    Args:
+        screen: the name of the help screen.
+
+    Returns:
+        The path of the cache file.
+    """
+    return cache_directory("help", screen) / f"{_key()}.txt"
+
+
+def print_cached(screen: str) -> bool:
+    """Print a help screen from the cache.
+
+    Args:
+        screen: the name of the help screen.
+
+    Returns:
+        True if the screen was found in the cache and printed, False
+        otherwise.
+    """
+    try:
+        sys.stdout.write(_cache_file(screen).read_text(encoding="utf-8"))
+    except OSError:
+        return False
+
+    return True
+
+
+def _store(screen: str, rendered: str) -> None:
+    """Store a help screen in the cache, replacing any stale screen.
+
+    Args:
+        screen: the name of the help screen.
+        rendered: the rendered help screen.
+    """
+    cache_file = _cache_file(screen)
+    with suppress(OSError):
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        for stale in cache_file.parent.glob("*.txt"):
+            stale.unlink()
+        temporary = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(rendered, encoding="utf-8")
+        temporary.replace(cache_file)
+
+
+class _Recorder(io.StringIO):
+    """Record what is written on a stream."""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize the recorder.
+
+        Args:
+            stream: the recorded stream.
+        """
+        super().__init__()
+        self.stream = stream
+
+    @property
+    @override
+    def encoding(self) -> str:  # type: ignore[override]
+        """The encoding of the recorded stream."""
+        return self.stream.encoding
+
+    @override
+    def write(self, s: str) -> int:
+        """Write on the recorded stream and record it.
+
+        Args:
+            s: the string to write.
+
+        Returns:
+            The number of characters written.
+        """
+        super().write(s)
+        return self.stream.write(s)
+
+    @override
+    def flush(self) -> None:
+        """Flush the recorded stream."""
+        self.stream.flush()
+
+    @override
+    def isatty(self) -> bool:
+        """Whether the recorded stream is a terminal.
+
+        Returns:
+            True if the recorded stream is a terminal, False otherwise.
+        """
+        return self.stream.isatty()
+
+    @override
+    def fileno(self) -> int:
+        """The file descriptor of the recorded stream.
+
+        Returns:
+            The file descriptor of the recorded stream.
+        """
+        return self.stream.fileno()
+
+
+@contextmanager
+def recording(screen: str) -> Generator[None, None, None]:
+    """Record the help screen printed on the standard output.
+
+    The screen is stored in the cache when the CLI exits successfully.
+
+    Args:
+        screen: the name of the help screen.
+
+    Yields:
+        Nothing, the standard output is recorded within the context.
+    """
+    recorder = _Recorder(sys.stdout)
+    sys.stdout = recorder
+    try:
+        yield
+    except SystemExit as exit_info:
+        if exit_info.code in {0, None}:
+            _store(screen, recorder.getvalue())
+        raise
+    finally:
+        sys.stdout = recorder.stream
@@ -2,18 +2,68 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-"""Initialize a project."""
-
+"""Initialize a project.
+
+The project is built from template layers: the Python template, then the
+optional command line and GitHub templates. The layers are applied one after
+another, concurrently when they are independent (see whiteprints.layer_graph),
+or composed into a single template rendered in one pass (see
+whiteprints.composition). Their tasks may be deferred until every layer
+rendered, and run once (see whiteprints.deferred_tasks). The layers are
+rendered in a staging directory, the finished project is then published (see
+whiteprints.staging): their tasks are deferred, and run in the published
+project. When the tasks of a layer cannot be deferred, the layers render into
+the project, as with `--in-place`. A checkpoint is recorded after each layer, a
+failed init resumes from it (see whiteprints.checkpoint). The environment is
+checked before any layer is applied (see whiteprints.preflight). The remote
+templates are cloned from local mirrors (see whiteprints.mirrors). A step
+rendered before is materialised from the render cache (see
+whiteprints.render_cache), which may be shared by machines (see
+whiteprints.remote_cache). A locked init renders each template at the commit of
+the lockfile (see whiteprints.lockfile), an unlocked init at the version copier
+picks, which the lockfile pins.
+"""
+
+import importlib
+import logging
+import math
 import sys
-from collections.abc import Iterable
+import tempfile
+from collections.abc import Iterable, Sequence
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
 from subprocess import CalledProcessError  # nosec
-from typing import Final, TypedDict
+from typing import TYPE_CHECKING, Final, Optional, TypedDict
 
 from click import ClickException
 
+from whiteprints import checkpoint, staging
+from whiteprints.cache_directory import cache_directory
+from whiteprints.checkpoint import CheckpointError
 from whiteprints.cli.init_interface import InitKwargs
 from whiteprints.copier_run import Copier
+from whiteprints.jinja_cache import JINJA_CACHE_DIRECTORY
+from whiteprints.layer_graph import (
+    LayerConflictError,
+    apply_layer_graph,
+    batches,
+)
+from whiteprints.layers import Layer
+from whiteprints.loc import _
+from whiteprints.supervision import (
+    ProcessTimeoutError,
+    Timeouts,
+    forward_signals,
+)
+from whiteprints.wheelhouse import WheelhouseError
+
+
+if TYPE_CHECKING:
+    from whiteprints.deferred_tasks import TaskPlan
+    from whiteprints.lockfile import Lock
+    from whiteprints.preflight import CheckResult
+    from whiteprints.remote_cache import Backend
 
 
 if sys.version_info >= (3, 11):
@@ -22,12 +72,27 @@
     from typing_extensions import Required, Unpack
 
 
-__all__: Final = ["CopierCopyError", "init"]
+__all__: Final = [
+    "CopierCopyError",
+    "Layer",
+    "LockfileError",
+    "PreflightCheckError",
+    "check",
+    "init",
+    "locked_layers",
+    "mirror_environment",
+    "selected_layers",
+]
 
 
 WHITEPRINTS_TEMPLATE_CONTEXT_VERSION: Final = "0.6.0"
 """The whiteprints-template-context version pin."""
 
+TEMPLATE_CONTEXT: Final = [
+    "whiteprints-template-context==" + WHITEPRINTS_TEMPLATE_CONTEXT_VERSION
+]
+"""The packages the templates need to be rendered."""
+
 
 class _FeatureRepository(TypedDict):
     """Feature dictionnary interface."""
@@ -46,13 +111,66 @@ class _FeatureRepository(TypedDict):
 )
 """A mapping from a feature name to its template repository."""
 
+PYTHON_LAYER: Final = Layer(
+    name="python",
+    template="gh:whiteprints/template-python.git",
+    requires=(),
+)
+"""The Python project layer, always applied first."""
+
+COMMAND_LINE_LAYER: Final = Layer(
+    name="command_line",
+    template="gh:whiteprints/template-rich-click.git",
+    requires=(PYTHON_LAYER["name"],),
+)
+"""The command line layer."""
+
+GITHUB_LAYER: Final = Layer(
+    name="github",
+    template="gh:whiteprints/template-github.git",
+    requires=(PYTHON_LAYER["name"], COMMAND_LINE_LAYER["name"]),
+)
+"""The GitHub layer, applied before the GitHub features."""
+
+FEATURE_REQUIREMENTS: Final = (PYTHON_LAYER["name"], GITHUB_LAYER["name"])
+"""The layers the GitHub features require, the features are independent."""
+
 
 class CopierCopyError(ClickException):
     """An error occured while creating the project."""
 
-    def __init__(self) -> None:
-        """Create an exception instance."""
-        super().__init__("Project creation failed.")
+    def __init__(self, reason: Optional[str] = None) -> None:
+        """Create an exception instance.
+
+        Args:
+            reason: why the project creation failed, if known.
+        """
+        message = "Project creation failed."
+        super().__init__(message if reason is None else f"{message} {reason}")
+
+
+class PreflightCheckError(ClickException):
+    """A pre-flight check failed."""
+
+    def __init__(self, error: ValueError) -> None:
+        """Create an exception instance.
+
+        Args:
+            error: the failed checks.
+        """
+        super().__init__(str(error))
+
+
+class LockfileError(ClickException):
+    """The lockfile cannot be used."""
+
+    def __init__(self, error: Exception) -> None:
+        """Create an exception instance.
+
+        Args:
+            error: why the lockfile cannot be used.
+        """
+        super().__init__(str(error))
 
 
 def _should_add(feature: str, cli_kwargs: InitKwargs) -> bool:
@@ -68,96 +186,627 @@ def _should_add(feature: str, cli_kwargs: InitKwargs) -> bool:
     return cli_kwargs.get(feature, False) or cli_kwargs["github_all"]
 
 
-def add_github_functionalities(
+def _require_github(**kwargs: Unpack[InitKwargs]) -> bool:
+    """Check if the project requires a GitHub configuration.
+
+    Args:
+        kwargs: the command line flags.
+
+    Returns:
+        True if the project requires a GitHub configuration, False otherwise.
+    """
+    return (
+        kwargs["github"]
+        or kwargs["github_all"]
+        or kwargs["pypi"]
+        or kwargs["codecov"]
+        or kwargs["readthedocs"]
+        or kwargs["protect_repository"]
+    )
+
+
+def github_layers(**kwargs: Unpack[InitKwargs]) -> list[Layer]:
+    """The GitHub layers selected by the command line flags.
+
+    Args:
+        kwargs: the command line flags.
+
+    Returns:
+        The GitHub layer followed by the GitHub feature layers, if any.
+    """
+    features = [
+        # There seems to be a bug in pyright as of 2024/10/19 repository is
+        # guaranteed to be a string, as shown in the TypedDict
+        # _FeatureRepository...
+        Layer(
+            name=feature,
+            template=repository,  # type: ignore[reportArgumentType]
+            requires=FEATURE_REQUIREMENTS,
+        )
+        for feature, repository in FEATURE_REPOSITORY.items()
+        if _should_add(feature, cli_kwargs=kwargs)
+    ]
+    return ([GITHUB_LAYER] if _require_github(**kwargs) else []) + features
+
+
+def selected_layers(**kwargs: Unpack[InitKwargs]) -> list[Layer]:
+    """The layers selected by the command line flags.
+
+    Args:
+        kwargs: the command line flags.
+
+    Returns:
+        The layers, in the order they are applied.
+    """
+    return [
+        PYTHON_LAYER,
+        *([COMMAND_LINE_LAYER] if kwargs["command_line"] else []),
+        *github_layers(**kwargs),
+    ]
+
+
+def _pinned(
+    layer: Layer,
+    *,
+    ref: Optional[str] = None,
+    skip_tasks: Optional[bool] = None,
+) -> Layer:
+    """A copy of a layer, pinned to a reference or skipping its tasks.
+
+    Args:
+        layer: the layer.
+        ref: the git reference of the template, None to keep the layer's.
+        skip_tasks: whether the tasks are skipped, None to keep the layer's.
+
+    Returns:
+        The copy of the layer.
+    """
+    pinned = layer.copy()
+    if ref is not None:
+        pinned["ref"] = ref
+
+    if skip_tasks is not None:
+        pinned["skip_tasks"] = skip_tasks
+
+    return pinned
+
+
+def _lock(lockfile: Path) -> "Lock":
+    """Read the lockfile.
+
+    Args:
+        lockfile: the lockfile.
+
+    Returns:
+        The lock of the templates.
+
+    Raises:
+        LockfileError: the lockfile cannot be used.
+    """
+    lockfile_module = importlib.import_module("whiteprints.lockfile")
+    try:
+        return lockfile_module.read(
+            lockfile, WHITEPRINTS_TEMPLATE_CONTEXT_VERSION
+        )
+    except lockfile_module.LockError as error:
+        raise LockfileError(error) from error
+
+
+def locked_layers(**kwargs: Unpack[InitKwargs]) -> list[Layer]:
+    """The layers selected, at the commits of the lockfile with `--locked`.
+
+    Args:
+        kwargs: the command line flags.
+
+    Returns:
+        The layers, in the order they are applied.
+
+    Raises:
+        LockfileError: a template of the layers is not locked.
+    """
+    layers = selected_layers(**kwargs)
+    if not kwargs["locked"]:
+        return layers
+
+    commits = _lock(kwargs["lockfile"])["templates"]
+    if missing := [
+        layer["template"]
+        for layer in layers
+        if layer["template"] not in commits
+    ]:
+        raise LockfileError(
+            importlib.import_module("whiteprints.lockfile").LockError(
+                reason=f"{', '.join(missing)} not locked, lock the "
+                "templates again."
+            )
+        )
+
+    return [_pinned(layer, ref=commits[layer["template"]]) for layer in layers]
+
+
+def render_layer(
+    layer: Layer,
+    directory: Path,
+    *,
     copier: Copier,
+    copier_args: Iterable[str],
+) -> None:
+    """Render a layer into a directory.
+
+    Args:
+        layer: the layer to render.
+        directory: the directory to render the layer into.
+        copier: a copier manager.
+        copier_args: additional arguments forwarded to copier.
+
+    Raises:
+        CopierCopyError: the layer exceeded one of its timeouts.
+    """
+    try:
+        copier.copy(
+            [
+                layer["template"],
+                str(directory),
+                *copier_args,
+                *(["--skip-tasks"] if layer.get("skip_tasks") else []),
+                *(["--vcs-ref", layer["ref"]] if "ref" in layer else []),
+            ],
+            context=TEMPLATE_CONTEXT,
+            trust=True,
+        )
+    except ProcessTimeoutError as error:
+        raise CopierCopyError(
+            reason=f"Layer '{layer['name']}': {error}"
+        ) from error
+
+
+def apply_layers(
+    copier: Copier,
+    layers: Sequence[Layer],
     *,
     copier_args: Iterable[str],
     project_directory: str,
-    **kwargs: Unpack[InitKwargs],
+    jobs: int = 1,
 ) -> None:
-    """Update the project to add GitHub functionalities.
+    """Apply the layers one after another, or following their dependencies.
+
+    Copier running in the current process is not thread-safe, the layers are
+    then applied one after another. The layers rendered concurrently run
+    copier from worker threads, the signals terminating whiteprints are
+    forwarded to their groups by the main thread.
 
     Args:
         copier: a copier manager.
+        layers: the layers to apply.
         copier_args: additional arguments forwarded to copier.
         project_directory: directory where the new project will be created.
-        kwargs: the command line flags.
+        jobs: the maximum number of independent layers rendered
+            concurrently.
+    """
+    render = partial(render_layer, copier=copier, copier_args=copier_args)
+    if jobs > 1 and copier.application is None:
+        with forward_signals():
+            apply_layer_graph(
+                layers, render, Path(project_directory), jobs=jobs
+            )
+
+        return
+
+    for layer in layers:
+        render(layer, Path(project_directory))
+
+
+def compose_layers(
+    copier: Copier,
+    layers: Sequence[Layer],
+    *,
+    copier_args: Iterable[str],
+    project_directory: str,
+) -> bool:
+    """Compose the layers into a single template, and render it once.
+
+    Args:
+        copier: a copier manager.
+        layers: the layers to compose.
+        copier_args: additional arguments forwarded to copier.
+        project_directory: directory where the new project will be created.
+
+    Returns:
+        True if the layers were composed and rendered, False if they cannot
+        be composed.
     """
-    for feature, repository in FEATURE_REPOSITORY.items():
-        if _should_add(feature, cli_kwargs=kwargs):  # pragma: no cover
-            copier.copy(
+    composition = importlib.import_module("whiteprints.composition")
+    with tempfile.TemporaryDirectory(prefix="whiteprints-") as directory:
+        composed = Path(directory) / "composed"
+        try:
+            composition.compose(
                 [
-                    # There seems to be a bug in pyright as of 2024/10/19
-                    # repository is guaranteed to be a string, as shown
-                    # in the TypedDict _FeatureRepository...
-                    repository,  # type: ignore[reportPropertyTypeMismatch]
-                    project_directory,
-                    *copier_args,
+                    importlib.import_module(
+                        "whiteprints.mirrors"
+                    ).local_source(layer["template"])
+                    for layer in layers
                 ],
-                context=[
-                    "whiteprints-template-context=="
-                    + WHITEPRINTS_TEMPLATE_CONTEXT_VERSION
-                ],
-                trust=True,
+                composed,
+                refs=[layer.get("ref") for layer in layers],
+            )
+        except (ImportError, composition.NotComposableError) as error:
+            logging.getLogger(__name__).info(
+                "Applying the layers one after another: %s", error
             )
+            return False
+
+        render_layer(
+            Layer(
+                name="composed",
+                template=str(composed),
+                requires=(),
+                skip_tasks=all(layer.get("skip_tasks") for layer in layers),
+            ),
+            Path(project_directory),
+            copier=copier,
+            copier_args=copier_args,
+        )
 
+    return True
 
-def _require_github(**kwargs: Unpack[InitKwargs]) -> bool:
-    """Check if the project requires a GitHub configuration.
+
+def plan_tasks(layers: Sequence[Layer]) -> Optional["TaskPlan"]:
+    """Plan the deferred tasks of the layers.
+
+    Args:
+        layers: the layers to apply.
+
+    Returns:
+        The deferred tasks of the layers, None if copier is not importable.
+    """
+    deferred_tasks = importlib.import_module("whiteprints.deferred_tasks")
+    mirrors = importlib.import_module("whiteprints.mirrors")
+    try:
+        return deferred_tasks.plan(
+            (
+                layer["name"],
+                deferred_tasks.read_configuration(
+                    mirrors.local_source(layer["template"]), layer.get("ref")
+                ),
+            )
+            for layer in layers
+        )
+    except ImportError as error:
+        logging.getLogger(__name__).info(
+            "Running the tasks as each layer renders: %s", error
+        )
+        return None
+
+
+def run_tasks(
+    tasks: "TaskPlan",
+    *,
+    copier: Copier,
+    project_directory: str,
+) -> None:
+    """Run the deferred tasks, and report the redundant ones.
 
     Args:
+        tasks: the deferred tasks of the layers.
+        copier: a copier manager.
+        project_directory: directory where the new project will be created.
+    """
+    importlib.import_module("whiteprints.deferred_tasks").run(
+        tasks["tasks"], Path(project_directory), copier.timeouts
+    )
+    console = importlib.import_module("whiteprints.console")
+    for task in tasks["redundant"]:
+        console.STDOUT.print(
+            _("Skipped the redundant task {} of the layer '{}'.").format(
+                task["command"], task["layer"]
+            )
+        )
+
+
+def _task_plan(
+    layers: Sequence[Layer], **kwargs: Unpack[InitKwargs]
+) -> tuple[Optional["TaskPlan"], bool]:
+    """Plan the deferred tasks of the layers, and where they render.
+
+    Staged layers defer their tasks until the project is published: a task
+    recording the path of the project would record the staging directory.
+    The layers render into the project when the tasks of one of them cannot
+    be deferred.
+
+    Args:
+        layers: the layers to apply.
         kwargs: the command line flags.
 
     Returns:
-        True if the project requires a GitHub configuration, False otherwise.
+        The deferred tasks of the layers, None if each layer runs its own,
+        and whether the layers render into the project.
     """
-    return (
-        kwargs["pypi"]
-        or kwargs["codecov"]
-        or kwargs["readthedocs"]
-        or kwargs["protect_repository"]
+    if kwargs["in_place"] and not kwargs["defer_tasks"]:
+        return None, True
+
+    tasks = plan_tasks(layers)
+    deferred = tasks is not None and all(
+        layer["name"] in tasks["deferred"] for layer in layers
     )
+    if not (kwargs["in_place"] or deferred):
+        logging.getLogger(__name__).info(
+            "The tasks of a layer cannot be deferred, rendering the layers "
+            "into the project."
+        )
 
+    in_place = kwargs["in_place"] or not deferred
+    return (tasks if kwargs["defer_tasks"] or not in_place else None), in_place
 
-def add_github(
+
+def _apply(
     copier: Copier,
+    layers: Sequence[Layer],
     *,
     copier_args: Iterable[str],
     project_directory: str,
     **kwargs: Unpack[InitKwargs],
 ) -> None:
-    """Update the project to add GitHub functionalities.
+    """Apply or compose the layers.
 
     Args:
         copier: a copier manager.
+        layers: the layers to apply.
         copier_args: additional arguments forwarded to copier.
         project_directory: directory where the new project will be created.
         kwargs: the command line flags.
     """
-    if (  # pragma: no cover
-        kwargs["github"] or kwargs["github_all"] or _require_github(**kwargs)
+    if kwargs["compose"] and compose_layers(
+        copier,
+        layers,
+        copier_args=copier_args,
+        project_directory=project_directory,
     ):
-        copier.copy(
-            [
-                "gh:whiteprints/template-github.git",
-                project_directory,
-                *copier_args,
-            ],
-            context=[
-                "whiteprints-template-context=="
-                + WHITEPRINTS_TEMPLATE_CONTEXT_VERSION
-            ],
-            trust=True,
-        )
+        return
 
-    add_github_functionalities(
+    apply_layers(
         copier,
+        layers,
         copier_args=copier_args,
         project_directory=project_directory,
+        jobs=kwargs["jobs"],
+    )
+
+
+def _steps(
+    layers: Sequence[Layer], **kwargs: Unpack[InitKwargs]
+) -> list[list[Layer]]:
+    """The steps applying the layers, a checkpoint is recorded after each.
+
+    Args:
+        layers: the layers to apply.
+        kwargs: the command line flags.
+
+    Returns:
+        The composed layers, the batches of concurrent layers, or each layer.
+    """
+    if kwargs["compose"]:
+        return [list(layers)]
+
+    if kwargs["jobs"] > 1:
+        return list(batches(layers))
+
+    return [[layer] for layer in layers]
+
+
+def _progress(
+    project: Path,
+    answers: str,
+    **kwargs: Unpack[InitKwargs],
+) -> tuple[checkpoint.Checkpoint, Optional[Path]]:
+    """Start the checkpoint of the project, or resume from it.
+
+    Args:
+        project: the project directory.
+        answers: the digest of the answers.
+        kwargs: the command line flags.
+
+    Returns:
+        The checkpoint, and the snapshot the staging starts from (None to
+        start from the project).
+    """
+    if kwargs["resume"]:
+        return checkpoint.resume(project, answers, in_place=kwargs["in_place"])
+
+    return checkpoint.start(project, answers), None
+
+
+def _render_key(
+    step: Sequence[Layer],
+    *,
+    copier_args: Sequence[str],
+    tree: str,
+    **kwargs: Unpack[InitKwargs],
+) -> Optional[str]:
+    """The render cache key of a step.
+
+    Args:
+        step: the layers of the step.
+        copier_args: additional arguments forwarded to copier.
+        tree: the digest of the tree the step renders into.
+        kwargs: the command line flags.
+
+    Returns:
+        The key of the step, None if it cannot be cached.
+    """
+    render_cache = importlib.import_module("whiteprints.render_cache")
+    if render_cache.DEFAULTS_FLAG not in copier_args:
+        return None
+
+    mirrors = importlib.import_module("whiteprints.mirrors")
+    return render_cache.step_key(
+        tree,
+        [
+            (
+                layer["template"],
+                layer.get("ref")
+                or render_cache.template_version(
+                    mirrors.local_source(layer["template"])
+                ),
+                layer.get("skip_tasks", False),
+            )
+            for layer in step
+        ],
+        copier_args,
+        TEMPLATE_CONTEXT,
+        compose=kwargs["compose"],
+    )
+
+
+def _unshare(directory: Path, **kwargs: Unpack[InitKwargs]) -> None:
+    """Copy the files of a directory hard linked to the render cache.
+
+    Editing such a file in place would also edit the cache.
+
+    Args:
+        directory: the directory rendered into.
+        kwargs: the command line flags.
+    """
+    if kwargs["render_cache"] == "hardlink":
+        importlib.import_module("whiteprints.render_cache").unshare(directory)
+
+
+def _render(
+    copier: Copier,
+    step: Sequence[Layer],
+    *,
+    copier_args: Sequence[str],
+    directory: Path,
+    **kwargs: Unpack[InitKwargs],
+) -> None:
+    """Render a step, the files hard linked to the render cache copied first.
+
+    Args:
+        copier: a copier manager.
+        step: the layers of the step.
+        copier_args: additional arguments forwarded to copier.
+        directory: the directory to render into.
+        kwargs: the command line flags.
+    """
+    _unshare(directory, **kwargs)
+    _apply(
+        copier,
+        step,
+        copier_args=copier_args,
+        project_directory=str(directory),
         **kwargs,
     )
 
 
+def _remote_cache(**kwargs: Unpack[InitKwargs]) -> Optional["Backend"]:
+    """The remote tier of the render cache.
+
+    Args:
+        kwargs: the command line flags.
+
+    Returns:
+        The remote tier, None without one.
+    """
+    if kwargs["remote_cache"] is None:
+        return None
+
+    return importlib.import_module("whiteprints.remote_cache").backend(
+        kwargs["remote_cache"]
+    )
+
+
+def _render_step(
+    copier: Copier,
+    step: Sequence[Layer],
+    *,
+    copier_args: Sequence[str],
+    directory: Path,
+    tree: str,
+    **kwargs: Unpack[InitKwargs],
+) -> None:
+    """Render a step, or materialise it from the render cache.
+
+    Args:
+        copier: a copier manager.
+        step: the layers of the step.
+        copier_args: additional arguments forwarded to copier.
+        directory: the directory to render into.
+        tree: the digest of the tree the step renders into.
+        kwargs: the command line flags.
+    """
+    render = partial(
+        _render,
+        copier,
+        step,
+        copier_args=copier_args,
+        directory=directory,
+        **kwargs,
+    )
+    if (
+        kwargs["render_cache"] == "off"
+        or (
+            key := _render_key(
+                step, copier_args=copier_args, tree=tree, **kwargs
+            )
+        )
+        is None
+    ):
+        render()
+        return
+
+    render_cache = importlib.import_module("whiteprints.render_cache")
+    remote = _remote_cache(**kwargs)
+    if (manifest := render_cache.lookup(key, remote=remote)) is not None:
+        render_cache.materialize(manifest, directory, kwargs["render_cache"])
+        return
+
+    render()
+    render_cache.store(key, directory, remote=remote)
+
+
+def _checkpointed(
+    copier: Copier,
+    layers: Sequence[Layer],
+    *,
+    copier_args: Sequence[str],
+    project: Path,
+    **kwargs: Unpack[InitKwargs],
+) -> None:
+    """Apply the layers not completed yet, recording a checkpoint after each.
+
+    Args:
+        copier: a copier manager.
+        layers: the layers to apply.
+        copier_args: additional arguments forwarded to copier.
+        project: directory where the new project will be created.
+        kwargs: the command line flags.
+    """
+    progress, snapshot = _progress(
+        project, checkpoint.answers_digest(layers, copier_args), **kwargs
+    )
+    pending = [
+        layer for layer in layers if layer["name"] not in progress["layers"]
+    ]
+    with (
+        nullcontext(project)
+        if kwargs["in_place"]
+        else staging.staged(project, snapshot)
+    ) as directory:
+        for step in _steps(pending, **kwargs):
+            _render_step(
+                copier,
+                step,
+                copier_args=copier_args,
+                directory=directory,
+                tree=progress["tree"],
+                **kwargs,
+            )
+            checkpoint.record(project, progress, step, directory)
+
+        _unshare(directory, **kwargs)
+
+    checkpoint.clear(project)
+
+
 def create_project(
     copier: Copier,
     *,
@@ -173,38 +822,120 @@ def create_project(
         project_directory: directory where the new project will be created.
         kwargs: the command line flags.
     """
-    copier.copy(
-        [
-            "gh:whiteprints/template-python.git",
-            project_directory,
-            *copier_args,
-        ],
-        context=[
-            "whiteprints-template-context=="
-            + WHITEPRINTS_TEMPLATE_CONTEXT_VERSION
-        ],
-        trust=True,
-    )
-    if kwargs["command_line"]:  # pragma: no cover
-        copier.copy(
-            [
-                "gh:whiteprints/template-rich-click.git",
-                project_directory,
-                *copier_args,
-            ],
-            context=[
-                "whiteprints-template-context=="
-                + WHITEPRINTS_TEMPLATE_CONTEXT_VERSION
-            ],
-            trust=True,
-        )
-
-    add_github(
+    layers = locked_layers(**kwargs)
+    tasks, kwargs["in_place"] = _task_plan(layers, **kwargs)
+    if tasks is not None:
+        layers = [
+            _pinned(layer, skip_tasks=layer["name"] in tasks["deferred"])
+            for layer in layers
+        ]
+
+    _checkpointed(
         copier,
-        copier_args=copier_args,
-        project_directory=project_directory,
+        layers,
+        copier_args=list(copier_args),
+        project=Path(project_directory),
         **kwargs,
     )
+    if tasks is not None:
+        run_tasks(tasks, copier=copier, project_directory=project_directory)
+
+
+def check(
+    project_directory: Path, **kwargs: Unpack[InitKwargs]
+) -> list["CheckResult"]:
+    """Check the environment of the project creation.
+
+    Args:
+        project_directory: directory the new project will be created.
+        kwargs: the command line flags.
+
+    Returns:
+        The results of the pre-flight checks.
+    """
+    mirrors = importlib.import_module("whiteprints.mirrors")
+    return importlib.import_module("whiteprints.preflight").preflight(
+        project_directory,
+        {
+            layer["name"]: mirrors.local_source(layer["template"])
+            for layer in selected_layers(**kwargs)
+        },
+        staging=None if kwargs["in_place"] else staging.staging_directory(),
+    )
+
+
+def mirror_environment(
+    layers: Sequence[Layer], ttl: Optional[float] = None
+) -> dict[str, str]:
+    """Synchronize the mirrors of the layers.
+
+    The mirrors of the locked layers are only refreshed when they miss the
+    locked commit, unless a time to live is given.
+
+    Args:
+        layers: the layers to apply.
+        ttl: the time to live of the mirrors, in seconds, None for the
+            default.
+
+    Returns:
+        The environment variables rewriting the templates to their mirrors.
+    """
+    mirrors = importlib.import_module("whiteprints.mirrors")
+    commits = {
+        layer["template"]: layer["ref"] for layer in layers if "ref" in layer
+    }
+    default_ttl = math.inf if commits else mirrors.DEFAULT_TTL
+    return mirrors.git_environment(
+        mirrors.sync_all(
+            [layer["template"] for layer in layers],
+            ttl=default_ttl if ttl is None else ttl,
+            commits=commits,
+        )
+    )
+
+
+def _report(results: list["CheckResult"]) -> None:
+    """Print the results of the pre-flight checks.
+
+    Args:
+        results: the results of the checks.
+    """
+    console = importlib.import_module("whiteprints.console")
+    for result in results:
+        message = (
+            _("{}: passed, {}.") if result["passed"] else _("{}: failed, {}.")
+        )
+        console.STDOUT.print(message.format(result["name"], result["detail"]))
+
+
+def _preflight(project_directory: Path, **kwargs: Unpack[InitKwargs]) -> bool:
+    """Run the pre-flight checks, reporting them with `--check`.
+
+    Args:
+        project_directory: directory the new project will be created.
+        kwargs: the command line flags.
+
+    Returns:
+        True if only the checks were requested, False to create the project.
+
+    Raises:
+        PreflightCheckError: A pre-flight check failed.
+    """
+    if kwargs["skip_checks"] and not kwargs["check"]:
+        return False
+
+    results = check(project_directory, **kwargs)
+    if kwargs["check"]:
+        _report(results)
+
+    if failures := [result for result in results if not result["passed"]]:
+        raise PreflightCheckError(
+            importlib.import_module("whiteprints.preflight").PreflightError(
+                failures
+            )
+        )
+
+    return kwargs["check"]
 
 
 def init(
@@ -221,8 +952,24 @@ def init(
 
     Raises:
         CopierCopyError: An error happened while creating the project.
+        PreflightCheckError: A pre-flight check failed.
+        LockfileError: The lockfile cannot be used.
     """
-    copier = Copier()
+    if _preflight(project_directory, **kwargs):
+        return
+
+    copier = Copier(
+        engine=kwargs["copier_engine"],
+        wheelhouse=kwargs["wheelhouse"],
+        timeouts=Timeouts(
+            timeout=kwargs["timeout"],
+            inactivity_timeout=kwargs["inactivity_timeout"],
+        ),
+        jinja_cache=cache_directory(JINJA_CACHE_DIRECTORY),
+        environment=mirror_environment(
+            locked_layers(**kwargs), kwargs["mirror_ttl"]
+        ),
+    )
     project_directory_str = str(project_directory)
 
     try:
@@ -234,3 +981,10 @@ def init(
         )
     except CalledProcessError as process_error:
         raise CopierCopyError from process_error
+    except (
+        CheckpointError,
+        LayerConflictError,
+        ProcessTimeoutError,
+        WheelhouseError,
+    ) as error:
+        raise CopierCopyError(reason=str(error)) from error
@@ -4,7 +4,13 @@
 
 """Initialize a project (interface)."""
 
-from typing import Final, TypedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Optional, TypedDict
+
+
+if TYPE_CHECKING:
+    from whiteprints.copier_run import CopierEngine
+    from whiteprints.render_cache import RenderCacheMode
 
 
 __all__: Final = ["InitKwargs"]
@@ -20,3 +26,19 @@ class InitKwargs(TypedDict):
     readthedocs: bool
     protect_repository: bool
     github_all: bool
+    copier_engine: "CopierEngine"
+    compose: bool
+    jobs: int
+    wheelhouse: Optional[Path]
+    timeout: Optional[float]
+    inactivity_timeout: Optional[float]
+    defer_tasks: bool
+    in_place: bool
+    resume: bool
+    check: bool
+    skip_checks: bool
+    mirror_ttl: Optional[float]
+    render_cache: "RenderCacheMode"
+    remote_cache: Optional[str]
+    locked: bool
+    lockfile: Path
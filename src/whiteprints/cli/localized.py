@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Commands whose help is translated when rendered.
+
+Help strings are marked with `N_` in the click decorators, and only
+translated when the help of the command is formatted.
+"""
+
+import sys
+from typing import Final
+
+from rich_click import Context, Option
+from rich_click.rich_command import RichCommand, RichGroup
+from rich_click.rich_context import RichContext
+from rich_click.rich_help_formatter import RichHelpFormatter
+
+from whiteprints.loc import _
+
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+__all__: Final = ["LocalizedCommand", "LocalizedGroup", "translate_help"]
+"""Public module attributes."""
+
+
+_TRANSLATED: Final = "_whiteprints_translated"
+"""Attribute flagging a command whose help has been translated."""
+
+
+def translate_help(command: RichCommand, ctx: Context) -> None:
+    """Translate the help of a command and of its options, once.
+
+    Args:
+        command: the command to translate.
+        ctx: the click context of the command.
+    """
+    if getattr(command, _TRANSLATED, False):
+        return
+
+    command.help = _(command.help) if command.help else command.help
+    command.short_help = (
+        _(command.short_help) if command.short_help else command.short_help
+    )
+    for parameter in command.get_params(ctx):
+        if isinstance(parameter, Option) and parameter.help:
+            parameter.help = _(parameter.help)
+
+    setattr(command, _TRANSLATED, True)
+
+
+class LocalizedCommand(RichCommand):
+    """A rich command whose help is translated when rendered."""
+
+    @override
+    def format_help(
+        self,
+        ctx: RichContext,
+        formatter: RichHelpFormatter,
+    ) -> None:
+        """Translate, then format the help.
+
+        Args:
+            ctx: the click context.
+            formatter: the rich help formatter.
+        """
+        translate_help(self, ctx)
+        super().format_help(ctx, formatter)
+
+
+class LocalizedGroup(RichGroup):
+    """A rich group whose help is translated when rendered."""
+
+    @override
+    def format_help(
+        self,
+        ctx: RichContext,
+        formatter: RichHelpFormatter,
+    ) -> None:
+        """Translate, then format the help.
+
+        Args:
+            ctx: the click context.
+            formatter: the rich help formatter.
+        """
+        translate_help(self, ctx)
+        super().format_help(ctx, formatter)
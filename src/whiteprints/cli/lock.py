@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Lock the templates of every layer."""
+
+from pathlib import Path
+from typing import Final
+
+from whiteprints import lockfile
+from whiteprints.cli import init, templates
+
+
+__all__: Final = ["lock"]
+"""Public module attributes."""
+
+
+def lock(path: Path) -> lockfile.Lock:
+    """Lock the templates of every layer, and write the lockfile.
+
+    Args:
+        path: the lockfile.
+
+    Returns:
+        The lock of the templates.
+
+    Raises:
+        LockfileError: A template cannot be resolved.
+    """
+    try:
+        templates_lock = lockfile.lock(
+            templates.templates(), init.WHITEPRINTS_TEMPLATE_CONTEXT_VERSION
+        )
+    except lockfile.LockError as error:
+        raise init.LockfileError(error) from error
+
+    lockfile.write(path, templates_lock)
+    return templates_lock
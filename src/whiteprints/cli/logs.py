@@ -7,13 +7,18 @@
 import importlib
 import logging
 import sys
-from typing import Final, Literal, TextIO
+from typing import Final, Literal, Optional, TextIO
 
 from whiteprints import console
-from whiteprints.loc import _
+from whiteprints.loc import N_, _
 
 
-__all__: Final = ["LogLevel", "configure_logging"]
+__all__: Final = [
+    "DATE_FORMAT",
+    "LOG_FORMAT",
+    "LogLevel",
+    "configure_logging",
+]
 
 
 if sys.version_info >= (3, 10):
@@ -32,22 +37,31 @@
 ]
 
 
+LOG_FORMAT: Final = N_(
+    "[{process}:{thread}] [{pathname}:{funcName}:{lineno}]\n{message}"
+)
+"""The default log message format, translated when logging is configured."""
+
+DATE_FORMAT: Final = N_("[%Y-%m-%dT%H:%M:%S]")
+"""The default log date format, translated when logging is configured."""
+
+
 def configure_logging(
     level: LogLevel,
     *,
     file: TextIO,
-    log_format: str = _(
-        "[{process}:{thread}] [{pathname}:{funcName}:{lineno}]\n{message}",
-    ),
-    date_format: str = _("[%Y-%m-%dT%H:%M:%S]"),
+    log_format: Optional[str] = None,
+    date_format: Optional[str] = None,
 ) -> None:
     """Configure Rich logging handler.
 
     Args:
         level: The logging verbosity level.
         file: An optional file in which to log.
-        log_format: The log message format.
-        date_format: The log date format.
+        log_format: The log message format. Defaults to the translated
+            LOG_FORMAT.
+        date_format: The log date format. Defaults to the translated
+            DATE_FORMAT.
 
     Example:
         >>> import sys
@@ -74,10 +88,10 @@ def configure_logging(
     ]
 
     logging.basicConfig(
-        format=f"{log_format}",
+        format=_(LOG_FORMAT) if log_format is None else log_format,
         handlers=handlers,
         level=level.upper(),
-        datefmt=date_format,
+        datefmt=_(DATE_FORMAT) if date_format is None else date_format,
         style="{",
     )
     logging.captureWarnings(capture=True)
@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Copyright and license notices printed by the CLI."""
+
+from pathlib import Path
+from typing import Final
+
+from whiteprints.loc import _
+
+
+__all__: Final = ["copyright_notice", "license_notice", "reuse_notice"]
+"""Public module attributes."""
+
+
+SOURCES_DIRECTORY: Final = Path(__file__).parent.parent
+"""The directory containing the package sources."""
+
+
+def copyright_notice() -> str:
+    """The code copyright notice.
+
+    Returns:
+        The translated copyright notice.
+    """
+    return _(
+        'Copyright © 2024 The "Whiteprints" contributors <whiteprints@pm.me>.'
+    )
+
+
+def license_notice(license_expression: str) -> str:
+    """The code license notice.
+
+    Args:
+        license_expression: the SPDX license expression of the code.
+
+    Returns:
+        The translated license notice.
+    """
+    return _("Code released under license '{}'.").format(license_expression)
+
+
+def reuse_notice() -> str:
+    """The REUSE compliance notice.
+
+    Returns:
+        The translated REUSE compliance notice.
+    """
+    return _(
+        "\nThis project is REUSE compliant ('https://reuse.software/')."
+        " Please check the SPDX header of each source code file for "
+        "detailed licensing information.\nSources located at '{}'.\n"
+    ).format(SOURCES_DIRECTORY)
@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Manage the mirrors of the template repositories."""
+
+from pathlib import Path
+from typing import Final
+
+from click import ClickException
+
+from whiteprints import mirrors
+from whiteprints.cli import init
+from whiteprints.template_source import source_url
+
+
+__all__: Final = [
+    "MirrorSyncError",
+    "gc",
+    "sync",
+    "templates",
+]
+"""Public module attributes."""
+
+
+class MirrorSyncError(ClickException):
+    """Mirrors cannot be synchronized."""
+
+    def __init__(self, sources: list[str]) -> None:
+        """Create an exception instance.
+
+        Args:
+            sources: the sources whose mirror cannot be synchronized.
+        """
+        super().__init__(
+            "The mirrors of "
+            + ", ".join(f"'{source}'" for source in sources)
+            + " cannot be synchronized."
+        )
+
+
+def templates() -> list[str]:
+    """The templates of every layer.
+
+    Returns:
+        The copier templates of the layers, the features included.
+    """
+    return [
+        init.PYTHON_LAYER["template"],
+        init.COMMAND_LINE_LAYER["template"],
+        init.GITHUB_LAYER["template"],
+        *map(str, init.FEATURE_REPOSITORY.values()),
+    ]
+
+
+def sync(ttl: float = 0) -> dict[str, Path]:
+    """Synchronize the mirrors of the templates of every layer.
+
+    Args:
+        ttl: the time to live of the mirrors, in seconds, 0 to refresh
+            every mirror.
+
+    Returns:
+        The source of each template, mapped to its mirror.
+
+    Raises:
+        MirrorSyncError: a mirror cannot be cloned.
+    """
+    synced = mirrors.sync_all(templates(), ttl=ttl)
+    if missing := sorted(
+        {
+            source_url(template)
+            for template in templates()
+            if mirrors.is_remote(template)
+        }
+        - synced.keys()
+    ):
+        raise MirrorSyncError(missing)
+
+    return synced
+
+
+def gc(*, gc_all: bool = False) -> list[Path]:
+    """Remove the mirrors no longer used.
+
+    Args:
+        gc_all: also remove the mirrors of the templates of the layers.
+
+    Returns:
+        The directories removed.
+    """
+    return mirrors.gc(keep=[] if gc_all else templates())
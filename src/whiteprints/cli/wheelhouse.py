@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Build the wheelhouse of the tool environment running copier."""
+
+from pathlib import Path
+from typing import Final
+
+from whiteprints import wheelhouse
+from whiteprints.cli.env import template_environment
+
+
+__all__: Final = ["build"]
+"""Public module attributes."""
+
+
+def build(directory: Path) -> Path:
+    """Build the wheelhouse of the tool environment rendering the templates.
+
+    Args:
+        directory: the wheelhouse directory.
+
+    Returns:
+        The lock file of the wheelhouse.
+    """
+    return wheelhouse.build(directory, template_environment().requirements)
@@ -0,0 +1,339 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Compose template layers into a single template.
+
+Applying the layers one after another renders the project once per layer,
+each layer re-reading and re-writing the files of the previous ones. The
+layers are instead merged into one template, rendered in a single pass:
+
+- files: a file of a later layer replaces the file of an earlier layer at
+  the same path, as it would when overwriting. The `_exclude` and
+  `_subdirectory` settings of each layer are applied while merging.
+- questions: the first layer asking a question defines it, the later layers
+  share its answer.
+- settings: `_tasks` and `_migrations` are concatenated in layer order,
+  `_skip_if_exists`, `_jinja_extensions` and `_secret_questions` are merged,
+  the first layer defines the other settings.
+- answers files: each layer keeps its own answers file, holding its own
+  source, commit and questions.
+
+Layers rendering differently (`_templates_suffix`, `_envops`,
+`_preserve_symlinks`) or whose exclusions and subdirectory are templated
+cannot be composed.
+
+Copier is imported on first use.
+"""
+
+import importlib
+import json
+import re
+import shutil
+from collections.abc import Iterable, Sequence
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Final, Optional
+
+
+__all__: Final = [
+    "TEMPLATE_MODULES",
+    "NotComposableError",
+    "compose",
+    "merge_configurations",
+    "template_class",
+]
+"""Public module attributes."""
+
+
+TEMPLATE_MODULES: Final = ("copier._template", "copier.template")
+"""The modules holding copier's template class, newest first."""
+
+COMPOSED_CONFIGURATION: Final = "copier.yml"
+"""The configuration file of the composed template."""
+
+CONCATENATED_SETTINGS: Final = ("_tasks", "_migrations")
+"""Settings concatenated in layer order."""
+
+MERGED_SETTINGS: Final = (
+    "_skip_if_exists",
+    "_jinja_extensions",
+    "_secret_questions",
+)
+"""Settings merged in layer order, without duplicates."""
+
+SHARED_SETTINGS: Final = (
+    "_templates_suffix",
+    "_envops",
+    "_preserve_symlinks",
+)
+"""Settings every composed layer must agree on."""
+
+APPLIED_SETTINGS: Final = ("_exclude", "_subdirectory")
+"""Settings applied to the files of each layer while merging."""
+
+PATH_PATTERNS: Final = ("gitignore", "gitwildmatch")
+"""The pathspec patterns matching the exclusions, newest first."""
+
+ANSWERS_FILE_TEMPLATE: Final = re.compile(
+    r"\{\{\s*_copier_conf\.answers_file\s*\}\}"
+)
+"""The name of the template file rendering the answers file."""
+
+LAYER_ANSWERS: Final = """\
+{{%- set _layer_answers = {remembered} -%}}
+{{%- for _key, _value in _copier_answers.items() if _key in {questions} -%}}
+{{%- set _ = _layer_answers.update({{_key: _value}}) -%}}
+{{%- endfor -%}}
+{{%- set _copier_answers = _layer_answers -%}}
+"""
+"""Restrict the answers rendered in a layer answers file to the layer."""
+
+
+class NotComposableError(ValueError):
+    """The layers cannot be composed into a single template."""
+
+    def __init__(self, setting: str) -> None:
+        """Initialize the exception.
+
+        Args:
+            setting: the setting preventing the composition.
+        """
+        super().__init__(
+            f"The templates cannot be composed because of their `{setting}` "
+            "setting."
+        )
+
+
+def template_class() -> Any:  # noqa: ANN401
+    """Import copier's template class.
+
+    Returns:
+        The template class.
+
+    Raises:
+        ImportError: copier is not importable.
+    """
+    for module in TEMPLATE_MODULES:
+        with suppress(ImportError):
+            return importlib.import_module(module).Template
+
+    raise ImportError(name="copier")
+
+
+def _check_shared_settings(configurations: Sequence[dict[str, Any]]) -> None:
+    """Check that the layers agree on the settings changing the rendering.
+
+    Args:
+        configurations: the raw configuration of each layer.
+
+    Raises:
+        NotComposableError: the layers disagree on a setting.
+    """
+    for setting in SHARED_SETTINGS:
+        values = {
+            json.dumps(configuration.get(setting), sort_keys=True)
+            for configuration in configurations
+        }
+        if len(values) > 1:
+            raise NotComposableError(setting)
+
+
+def _merge_setting(merged: dict[str, Any], key: str, value: Any) -> None:  # noqa: ANN401
+    """Merge a setting or a question of a layer into the composition.
+
+    Args:
+        merged: the configuration of the composed template.
+        key: the name of the setting or question.
+        value: the value of the setting or question.
+    """
+    if key in CONCATENATED_SETTINGS:
+        merged[key] = [*merged.get(key, []), *value]
+    elif key in MERGED_SETTINGS:
+        merged[key] = list(dict.fromkeys([*merged.get(key, []), *value]))
+    elif key not in APPLIED_SETTINGS:
+        merged.setdefault(key, value)
+
+
+def merge_configurations(
+    configurations: Iterable[dict[str, Any]],
+) -> dict[str, Any]:
+    """Merge the raw configuration of the layers.
+
+    Args:
+        configurations: the raw configuration of each layer, in layer order.
+
+    Returns:
+        The configuration of the composed template.
+
+    Example:
+        >>> merge_configurations([
+        ...     {"name": {"type": "str"}, "_tasks": ["a"]},
+        ...     {"name": {"type": "int"}, "_tasks": ["b"]},
+        ... ])
+        {'name': {'type': 'str'}, '_tasks': ['a', 'b'], '_exclude': ['copier.yml']}
+    """  # noqa: E501
+    merged: dict[str, Any] = {}
+    for configuration in configurations:
+        for key, value in configuration.items():
+            _merge_setting(merged, key, value)
+
+    merged["_exclude"] = [COMPOSED_CONFIGURATION]
+    return merged
+
+
+def _exclusions(template: Any) -> Any:  # noqa: ANN401
+    """The files a layer excludes.
+
+    Args:
+        template: the copier template of the layer.
+
+    Returns:
+        A path specification of the excluded files.
+
+    Raises:
+        NotComposableError: the exclusions or subdirectory are templated.
+    """
+    if any("{{" in pattern for pattern in template.exclude):
+        raise NotComposableError(setting="_exclude")
+
+    if "{{" in template.subdirectory:
+        raise NotComposableError(setting="_subdirectory")
+
+    path_spec = importlib.import_module("pathspec").PathSpec
+    for pattern in PATH_PATTERNS[:-1]:
+        with suppress(LookupError):
+            return path_spec.from_lines(pattern, template.exclude)
+
+    return path_spec.from_lines(PATH_PATTERNS[-1], template.exclude)
+
+
+def _answers_file_template(template: Any, content: str) -> str:  # noqa: ANN401
+    """Restrict an answers file template to the answers of its layer.
+
+    Args:
+        template: the copier template of the layer.
+        content: the content of the answers file template.
+
+    Returns:
+        The content of the layer answers file template.
+    """
+    remembered = {
+        key: value
+        for key, value in (
+            ("_commit", template.commit),
+            ("_src_path", template.url),
+        )
+        if value is not None
+    }
+    return (
+        LAYER_ANSWERS.format(
+            remembered=json.dumps(remembered),
+            questions=json.dumps(list(template.questions_data)),
+        )
+        + content
+    )
+
+
+def _copy_file(
+    template: Any,  # noqa: ANN401
+    source: Path,
+    destination: Path,
+) -> None:
+    """Copy a file of a layer in the composed template.
+
+    Args:
+        template: the copier template of the layer.
+        source: the file, relative to the layer root.
+        destination: the composed template directory.
+    """
+    root = Path(template.local_abspath) / template.subdirectory
+    name = source.as_posix()
+    if ANSWERS_FILE_TEMPLATE.search(name):
+        target = destination / ANSWERS_FILE_TEMPLATE.sub(
+            template.answers_relpath.as_posix(), name
+        )
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(
+            _answers_file_template(
+                template, (root / source).read_text(encoding="utf-8")
+            ),
+            encoding="utf-8",
+        )
+        return
+
+    target = destination / source
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with suppress(FileNotFoundError):
+        target.unlink()
+    shutil.copy2(
+        root / source,
+        target,
+        follow_symlinks=not template.preserve_symlinks,
+    )
+
+
+def _copy_layer(template: Any, destination: Path) -> None:  # noqa: ANN401
+    """Copy the files of a layer in the composed template.
+
+    Args:
+        template: the copier template of the layer.
+        destination: the composed template directory.
+    """
+    exclusions = _exclusions(template)
+    root = Path(template.local_abspath) / template.subdirectory
+    for path in sorted(root.rglob("*")):
+        source = path.relative_to(root)
+        if exclusions.match_file(source.as_posix()):
+            continue
+
+        if path.is_dir() and not path.is_symlink():
+            (destination / source).mkdir(parents=True, exist_ok=True)
+        else:
+            _copy_file(template, source, destination)
+
+
+def compose(
+    templates: Sequence[str],
+    destination: Path,
+    *,
+    refs: Optional[Sequence[Optional[str]]] = None,
+) -> None:
+    """Compose template layers into a single template.
+
+    Args:
+        templates: the copier template of each layer (path or URL), in the
+            order they would be applied.
+        destination: the directory of the composed template.
+        refs: the git reference of each template, None for their latest
+            version.
+
+    Raises:
+        NotComposableError: the layers cannot be composed.
+    """
+    template = template_class()
+    layers = [
+        template(url=url, ref=ref)
+        for url, ref in zip(templates, refs or [None] * len(templates))
+    ]
+    try:
+        configurations: list[dict[str, Any]] = [
+            layer._raw_config  # noqa: SLF001
+            for layer in layers
+        ]
+        _check_shared_settings(configurations)
+        destination.mkdir(parents=True, exist_ok=True)
+        for layer in layers:
+            _copy_layer(layer, destination)
+
+        (destination / COMPOSED_CONFIGURATION).write_text(
+            importlib.import_module("yaml").safe_dump(
+                merge_configurations(configurations),
+                sort_keys=False,
+                allow_unicode=True,
+            ),
+            encoding="utf-8",
+        )
+    finally:
+        for layer in layers:
+            layer._cleanup()  # noqa: SLF001
@@ -0,0 +1,430 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Render the files of a template concurrently, in copier's process.
+
+Copier renders the files of a template one at a time: it walks the template,
+renders each Jinja template, and writes it. Rendering a file only reads the
+template and the answers, the files are independent: the walk is split from
+the writes, the templates are rendered by a thread pool while the walk goes
+on, and the writes are then replayed in the order of the walk:
+
+- order: the folders and files are created, and reported, in the order of
+  the walk. Copier's own checks (exclusions, conflicts, prompts, modes) run
+  as they would, one file at a time.
+- identity: each file is written by copier's own code, given the text the
+  pool rendered with the same context, and raising the errors it raised: the
+  project is byte-identical to the sequential rendering.
+- streaming: the files which are not Jinja templates are not read by the
+  pool, copier copies them while replaying the writes, one at a time.
+
+Each thread of the pool renders in an overlay of copier's Jinja environment,
+sharing its loader, filters and bytecode cache (see whiteprints.jinja_cache),
+but not its `yield` state. A template preserving its symbolic links is
+rendered sequentially: a link written earlier may redirect a later path.
+
+The rendering is installed by wrapping the methods of copier's worker, for
+the `in-process` engine (see whiteprints.copier_run). Copier and Jinja are
+imported on first use.
+"""
+
+import importlib
+import threading
+from collections.abc import Callable, Generator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar, copy_context
+from pathlib import Path
+from typing import Any, Final, NamedTuple, Optional, Union
+
+
+__all__: Final = ["COPIER_WORKERS", "installed"]
+"""Public module attributes."""
+
+
+COPIER_WORKERS: Final = ("copier._main", "copier.main")
+"""The modules holding copier's worker, newest first."""
+
+
+class _YieldState:
+    """The `yield` state of a Jinja environment, without `yield` support."""
+
+    yield_name: Optional[str] = None
+    yield_iterable: Any = None
+
+
+def _yield_state(environment: object) -> Any:  # noqa: ANN401
+    """The `yield` state of a Jinja environment, cleared.
+
+    Copier checks it after rendering a file: a file must not `yield`.
+
+    Args:
+        environment: the Jinja environment.
+
+    Returns:
+        The `yield` state of the environment.
+    """
+    get_yield_context = getattr(
+        importlib.import_module(_worker_class().__module__),
+        "get_yield_context",
+        None,
+    )
+    state = (
+        _YieldState()
+        if get_yield_context is None
+        else (get_yield_context(environment))
+    )
+    state.yield_name = state.yield_iterable = None
+    return state
+
+
+class _Rendered(NamedTuple):
+    """A template rendered by the pool."""
+
+    text: str
+    yield_name: Optional[str]
+    yield_iterable: Any
+
+
+class _Failed(NamedTuple):
+    """A template the pool failed to render."""
+
+    stage: str
+    error: Exception
+
+
+_Rendering = Union[_Rendered, _Failed]
+"""The outcome of the rendering of a template."""
+
+
+class _Operation(NamedTuple):
+    """A write of the walk, replayed in order."""
+
+    method: Callable[..., None]
+    arguments: tuple[Any, ...]
+    rendering: Optional["Future[_Rendering]"]
+
+
+class _Plan:
+    """The writes of a walk, and the templates rendered by the pool."""
+
+    def __init__(self, worker: Any, executor: ThreadPoolExecutor) -> None:  # noqa: ANN401
+        """Initialize the plan.
+
+        Args:
+            worker: copier's worker walking the template.
+            executor: the pool rendering the templates.
+        """
+        self.worker = worker
+        self.executor = executor
+        self.operations: list[_Operation] = []
+        self._environment = worker.jinja_env
+        self._overlays = threading.local()
+
+    def _overlay(self) -> Any:  # noqa: ANN401
+        """The overlay of the Jinja environment of the current thread.
+
+        Returns:
+            An environment sharing copier's, but for its `yield` state.
+        """
+        if not hasattr(self._overlays, "environment"):
+            self._overlays.environment = self._environment.overlay()
+
+        return self._overlays.environment
+
+    def _render(self, name: str, context: dict[str, Any]) -> _Rendering:
+        """Render a template, in a thread of the pool.
+
+        Args:
+            name: the name of the template.
+            context: the context of the template.
+
+        Returns:
+            The text rendered, with the `yield` state copier checks, or the
+            error raised and the stage raising it.
+        """
+        environment = self._overlay()
+        try:
+            template = environment.get_template(name)
+        except Exception as error:  # noqa: BLE001
+            return _Failed(stage="load", error=error)
+
+        state = _yield_state(environment)
+        try:
+            text = template.render(**context)
+        except Exception as error:  # noqa: BLE001
+            return _Failed(stage="render", error=error)
+
+        return _Rendered(text, state.yield_name, state.yield_iterable)
+
+    def file(
+        self,
+        method: Callable[..., None],
+        src_relpath: Path,
+        dst_relpath: Path,
+        extra_context: Optional[dict[str, Any]],
+    ) -> None:
+        """Record the write of a file, rendering it in the pool.
+
+        Args:
+            method: copier's method writing the file.
+            src_relpath: the file, relative to the template.
+            dst_relpath: the file, relative to the project.
+            extra_context: the context added by the path of the file.
+        """
+        rendering = None
+        if src_relpath.name.endswith(self.worker.template.templates_suffix):
+            context = {
+                **self.worker._render_context(),  # noqa: SLF001
+                **(extra_context or {}),
+            }
+            rendering = self.executor.submit(
+                copy_context().run,
+                self._render,
+                src_relpath.as_posix(),
+                context,
+            )
+
+        self.operations.append(
+            _Operation(
+                method, (src_relpath, dst_relpath, extra_context), rendering
+            )
+        )
+
+    def replay(self) -> None:
+        """Replay the writes, in the order of the walk."""
+        for operation in self.operations:
+            if operation.rendering is None:
+                operation.method(self.worker, *operation.arguments)
+                continue
+
+            self.worker.__dict__["jinja_env"] = _Environment(
+                self._environment,
+                operation.arguments[0].as_posix(),
+                operation.rendering.result(),
+            )
+            try:
+                operation.method(self.worker, *operation.arguments)
+            finally:
+                self.worker.__dict__["jinja_env"] = self._environment
+
+
+class _Environment:
+    """Copier's Jinja environment, handing out a template rendered before.
+
+    It also acts as the template, rendering its text.
+    """
+
+    def __init__(
+        self,
+        environment: Any,  # noqa: ANN401
+        name: str,
+        rendering: _Rendering,
+    ) -> None:
+        """Initialize the environment.
+
+        Args:
+            environment: copier's Jinja environment.
+            name: the name of the template rendered before.
+            rendering: the outcome of its rendering.
+        """
+        self._environment = environment
+        self._name = name
+        self._rendering = rendering
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Delegate to copier's Jinja environment.
+
+        Args:
+            name: the name of the attribute.
+
+        Returns:
+            The attribute of copier's Jinja environment.
+        """
+        return getattr(self._environment, name)
+
+    def get_template(self, name: str, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        """Load a template, the template rendered before as itself.
+
+        Args:
+            name: the name of the template.
+            args: the positional arguments of Jinja's `get_template`.
+            kwargs: the keyword arguments of Jinja's `get_template`.
+
+        Returns:
+            The template.
+
+        Raises:
+            Exception: the error loading the template rendered before.
+        """
+        if name != self._name:
+            return self._environment.get_template(name, *args, **kwargs)
+
+        if isinstance(self._rendering, _Failed) and (
+            self._rendering.stage == "load"
+        ):
+            raise self._rendering.error
+
+        return self
+
+    def render(self, *_args: Any, **_kwargs: Any) -> str:  # noqa: ANN401
+        """Render the template rendered before, and its `yield` state.
+
+        Returns:
+            The text rendered.
+
+        Raises:
+            Exception: the error rendering the template.
+        """
+        if isinstance(self._rendering, _Failed):
+            raise self._rendering.error
+
+        state = _yield_state(self)
+        state.yield_name = self._rendering.yield_name
+        state.yield_iterable = self._rendering.yield_iterable
+        return self._rendering.text
+
+
+_PLAN: ContextVar[Optional[_Plan]] = ContextVar("_PLAN", default=None)
+"""The plan recording the writes of the walk in progress, if any."""
+
+
+def _worker_class() -> Any:  # noqa: ANN401
+    """Import copier's worker.
+
+    Returns:
+        The class of copier's worker.
+
+    Raises:
+        ImportError: copier is not importable.
+    """
+    for module in COPIER_WORKERS:
+        with suppress(ImportError):
+            return importlib.import_module(module).Worker
+
+    message = "copier is not importable"
+    raise ImportError(message)
+
+
+def _method(function: Callable[..., None]) -> Callable[..., None]:
+    """Turn a function into a method of copier's worker.
+
+    Args:
+        function: the function, taking the worker first.
+
+    Returns:
+        A function bound to the worker when set on its class.
+    """
+
+    def method(worker: Any, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        function(worker, *args, **kwargs)
+
+    return method
+
+
+class _Installation:
+    """The methods of copier's worker, wrapped to render concurrently."""
+
+    def __init__(self, worker_class: Any, jobs: Optional[int]) -> None:  # noqa: ANN401
+        """Initialize the installation.
+
+        Args:
+            worker_class: the class of copier's worker.
+            jobs: the maximum number of files rendered concurrently.
+        """
+        self.worker_class = worker_class
+        self.jobs = jobs
+        self.originals = {
+            name: getattr(worker_class, name)
+            for name in ("_render_template", "_render_file", "_render_folder")
+        }
+
+    def walk(self, worker: Any) -> None:  # noqa: ANN401
+        """Walk a template, recording the writes, then replay them.
+
+        Args:
+            worker: copier's worker.
+        """
+        if worker.template.preserve_symlinks:
+            self.originals["_render_template"](worker)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            plan = _Plan(worker, executor)
+            token = _PLAN.set(plan)
+            try:
+                self.originals["_render_template"](worker)
+            finally:
+                _PLAN.reset(token)
+                # The writes walked before an error are done, as they would.
+                plan.replay()
+
+    def file(
+        self,
+        worker: Any,  # noqa: ANN401
+        src_relpath: Path,
+        dst_relpath: Path,
+        extra_context: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Record the write of a file, or write it outside of a walk.
+
+        Args:
+            worker: copier's worker.
+            src_relpath: the file, relative to the template.
+            dst_relpath: the file, relative to the project.
+            extra_context: the context added by the path of the file.
+        """
+        render_file = self.originals["_render_file"]
+        if (plan := _PLAN.get()) is None or plan.worker is not worker:
+            render_file(worker, src_relpath, dst_relpath, extra_context)
+            return
+
+        plan.file(render_file, src_relpath, dst_relpath, extra_context)
+
+    def folder(self, worker: Any, dst_relpath: Path) -> None:  # noqa: ANN401
+        """Record the creation of a folder, or create it outside of a walk.
+
+        Args:
+            worker: copier's worker.
+            dst_relpath: the folder, relative to the project.
+        """
+        render_folder = self.originals["_render_folder"]
+        if (plan := _PLAN.get()) is None or plan.worker is not worker:
+            render_folder(worker, dst_relpath)
+            return
+
+        plan.operations.append(_Operation(render_folder, (dst_relpath,), None))
+
+    def install(self) -> None:
+        """Wrap the methods of copier's worker."""
+        for name, function in (
+            ("_render_template", self.walk),
+            ("_render_file", self.file),
+            ("_render_folder", self.folder),
+        ):
+            setattr(self.worker_class, name, _method(function))
+
+    def uninstall(self) -> None:
+        """Restore the methods of copier's worker."""
+        for name, original in self.originals.items():
+            setattr(self.worker_class, name, original)
+
+
+@contextmanager
+def installed(jobs: Optional[int] = None) -> Generator[None, None, None]:
+    """Render the files of the templates concurrently.
+
+    Args:
+        jobs: the maximum number of files rendered concurrently, None for
+            the default of the standard library thread pool.
+
+    Yields:
+        Nothing, the rendering is installed until the context exits.
+    """
+    installation = _Installation(_worker_class(), jobs)
+    installation.install()
+    try:
+        yield
+    finally:
+        installation.uninstall()
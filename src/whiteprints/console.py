@@ -2,18 +2,25 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-"""Manage a global rich console."""
+"""Manage a global rich console.
 
-from typing import Final
+The consoles are created, and rich imported, on first access.
+"""
+
+import importlib
+from functools import cache
+from typing import TYPE_CHECKING, Final
 
-from rich import console
+
+if TYPE_CHECKING:
+    from rich.console import Console
 
 
 __all__: Final = ["STDERR", "STDOUT"]
 """Public module attributes."""
 
 
-STDOUT: Final = console.Console()
+STDOUT: "Console"
 """A high level console interface instance.
 
 Print on the standard output.
@@ -22,7 +29,7 @@
     https://rich.readthedocs.io/en/stable/reference/console.html
 """
 
-STDERR: Final = console.Console(stderr=True)
+STDERR: "Console"
 """A high level console interface instance.
 
 Print on the standard error.
@@ -30,3 +37,34 @@
 See Also:
     https://rich.readthedocs.io/en/stable/reference/console.html
 """
+
+
+@cache
+def _console(*, stderr: bool) -> "Console":
+    """Create a console, once.
+
+    Args:
+        stderr: whether the console prints on the standard error.
+
+    Returns:
+        The console.
+    """
+    return importlib.import_module("rich.console").Console(stderr=stderr)
+
+
+def __getattr__(name: str) -> "Console":
+    """Lazily create the consoles.
+
+    Args:
+        name: the name of the module attribute.
+
+    Raises:
+        AttributeError: the module has no such attribute.
+
+    Returns:
+        The console, for the `STDOUT` and `STDERR` attributes.
+    """
+    if name in __all__:
+        return _console(stderr=name == "STDERR")
+
+    raise AttributeError(name)
@@ -4,27 +4,184 @@
 
 """Run copier commands.
 
-We use uvx.
+Two engines are available:
+
+- `subprocess` runs each copier command in a persistent tool environment
+  holding copier and the context packages (see whiteprints.tool_environment),
+  created on first use and reused by every template layer and invocation.
+- `in-process` runs copier's command line application inside the current
+  process, so that every template layer shares one interpreter and one
+  environment. The engine falls back to `subprocess` when copier, or one of
+  the context packages, is not installed in the current environment. The
+  files of each template are rendered concurrently (see
+  whiteprints.concurrent_render).
+
+`Copier.copy_async` runs a copier command in the tool environment with an
+asynchronous runner (see whiteprints.async_run), capturing its output.
+
+With timeouts (see whiteprints.supervision), copier always runs in its tool
+environment: a command running in the current process cannot be terminated.
+
+With a Jinja cache (see whiteprints.jinja_cache), the compiled templates are
+kept across runs, by either engine.
 """
 
-import itertools
-from collections.abc import Iterable
+import importlib
+import logging
+import os
+import sys
+from collections.abc import Iterable, Mapping
+from contextlib import ExitStack, suppress
 from functools import cached_property
+from importlib import metadata
+from pathlib import Path
+from subprocess import CalledProcessError  # nosec
+from types import ModuleType
+from typing import TYPE_CHECKING, Final, Literal, Optional
+
+
+if sys.version_info >= (3, 11):
+    from typing import Unpack
+else:
+    from typing_extensions import Unpack
+
+if TYPE_CHECKING:
+    from whiteprints.async_run import (
+        AsyncRunner,
+        OutputCallbacks,
+        ProcessResult,
+    )
+    from whiteprints.supervision import Timeouts
+    from whiteprints.tool_environment import ToolEnvironment
+
+
+__all__: Final = [
+    "COPIER_APPLICATIONS",
+    "COPIER_REQUIREMENT",
+    "Copier",
+    "CopierEngine",
+    "copier_environment",
+]
+"""Public module attributes."""
+
+
+CopierEngine = Literal["subprocess", "in-process"]
+"""The engines running copier."""
+
+COPIER_APPLICATIONS: Final = ("copier._cli", "copier.cli")
+"""The modules holding copier's command line application, newest first."""
+
+COPIER_REQUIREMENT: Final = "copier"
+"""The requirement installing copier in its tool environment."""
+
+
+def _copier_application() -> Optional[ModuleType]:
+    """Import copier's command line application.
+
+    Returns:
+        The module holding the application, None if copier is not importable.
+    """
+    for module in COPIER_APPLICATIONS:
+        with suppress(ImportError):
+            return importlib.import_module(module)
+
+    return None
+
+
+def _is_installed(requirement: str) -> bool:
+    """Check whether a pinned requirement is installed.
+
+    Args:
+        requirement: a requirement, either `name` or `name==version`.
+
+    Returns:
+        True if the requirement is installed, False otherwise.
+    """
+    name, _, version = requirement.partition("==")
+    try:
+        return version in {"", metadata.version(name)}
+    except metadata.PackageNotFoundError:
+        return False
+
+
+def copier_environment(
+    context: Iterable[str] = (),
+    wheelhouse: Optional[Path] = None,
+) -> "ToolEnvironment":
+    """The tool environment running copier.
 
-from whiteprints.uvx_run import UVX
+    Args:
+        context: the context packages of the templates.
+        wheelhouse: the wheelhouse to install the environment from, None to
+            resolve it against the package indexes.
+
+    Returns:
+        The tool environment holding copier and the context packages.
+    """
+    return importlib.import_module(
+        "whiteprints.tool_environment"
+    ).ToolEnvironment([COPIER_REQUIREMENT, *context], wheelhouse=wheelhouse)
 
 
 class Copier:
     """Manage the copier command."""
 
+    def __init__(
+        self,
+        engine: CopierEngine = "subprocess",
+        wheelhouse: Optional[Path] = None,
+        timeouts: Optional["Timeouts"] = None,
+        jinja_cache: Optional[Path] = None,
+        environment: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """Initialize the copier manager.
+
+        Args:
+            engine: the engine running copier.
+            wheelhouse: the wheelhouse to install copier's tool environment
+                from, None to resolve it against the package indexes.
+            timeouts: the timeouts of each copier command.
+            jinja_cache: the root of the Jinja bytecode cache, None to
+                compile the templates on every run.
+            environment: the environment variables added to the copier
+                commands (e.g. the mirrors of the templates, see
+                whiteprints.mirrors).
+        """
+        self.engine = engine
+        self.wheelhouse = wheelhouse
+        self.timeouts = timeouts
+        self.jinja_cache = jinja_cache
+        self.environment = dict(environment or {})
+
+    @cached_property
+    def runner(self) -> "AsyncRunner":
+        """The runner of the asynchronous copier commands.
+
+        Returns:
+            A runner with the default concurrency limit.
+        """
+        return importlib.import_module("whiteprints.async_run").AsyncRunner()
+
     @cached_property
-    def uvx(self) -> UVX:
-        """A uvx manager.
+    def application(self) -> Optional[ModuleType]:
+        """Copier's command line application, for the `in-process` engine.
 
         Returns:
-            a uvx manager instance.
+            The module holding the application, None if it is not available.
         """
-        return UVX()
+        if self.engine != "in-process":
+            return None
+
+        if self.timeouts and any(
+            timeout is not None for timeout in self.timeouts.values()
+        ):
+            logging.getLogger(__name__).info(
+                "Copier cannot be timed out in-process, running copier in "
+                "its tool environment."
+            )
+            return None
+
+        return _copier_application()
 
     def copy(
         self,
@@ -40,12 +197,176 @@ def copy(
             context: additional depenencies to inject.
             trust: copier trust for code execution.
         """
-        command = [
-            *itertools.chain.from_iterable(
-                ("--with", package) for package in context
-            ),
-            "copier",
-            "copy",
-            *command,
-        ] + (["--trust"] if trust else [])
-        self.uvx.run(command)
+        context = list(context)
+        command = ["copy", *command] + (["--trust"] if trust else [])
+        if self.application is not None and all(map(_is_installed, context)):
+            with self._in_process(command[1]):
+                self._run_in_process(self.application, command)
+
+            return
+
+        if self.engine == "in-process":
+            logging.getLogger(__name__).info(
+                "Copier or its context %s is not installed, running copier "
+                "in its tool environment.",
+                context,
+            )
+
+        self._run_in_environment(
+            copier_environment(context, wheelhouse=self.wheelhouse), command
+        )
+
+    async def copy_async(
+        self,
+        command: Iterable[str],
+        *,
+        name: str,
+        context: Iterable[str] = (),
+        trust: bool = False,
+        **callbacks: Unpack["OutputCallbacks"],
+    ) -> "ProcessResult":
+        """Run a copier command asynchronously, in its tool environment.
+
+        The command does not read the standard input: the answers must be
+        given on the command line (e.g. `--defaults`, `--data`).
+
+        Args:
+            command: arguments for the copier copy command.
+            name: the name of the invocation, naming its log files.
+            context: additional depenencies to inject.
+            trust: copier trust for code execution.
+            callbacks: the callbacks receiving the output (`on_stdout`,
+                `on_stderr`).
+
+        Returns:
+            The result of the copier command.
+
+        Raises:
+            CalledProcessError: copier exited with a non zero status.
+            ProcessTimeoutError: copier exceeded one of its timeouts.
+        """
+        async_run = importlib.import_module("whiteprints.async_run")
+        environment = copier_environment(context, wheelhouse=self.wheelhouse)
+        await importlib.import_module("asyncio").to_thread(environment.create)
+        command = ["copy", *command] + (["--trust"] if trust else [])
+        return async_run.check_returncode(
+            await self.runner.run(
+                self._command(environment, command),
+                name=name,
+                env=self._environment(command[1]),
+                timeouts=self.timeouts,
+                **callbacks,
+            )
+        )
+
+    def _in_process(self, template: str) -> ExitStack:
+        """Give the Jinja cache and the environment to an in-process run.
+
+        The files of the template are rendered concurrently.
+
+        Args:
+            template: the template source.
+
+        Returns:
+            A context installing the concurrent rendering, the Jinja cache and
+            the environment, if any.
+        """
+        stack = ExitStack()
+        stack.enter_context(
+            importlib.import_module(
+                "whiteprints.concurrent_render"
+            ).installed()
+        )
+
+        if self.jinja_cache is not None:
+            stack.enter_context(
+                importlib.import_module("whiteprints.jinja_cache").installed(
+                    self.jinja_cache, template
+                )
+            )
+
+        if self.environment:
+            # Copier runs git through plumbum, whose environment is a copy.
+            stack.enter_context(
+                importlib.import_module("plumbum").local.env(
+                    **self.environment
+                )
+            )
+
+        return stack
+
+    def _environment(self, template: str) -> Optional[dict[str, str]]:
+        """The environment of a copier command.
+
+        Args:
+            template: the template source.
+
+        Returns:
+            The environment of the command, with the Jinja cache and the
+            added variables, None to inherit it.
+        """
+        if self.jinja_cache is None and not self.environment:
+            return None
+
+        environment = {**os.environ, **self.environment}
+        if self.jinja_cache is not None:
+            jinja_cache = importlib.import_module("whiteprints.jinja_cache")
+            environment[jinja_cache.CACHE_VARIABLE] = str(self.jinja_cache)
+            environment[jinja_cache.TEMPLATE_VARIABLE] = template
+
+        return environment
+
+    def _command(
+        self, environment: "ToolEnvironment", command: list[str]
+    ) -> list[str]:
+        """The command line running copier in its tool environment.
+
+        Args:
+            environment: the tool environment.
+            command: the copier command.
+
+        Returns:
+            The command line, through the Jinja cache script if any.
+        """
+        if self.jinja_cache is None:
+            return environment.command("copier", command)
+
+        return environment.script(
+            importlib.import_module("whiteprints.jinja_cache").SCRIPT, command
+        )
+
+    def _run_in_environment(
+        self, environment: "ToolEnvironment", command: list[str]
+    ) -> None:
+        """Run a copier command in its tool environment.
+
+        Args:
+            environment: the tool environment.
+            command: the copier command.
+        """
+        if self._environment(command[1]) is None:
+            environment.run("copier", command, self.timeouts)
+            return
+
+        environment.create()
+        importlib.import_module("whiteprints.supervision").run(
+            self._command(environment, command),
+            self.timeouts,
+            env=self._environment(command[1]),
+        )
+
+    @staticmethod
+    def _run_in_process(application: ModuleType, command: list[str]) -> None:
+        """Run a copier command in the current process.
+
+        Args:
+            application: the module holding copier's application.
+            command: the copier command.
+
+        Raises:
+            CalledProcessError: copier exited with a non zero status.
+        """
+        argv = ["copier", *command]
+        _, status = application.CopierApp.run(argv, exit=False)
+        if status:
+            raise CalledProcessError(status, argv)
@@ -0,0 +1,259 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Defer the tasks of the template layers.
+
+Each layer runs its copier tasks right after it renders, so a step several
+layers share (dependency sync, lock, hook installation, commit) runs once per
+layer. The tasks of the layers are instead collected, the layers render with
+copier's `--skip-tasks`, then the tasks run once every layer rendered:
+
+- order: the tasks run in layer order, then in the order of each layer.
+- de-duplication: a task identical to an earlier one (same command and
+  working directory) is skipped, and reported as redundant.
+
+Only the tasks copier would run unchanged are deferred: a task whose command,
+condition or working directory is templated depends on the answers of its
+layer. A layer holding such a task runs its tasks itself, as it renders.
+
+Copier is imported on first use.
+"""
+
+import json
+import os
+import sys
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, Final, Optional, TypedDict, Union, cast
+
+from whiteprints import supervision
+from whiteprints.composition import template_class
+
+
+__all__: Final = [
+    "Task",
+    "TaskPlan",
+    "layer_tasks",
+    "parse_task",
+    "plan",
+    "read_configuration",
+    "run",
+]
+"""Public module attributes."""
+
+
+JINJA_MARKERS: Final = ("{{", "{%")
+"""The markers of a templated value."""
+
+ALWAYS: Final = (True, "true")
+"""The conditions of the unconditional tasks."""
+
+TASK_ENVIRONMENT: Final = {"STAGE": "task", "COPIER_OPERATION": "copy"}
+"""The environment variables copier sets while running a task."""
+
+
+TaskCommand = Union[str, list[str]]
+"""A task command: a shell command line, or a program and its arguments."""
+
+
+class Task(TypedDict):
+    """A task of a layer."""
+
+    command: TaskCommand
+    working_directory: str
+    layer: str
+
+
+class TaskPlan(TypedDict):
+    """The deferred tasks of the layers."""
+
+    deferred: list[str]
+    tasks: list[Task]
+    redundant: list[Task]
+
+
+def _is_templated(value: object) -> bool:
+    """Whether a task setting is templated.
+
+    Args:
+        value: the setting.
+
+    Returns:
+        True if the setting, or one of its items, holds a Jinja marker.
+    """
+    if isinstance(value, list):
+        return any(map(_is_templated, cast("list[object]", value)))
+
+    return isinstance(value, str) and any(
+        marker in value for marker in JINJA_MARKERS
+    )
+
+
+def parse_task(task: Any, layer: str) -> Optional[Task]:  # noqa: ANN401
+    """Parse a task of a copier configuration.
+
+    Args:
+        task: the task, as written in the `_tasks` setting.
+        layer: the name of the layer holding the task.
+
+    Returns:
+        The task, None if it cannot be deferred.
+
+    Example:
+        >>> parse_task("uv lock", "python")
+        {'command': 'uv lock', 'working_directory': '.', 'layer': 'python'}
+        >>> parse_task({"command": "git init", "when": "{{ git }}"}, "python")
+    """
+    settings = (
+        cast("dict[str, Any]", task)
+        if isinstance(task, dict)
+        else {"command": task}
+    )
+    command = settings["command"]
+    working_directory = settings.get("working_directory", ".")
+    if settings.get("when", True) not in ALWAYS or any(
+        map(_is_templated, (command, working_directory))
+    ):
+        return None
+
+    return Task(
+        command=(
+            command
+            if isinstance(command, str)
+            else [str(part) for part in command]
+        ),
+        working_directory=str(working_directory),
+        layer=layer,
+    )
+
+
+def layer_tasks(
+    configuration: dict[str, Any], layer: str
+) -> Optional[list[Task]]:
+    """The tasks of a layer.
+
+    Args:
+        configuration: the raw copier configuration of the layer.
+        layer: the name of the layer.
+
+    Returns:
+        The tasks of the layer, None if one of them cannot be deferred.
+    """
+    tasks = [
+        parse_task(task, layer) for task in configuration.get("_tasks", [])
+    ]
+    if None in tasks:
+        return None
+
+    return [task for task in tasks if task is not None]
+
+
+def read_configuration(
+    template: str, ref: Optional[str] = None
+) -> dict[str, Any]:
+    """Read the raw copier configuration of a template.
+
+    Args:
+        template: the copier template (path or URL).
+        ref: the git reference of the template, None for its latest version.
+
+    Returns:
+        The raw configuration of the template.
+
+    Raises:
+        ImportError: copier is not importable.
+    """
+    layer = template_class()(url=template, ref=ref)
+    try:
+        return dict(layer._raw_config)  # noqa: SLF001
+    finally:
+        layer._cleanup()  # noqa: SLF001
+
+
+def _key(task: Task) -> str:
+    """Identify the identical tasks.
+
+    Args:
+        task: the task.
+
+    Returns:
+        The command and the working directory of the task.
+    """
+    return json.dumps(
+        [task["command"], os.path.normpath(task["working_directory"])]
+    )
+
+
+def plan(configurations: Iterable[tuple[str, dict[str, Any]]]) -> TaskPlan:
+    """Plan the deferred tasks of the layers.
+
+    Args:
+        configurations: the name and raw copier configuration of each layer,
+            in layer order.
+
+    Returns:
+        The layers whose tasks are deferred, the tasks to run once and the
+        redundant tasks skipped.
+
+    Example:
+        >>> plan([
+        ...     ("python", {"_tasks": ["uv lock", "git init"]}),
+        ...     ("command_line", {"_tasks": ["uv lock"]}),
+        ... ])["redundant"]
+        [{'command': 'uv lock', 'working_directory': '.', 'layer': 'command_line'}]
+    """  # noqa: E501
+    result = TaskPlan(deferred=[], tasks=[], redundant=[])
+    seen: set[str] = set()
+    for layer, configuration in configurations:
+        tasks = layer_tasks(configuration, layer)
+        if tasks is None:
+            continue
+
+        result["deferred"].append(layer)
+        for task in tasks:
+            (
+                result["redundant"] if _key(task) in seen else result["tasks"]
+            ).append(task)
+            seen.add(_key(task))
+
+    return result
+
+
+def _command(command: TaskCommand) -> Sequence[str]:
+    """The command line of a task.
+
+    Args:
+        command: the task command.
+
+    Returns:
+        The program and its arguments, a shell running a command line.
+    """
+    if isinstance(command, list):
+        return command
+
+    if sys.platform == "win32":
+        return [os.environ.get("COMSPEC", "cmd.exe"), "/c", command]
+
+    return ["/bin/sh", "-c", command]
+
+
+def run(
+    tasks: Iterable[Task],
+    project: Path,
+    timeouts: Optional[supervision.Timeouts] = None,
+) -> None:
+    """Run the deferred tasks, as copier would.
+
+    Args:
+        tasks: the tasks to run, in order.
+        project: the project directory.
+        timeouts: the timeouts of each task.
+    """
+    for task in tasks:
+        supervision.run(
+            _command(task["command"]),
+            timeouts,
+            cwd=project / task["working_directory"],
+            env={**os.environ, **TASK_ENVIRONMENT},
+        )
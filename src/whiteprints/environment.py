@@ -4,14 +4,13 @@
 
 """Manage environment variables."""
 
-import logging
+import importlib
+from functools import cache
 from pathlib import Path
 from typing import Final
 
-import dotenv
 
-
-__all__: Final = ["ENVIRONMENT_FILE", "load_dotenv"]
+__all__: Final = ["ENVIRONMENT_FILE", "initialize", "load_dotenv"]
 
 ENVIRONMENT_FILE: Final = Path(".env")
 """The default path to the dotenv file."""
@@ -21,12 +20,26 @@ def load_dotenv(environment_file: Path) -> None:
     """Load a dotenv file to os.environ.
 
     A dotenv file stores the environment variables useful to customise the
-    behaviour of the app.
+    behaviour of the app. Dotenv and logging are only imported when the file
+    exists.
 
     Args:
         environment_file: the dotenv file to load.
     """
-    if dotenv.load_dotenv(environment_file):
-        logging.getLogger(__name__).info(
+    if not environment_file.is_file():
+        return
+
+    if importlib.import_module("dotenv").load_dotenv(environment_file):
+        importlib.import_module("logging").getLogger(__name__).info(
             "Loading environment variables from `%s` file.", environment_file
         )
+
+
+@cache
+def initialize() -> None:
+    """Load the default dotenv file, once.
+
+    The command line interface calls this function before reading its
+    environment variables. Subsequent calls do nothing.
+    """
+    load_dotenv(ENVIRONMENT_FILE)
@@ -0,0 +1,213 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Digest, copy and flush directory trees, file by file, concurrently.
+
+The files of a tree are independent: they are digested, copied and flushed
+by a thread pool, while the result keeps the order of the sorted paths. The
+files are streamed in chunks, a large asset is never loaded whole. Hashing,
+copying and flushing release the GIL, the threads then run in parallel.
+
+This is the per-file work whiteprints does around a layer (the staging
+copies, footprints, render cache and publication). The files of a template
+are rendered concurrently by the `in-process` engine (see
+whiteprints.concurrent_render).
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Final, Optional
+
+
+__all__: Final = [
+    "CHUNK_SIZE",
+    "DIRECTORY",
+    "copy_tree",
+    "digest",
+    "file_digest",
+    "sync_path",
+    "sync_tree",
+    "tree_digests",
+]
+"""Public module attributes."""
+
+
+CHUNK_SIZE: Final = 1 << 20
+"""The number of bytes read at once while streaming a file."""
+
+DIRECTORY: Final = "directory"
+"""The digest of a directory."""
+
+
+def file_digest(path: Path) -> str:
+    """Digest a file, streaming it.
+
+    Args:
+        path: a regular file.
+
+    Returns:
+        The SHA-256 digest of the content of the file.
+    """
+    sha256 = hashlib.sha256()
+    with path.open("rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+def digest(path: Path) -> str:
+    """Identify the content of a path.
+
+    Args:
+        path: a file, a symbolic link or a directory.
+
+    Returns:
+        A digest of the content of the path.
+    """
+    if path.is_symlink():
+        return "symlink:" + str(path.readlink())
+
+    if path.is_dir():
+        return DIRECTORY
+
+    return "file:" + file_digest(path)
+
+
+def _walk(root: Path) -> Iterator[Path]:
+    """The paths of a directory tree, without following symbolic links.
+
+    Args:
+        root: the root of the tree.
+
+    Yields:
+        The paths of the tree, sorted.
+    """
+    yield from sorted(root.rglob("*"))
+
+
+def tree_digests(root: Path, *, jobs: Optional[int] = None) -> dict[str, str]:
+    """Identify the content of a directory tree.
+
+    Args:
+        root: the root of the tree.
+        jobs: the maximum number of paths digested concurrently, None for
+            the default of the standard library thread pool.
+
+    Returns:
+        The paths of the tree, relative to the root and sorted, mapped to
+        their digest.
+    """
+    if not root.exists():
+        return {}
+
+    paths = list(_walk(root))
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return {
+            path.relative_to(root).as_posix(): path_digest
+            for path, path_digest in zip(paths, executor.map(digest, paths))
+        }
+
+
+def _create(path: Path, target: Path) -> bool:
+    """Create the copy of a directory or a symbolic link.
+
+    Args:
+        path: a path of the source tree.
+        target: the copy of the path.
+
+    Returns:
+        True if the path is a file, left to copy, False otherwise.
+    """
+    if path.is_symlink():
+        target.symlink_to(path.readlink())
+        shutil.copystat(path, target, follow_symlinks=False)
+        return False
+
+    if path.is_dir():
+        target.mkdir()
+        return False
+
+    return True
+
+
+def copy_tree(
+    source: Path,
+    destination: Path,
+    *,
+    jobs: Optional[int] = None,
+) -> None:
+    """Copy a directory tree, as `shutil.copytree` with `symlinks=True`.
+
+    The directories and symbolic links are created first, in order, then
+    the files are copied concurrently, then the directories get the
+    permissions and times of their source, deepest first.
+
+    Args:
+        source: the root of the tree.
+        destination: the root of the copy, which must not exist.
+        jobs: the maximum number of files copied concurrently, None for
+            the default of the standard library thread pool.
+    """
+    destination.mkdir(parents=True)
+    paths = list(_walk(source))
+    files = [
+        path
+        for path in paths
+        if _create(path, destination / path.relative_to(source))
+    ]
+    directories = [
+        source,
+        *(path for path in paths if path.is_dir() and not path.is_symlink()),
+    ]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(
+            executor.map(
+                shutil.copy2,
+                files,
+                [destination / path.relative_to(source) for path in files],
+            )
+        )
+
+    for directory in reversed(directories):
+        shutil.copystat(directory, destination / directory.relative_to(source))
+
+
+def sync_path(path: Path) -> None:
+    """Flush a file or a directory to its storage.
+
+    The directories cannot be flushed on Windows, they are skipped.
+
+    Args:
+        path: a regular file or a directory.
+    """
+    if path.is_dir() and sys.platform == "win32":
+        return
+
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def sync_tree(root: Path, *, jobs: Optional[int] = None) -> None:
+    """Flush a directory tree to its storage, file by file, concurrently.
+
+    Args:
+        root: the root of the tree.
+        jobs: the maximum number of paths flushed concurrently, None for
+            the default of the standard library thread pool.
+    """
+    paths = [
+        root,
+        *(path for path in _walk(root) if not path.is_symlink()),
+    ]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(executor.map(sync_path, paths))
@@ -0,0 +1,317 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Cache the compiled Jinja templates of the layers.
+
+Copier compiles every Jinja template of a layer on every run, while the
+templates only change with their commit. The compiled templates are instead
+kept in a persistent bytecode cache, in the user cache directory:
+
+- namespace: one directory per template source and resolved commit.
+- key: the name of the template in its layer, the clone copier renders from
+  is temporary. Jinja checks the checksum of the source of each entry, a
+  stale entry is compiled again.
+- eviction: the cache is bounded in size, the least recently used entries
+  (by modification time, refreshed on each load) are evicted first.
+
+Copier creates its Jinja environment itself: the cache is installed by
+wrapping the constructor of Jinja's sandboxed environment. In the tool
+environment running copier, whiteprints is not installed: this module is run
+there as a script, installing the cache, then running copier. It only imports
+the standard library, Jinja is imported on first use.
+"""
+
+import hashlib
+import importlib
+import os
+import runpy
+import subprocess  # nosec
+import sys
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Any, Final, Optional
+
+
+__all__: Final = [
+    "CACHE_VARIABLE",
+    "JINJA_CACHE_DIRECTORY",
+    "MAXIMUM_SIZE",
+    "SCRIPT",
+    "TEMPLATE_VARIABLE",
+    "BytecodeCache",
+    "evict",
+    "installed",
+    "namespace",
+    "template_commit",
+]
+"""Public module attributes."""
+
+
+JINJA_CACHE_DIRECTORY: Final = "jinja"
+"""The user cache subdirectory holding the compiled templates."""
+
+CACHE_VARIABLE: Final = "WHITEPRINTS_JINJA_CACHE"
+"""The environment variable giving the cache to the copier script."""
+
+TEMPLATE_VARIABLE: Final = "WHITEPRINTS_JINJA_TEMPLATE"
+"""The environment variable giving the template source to the copier
+script."""
+
+MAXIMUM_SIZE: Final = 128 * (1 << 20)
+"""The maximum size of the cache, in bytes."""
+
+SCRIPT: Final = Path(__file__)
+"""The script running copier with the cache."""
+
+SUFFIX: Final = ".cache"
+"""The suffix of the cache entries."""
+
+KEY_LENGTH: Final = 16
+"""The number of hexadecimal digits of a namespace."""
+
+WORKTREE: Final = "worktree"
+"""The commit of a template which is not versioned."""
+
+
+def template_commit(path: Path) -> str:
+    """The commit of a template checkout.
+
+    Args:
+        path: the local checkout of the template.
+
+    Returns:
+        The commit checked out, WORKTREE if the template is not versioned.
+    """
+    try:
+        return subprocess.run(  # nosec
+            ["git", "-C", str(path), "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return WORKTREE
+
+
+def namespace(template: str, commit: str) -> str:
+    """The cache namespace of a template version.
+
+    Args:
+        template: the template source.
+        commit: the commit of the template.
+
+    Returns:
+        A digest of the template source and of its commit.
+
+    Example:
+        >>> len(namespace("gh:whiteprints/template-python.git", "worktree"))
+        16
+    """
+    return hashlib.sha256(f"{template}\0{commit}".encode()).hexdigest()[
+        :KEY_LENGTH
+    ]
+
+
+def _entries(root: Path) -> list[tuple[int, int, Path]]:
+    """The entries of the cache.
+
+    Args:
+        root: the root of the cache.
+
+    Returns:
+        The last use, the size and the path of each entry, oldest first.
+    """
+    entries: list[tuple[int, int, Path]] = []
+    for path in root.glob(f"*/*{SUFFIX}"):
+        with suppress(FileNotFoundError):
+            status = path.stat()
+            entries.append((status.st_mtime_ns, status.st_size, path))
+
+    return sorted(entries)
+
+
+def evict(root: Path, maximum_size: int) -> int:
+    """Evict the least recently used entries, down to the maximum size.
+
+    Args:
+        root: the root of the cache.
+        maximum_size: the maximum size of the cache, in bytes.
+
+    Returns:
+        The size of the cache, in bytes.
+    """
+    entries = _entries(root)
+    size = sum(entry_size for _, entry_size, _ in entries)
+    for _, entry_size, path in entries:
+        if size <= maximum_size:
+            break
+
+        with suppress(FileNotFoundError):
+            path.unlink()
+
+        size -= entry_size
+
+    return size
+
+
+class BytecodeCache:
+    """A size-bounded Jinja bytecode cache, namespaced by template version.
+
+    It implements the `get_bucket` and `set_bucket` interface of Jinja's
+    bytecode caches.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        namespace: str,
+        maximum_size: int = MAXIMUM_SIZE,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            root: the root of the cache, shared by the namespaces.
+            namespace: the namespace of the template version.
+            maximum_size: the maximum size of the cache, in bytes.
+        """
+        self.root = root
+        self.directory = root / namespace
+        self.maximum_size = maximum_size
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> Path:
+        """The entry of a template.
+
+        Args:
+            name: the name of the template.
+
+        Returns:
+            The path of the entry.
+        """
+        return self.directory / (
+            hashlib.sha256(name.encode()).hexdigest() + SUFFIX
+        )
+
+    def get_bucket(
+        self,
+        environment: Any,  # noqa: ANN401
+        name: str,
+        _filename: Optional[str],
+        source: str,
+    ) -> Any:  # noqa: ANN401
+        """Load the compiled template, if it is cached.
+
+        Args:
+            environment: the Jinja environment.
+            name: the name of the template.
+            source: the source of the template.
+
+        Returns:
+            The Jinja bucket of the template, without code if it is missing
+            or stale.
+        """
+        bucket = importlib.import_module("jinja2.bccache").Bucket(
+            environment,
+            name,
+            hashlib.sha1(  # nosec
+                source.encode("utf-8", "replace")
+            ).hexdigest(),
+        )
+        path = self.path(name)
+        with suppress(FileNotFoundError):
+            with path.open("rb") as file:
+                bucket.load_bytecode(file)
+
+            os.utime(path)
+
+        return bucket
+
+    def set_bucket(self, bucket: Any) -> None:  # noqa: ANN401
+        """Store a compiled template, evicting the least recently used.
+
+        Args:
+            bucket: the Jinja bucket of the template.
+        """
+        path = self.path(bucket.key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(
+            f".{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with temporary.open("wb") as file:
+            bucket.write_bytecode(file)
+
+        temporary.replace(path)
+        with self._lock:
+            if self._size is None:
+                self._size = evict(self.root, self.maximum_size)
+                return
+
+            self._size += path.stat().st_size
+            if self._size > self.maximum_size:
+                self._size = evict(self.root, self.maximum_size)
+
+
+@contextmanager
+def installed(
+    root: Path,
+    template: str,
+    *,
+    maximum_size: int = MAXIMUM_SIZE,
+) -> Generator[None, None, None]:
+    """Cache the templates compiled by Jinja's sandboxed environments.
+
+    Args:
+        root: the root of the cache.
+        template: the template source.
+        maximum_size: the maximum size of the cache, in bytes.
+
+    Yields:
+        Nothing, the cache is installed until the context exits.
+    """
+    environment_class = importlib.import_module(
+        "jinja2.sandbox"
+    ).SandboxedEnvironment
+    constructor = environment_class.__init__
+
+    def cached(
+        self: Any,  # noqa: ANN401
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        constructor(self, *args, **kwargs)
+        searchpath = getattr(self.loader, "searchpath", None)
+        if self.bytecode_cache is None and searchpath:
+            self.bytecode_cache = BytecodeCache(
+                root,
+                namespace(template, template_commit(Path(searchpath[0]))),
+                maximum_size,
+            )
+
+    environment_class.__init__ = cached
+    try:
+        yield
+    finally:
+        environment_class.__init__ = constructor
+
+
+def main() -> None:
+    """Run copier, with the cache given by the environment."""
+    root = os.environ.get(CACHE_VARIABLE)
+    sys.argv[0] = "copier"
+    if root is None:
+        runpy.run_module("copier", run_name="__main__", alter_sys=True)
+        return
+
+    with installed(Path(root), os.environ.get(TEMPLATE_VARIABLE, "")):
+        runpy.run_module("copier", run_name="__main__", alter_sys=True)
+
+
+if __name__ == "__main__":
+    # Run as a script: its directory, the whiteprints package, must not
+    # shadow the modules of the tool environment.
+    del sys.path[0]
+    main()
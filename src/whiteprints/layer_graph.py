@@ -0,0 +1,285 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Apply template layers following their dependency graph.
+
+Each layer declares the layers it requires. The layers are applied in
+batches, a batch holding the layers whose requirements are already applied:
+
+- a batch of a single layer is rendered directly into the project.
+- the layers of a larger batch are independent. Each one is rendered
+  concurrently into its own staging copy of the project. The files a layer
+  changed in its staging copy, its footprint, are then merged into the
+  project in layer order. Two layers of a batch changing the same file
+  differently conflict.
+
+The staging copies and the footprints are made file by file, concurrently
+(see whiteprints.file_tree).
+"""
+
+import graphlib
+import shutil
+import tempfile
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
+from pathlib import Path
+from typing import Final, Optional
+
+from whiteprints.file_tree import DIRECTORY, copy_tree, tree_digests
+from whiteprints.layers import Layer
+
+
+__all__: Final = [
+    "Footprint",
+    "LayerConflictError",
+    "Render",
+    "apply_layer_graph",
+    "batches",
+    "footprint",
+]
+"""Public module attributes."""
+
+
+Footprint = dict[str, Optional[str]]
+"""The files a layer changed, mapped to their new digest (None if removed)."""
+
+Render = Callable[[Layer, Path], None]
+"""Render a layer into a directory."""
+
+
+class LayerConflictError(ValueError):
+    """Independent layers changed the same files differently."""
+
+    def __init__(self, conflicts: dict[str, list[str]]) -> None:
+        """Initialize the exception.
+
+        Args:
+            conflicts: the conflicting files, mapped to the layers changing
+                them.
+        """
+        super().__init__(
+            "Independent templates changed the same files: "
+            + "; ".join(
+                f"{path} ({', '.join(layers)})"
+                for path, layers in sorted(conflicts.items())
+            )
+        )
+        self.conflicts = conflicts
+
+
+def batches(layers: Sequence[Layer]) -> Iterator[list[Layer]]:
+    """Group the layers in batches of independent layers.
+
+    The requirements on layers that are not selected are ignored.
+
+    Args:
+        layers: the layers, in the order they would be applied one after
+            another.
+
+    Yields:
+        The batches, in dependency order. Each batch is in layer order.
+
+    Example:
+        >>> layers = [
+        ...     Layer(name="python", template="", requires=()),
+        ...     Layer(name="github", template="", requires=("python",)),
+        ...     Layer(name="pypi", template="", requires=("github",)),
+        ...     Layer(name="codecov", template="", requires=("github",)),
+        ... ]
+        >>> [[layer["name"] for layer in batch] for batch in batches(layers)]
+        [['python'], ['github'], ['pypi', 'codecov']]
+    """
+    order = {layer["name"]: index for index, layer in enumerate(layers)}
+    sorter = graphlib.TopologicalSorter(
+        {
+            layer["name"]: [
+                requirement
+                for requirement in layer["requires"]
+                if requirement in order
+            ]
+            for layer in layers
+        }
+    )
+    sorter.prepare()
+    while sorter.is_active():
+        ready = sorted(sorter.get_ready(), key=order.__getitem__)
+        yield [layers[order[name]] for name in ready]
+        sorter.done(*ready)
+
+
+def footprint(
+    before: dict[str, str],
+    root: Path,
+    *,
+    jobs: Optional[int] = None,
+) -> Footprint:
+    """The files changed in a directory tree.
+
+    Args:
+        before: the digests of the tree before the changes.
+        root: the root of the changed tree.
+        jobs: the maximum number of files digested concurrently.
+
+    Returns:
+        The footprint of the changes.
+    """
+    after = tree_digests(root, jobs=jobs)
+    changed: Footprint = {
+        path: digest
+        for path, digest in after.items()
+        if before.get(path) != digest
+    }
+    changed.update(dict.fromkeys(before.keys() - after.keys()))
+    return changed
+
+
+def _conflicts(
+    batch: Sequence[Layer],
+    footprints: Sequence[Footprint],
+) -> dict[str, list[str]]:
+    """The files changed differently by the layers of a batch.
+
+    Args:
+        batch: the layers of the batch.
+        footprints: the footprint of each layer.
+
+    Returns:
+        The conflicting files, mapped to the layers changing them.
+    """
+    changes: dict[str, dict[Optional[str], list[str]]] = {}
+    for layer, layer_footprint in zip(batch, footprints):
+        for path, digest in layer_footprint.items():
+            changes.setdefault(path, {}).setdefault(digest, []).append(
+                layer["name"]
+            )
+
+    return {
+        path: [name for names in digests.values() for name in names]
+        for path, digests in changes.items()
+        if len(digests) > 1
+    }
+
+
+def _remove(path: Path) -> None:
+    """Remove a path, if it exists.
+
+    Args:
+        path: a file, a symbolic link or a directory.
+    """
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        with suppress(FileNotFoundError):
+            path.unlink()
+
+
+def _merge_path(source: Path, target: Path, digest: Optional[str]) -> None:
+    """Merge a changed path of a staging tree into the project.
+
+    Args:
+        source: the path in the staging tree.
+        target: the path in the project.
+        digest: the new digest of the path, None if it was removed.
+    """
+    if digest != DIRECTORY or not target.is_dir():
+        _remove(target)
+
+    if digest == DIRECTORY:
+        target.mkdir(parents=True, exist_ok=True)
+    elif digest is not None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target, follow_symlinks=False)
+
+
+def _stage(
+    layer: Layer,
+    staging: Path,
+    *,
+    render: Render,
+    project: Path,
+    jobs: Optional[int],
+) -> None:
+    """Render a layer into a staging copy of the project.
+
+    Args:
+        layer: the layer to render.
+        staging: the staging directory.
+        render: render a layer into a directory.
+        project: the project directory.
+        jobs: the maximum number of files copied concurrently.
+    """
+    if project.exists():
+        copy_tree(project, staging, jobs=jobs)
+    else:
+        staging.mkdir(parents=True)
+
+    render(layer, staging)
+
+
+def _apply_batch(
+    batch: Sequence[Layer],
+    render: Render,
+    project: Path,
+    *,
+    jobs: Optional[int],
+) -> None:
+    """Render the independent layers of a batch concurrently, then merge them.
+
+    Args:
+        batch: the layers of the batch.
+        render: render a layer into a directory.
+        project: the project directory.
+        jobs: the maximum number of layers rendered concurrently.
+
+    Raises:
+        LayerConflictError: layers of the batch changed the same files
+            differently.
+    """
+    before = tree_digests(project, jobs=jobs)
+    with tempfile.TemporaryDirectory(prefix="whiteprints-") as directory:
+        stagings = [Path(directory) / layer["name"] for layer in batch]
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            list(
+                executor.map(
+                    partial(_stage, render=render, project=project, jobs=jobs),
+                    batch,
+                    stagings,
+                )
+            )
+
+        footprints = [
+            footprint(before, staging, jobs=jobs) for staging in stagings
+        ]
+        if conflicts := _conflicts(batch, footprints):
+            raise LayerConflictError(conflicts)
+
+        for staging, layer_footprint in zip(stagings, footprints):
+            for path, digest in sorted(layer_footprint.items()):
+                _merge_path(staging / path, project / path, digest)
+
+
+def apply_layer_graph(
+    layers: Sequence[Layer],
+    render: Render,
+    project: Path,
+    *,
+    jobs: Optional[int] = None,
+) -> None:
+    """Apply the layers following their dependency graph.
+
+    Args:
+        layers: the layers, in the order they would be applied one after
+            another.
+        render: render a layer into a directory.
+        project: the project directory.
+        jobs: the maximum number of layers rendered concurrently, None for
+            the default of the standard library thread pool.
+    """
+    for batch in batches(layers):
+        if len(batch) == 1:
+            render(batch[0], project)
+        else:
+            _apply_batch(batch, render, project, jobs=jobs)
@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""The template layers applied to a project."""
+
+import sys
+from typing import Final, TypedDict
+
+
+if sys.version_info >= (3, 11):
+    from typing import NotRequired, Required
+else:
+    from typing_extensions import NotRequired, Required
+
+
+__all__: Final = ["Layer"]
+"""Public module attributes."""
+
+
+class Layer(TypedDict):
+    """A template applied to the project."""
+
+    name: Required[str]
+    template: Required[str]
+    requires: Required[tuple[str, ...]]
+    skip_tasks: NotRequired[bool]
+    ref: NotRequired[str]
@@ -2,26 +2,181 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-"""Localization."""
+"""Localization.
+
+The translation is only loaded the first time a message is translated. Help
+strings given to click decorators are marked with `N_`, and translated when
+the help is rendered (see whiteprints.cli.localized), so that an invocation
+that does not print help never loads a catalog.
+
+Catalogs are compiled at build time into a marshal dump of the messages (see
+hatch_build.py), which is faster to load than the Gettext `.mo` file. The
+`.mo` file is used when the dump is missing or cannot be read.
+"""
 
 import gettext
+import marshal
 import pathlib
+import sys
+from functools import cache
 from typing import Final
 
 
-__all__: Final = ["LOCALE_DIRECTORY", "TRANSLATION", "_"]
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+__all__: Final = [
+    "COMPILED_CATALOG_SUFFIX",
+    "DOMAIN",
+    "LOCALE_DIRECTORY",
+    "N_",
+    "TRANSLATION",
+    "CompiledTranslations",
+    "_",
+    "catalog_files",
+    "translation",
+]
 """Public module attributes."""
 
 
+DOMAIN: Final = "messages"
+"""The Gettext domain of the translations."""
+
 LOCALE_DIRECTORY: Final = pathlib.Path(__file__).parent / "locale"
 """Path to the directory containing the locales."""
 
-TRANSLATION: Final = gettext.translation(
-    "messages",
-    LOCALE_DIRECTORY,
-    fallback=True,
-)
-"""A Gettext translation."""
+COMPILED_CATALOG_SUFFIX: Final = ".marshal"
+"""The suffix of the catalogs compiled at build time."""
+
+
+class CompiledTranslations(gettext.NullTranslations):
+    """A translation backed by a catalog compiled at build time."""
+
+    def __init__(self, catalog: dict[str, str]) -> None:
+        """Initialize the translation.
+
+        Args:
+            catalog: a mapping from the messages to their translation.
+        """
+        super().__init__()
+        self.catalog = catalog
+
+    @override
+    def gettext(self, message: str) -> str:
+        """Translate a message.
+
+        Args:
+            message: the message to translate.
+
+        Returns:
+            The translated message.
+        """
+        if (translated := self.catalog.get(message)) is not None:
+            return translated
+
+        return super().gettext(message)
+
+
+def catalog_files() -> list[pathlib.Path]:
+    """The compiled catalogs matching the active locale.
+
+    Returns:
+        The paths of the catalogs, by order of precedence.
+    """
+    return list(
+        map(pathlib.Path, gettext.find(DOMAIN, LOCALE_DIRECTORY, all=True))
+    )
+
+
+def _load_catalog(catalog_file: pathlib.Path) -> gettext.NullTranslations:
+    """Load a catalog, preferring its build time compiled form.
+
+    Args:
+        catalog_file: the path to the Gettext `.mo` file.
+
+    Returns:
+        The translation of the catalog.
+    """
+    try:
+        return CompiledTranslations(
+            marshal.loads(  # nosec
+                catalog_file.with_suffix(COMPILED_CATALOG_SUFFIX).read_bytes()
+            )
+        )
+    except (OSError, EOFError, ValueError, TypeError):
+        with catalog_file.open("rb") as catalog:
+            return gettext.GNUTranslations(catalog)
+
+
+@cache
+def translation() -> gettext.NullTranslations:
+    """The Gettext translation of the active locale.
+
+    Returns:
+        The translation, with the catalogs of the less specific locales as
+        fallbacks.
+    """
+    translations = list(map(_load_catalog, catalog_files()))
+    if not translations:
+        return gettext.NullTranslations()
+
+    primary, *fallbacks = translations
+    for fallback in fallbacks:
+        primary.add_fallback(fallback)
+
+    return primary
+
+
+def _(message: str) -> str:
+    """Translate a message.
+
+    Args:
+        message: the message to translate.
+
+    Returns:
+        The translated message.
+    """
+    return translation().gettext(message)
+
+
+def N_(message: str) -> str:  # noqa: N802
+    """Mark a message for translation, without translating it.
+
+    The message is extracted in the catalog and translated later, with `_`.
+
+    Args:
+        message: the message to translate later.
+
+    Example:
+        >>> N_("init")
+        'init'
+
+    Returns:
+        The message, untranslated.
+    """
+    return message
+
+
+TRANSLATION: gettext.NullTranslations
+"""A Gettext translation, loaded on first access."""
+
+
+def __getattr__(name: str) -> gettext.NullTranslations:
+    """Lazily load the Gettext translation.
+
+    Args:
+        name: the name of the module attribute.
+
+    Raises:
+        AttributeError: the module has no such attribute.
+
+    Returns:
+        The translation, for the `TRANSLATION` attribute.
+    """
+    if name == "TRANSLATION":
+        return translation()
 
-_: Final = TRANSLATION.gettext
-"""Convenient access to Gettext's translation."""
+    raise AttributeError(name)
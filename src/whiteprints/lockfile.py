@@ -0,0 +1,254 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Lock the templates of the layers.
+
+Without a lockfile, each layer renders the version of its template copier
+picks, resolved as the layer renders: its latest PEP 440 tag, prereleases
+excluded, or its head if it has none. A lockfile (`whiteprints.lock`) instead
+records the commit of that version of each template, and the
+whiteprints-template-context version the templates are rendered with:
+
+- the commits of the templates are resolved at once, concurrently, with one
+  `git ls-remote` each: the lockfile pins what an unlocked init renders.
+- a locked init renders each template at its commit, and skips resolving
+  it: the mirrors are not refreshed unless they miss the commit, the render
+  cache is keyed by the commit.
+
+The lockfile is a JSON document, sorted to be reviewed and versioned.
+"""
+
+import importlib
+import json
+import subprocess  # nosec
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Optional, TypedDict
+
+from whiteprints.template_source import source_url
+
+
+if TYPE_CHECKING:
+    from packaging.version import Version
+
+
+__all__: Final = [
+    "LOCK_FILE",
+    "LOCK_VERSION",
+    "Lock",
+    "LockError",
+    "lock",
+    "read",
+    "resolve",
+    "write",
+]
+"""Public module attributes."""
+
+
+LOCK_FILE: Final = "whiteprints.lock"
+"""The default lockfile."""
+
+LOCK_VERSION: Final = 1
+"""The version of the lockfile format."""
+
+HEAD: Final = "HEAD"
+"""The reference of the templates rendered when they have no version tag."""
+
+TAGS: Final = "refs/tags/"
+"""The prefix of the tag references."""
+
+PEELED: Final = "^{}"
+"""The suffix of the commit an annotated tag references."""
+
+
+class Lock(TypedDict):
+    """The templates locked."""
+
+    version: int
+    template_context: str
+    templates: dict[str, str]
+
+
+class LockError(Exception):
+    """The templates cannot be locked, or the lockfile cannot be used."""
+
+    def __init__(self, reason: str) -> None:
+        """Create an exception instance.
+
+        Args:
+            reason: why the templates cannot be locked.
+        """
+        super().__init__(f"Lockfile: {reason}")
+
+
+def _references(output: str) -> dict[str, str]:
+    r"""Parse the references listed by `git ls-remote`.
+
+    Args:
+        output: the output of `git ls-remote`.
+
+    Returns:
+        The commit of each reference, an annotated tag peeled to its commit.
+
+    Example:
+        >>> _references("1\tHEAD\n2\trefs/tags/v1^{}\n3\trefs/tags/v1\n")
+        {'HEAD': '1', 'refs/tags/v1': '2'}
+    """
+    entries = [line.split("\t", 1) for line in output.splitlines()]
+    references = {
+        name: commit for commit, name in entries if not name.endswith(PEELED)
+    }
+    references.update(
+        (name.removesuffix(PEELED), commit)
+        for commit, name in entries
+        if name.endswith(PEELED)
+    )
+    return references
+
+
+def _version(tag: str) -> Optional["Version"]:
+    """The version of a tag, as copier parses it.
+
+    Args:
+        tag: the name of the tag.
+
+    Returns:
+        The version, None if the tag is not a PEP 440 version or is a
+        prerelease.
+
+    Example:
+        >>> _version("v1.0.0"), _version("2.0.0rc1"), _version("latest")
+        (<Version('1.0.0')>, None, None)
+    """
+    version_module = importlib.import_module("packaging.version")
+    try:
+        version = version_module.Version(tag)
+    except version_module.InvalidVersion:
+        return None
+
+    return None if version.is_prerelease else version
+
+
+def _latest(references: dict[str, str]) -> Optional[str]:
+    """The reference copier renders by default.
+
+    Args:
+        references: the commit of each reference of the template.
+
+    Returns:
+        The latest PEP 440 tag, prereleases excluded, or the head if there is
+        none, None if the template has neither.
+    """
+    versions = {
+        reference: version
+        for reference in references
+        if reference.startswith(TAGS)
+        and (version := _version(reference.removeprefix(TAGS)))
+    }
+    if versions:
+        return max(versions, key=versions.__getitem__)
+
+    return HEAD if HEAD in references else None
+
+
+def resolve(template: str) -> str:
+    """Resolve the version of a template copier renders by default.
+
+    Args:
+        template: the copier template (URL, shortcut or path).
+
+    Returns:
+        The commit of the latest version tag of the template repository, of
+        its head if it has none.
+
+    Raises:
+        LockError: the template cannot be resolved.
+    """
+    try:
+        output = subprocess.run(  # nosec
+            ["git", "ls-remote", "--", source_url(template)],
+            capture_output=True,
+            check=True,
+            text=True,
+            stdin=subprocess.DEVNULL,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as error:
+        raise LockError(
+            reason=f"'{template}' cannot be resolved: {error}"
+        ) from error
+
+    references = _references(output)
+    if (reference := _latest(references)) is None:
+        raise LockError(reason=f"'{template}' has no {HEAD}.")
+
+    return references[reference]
+
+
+def lock(templates: Iterable[str], template_context: str) -> Lock:
+    """Lock templates, resolving them concurrently.
+
+    Args:
+        templates: the copier templates.
+        template_context: the whiteprints-template-context version.
+
+    Returns:
+        The lock of the templates.
+    """
+    unique = sorted(set(templates))
+    with ThreadPoolExecutor(max_workers=max(len(unique), 1)) as executor:
+        commits = list(executor.map(resolve, unique))
+
+    return Lock(
+        version=LOCK_VERSION,
+        template_context=template_context,
+        templates=dict(zip(unique, commits)),
+    )
+
+
+def write(path: Path, templates_lock: Lock) -> None:
+    """Write a lockfile.
+
+    Args:
+        path: the lockfile.
+        templates_lock: the lock of the templates.
+    """
+    path.write_text(
+        json.dumps(templates_lock, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+
+
+def read(path: Path, template_context: str) -> Lock:
+    """Read a lockfile.
+
+    Args:
+        path: the lockfile.
+        template_context: the whiteprints-template-context version required.
+
+    Returns:
+        The lock of the templates.
+
+    Raises:
+        LockError: the lockfile is missing, invalid, or was written for
+            another whiteprints-template-context version.
+    """
+    try:
+        templates_lock: Lock = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as error:
+        raise LockError(reason=f"'{path}' cannot be read: {error}") from error
+
+    if templates_lock.get("version") != LOCK_VERSION:
+        raise LockError(reason=f"'{path}' has an unsupported version.")
+
+    if templates_lock["template_context"] != template_context:
+        raise LockError(
+            reason=(
+                f"'{path}' pins whiteprints-template-context "
+                f"{templates_lock['template_context']}, whiteprints requires "
+                f"{template_context}: lock the templates again."
+            )
+        )
+
+    return templates_lock
@@ -0,0 +1,395 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Mirror the template repositories locally.
+
+Copier clones each template from its remote on every run. The remote
+templates are instead kept as bare mirrors, in the user cache directory:
+
+- a mirror is cloned on first use, then refreshed (`git remote update`) only
+  when it is older than a time to live. A failed refresh keeps the stale
+  mirror, the layers then render offline.
+- the mirrors of an init are synchronized concurrently, before any layer.
+- copier is given the original template sources: git rewrites them to their
+  mirrors (`url.<mirror>.insteadOf`), set in the environment of copier. The
+  answers files keep the original sources.
+
+A mirror is cloned in a temporary directory, then published by renaming it,
+so that a partial mirror is never used. Its stamp file records its source,
+the modification time of the stamp file its last refresh. The garbage
+collection leaves the temporary directories of the clones in progress, and
+removes those left by an interrupted clone.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import subprocess  # nosec
+import tempfile
+import time
+from collections.abc import Collection, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+from typing import Final, Optional, TypedDict
+
+from whiteprints.cache_directory import cache_directory
+from whiteprints.template_source import source_url
+
+
+__all__: Final = [
+    "DEFAULT_TTL",
+    "MIRRORS_DIRECTORY",
+    "Mirror",
+    "gc",
+    "git_environment",
+    "is_remote",
+    "local_source",
+    "mirror_path",
+    "mirrors",
+    "sync",
+    "sync_all",
+]
+"""Public module attributes."""
+
+
+MIRRORS_DIRECTORY: Final = "mirrors"
+"""The user cache subdirectory holding the mirrors."""
+
+DEFAULT_TTL: Final = 24 * 60 * 60.0
+"""The default time to live of a mirror, in seconds."""
+
+STAMP_FILE: Final = "whiteprints-source"
+"""The file of a mirror recording its source and its last refresh."""
+
+KEY_LENGTH: Final = 16
+"""The number of hexadecimal digits of a mirror key."""
+
+REMOTE_PREFIXES: Final = ("git@", "git://", "git+")
+"""The prefixes of the remote template sources, besides the URLs."""
+
+CLONE_TIMEOUT: Final = 60 * 60.0
+"""The age, in seconds, after which a temporary clone is abandoned."""
+
+
+class Mirror(TypedDict):
+    """A mirror of a template repository."""
+
+    source: str
+    path: Path
+    refreshed: float
+
+
+def is_remote(template: str) -> bool:
+    """Whether a template is cloned from a remote repository.
+
+    Args:
+        template: the copier template (path, URL or shortcut).
+
+    Returns:
+        True if the template is a remote repository.
+
+    Example:
+        >>> is_remote("gh:whiteprints/template-python.git")
+        True
+        >>> is_remote(".")
+        False
+    """
+    source = source_url(template)
+    return not Path(source).exists() and (
+        "://" in source or source.startswith(REMOTE_PREFIXES)
+    )
+
+
+def mirror_path(template: str) -> Path:
+    """The mirror of a template.
+
+    Args:
+        template: the copier template (URL or shortcut).
+
+    Returns:
+        The directory of the bare mirror, in the user cache directory.
+    """
+    return cache_directory(
+        MIRRORS_DIRECTORY,
+        hashlib.sha256(source_url(template).encode()).hexdigest()[:KEY_LENGTH]
+        + ".git",
+    )
+
+
+def _git(*arguments: str) -> None:
+    """Run a git command.
+
+    Args:
+        arguments: the arguments of git.
+    """
+    subprocess.run(  # nosec
+        ["git", *arguments],
+        capture_output=True,
+        check=True,
+        stdin=subprocess.DEVNULL,
+    )
+
+
+def _is_valid(path: Path) -> bool:
+    """Whether a mirror is published.
+
+    Args:
+        path: the directory of the mirror.
+
+    Returns:
+        True if the mirror has its stamp file.
+    """
+    return (path / STAMP_FILE).is_file()
+
+
+def _clone(source: str, path: Path) -> None:
+    """Clone a mirror, publishing it once complete.
+
+    Args:
+        source: the source of the template.
+        path: the directory of the mirror.
+    """
+    shutil.rmtree(path, ignore_errors=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    build = Path(tempfile.mkdtemp(prefix=f".{path.stem}-", dir=path.parent))
+    try:
+        _git("clone", "--quiet", "--mirror", "--", source, str(build / "git"))
+        (build / "git" / STAMP_FILE).write_text(source, encoding="utf-8")
+        # Another process may have published the mirror meanwhile.
+        with suppress(OSError):
+            (build / "git").rename(path)
+    finally:
+        shutil.rmtree(build, ignore_errors=True)
+
+
+def _refresh(path: Path) -> None:
+    """Refresh a mirror from its source.
+
+    Args:
+        path: the directory of the mirror.
+    """
+    _git("--git-dir", str(path), "remote", "update", "--prune")
+    (path / STAMP_FILE).touch()
+
+
+def _has_commit(path: Path, commit: Optional[str]) -> bool:
+    """Whether a mirror has a commit.
+
+    Args:
+        path: the directory of the mirror.
+        commit: the commit, None for any.
+
+    Returns:
+        True if the commit is in the mirror.
+    """
+    if commit is None:
+        return True
+
+    try:
+        _git("--git-dir", str(path), "cat-file", "-e", f"{commit}^{{commit}}")
+    except subprocess.CalledProcessError:
+        return False
+
+    return True
+
+
+def _is_stale(path: Path, ttl: float, commit: Optional[str]) -> bool:
+    """Whether a mirror must be refreshed.
+
+    Args:
+        path: the directory of the mirror.
+        ttl: the time to live of the mirror, in seconds.
+        commit: a commit the mirror must have, None for none.
+
+    Returns:
+        True if the mirror is older than its time to live, or misses the
+        commit.
+    """
+    return time.time() - (
+        path / STAMP_FILE
+    ).stat().st_mtime >= ttl or not _has_commit(path, commit)
+
+
+def sync(
+    template: str,
+    *,
+    ttl: float = DEFAULT_TTL,
+    commit: Optional[str] = None,
+) -> Optional[Path]:
+    """Synchronize the mirror of a template.
+
+    Args:
+        template: the copier template (URL or shortcut).
+        ttl: the time to live of the mirror, in seconds: an older mirror is
+            refreshed, 0 always refreshes it.
+        commit: a commit the mirror must have, a mirror missing it is
+            refreshed, None for none.
+
+    Returns:
+        The mirror, None if it cannot be cloned.
+    """
+    source = source_url(template)
+    path = mirror_path(source)
+    try:
+        if not _is_valid(path):
+            _clone(source, path)
+        elif _is_stale(path, ttl, commit):
+            _refresh(path)
+    except (OSError, subprocess.CalledProcessError) as error:
+        logging.getLogger(__name__).warning(
+            "The mirror of '%s' cannot be synchronized: %s", source, error
+        )
+
+    return path if _is_valid(path) else None
+
+
+def sync_all(
+    templates: Iterable[str],
+    *,
+    ttl: float = DEFAULT_TTL,
+    commits: Optional[Mapping[str, str]] = None,
+) -> dict[str, Path]:
+    """Synchronize the mirrors of the remote templates, concurrently.
+
+    Args:
+        templates: the copier templates (paths, URLs or shortcuts).
+        ttl: the time to live of the mirrors, in seconds.
+        commits: the commit each mirror must have, by template.
+
+    Returns:
+        The source of each remote template, mapped to its mirror.
+    """
+    sources = sorted(
+        {source_url(template) for template in templates if is_remote(template)}
+    )
+    source_commits = {
+        source_url(template): commit
+        for template, commit in (commits or {}).items()
+    }
+    with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+        futures = [
+            executor.submit(
+                sync, source, ttl=ttl, commit=source_commits.get(source)
+            )
+            for source in sources
+        ]
+        paths = [future.result() for future in futures]
+
+    return {
+        source: path
+        for source, path in zip(sources, paths)
+        if path is not None
+    }
+
+
+def local_source(template: str) -> str:
+    """The local source of a template, its mirror if any.
+
+    Args:
+        template: the copier template (path, URL or shortcut).
+
+    Returns:
+        The URL of the mirror of the template, the template otherwise.
+    """
+    if not is_remote(template) or not _is_valid(path := mirror_path(template)):
+        return template
+
+    return path.as_uri()
+
+
+def git_environment(sources: Mapping[str, Path]) -> dict[str, str]:
+    """The environment variables rewriting the sources to their mirrors.
+
+    The rewrites are appended to the configuration already given by the
+    environment (`GIT_CONFIG_COUNT`).
+
+    Args:
+        sources: the source of each template, mapped to its mirror.
+
+    Returns:
+        The git configuration environment variables, none without mirrors.
+    """
+    if not sources:
+        return {}
+
+    count = int(os.environ.get("GIT_CONFIG_COUNT", "0"))
+    environment = {"GIT_CONFIG_COUNT": str(count + len(sources))}
+    for index, (source, path) in enumerate(sources.items(), start=count):
+        environment[f"GIT_CONFIG_KEY_{index}"] = (
+            f"url.{path.as_uri()}.insteadOf"
+        )
+        environment[f"GIT_CONFIG_VALUE_{index}"] = source
+
+    return environment
+
+
+def mirrors() -> list[Mirror]:
+    """The mirrors of the user cache directory.
+
+    Returns:
+        The published mirrors, sorted by source.
+    """
+    directory = cache_directory(MIRRORS_DIRECTORY)
+    if not directory.is_dir():
+        return []
+
+    return sorted(
+        (
+            Mirror(
+                source=(path / STAMP_FILE).read_text(encoding="utf-8"),
+                path=path,
+                refreshed=(path / STAMP_FILE).stat().st_mtime,
+            )
+            for path in directory.iterdir()
+            if _is_valid(path)
+        ),
+        key=lambda mirror: mirror["source"],
+    )
+
+
+def _is_cloning(path: Path) -> bool:
+    """Whether an entry of the mirrors directory is a clone in progress.
+
+    Args:
+        path: the entry.
+
+    Returns:
+        True if the entry is a temporary clone younger than the clone
+        timeout, or was removed meanwhile.
+    """
+    try:
+        return path.name.startswith(".") and (
+            time.time() - path.stat().st_mtime < CLONE_TIMEOUT
+        )
+    except FileNotFoundError:
+        return True
+
+
+def gc(keep: Collection[str] = ()) -> list[Path]:
+    """Remove the mirrors no longer used, and the partial ones.
+
+    The clones in progress, in another process, are left.
+
+    Args:
+        keep: the templates whose mirrors are kept.
+
+    Returns:
+        The directories removed.
+    """
+    directory = cache_directory(MIRRORS_DIRECTORY)
+    if not directory.is_dir():
+        return []
+
+    kept = {mirror_path(template) for template in keep}
+    removed = sorted(
+        path
+        for path in directory.iterdir()
+        if path not in kept and not _is_cloning(path)
+    )
+    for path in removed:
+        shutil.rmtree(path, ignore_errors=True)
+
+    return removed
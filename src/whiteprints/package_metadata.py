@@ -2,10 +2,23 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-"""Discover the package's version number."""
+"""Discover the package's version number.
 
-from importlib import metadata
-from typing import Final
+Built wheels ship a generated `_build_info` module holding the metadata known
+at build time (see hatch_build.py). Editable and development installs fall
+back to importlib metadata.
+"""
+
+import importlib
+from functools import cache
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Final, Optional, TypedDict
+
+
+if TYPE_CHECKING:
+    from email.message import Message
+    from importlib import metadata
 
 
 __all__: Final = [
@@ -17,11 +30,26 @@
 """Public module attributes."""
 
 
+BUILD_INFO: Final = "whiteprints._build_info"
+"""The module holding the metadata generated at build time."""
+
+INSTALLATION_DIRECTORY: Final = Path(__file__).parent.parent
+"""The directory in which the package is installed."""
+
+
+class _PackageInfo(TypedDict):
+    """The package metadata needed at runtime."""
+
+    version: str
+    license: str
+    license_files: list[Path]
+
+
 def _find_license_files(
     *,
-    license_paths: list[metadata.PackagePath],
+    license_paths: list["metadata.PackagePath"],
     license_files: list[str],
-) -> list[metadata.PackagePath]:
+) -> list["metadata.PackagePath"]:
     """Find the licenses in the wheel defined in the package metadata.
 
     Args:
@@ -39,17 +67,104 @@ def _find_license_files(
     ]
 
 
-__version__: Final = metadata.version(__package__ or "")
-"""The package version number as found by importlib metadata."""
+@cache
+def _metadata() -> "Message":
+    """The package metadata as found by importlib metadata.
+
+    Returns:
+        The package metadata.
+    """
+    return importlib.import_module("importlib.metadata").metadata(
+        __package__ or ""
+    )
+
+
+def _from_build_info(build_info: ModuleType) -> _PackageInfo:
+    """Read the package metadata generated at build time.
 
-__metadata__: Final = metadata.metadata(__package__ or "")
-"""The package metadata."""
+    Args:
+        build_info: the generated build information module.
 
-__license__: Final = __metadata__["License-Expression"]
-"""The package code license as found by importlib metadata."""
+    Returns:
+        The package metadata.
+    """
+    return _PackageInfo(
+        version=build_info.VERSION,
+        license=build_info.LICENSE_EXPRESSION,
+        license_files=[
+            INSTALLATION_DIRECTORY / license_file
+            for license_file in build_info.LICENSE_FILES
+        ],
+    )
+
+
+def _from_importlib_metadata() -> _PackageInfo:
+    """Read the package metadata with importlib metadata.
+
+    Returns:
+        The package metadata.
+    """
+    metadata = importlib.import_module("importlib.metadata")
+    return _PackageInfo(
+        version=metadata.version(__package__ or ""),
+        license=_metadata()["License-Expression"],
+        license_files=[
+            Path(str(license_path.locate()))
+            for license_path in _find_license_files(
+                license_paths=metadata.files(__package__ or "") or [],
+                license_files=_metadata().get_all("License-File") or [],
+            )
+        ],
+    )
 
-__license_file__: Final = _find_license_files(
-    license_paths=metadata.files(__package__ or "") or [],
-    license_files=__metadata__.get_all("License-File") or [],
-)
+
+def _read_package_info() -> _PackageInfo:
+    """Read the package metadata.
+
+    Returns:
+        The package metadata.
+    """
+    build_info: Optional[ModuleType]
+    try:
+        build_info = importlib.import_module(BUILD_INFO)
+    except ModuleNotFoundError:
+        build_info = None
+
+    if build_info is None:
+        return _from_importlib_metadata()
+
+    return _from_build_info(build_info)
+
+
+_PACKAGE_INFO: Final = _read_package_info()
+"""The package metadata needed at runtime."""
+
+__version__: Final = _PACKAGE_INFO["version"]
+"""The package version number."""
+
+__license__: Final = _PACKAGE_INFO["license"]
+"""The package code license."""
+
+__license_file__: Final = _PACKAGE_INFO["license_files"]
 """A list containing the path to the license(s) of the package code."""
+
+__metadata__: "Message"
+"""The package metadata, lazily read with importlib metadata."""
+
+
+def __getattr__(name: str) -> "Message":
+    """Lazily read the full package metadata.
+
+    Args:
+        name: the name of the module attribute.
+
+    Raises:
+        AttributeError: the module has no such attribute.
+
+    Returns:
+        The package metadata, for the `__metadata__` attribute.
+    """
+    if name == "__metadata__":
+        return _metadata()
+
+    raise AttributeError(name)
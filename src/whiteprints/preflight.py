@@ -0,0 +1,386 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Check the environment before applying any layer.
+
+A missing tool, an unwritable target, a full disk or an unreachable template
+would otherwise only fail the layer needing it, maybe minutes into the init.
+The checks run concurrently, each command under a short timeout, and write
+nothing but their state file.
+
+The versions of the tools do not change until the tools do: they are cached
+in a state file of the user cache directory, keyed by the PATH, the path of
+the tool and its modification time.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess  # nosec
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
+from pathlib import Path
+from typing import Final, Optional, TypedDict
+
+from whiteprints.cache_directory import cache_directory
+from whiteprints.template_source import source_url
+from whiteprints.uvx_run import UVX
+
+
+__all__: Final = [
+    "CHECK_TIMEOUT",
+    "MINIMUM_FREE_SPACE",
+    "STATE_FILE",
+    "Check",
+    "CheckError",
+    "CheckResult",
+    "PreflightError",
+    "preflight",
+    "run_checks",
+]
+"""Public module attributes."""
+
+
+CHECK_TIMEOUT: Final = 10.0
+"""The timeout of each command run by a check, in seconds."""
+
+MINIMUM_FREE_SPACE: Final = 100 * (1 << 20)
+"""The free space a project needs on its filesystems, in bytes."""
+
+STATE_FILE: Final = "preflight.json"
+"""The user cache file holding the versions of the tools."""
+
+
+Check = Callable[[], str]
+"""A check, returning what it found, raising CheckError if it failed."""
+
+
+class CheckResult(TypedDict):
+    """The result of a check."""
+
+    name: str
+    passed: bool
+    detail: str
+
+
+class CheckError(ValueError):
+    """A check failed."""
+
+    def __init__(self, reason: str) -> None:
+        """Initialize the exception.
+
+        Args:
+            reason: why the check failed.
+        """
+        super().__init__(reason)
+
+
+class PreflightError(ValueError):
+    """Checks failed before applying any layer."""
+
+    def __init__(self, failures: Iterable[CheckResult]) -> None:
+        """Initialize the exception.
+
+        Args:
+            failures: the results of the failed checks.
+        """
+        super().__init__(
+            "Pre-flight checks failed: "
+            + "; ".join(
+                f"{result['name']} ({result['detail']})" for result in failures
+            )
+        )
+
+
+def _state_key(program: Path) -> str:
+    """Identify a version of a tool.
+
+    Args:
+        program: the path of the tool.
+
+    Returns:
+        A digest of the PATH, of the path of the tool and of its
+        modification time.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            [
+                os.environ.get("PATH", ""),
+                str(program),
+                program.stat().st_mtime_ns,
+            ]
+        ).encode()
+    ).hexdigest()
+
+
+def _load_state() -> dict[str, str]:
+    """Load the cached versions of the tools.
+
+    Returns:
+        The versions of the tools, by state key.
+    """
+    try:
+        state: dict[str, str] = json.loads(
+            cache_directory(STATE_FILE).read_text(encoding="utf-8")
+        )
+    except (OSError, ValueError):
+        return {}
+
+    return state
+
+
+def _save_state(state: dict[str, str]) -> None:
+    """Save the cached versions of the tools.
+
+    Args:
+        state: the versions of the tools, by state key.
+    """
+    path = cache_directory(STATE_FILE)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    with suppress(OSError):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary.write_text(json.dumps(state), encoding="utf-8")
+        temporary.replace(path)
+
+
+def _run(command: list[str], timeout: float) -> str:
+    """Run a check command.
+
+    Args:
+        command: the command.
+        timeout: the timeout of the command, in seconds.
+
+    Returns:
+        The first line of the output of the command.
+    """
+    return subprocess.run(  # nosec
+        command,
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=timeout,
+        stdin=subprocess.DEVNULL,
+    ).stdout.partition("\n")[0]
+
+
+def _tool_version(
+    program: Optional[Path],
+    *,
+    state: dict[str, str],
+    timeout: float,
+) -> str:
+    """Check that a tool runs, reporting its version.
+
+    Args:
+        program: the path of the tool, None if it is not installed.
+        state: the cached versions of the tools, updated.
+        timeout: the timeout of the command, in seconds.
+
+    Returns:
+        The version of the tool.
+
+    Raises:
+        CheckError: the tool is not installed.
+    """
+    if program is None:
+        raise CheckError(reason="not installed")
+
+    key = _state_key(program)
+    if key not in state:
+        state[key] = _run([str(program), "--version"], timeout)
+
+    return state[key]
+
+
+def _uv_version(*, state: dict[str, str], timeout: float) -> str:
+    """Check that uv runs, reporting its version.
+
+    Args:
+        state: the cached versions of the tools, updated.
+        timeout: the timeout of the command, in seconds.
+
+    Returns:
+        The version of uv.
+    """
+    return _tool_version(UVX().bin, state=state, timeout=timeout)
+
+
+def _which(name: str) -> Optional[Path]:
+    """Locate a program on the PATH.
+
+    Args:
+        name: the name of the program.
+
+    Returns:
+        The path of the program, None if it is not installed.
+    """
+    program = shutil.which(name)
+    return None if program is None else Path(program)
+
+
+def _existing(path: Path) -> Path:
+    """The path, or its nearest existing parent.
+
+    Args:
+        path: a path, existing or not.
+
+    Returns:
+        The nearest existing path.
+    """
+    while not path.exists():
+        path = path.parent
+
+    return path
+
+
+def _writable(directory: Path) -> str:
+    """Check that a directory can be created or written to.
+
+    Args:
+        directory: the directory.
+
+    Returns:
+        The nearest existing parent of the directory.
+
+    Raises:
+        CheckError: the directory cannot be written to.
+    """
+    existing = _existing(directory)
+    if not existing.is_dir() or not os.access(existing, os.W_OK | os.X_OK):
+        raise CheckError(reason=f"'{existing}' is not a writable directory")
+
+    return str(existing)
+
+
+def _free_space(directory: Path, minimum: int) -> str:
+    """Check the free space of the filesystem of a directory.
+
+    Args:
+        directory: the directory.
+        minimum: the free space needed, in bytes.
+
+    Returns:
+        The free space.
+
+    Raises:
+        CheckError: the filesystem is too full.
+    """
+    free = shutil.disk_usage(_existing(directory)).free
+    if free < minimum:
+        raise CheckError(
+            reason=f"{free >> 20} MiB free, {minimum >> 20} MiB needed"
+        )
+
+    return f"{free >> 20} MiB free"
+
+
+def _reachable(template: str, timeout: float) -> str:
+    """Check that a template source is reachable.
+
+    Args:
+        template: the copier template (path, URL or shortcut).
+        timeout: the timeout of the command, in seconds.
+
+    Returns:
+        The source of the template.
+
+    Raises:
+        CheckError: the template is a missing local directory.
+    """
+    source = source_url(template)
+    if Path(source).is_dir():
+        return source
+
+    if "://" not in source and not source.startswith("git@"):
+        raise CheckError(reason=f"'{source}' does not exist")
+
+    _run(["git", "ls-remote", "--exit-code", source, "HEAD"], timeout)
+    return source
+
+
+def _outcome(check: Check) -> tuple[bool, str]:
+    """Run a check.
+
+    Args:
+        check: the check.
+
+    Returns:
+        Whether the check passed, and what it found or why it failed.
+    """
+    try:
+        return True, check()
+    except subprocess.TimeoutExpired as error:
+        return False, f"timed out after {error.timeout:g} seconds"
+    except subprocess.CalledProcessError as error:
+        return False, (error.stderr or "").strip() or str(error)
+    except (OSError, ValueError) as error:
+        return False, str(error)
+
+
+def run_checks(checks: dict[str, Check]) -> list[CheckResult]:
+    """Run checks concurrently.
+
+    Args:
+        checks: the checks, by name.
+
+    Returns:
+        The results of the checks, in order.
+    """
+    with ThreadPoolExecutor(max_workers=max(len(checks), 1)) as executor:
+        outcomes = list(executor.map(_outcome, checks.values()))
+
+    return [
+        CheckResult(name=name, passed=passed, detail=detail)
+        for name, (passed, detail) in zip(checks, outcomes)
+    ]
+
+
+def preflight(
+    project: Path,
+    templates: dict[str, str],
+    *,
+    staging: Optional[Path] = None,
+    timeout: float = CHECK_TIMEOUT,
+) -> list[CheckResult]:
+    """Check the environment of an init.
+
+    Args:
+        project: the project directory.
+        templates: the copier template of each layer, by layer name.
+        staging: the staging directory, None when rendering in place.
+        timeout: the timeout of each command, in seconds.
+
+    Returns:
+        The results of the checks.
+    """
+    state = _load_state()
+    directories = {"project": project, "staging": staging}
+    checks: dict[str, Check] = {
+        "git": partial(
+            _tool_version, _which("git"), state=state, timeout=timeout
+        ),
+        "uv": partial(_uv_version, state=state, timeout=timeout),
+        **{
+            f"{name} directory": partial(_writable, directory)
+            for name, directory in directories.items()
+            if directory is not None
+        },
+        **{
+            f"{name} disk space": partial(
+                _free_space, directory, MINIMUM_FREE_SPACE
+            )
+            for name, directory in directories.items()
+            if directory is not None
+        },
+        **{
+            f"{name} template": partial(_reachable, template, timeout)
+            for name, template in templates.items()
+        },
+    }
+    results = run_checks(checks)
+    _save_state(state)
+    return results
@@ -0,0 +1,305 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Share the render cache between machines.
+
+The render cache (see whiteprints.render_cache) is local to a machine, the
+cold runners of a CI start empty. A remote tier is instead shared by the
+machines, behind the local cache: a miss of the local cache is looked up in
+the remote tier, then kept locally (read-through), a rendered tree is stored
+in both. The remote tier is:
+
+- a shared directory (a path or a `file://` URL, e.g. on NFS).
+- an HTTP endpoint (an `http://` or `https://` URL), serving `GET`, `HEAD`
+  and `PUT` on the keys below it. A reference server ships with whiteprints
+  (see whiteprints.cache_server).
+
+The files are content addressed: a file fetched is checked against its
+digest, a corrupted file is a miss. Files are written atomically (written to
+a temporary file, then renamed), the concurrent writers of a file write the
+same content, the last one wins. The files of a tree are stored before its
+manifest, a manifest never refers to missing files. A remote tier which
+cannot be reached is a miss, the layers are then rendered.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Final, Optional, Union
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+
+__all__: Final = [
+    "KEY_PATTERN",
+    "TIMEOUT",
+    "Backend",
+    "DirectoryBackend",
+    "HTTPBackend",
+    "backend",
+    "fetch",
+    "is_valid",
+    "push",
+]
+"""Public module attributes."""
+
+
+TIMEOUT: Final = 30.0
+"""The timeout of a request to an HTTP remote tier, in seconds."""
+
+KEY_PATTERN: Final = re.compile(
+    r"(?P<kind>objects|trees)/(?P<digest>[0-9a-f]{64})(\.x|\.json)?"
+)
+"""The keys of the remote tier: the files and the manifests of the trees."""
+
+HTTP_SCHEMES: Final = ("http", "https")
+"""The URL schemes of the HTTP remote tiers."""
+
+
+class DirectoryBackend:
+    """A remote tier in a shared directory."""
+
+    def __init__(self, root: Path) -> None:
+        """Initialize the remote tier.
+
+        Args:
+            root: the shared directory.
+        """
+        self.root = root
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read a file.
+
+        Args:
+            key: the key of the file.
+
+        Returns:
+            The content of the file, None if it is missing.
+        """
+        try:
+            return (self.root / key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def exists(self, key: str) -> bool:
+        """Whether a file is stored.
+
+        Args:
+            key: the key of the file.
+
+        Returns:
+            True if the file is stored.
+        """
+        return (self.root / key).is_file()
+
+    def put(self, key: str, data: bytes) -> None:
+        """Write a file, atomically.
+
+        Args:
+            key: the key of the file.
+            data: the content of the file.
+        """
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}-", delete=False
+        ) as temporary:
+            temporary.write(data)
+            temporary.flush()
+            os.fsync(temporary.fileno())
+
+        Path(temporary.name).replace(path)
+
+
+class HTTPBackend:
+    """A remote tier behind an HTTP endpoint."""
+
+    def __init__(self, url: str, timeout: float = TIMEOUT) -> None:
+        """Initialize the remote tier.
+
+        Args:
+            url: the URL of the endpoint, the keys are below it.
+            timeout: the timeout of a request, in seconds.
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(
+        self, method: str, key: str, data: Optional[bytes] = None
+    ) -> Optional[bytes]:
+        """Send a request.
+
+        Args:
+            method: the HTTP method.
+            key: the key of the file.
+            data: the body of the request.
+
+        Returns:
+            The body of the response, None if the file is missing.
+
+        Raises:
+            HTTPError: The request failed.
+        """
+        request = urllib.request.Request(
+            f"{self.url}/{key}", data=data, method=method
+        )
+        try:
+            with urllib.request.urlopen(  # nosec
+                request, timeout=self.timeout
+            ) as response:
+                return response.read()
+        except urllib.error.HTTPError as error:
+            if error.code == 404:  # noqa: PLR2004
+                return None
+
+            raise
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Download a file.
+
+        Args:
+            key: the key of the file.
+
+        Returns:
+            The content of the file, None if it is missing.
+        """
+        return self._request("GET", key)
+
+    def exists(self, key: str) -> bool:
+        """Whether a file is stored.
+
+        Args:
+            key: the key of the file.
+
+        Returns:
+            True if the file is stored.
+        """
+        return self._request("HEAD", key) is not None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Upload a file.
+
+        Args:
+            key: the key of the file.
+            data: the content of the file.
+        """
+        self._request("PUT", key, data)
+
+
+Backend = Union[DirectoryBackend, HTTPBackend]
+"""A remote tier."""
+
+
+def backend(url: str) -> Backend:
+    """The remote tier of a URL.
+
+    Args:
+        url: an HTTP URL, a `file://` URL or a path.
+
+    Returns:
+        The remote tier.
+
+    Example:
+        >>> backend("http://localhost:8000/cache").url
+        'http://localhost:8000/cache'
+        >>> backend("file:///srv/cache").root.as_posix()
+        '/srv/cache'
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in HTTP_SCHEMES:
+        return HTTPBackend(url)
+
+    if parsed.scheme == "file":
+        return DirectoryBackend(Path(url2pathname(parsed.path)))
+
+    return DirectoryBackend(Path(url))
+
+
+def is_valid(key: str, data: bytes) -> bool:
+    """Whether a file matches its key.
+
+    Args:
+        key: the key of the file.
+        data: the content of the file.
+
+    Returns:
+        True if the key is a key of the remote tier, and the content of a
+        file matches its digest.
+
+    Example:
+        >>> digest = hashlib.sha256(b"data").hexdigest()
+        >>> is_valid(f"objects/{digest}", b"data")
+        True
+        >>> is_valid(f"objects/{digest}.x", b"corrupted")
+        False
+        >>> is_valid("../outside", b"data")
+        False
+    """
+    match = KEY_PATTERN.fullmatch(key)
+    if match is None:
+        return False
+
+    return (
+        match["kind"] != "objects"
+        or hashlib.sha256(data).hexdigest() == match["digest"]
+    )
+
+
+def fetch(remote: Backend, key: str) -> Optional[bytes]:
+    """Fetch a file from the remote tier, checking its integrity.
+
+    Args:
+        remote: the remote tier.
+        key: the key of the file.
+
+    Returns:
+        The content of the file, None if it is missing, corrupted, or the
+        remote tier cannot be reached.
+    """
+    try:
+        data = remote.get(key)
+    except OSError as error:
+        logging.getLogger(__name__).warning(
+            "The remote cache cannot be read: %s", error
+        )
+        return None
+
+    if data is not None and not is_valid(key, data):
+        logging.getLogger(__name__).warning(
+            "The remote cache file '%s' is corrupted.", key
+        )
+        return None
+
+    return data
+
+
+def push(remote: Backend, key: str, data: bytes) -> bool:
+    """Store a file in the remote tier, unless it is stored already.
+
+    Only the files are skipped when stored, a manifest is always replaced.
+
+    Args:
+        remote: the remote tier.
+        key: the key of the file.
+        data: the content of the file.
+
+    Returns:
+        True if the file is stored, False if the remote tier cannot be
+        reached.
+    """
+    try:
+        if not (key.startswith("objects/") and remote.exists(key)):
+            remote.put(key, data)
+    except OSError as error:
+        logging.getLogger(__name__).warning(
+            "The remote cache cannot be written: %s", error
+        )
+        return False
+
+    return True
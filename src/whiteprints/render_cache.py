@@ -0,0 +1,908 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Cache the rendered layers, content addressed.
+
+Projects created with the same flags and answers render the same trees. The
+tree rendered by each step of an init (see whiteprints.checkpoint) is instead
+cached in the user cache directory, keyed by:
+
+- the tree the step renders into, by its digest: a step whose input changed
+  misses, so do the following steps.
+- the template of each layer and its resolved version: the references of
+  the template repository (or of its mirror, see whiteprints.mirrors), the
+  digest of a local template directory.
+- the copier arguments (the answers), the content of the answers files
+  given with `--data-file`, and the template context packages.
+
+The files of the cached trees are stored once, by digest. On a hit, the
+cached tree is materialised into the project instead of rendering the step:
+
+- `reflink`: the files are cloned (copy-on-write), where the filesystem
+  supports it, copied otherwise.
+- `copy`: the files are copied in the kernel (`copy_file_range`).
+- `hardlink`: the files are hard linked to the cache, copied across
+  filesystems. Editing such a file in place also edits the cache: the linked
+  files are copied before copier renders into the tree again, and once the
+  last step is rendered, the project is never linked to the cache.
+
+Copier must not prompt: the answers must all be given on the command line,
+the cache is only used with `--defaults`. A cached step does not run the
+tasks of its layers: only the steps whose layers skip their tasks (deferred
+until the last step, see whiteprints.deferred_tasks) are cached. The answers
+copier derives from the environment (the git user, the date...) are not part
+of the key: a hit has those of the run which rendered it. The cache is
+bounded in size, the least recently used trees are evicted first. A remote
+tier may be shared by machines, behind the local cache (see
+whiteprints.remote_cache).
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess  # nosec
+import sys
+import tempfile
+import threading
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Final, Literal, Optional, TypedDict
+
+from whiteprints.cache_directory import cache_directory
+from whiteprints.file_tree import DIRECTORY, tree_digests
+
+
+if TYPE_CHECKING:
+    from whiteprints.remote_cache import Backend
+
+
+__all__: Final = [
+    "MAXIMUM_SIZE",
+    "RENDERS_DIRECTORY",
+    "Entry",
+    "Materialization",
+    "RenderCacheMode",
+    "UnsafeTreeError",
+    "evict",
+    "lookup",
+    "materialize",
+    "step_key",
+    "store",
+    "template_version",
+    "unshare",
+]
+"""Public module attributes."""
+
+
+RENDERS_DIRECTORY: Final = "renders"
+"""The user cache subdirectory holding the rendered trees."""
+
+OBJECTS_DIRECTORY: Final = "objects"
+"""The subdirectory holding the files, by digest."""
+
+TREES_DIRECTORY: Final = "trees"
+"""The subdirectory holding the manifests of the trees, by key."""
+
+MAXIMUM_SIZE: Final = 1 << 30
+"""The maximum size of the files of the cache, in bytes."""
+
+EXECUTABLE: Final = ".x"
+"""The suffix of the executable files of the cache."""
+
+FICLONE: Final = 0x40049409
+"""The Linux ioctl cloning a file."""
+
+FILE_PREFIX: Final = "file:"
+"""The prefix of the digest of a file (see whiteprints.file_tree)."""
+
+SYMLINK_PREFIX: Final = "symlink:"
+"""The prefix of the digest of a symbolic link (see whiteprints.file_tree)."""
+
+OBJECT_PATTERN: Final = re.compile(r"[0-9a-f]{64}(\.x)?")
+"""The names of the objects of the cache."""
+
+KINDS: Final = frozenset({"file", "directory", "symlink"})
+"""The kinds of the paths of a cached tree."""
+
+DEFAULTS_FLAG: Final = "--defaults"
+"""The copier flag using the default answers, copier never prompts."""
+
+DATA_FILE_FLAG: Final = "--data-file"
+"""The copier flag reading answers from a file."""
+
+
+Materialization = Literal["reflink", "copy", "hardlink"]
+"""The ways to materialise a cached file."""
+
+RenderCacheMode = Literal["off", "reflink", "copy", "hardlink"]
+"""Whether the render cache is used, and how its files are materialised."""
+
+
+class Entry(TypedDict):
+    """A path of a cached tree."""
+
+    kind: Literal["file", "directory", "symlink"]
+    target: str
+
+
+class UnsafeTreeError(ValueError):
+    """A cached tree writes outside of the directory it is materialised in."""
+
+    def __init__(self, directory: Path) -> None:
+        """Create an exception instance.
+
+        Args:
+            directory: the directory the tree is materialised in.
+        """
+        super().__init__(
+            f"The cached tree writes outside of the directory '{directory}'."
+        )
+
+
+def _root(*names: str) -> Path:
+    """The render cache directory.
+
+    Args:
+        names: the names of the subdirectories.
+
+    Returns:
+        The (sub)directory of the render cache.
+    """
+    return cache_directory(RENDERS_DIRECTORY, *names)
+
+
+def _digest(value: object) -> str:
+    """Digest a JSON value.
+
+    Args:
+        value: the value.
+
+    Returns:
+        The SHA-256 digest of the JSON document of the value.
+    """
+    return hashlib.sha256(json.dumps(value).encode()).hexdigest()
+
+
+def template_version(template: str) -> Optional[str]:
+    """The resolved version of a template.
+
+    Args:
+        template: the local source of the template (see
+            whiteprints.mirrors.local_source).
+
+    Returns:
+        The digest of the references of the template repository, of the
+        content of a local template directory, None if it is unknown.
+    """
+    if Path(template).is_dir():
+        return _digest(tree_digests(Path(template)))
+
+    try:
+        return _digest(
+            subprocess.run(  # nosec
+                ["git", "ls-remote", "--", template],
+                capture_output=True,
+                check=True,
+                text=True,
+                stdin=subprocess.DEVNULL,
+            ).stdout
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _data_files(copier_args: Sequence[str]) -> Optional[list[str]]:
+    """Digest the answers files given to copier.
+
+    Args:
+        copier_args: the arguments forwarded to copier.
+
+    Returns:
+        The digest of each answers file, in order, None if one cannot be
+        read.
+
+    Example:
+        >>> _data_files(["--defaults"])
+        []
+        >>> _data_files(["--data-file", "/missing/answers.yml"])
+    """
+    paths = [
+        argument.partition("=")[2]
+        if argument.startswith(f"{DATA_FILE_FLAG}=")
+        else next_argument
+        for argument, next_argument in zip(copier_args, [*copier_args[1:], ""])
+        if argument == DATA_FILE_FLAG
+        or argument.startswith(f"{DATA_FILE_FLAG}=")
+    ]
+    try:
+        return [
+            hashlib.sha256(Path(path).read_bytes()).hexdigest()
+            for path in paths
+        ]
+    except OSError:
+        return None
+
+
+def step_key(
+    tree: str,
+    layers: Sequence[tuple[str, Optional[str], bool]],
+    copier_args: Sequence[str],
+    context: Iterable[str],
+    *,
+    compose: bool,
+) -> Optional[str]:
+    """The key of a rendered step.
+
+    Args:
+        tree: the digest of the tree the step renders into.
+        layers: the template of each layer of the step, its resolved
+            version, and whether its tasks are skipped.
+        copier_args: the arguments forwarded to copier.
+        context: the context packages of the templates.
+        compose: whether the layers are composed into one template.
+
+    Returns:
+        The key of the step, None if it cannot be cached: a version is
+        unknown, a layer runs its tasks, an answers file cannot be read, or
+        copier may prompt.
+
+    Example:
+        >>> layer = ("gh:a/b.git", "v1", True)
+        >>> step_key("tree", [layer], [], [], compose=False)
+        >>> len(step_key("tree", [layer], ["--defaults"], [], compose=False))
+        64
+        >>> step_key("tree", [layer[:2] + (False,)], ["--defaults"], [],
+        ...     compose=False)
+    """
+    data_files = _data_files(copier_args)
+    if (
+        DEFAULTS_FLAG not in copier_args
+        or data_files is None
+        or any(
+            version is None or not skip_tasks
+            for _, version, skip_tasks in layers
+        )
+    ):
+        return None
+
+    return _digest(
+        {
+            "tree": tree,
+            "layers": [list(layer) for layer in layers],
+            "copier_args": list(copier_args),
+            "data_files": data_files,
+            "context": list(context),
+            "compose": compose,
+        }
+    )
+
+
+def _objects(manifest: Mapping[str, Entry]) -> set[str]:
+    """The objects of a cached tree.
+
+    Args:
+        manifest: the manifest of the tree.
+
+    Returns:
+        The names of the objects of the files of the tree.
+    """
+    return {
+        entry["target"]
+        for entry in manifest.values()
+        if entry["kind"] == "file"
+    }
+
+
+def _missing(manifest: Mapping[str, Entry]) -> list[str]:
+    """The objects of a cached tree missing from the local cache.
+
+    Args:
+        manifest: the manifest of the tree.
+
+    Returns:
+        The names of the missing objects, sorted.
+    """
+    objects = _root(OBJECTS_DIRECTORY)
+    return sorted(
+        name for name in _objects(manifest) if not (objects / name).is_file()
+    )
+
+
+def _is_safe_path(path: str, symlinks: set[str]) -> bool:
+    """Whether a path of a cached tree stays in the tree.
+
+    Args:
+        path: the path, relative to the tree.
+        symlinks: the symbolic links of the tree.
+
+    Returns:
+        True if the path is relative, normalised (no `..`), and does not
+        pass through a symbolic link of the tree.
+    """
+    posix = PurePosixPath(path)
+    return (
+        not posix.is_absolute()
+        and posix.as_posix() == path
+        and path not in {"", "."}
+        and ".." not in posix.parts
+        and not any(parent.as_posix() in symlinks for parent in posix.parents)
+    )
+
+
+def _is_safe(manifest: Mapping[str, Entry]) -> bool:
+    """Whether a manifest only writes within the tree it is materialised in.
+
+    A manifest is read from the cache, maybe shared with other machines: a
+    poisoned manifest could otherwise write anywhere.
+
+    Args:
+        manifest: the manifest of the tree.
+
+    Returns:
+        True if every path of the tree is safe, and every file refers to an
+        object of the cache.
+
+    Example:
+        >>> _is_safe({"a/b": Entry(kind="directory", target="")})
+        True
+        >>> _is_safe({"../b": Entry(kind="directory", target="")})
+        False
+        >>> _is_safe({"/b": Entry(kind="directory", target="")})
+        False
+        >>> _is_safe(
+        ...     {
+        ...         "a": Entry(kind="symlink", target="/etc"),
+        ...         "a/passwd": Entry(kind="file", target="0" * 64),
+        ...     }
+        ... )
+        False
+        >>> _is_safe({"a": Entry(kind="file", target="../../secret")})
+        False
+    """
+    symlinks = {
+        path for path, entry in manifest.items() if entry["kind"] == "symlink"
+    }
+    return all(
+        entry["kind"] in KINDS
+        and _is_safe_path(path, symlinks)
+        and (
+            entry["kind"] != "file"
+            or OBJECT_PATTERN.fullmatch(entry["target"]) is not None
+        )
+        for path, entry in manifest.items()
+    )
+
+
+def _write(path: Path, data: bytes, mode: int = 0o644) -> None:
+    """Write a file of the cache, atomically.
+
+    Args:
+        path: the file.
+        data: the content of the file.
+        mode: the permissions of the file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}-", suffix=".tmp", delete=False
+    ) as temporary:
+        temporary.write(data)
+
+    Path(temporary.name).chmod(mode)
+    Path(temporary.name).replace(path)
+
+
+def _load(key: str) -> Optional[dict[str, Entry]]:
+    """Load a tree of the local cache.
+
+    Args:
+        key: the key of the step.
+
+    Returns:
+        The manifest of the tree, None if it is not cached, is unsafe or
+        misses files.
+    """
+    try:
+        manifest: dict[str, Entry] = json.loads(
+            _root(TREES_DIRECTORY, f"{key}.json").read_text(encoding="utf-8")
+        )
+    except (OSError, ValueError):
+        return None
+
+    if not _is_safe(manifest) or _missing(manifest):
+        return None
+
+    return manifest
+
+
+def _pull_object(remote: "Backend", name: str) -> bool:
+    """Fetch a file of a tree from the remote tier into the local cache.
+
+    Args:
+        remote: the remote tier.
+        name: the name of the object of the file.
+
+    Returns:
+        True if the file was fetched.
+    """
+    remote_cache = importlib.import_module("whiteprints.remote_cache")
+    data = remote_cache.fetch(remote, f"{OBJECTS_DIRECTORY}/{name}")
+    if data is None:
+        return False
+
+    _write(
+        _root(OBJECTS_DIRECTORY, name),
+        data,
+        0o755 if name.endswith(EXECUTABLE) else 0o644,
+    )
+    return True
+
+
+def _parse(key: str, data: bytes) -> Optional[dict[str, Entry]]:
+    """Parse a manifest fetched from the remote tier.
+
+    Args:
+        key: the key of the step.
+        data: the manifest.
+
+    Returns:
+        The manifest of the tree, None if it is invalid or unsafe.
+    """
+    try:
+        manifest: dict[str, Entry] = json.loads(data)
+    except ValueError:
+        return None
+
+    if not _is_safe(manifest):
+        logging.getLogger(__name__).warning(
+            "The remote cache tree '%s' is unsafe.", key
+        )
+        return None
+
+    return manifest
+
+
+def _pull(key: str, remote: "Backend") -> None:
+    """Fetch a tree from the remote tier into the local cache.
+
+    The manifest is kept locally once all the files of the tree are, an
+    unsafe manifest is ignored.
+
+    Args:
+        key: the key of the step.
+        remote: the remote tier.
+    """
+    remote_cache = importlib.import_module("whiteprints.remote_cache")
+    data = remote_cache.fetch(remote, f"{TREES_DIRECTORY}/{key}.json")
+    if data is None:
+        return
+
+    manifest = _parse(key, data)
+    if manifest is None:
+        return
+
+    missing = _missing(manifest)
+    with ThreadPoolExecutor() as executor:
+        pulled = list(executor.map(partial(_pull_object, remote), missing))
+
+    if all(pulled):
+        _write(_root(TREES_DIRECTORY, f"{key}.json"), data)
+
+
+def lookup(
+    key: str, *, remote: Optional["Backend"] = None
+) -> Optional[dict[str, Entry]]:
+    """Look a rendered tree up, marking it as used.
+
+    Args:
+        key: the key of the step.
+        remote: the remote tier looked up on a miss, None for none.
+
+    Returns:
+        The manifest of the tree, None if it is not cached.
+    """
+    manifest = _load(key)
+    if manifest is None and remote is not None:
+        _pull(key, remote)
+        manifest = _load(key)
+
+    if manifest is not None:
+        os.utime(_root(TREES_DIRECTORY, f"{key}.json"))
+
+    return manifest
+
+
+def _entry(path: Path, digest: str) -> Entry:
+    """The manifest entry of a path.
+
+    Args:
+        path: the path, in the rendered tree.
+        digest: the digest of the path (see whiteprints.file_tree).
+
+    Returns:
+        The entry: a file refers to its object.
+    """
+    if digest == DIRECTORY:
+        return Entry(kind="directory", target="")
+
+    if digest.startswith(SYMLINK_PREFIX):
+        return Entry(kind="symlink", target=digest[len(SYMLINK_PREFIX) :])
+
+    executable = path.stat().st_mode & 0o111
+    return Entry(
+        kind="file",
+        target=digest[len(FILE_PREFIX) :] + (EXECUTABLE if executable else ""),
+    )
+
+
+def _store_object(path: Path, name: str) -> None:
+    """Store a file of a rendered tree, unless it is stored already.
+
+    Args:
+        path: the file.
+        name: the name of its object.
+    """
+    target = _root(OBJECTS_DIRECTORY, name)
+    if target.is_file():
+        return
+
+    temporary = target.with_name(
+        f".{name}-{os.getpid()}-{threading.get_ident()}.tmp"
+    )
+    shutil.copy2(path, temporary)
+    temporary.replace(target)
+
+
+def _push_object(remote: "Backend", name: str) -> bool:
+    """Store a file of a tree in the remote tier.
+
+    Args:
+        remote: the remote tier.
+        name: the name of the object of the file.
+
+    Returns:
+        True if the file is stored.
+    """
+    return importlib.import_module("whiteprints.remote_cache").push(
+        remote,
+        f"{OBJECTS_DIRECTORY}/{name}",
+        _root(OBJECTS_DIRECTORY, name).read_bytes(),
+    )
+
+
+def _push(key: str, data: bytes, remote: "Backend") -> None:
+    """Store a tree in the remote tier, its files before its manifest.
+
+    Args:
+        key: the key of the step.
+        data: the manifest of the tree.
+        remote: the remote tier.
+    """
+    objects = sorted(_objects(json.loads(data)))
+    with ThreadPoolExecutor() as executor:
+        pushed = list(executor.map(partial(_push_object, remote), objects))
+
+    if all(pushed):
+        importlib.import_module("whiteprints.remote_cache").push(
+            remote, f"{TREES_DIRECTORY}/{key}.json", data
+        )
+
+
+def store(
+    key: str,
+    tree: Path,
+    *,
+    remote: Optional["Backend"] = None,
+    jobs: Optional[int] = None,
+    maximum_size: int = MAXIMUM_SIZE,
+) -> None:
+    """Cache a rendered tree.
+
+    Args:
+        key: the key of the step.
+        tree: the tree rendered by the step.
+        remote: the remote tier the tree is also stored in, None for none.
+        jobs: the maximum number of files stored concurrently, None for the
+            default of the standard library thread pool.
+        maximum_size: the maximum size of the cache, in bytes.
+    """
+    manifest = {
+        path: _entry(tree / path, digest)
+        for path, digest in tree_digests(tree, jobs=jobs).items()
+    }
+    files = {
+        entry["target"]: tree / path
+        for path, entry in manifest.items()
+        if entry["kind"] == "file"
+    }
+    _root(OBJECTS_DIRECTORY).mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(executor.map(_store_object, files.values(), files))
+
+    data = json.dumps(manifest).encode()
+    _write(_root(TREES_DIRECTORY, f"{key}.json"), data)
+    if remote is not None:
+        _push(key, data, remote)
+
+    evict(maximum_size)
+
+
+def _tree_objects(manifest_path: Path) -> set[str]:
+    """The objects of a cached tree.
+
+    Args:
+        manifest_path: the manifest of the tree.
+
+    Returns:
+        The names of the objects of the files of the tree.
+    """
+    with suppress(OSError, ValueError):
+        return _objects(json.loads(manifest_path.read_text(encoding="utf-8")))
+
+    return set()
+
+
+def _size(objects: Iterable[str]) -> int:
+    """The size of objects.
+
+    Args:
+        objects: the names of the objects.
+
+    Returns:
+        The total size of the objects, in bytes.
+    """
+    size = 0
+    for name in objects:
+        with suppress(OSError):
+            size += _root(OBJECTS_DIRECTORY, name).stat().st_size
+
+    return size
+
+
+def _kept(maximum_size: int) -> tuple[set[str], int]:
+    """Keep the most recently used trees fitting the maximum size.
+
+    Args:
+        maximum_size: the maximum size of the cache, in bytes.
+
+    Returns:
+        The objects of the trees kept, and their size in bytes.
+    """
+    manifests = sorted(
+        _root(TREES_DIRECTORY).glob("*.json"),
+        key=lambda path: path.stat().st_mtime_ns,
+        reverse=True,
+    )
+    kept: set[str] = set()
+    size = 0
+    for manifest_path in manifests:
+        objects = _tree_objects(manifest_path) - kept
+        objects_size = _size(objects)
+        if size + objects_size > maximum_size:
+            manifest_path.unlink(missing_ok=True)
+            continue
+
+        kept |= objects
+        size += objects_size
+
+    return kept, size
+
+
+def evict(maximum_size: int = MAXIMUM_SIZE) -> int:
+    """Evict the least recently used trees, down to the maximum size.
+
+    The objects no longer referenced by a tree are removed.
+
+    Args:
+        maximum_size: the maximum size of the cache, in bytes.
+
+    Returns:
+        The size of the cache, in bytes.
+    """
+    kept, size = _kept(maximum_size)
+    for path in _root(OBJECTS_DIRECTORY).glob("*"):
+        if path.name not in kept and path.suffix != ".tmp":
+            path.unlink(missing_ok=True)
+
+    return size
+
+
+def _copy_range(source: Path, target: Path) -> None:
+    """Copy a file in the kernel, where supported.
+
+    Args:
+        source: the file.
+        target: the copy, which must not exist.
+    """
+    with source.open("rb") as source_file, target.open("wb") as target_file:
+        remaining = os.fstat(source_file.fileno()).st_size
+        with suppress(AttributeError, OSError):
+            while remaining > 0:
+                copied = os.copy_file_range(
+                    source_file.fileno(), target_file.fileno(), remaining
+                )
+                if not copied:
+                    break
+
+                remaining -= copied
+
+        if remaining > 0:
+            shutil.copyfileobj(source_file, target_file)
+
+    shutil.copymode(source, target)
+
+
+def _clone(source: Path, target: Path) -> bool:
+    """Clone a file, copy-on-write (Linux).
+
+    Args:
+        source: the file.
+        target: the clone.
+
+    Returns:
+        True if the file was cloned, False if it is not supported.
+    """
+    with source.open("rb") as file, target.open("wb") as clone:
+        try:
+            importlib.import_module("fcntl").ioctl(
+                clone.fileno(), FICLONE, file.fileno()
+            )
+        except OSError:
+            return False
+
+    shutil.copymode(source, target)
+    return True
+
+
+def _reflink(source: Path, target: Path) -> None:
+    """Clone a file, copy-on-write, where supported.
+
+    Args:
+        source: the file.
+        target: the clone, which must not exist.
+    """
+    if sys.platform == "linux" and _clone(source, target):
+        return
+
+    target.unlink(missing_ok=True)
+    _copy_range(source, target)
+
+
+def _hardlink(source: Path, target: Path) -> None:
+    """Hard link a file, where supported.
+
+    Args:
+        source: the file.
+        target: the link, which must not exist.
+    """
+    try:
+        os.link(source, target)
+    except OSError:
+        _copy_range(source, target)
+
+
+MATERIALIZERS: Final[dict[Materialization, Callable[[Path, Path], None]]] = {
+    "reflink": _reflink,
+    "copy": _copy_range,
+    "hardlink": _hardlink,
+}
+"""The functions materialising a cached file."""
+
+
+def _kind(path: Path) -> str:
+    """The kind of a path.
+
+    Args:
+        path: an existing path.
+
+    Returns:
+        The kind of the path, as in a manifest entry.
+    """
+    if path.is_symlink():
+        return "symlink"
+
+    return "directory" if path.is_dir() else "file"
+
+
+def _remove_stale(directory: Path, manifest: dict[str, Entry]) -> None:
+    """Remove the paths of a directory missing from a cached tree.
+
+    Args:
+        directory: the directory.
+        manifest: the manifest of the cached tree.
+    """
+    for path in sorted(directory.rglob("*"), reverse=True):
+        entry = manifest.get(path.relative_to(directory).as_posix())
+        if entry is not None and entry["kind"] == _kind(path):
+            continue
+
+        if _kind(path) == "directory":
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+
+
+def _make_entries(
+    manifest: dict[str, Entry], directory: Path
+) -> list[tuple[Path, Path]]:
+    """Make the directories and the symbolic links of a cached tree.
+
+    Args:
+        manifest: the manifest of the cached tree.
+        directory: the directory the tree is materialised in.
+
+    Returns:
+        The object and the target of each file left to materialise.
+    """
+    files: list[tuple[Path, Path]] = []
+    for path, entry in sorted(manifest.items()):
+        target = directory / path
+        if entry["kind"] == "directory":
+            target.mkdir(exist_ok=True)
+        elif entry["kind"] == "symlink":
+            target.unlink(missing_ok=True)
+            target.symlink_to(entry["target"])
+        else:
+            target.unlink(missing_ok=True)
+            files.append((_root(OBJECTS_DIRECTORY, entry["target"]), target))
+
+    return files
+
+
+def materialize(
+    manifest: dict[str, Entry],
+    directory: Path,
+    how: Materialization = "reflink",
+    *,
+    jobs: Optional[int] = None,
+) -> None:
+    """Materialise a cached tree into a directory.
+
+    Args:
+        manifest: the manifest of the cached tree.
+        directory: the directory, made identical to the cached tree.
+        how: how the files are materialised.
+        jobs: the maximum number of files materialised concurrently, None
+            for the default of the standard library thread pool.
+
+    Raises:
+        UnsafeTreeError: the manifest writes outside of the directory.
+    """
+    if not _is_safe(manifest):
+        raise UnsafeTreeError(directory=directory)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    _remove_stale(directory, manifest)
+    files = _make_entries(manifest, directory)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(
+            executor.map(
+                MATERIALIZERS[how],
+                [source for source, _ in files],
+                [target for _, target in files],
+            )
+        )
+
+
+def unshare(directory: Path) -> None:
+    """Replace the hard linked files of a directory by copies.
+
+    Args:
+        directory: the directory, materialised with hard links.
+    """
+    for path in directory.rglob("*"):
+        if (
+            path.is_file()
+            and not path.is_symlink()
+            and (path.stat().st_nlink > 1)
+        ):
+            copy = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            shutil.copy2(path, copy)
+            copy.replace(path)
@@ -0,0 +1,247 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Render a project in a staging directory, then publish it.
+
+Rendering straight into the project leaves a half-built tree when a layer
+fails, and every rewrite of a layer hits the (possibly networked) project
+filesystem. The project is instead rendered in a staging directory, on a
+fast local filesystem (the shared memory tmpfs when available), starting
+from a copy of the project. The finished project is then published:
+
+- the staged tree is brought to the filesystem of the project: renamed when
+  both are on the same filesystem, copied next to the project otherwise.
+- it is flushed to the storage once.
+- it is renamed into place. An existing project directory is kept, its
+  entries are replaced one by one: the replaced and removed entries are
+  moved aside, and only deleted once every entry is in place.
+
+A failure before the publication leaves the project untouched, a failure
+while replacing the entries moves them back.
+
+The tasks of the templates would run in the staging directory, and a task
+recording the absolute path of the project (e.g. a virtual environment)
+would record the staging directory instead: the tasks of the staged
+templates are deferred, and run once the project is published (see
+whiteprints.deferred_tasks).
+"""
+
+import os
+import shutil
+import tempfile
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Final, Optional
+
+from whiteprints.file_tree import copy_tree, sync_path, sync_tree
+
+
+__all__: Final = [
+    "SHARED_MEMORY",
+    "STAGING_DIRECTORY_VARIABLE",
+    "publish",
+    "staged",
+    "staging_directory",
+]
+"""Public module attributes."""
+
+
+STAGING_DIRECTORY_VARIABLE: Final = "WHITEPRINTS_STAGING_DIR"
+"""The environment variable overriding the staging directory."""
+
+SHARED_MEMORY: Final = Path("/dev/shm")
+"""The shared memory tmpfs, on Linux."""
+
+PREFIX: Final = ".whiteprints-"
+"""The prefix of the temporary directories."""
+
+
+def staging_directory() -> Path:
+    """The directory the projects are staged in.
+
+    Returns:
+        The directory set by the environment, the shared memory tmpfs when
+        writable, or the temporary directory.
+    """
+    if (directory := os.environ.get(STAGING_DIRECTORY_VARIABLE)) is not None:
+        return Path(directory)
+
+    if SHARED_MEMORY.is_dir() and os.access(SHARED_MEMORY, os.W_OK):
+        return SHARED_MEMORY
+
+    return Path(tempfile.gettempdir())
+
+
+def _filesystem(path: Path) -> int:
+    """The filesystem holding a path, or the one it would be created on.
+
+    Args:
+        path: a path, existing or not.
+
+    Returns:
+        The device identifier of the filesystem.
+    """
+    while not path.exists():
+        path = path.parent
+
+    return path.stat().st_dev
+
+
+def _landing(staged: Path, project: Path) -> Path:
+    """Bring a staged tree to the filesystem of the project.
+
+    Args:
+        staged: the staged tree.
+        project: the project directory.
+
+    Returns:
+        The staged tree, or its copy on the filesystem of the project.
+    """
+    if _filesystem(staged) == _filesystem(project):
+        return staged
+
+    parent = project if project.is_dir() else project.parent
+    parent.mkdir(parents=True, exist_ok=True)
+    landing = Path(tempfile.mkdtemp(prefix=PREFIX, dir=parent)) / "project"
+    copy_tree(staged, landing)
+    return landing
+
+
+def _removed(landing: Path, project: Path) -> list[Path]:
+    """The entries of the project the rendering removed.
+
+    Args:
+        landing: the landed tree, on the filesystem of the project.
+        project: the existing project directory.
+
+    Returns:
+        The entries of the project missing from the landed tree, except the
+        temporary directories of whiteprints.
+    """
+    return [
+        entry
+        for entry in sorted(project.iterdir())
+        if not entry.name.startswith(PREFIX)
+        and not os.path.lexists(landing / entry.name)
+    ]
+
+
+def _move(
+    source: Path, destination: Path, moves: list[tuple[Path, Path]]
+) -> None:
+    """Move an entry, recording the move to undo it.
+
+    Args:
+        source: the entry.
+        destination: where the entry is moved, which must not exist.
+        moves: the moves done so far, the move is appended.
+    """
+    source.rename(destination)
+    moves.append((source, destination))
+
+
+def _undo(moves: list[tuple[Path, Path]]) -> None:
+    """Undo moves, the last one first.
+
+    Args:
+        moves: the moves done.
+    """
+    for source, destination in reversed(moves):
+        destination.rename(source)
+
+
+def _swap_entries(
+    landing: Path, project: Path, trash: Path, moves: list[tuple[Path, Path]]
+) -> None:
+    """Move the entries of the landed tree into the project.
+
+    Args:
+        landing: the landed tree, on the filesystem of the project.
+        project: the existing project directory.
+        trash: where the replaced and removed entries are moved.
+        moves: the moves done so far, the moves are appended.
+    """
+    for entry in _removed(landing, project):
+        _move(entry, trash / entry.name, moves)
+
+    for entry in sorted(landing.iterdir()):
+        target = project / entry.name
+        if os.path.lexists(target):
+            _move(target, trash / entry.name, moves)
+
+        _move(entry, target, moves)
+
+
+def _replace_entries(landing: Path, project: Path) -> None:
+    """Replace the entries of the project by the ones of the landed tree.
+
+    The replaced and removed entries are deleted once every entry is in
+    place, a failure moves them back.
+
+    Args:
+        landing: the landed tree, on the filesystem of the project.
+        project: the existing project directory.
+    """
+    trash = Path(tempfile.mkdtemp(prefix=PREFIX, dir=project))
+    moves: list[tuple[Path, Path]] = []
+    try:
+        _swap_entries(landing, project, trash, moves)
+    except BaseException:
+        _undo(moves)
+        trash.rmdir()
+        raise
+
+    shutil.rmtree(trash, ignore_errors=True)
+
+
+def publish(staged: Path, project: Path) -> None:
+    """Publish a staged tree as the project.
+
+    Args:
+        staged: the staged tree.
+        project: the project directory.
+    """
+    landing = _landing(staged, project)
+    try:
+        sync_tree(landing)
+        if project.is_dir():
+            _replace_entries(landing, project)
+        else:
+            project.parent.mkdir(parents=True, exist_ok=True)
+            landing.rename(project)
+
+        sync_path(project.parent)
+    finally:
+        if landing != staged:
+            shutil.rmtree(landing.parent, ignore_errors=True)
+
+
+@contextmanager
+def staged(
+    project: Path,
+    source: Optional[Path] = None,
+) -> Generator[Path, None, None]:
+    """Stage a project, and publish it if the staging succeeded.
+
+    Args:
+        project: the project directory.
+        source: the tree the staging starts from, None for the project.
+
+    Yields:
+        The staging copy of the project, to render into.
+    """
+    source = project if source is None else source
+    staging_directory().mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(
+        prefix=PREFIX, dir=staging_directory()
+    ) as directory:
+        staging = Path(directory) / "project"
+        if source.is_dir():
+            copy_tree(source, staging)
+        else:
+            staging.mkdir()
+
+        yield staging
+        publish(staging, project)
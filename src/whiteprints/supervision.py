@@ -0,0 +1,418 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Supervise commands: timeouts and process groups.
+
+A command runs in its own process group, so that the whole group, including
+the grandchildren (uv, copier, git...), is terminated on timeout or
+interrupt: first gracefully (SIGTERM, CTRL_BREAK_EVENT on Windows), then
+forcibly after a grace period.
+
+Two timeouts are available:
+
+- the wall-clock timeout bounds the duration of the command.
+- the inactivity timeout bounds the time without any output. The output is
+  then read through pipes and forwarded, so the command cannot prompt.
+
+A command attached to an interactive terminal also gets its own process
+group, in the session of the terminal: the terminal foreground is handed to
+the group while it runs, so that it can prompt, and the terminal delivers
+Ctrl-C to the whole group itself. The foreground is handed to one group at a
+time, a concurrent command waits for it before its group may read the
+terminal. On Windows, an interrupt of whiteprints is forwarded to the group
+instead.
+
+The groups no longer receive the signals sent to the group of whiteprints:
+while commands run, SIGTERM and SIGHUP are forwarded to their groups, then
+terminate whiteprints as they would have.
+"""
+
+import importlib
+import os
+import signal
+import subprocess  # nosec
+import sys
+import threading
+from collections.abc import Generator, Mapping, Sequence
+from contextlib import contextmanager, nullcontext, suppress
+from functools import partial
+from pathlib import Path
+from typing import Any, Final, Optional, TypedDict, Union
+
+
+__all__: Final = [
+    "GRACE_PERIOD",
+    "ProcessTimeoutError",
+    "Timeouts",
+    "forward_signals",
+    "group_options",
+    "kill_group",
+    "run",
+    "stop_group",
+    "supervised",
+]
+"""Public module attributes."""
+
+
+GRACE_PERIOD: Final = 5.0
+"""Seconds between the graceful and the forced termination."""
+
+FORWARDED_SIGNALS: Final = ("SIGTERM", "SIGHUP")
+"""The signals of whiteprints forwarded to the groups of its commands."""
+
+_GROUPS: Final[set[int]] = set()
+"""The leaders of the groups of the commands running."""
+
+_FOREGROUND: Final = threading.Lock()
+"""Held by the command the terminal foreground is handed to."""
+
+
+class Timeouts(TypedDict, total=False):
+    """The timeouts of a command, in seconds (None for no timeout)."""
+
+    timeout: Optional[float]
+    inactivity_timeout: Optional[float]
+
+
+class ProcessTimeoutError(TimeoutError):
+    """A command exceeded one of its timeouts."""
+
+    def __init__(self, kind: str, seconds: float) -> None:
+        """Initialize the exception.
+
+        Args:
+            kind: the kind of timeout exceeded ("wall-clock", "inactivity").
+            seconds: the timeout, in seconds.
+        """
+        super().__init__(
+            f"The command exceeded its {kind} timeout of {seconds:g} seconds."
+        )
+        self.kind = kind
+        self.seconds = seconds
+
+
+def group_options(*, foreground: bool = False) -> dict[str, Any]:
+    """The subprocess options starting a command in its own process group.
+
+    Args:
+        foreground: whether the group may take the terminal foreground: it
+            then stays in the session of the terminal, instead of starting
+            its own session.
+
+    Returns:
+        The keyword arguments of `subprocess.Popen` or
+        `asyncio.create_subprocess_exec`.
+    """
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+
+    if not foreground:
+        return {"start_new_session": True}
+
+    if sys.version_info >= (3, 11):
+        return {"process_group": 0}
+
+    return {"preexec_fn": os.setpgrp}
+
+
+def stop_group(pid: int) -> None:
+    """Ask a process group to terminate.
+
+    Args:
+        pid: the process identifier of the group leader.
+    """
+    with suppress(ProcessLookupError, PermissionError):
+        if sys.platform == "win32":
+            os.kill(pid, signal.CTRL_BREAK_EVENT)
+        else:
+            os.killpg(pid, signal.SIGTERM)
+
+
+def kill_group(pid: int) -> None:
+    """Kill a process group, including the processes left by its leader.
+
+    Args:
+        pid: the process identifier of the group leader.
+    """
+    if sys.platform == "win32":
+        subprocess.run(  # nosec
+            ["taskkill", "/F", "/T", "/PID", str(pid)],
+            check=False,
+            capture_output=True,
+        )
+    else:
+        with suppress(ProcessLookupError, PermissionError):
+            os.killpg(pid, signal.SIGKILL)
+
+
+def _terminate(process: "subprocess.Popen[Any]") -> None:
+    """Terminate a command group, gracefully then forcibly.
+
+    Args:
+        process: the command process, leader of its group.
+    """
+    stop_group(process.pid)
+    with suppress(subprocess.TimeoutExpired):
+        process.wait(GRACE_PERIOD)
+
+    kill_group(process.pid)
+
+
+def _forward_signal(signum: int, _frame: object) -> None:
+    """Forward a signal to the command groups, then terminate on it.
+
+    Args:
+        signum: the signal received.
+    """
+    # Copying a set is atomic, it may be updated by another thread.
+    for pid in _GROUPS.copy():
+        stop_group(pid)
+
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+
+@contextmanager
+def forward_signals() -> Generator[None, None, None]:
+    """Forward the signals terminating whiteprints to the command groups.
+
+    Signal handlers are installed by the main thread only, a command run by
+    another thread relies on the main thread forwarding them. A signal
+    handled or ignored already (e.g. SIGHUP under nohup) is left as is.
+
+    Yields:
+        Nothing, the signals are forwarded within the context.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    installed = [
+        signum
+        for signum in (
+            getattr(signal, name, None) for name in FORWARDED_SIGNALS
+        )
+        if signum is not None and signal.getsignal(signum) is signal.SIG_DFL
+    ]
+    for signum in installed:
+        signal.signal(signum, _forward_signal)
+
+    try:
+        yield
+    finally:
+        for signum in installed:
+            signal.signal(signum, signal.SIG_DFL)
+
+
+@contextmanager
+def supervised(pid: int) -> Generator[None, None, None]:
+    """Forward the signals terminating whiteprints to a command group.
+
+    Args:
+        pid: the process identifier of the group leader.
+
+    Yields:
+        Nothing, the signals are forwarded to the group within the context.
+    """
+    _GROUPS.add(pid)
+    try:
+        with forward_signals():
+            yield
+    finally:
+        _GROUPS.discard(pid)
+
+
+def _terminal() -> Optional[int]:
+    """The interactive terminal whiteprints runs in the foreground of.
+
+    Returns:
+        The file descriptor of the terminal, None if the standard input is
+        not a terminal, whiteprints runs in the background, or on Windows.
+    """
+    if sys.platform == "win32" or sys.stdin is None or not sys.stdin.isatty():
+        return None
+
+    terminal = sys.stdin.fileno()
+    try:
+        return terminal if os.tcgetpgrp(terminal) == os.getpgrp() else None
+    except OSError:
+        return None
+
+
+@contextmanager
+def _foreground(terminal: int, pid: int) -> Generator[None, None, None]:
+    """Hand the terminal foreground to a process group, then take it back.
+
+    The foreground is handed to one group at a time, the other commands wait
+    for it. The group may have stopped reading the terminal before it was
+    handed the foreground, it is resumed.
+
+    Args:
+        terminal: the file descriptor of the terminal.
+        pid: the process identifier of the group leader.
+
+    Yields:
+        Nothing, the group is in the foreground within the context.
+    """
+    with _FOREGROUND:
+        # The group exists once the command is started, but may have exited.
+        with suppress(OSError):
+            os.tcsetpgrp(terminal, pid)
+            os.killpg(pid, signal.SIGCONT)
+
+        try:
+            yield
+        finally:
+            _take_foreground(terminal)
+
+
+def _take_foreground(terminal: int) -> None:
+    """Take the terminal foreground back.
+
+    Args:
+        terminal: the file descriptor of the terminal.
+    """
+    # A background group taking the foreground back is sent SIGTTOU, unless
+    # it blocks it.
+    mask = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTTOU})
+    try:
+        with suppress(OSError):
+            os.tcsetpgrp(terminal, os.getpgrp())
+    finally:
+        signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+
+
+def _run_watched(
+    command: Sequence[str],
+    timeouts: Timeouts,
+    *,
+    cwd: Optional[Path] = None,
+    env: Optional[Mapping[str, str]] = None,
+) -> None:
+    """Run a command watched for inactivity, forwarding its output.
+
+    Args:
+        command: the command to run.
+        timeouts: the timeouts of the command.
+        cwd: the working directory of the command.
+        env: the environment of the command, None to inherit it.
+    """
+    async_run = importlib.import_module("whiteprints.async_run")
+    result = importlib.import_module("asyncio").run(
+        async_run.AsyncRunner(limit=1).run(
+            command,
+            name="watched",
+            cwd=cwd,
+            env=env,
+            timeouts=timeouts,
+            on_stdout=partial(_forward, sys.stdout),
+            on_stderr=partial(_forward, sys.stderr),
+        )
+    )
+    async_run.check_returncode(result)
+
+
+def _forward(stream: Any, line: bytes) -> None:  # noqa: ANN401
+    """Forward a line of output.
+
+    Args:
+        stream: the text stream to forward the line to.
+        line: the line of output.
+    """
+    stream.write(line.decode(errors="replace"))
+    stream.flush()
+
+
+def _wait(
+    process: "subprocess.Popen[Any]",
+    timeout: Optional[float],
+    terminal: Optional[int],
+) -> int:
+    """Wait for a command group, terminating it on timeout or interrupt.
+
+    The signals terminating whiteprints are forwarded to the group.
+
+    Args:
+        process: the command process, leader of its group.
+        timeout: the wall-clock timeout, in seconds.
+        terminal: the terminal handed to the group, None for none.
+
+    Returns:
+        The exit status of the command.
+
+    Raises:
+        ProcessTimeoutError: the command exceeded its timeout.
+    """
+    foreground = (
+        nullcontext()
+        if terminal is None
+        else _foreground(terminal, process.pid)
+    )
+    with supervised(process.pid), foreground:
+        try:
+            return process.wait(timeout)
+        except subprocess.TimeoutExpired as error:
+            _terminate(process)
+            raise ProcessTimeoutError(
+                kind="wall-clock", seconds=error.timeout
+            ) from error
+        except KeyboardInterrupt:
+            _terminate(process)
+            raise
+
+
+def _run_in_group(
+    arguments: list[str],
+    timeout: Optional[float],
+    *,
+    cwd: Optional[Path] = None,
+    env: Optional[Mapping[str, str]] = None,
+) -> None:
+    """Run a command in its own process group, under a wall-clock timeout.
+
+    Args:
+        arguments: the command to run.
+        timeout: the wall-clock timeout, in seconds.
+        cwd: the working directory of the command.
+        env: the environment of the command, None to inherit it.
+
+    Raises:
+        CalledProcessError: the command exited with a non zero status.
+        ProcessTimeoutError: the command exceeded its timeout.
+    """
+    terminal = _terminal()
+    with subprocess.Popen(  # nosec
+        arguments,
+        cwd=cwd,
+        env=env,
+        **group_options(foreground=terminal is not None),
+    ) as process:
+        returncode = _wait(process, timeout, terminal)
+
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, arguments)
+
+
+def run(
+    command: Sequence[Union[str, "os.PathLike[str]"]],
+    timeouts: Optional[Timeouts] = None,
+    *,
+    cwd: Optional[Path] = None,
+    env: Optional[Mapping[str, str]] = None,
+) -> None:
+    """Run a supervised command.
+
+    Args:
+        command: the command to run.
+        timeouts: the timeouts of the command.
+        cwd: the working directory of the command.
+        env: the environment of the command, None to inherit it.
+    """
+    timeouts = timeouts or Timeouts()
+    arguments = [str(argument) for argument in command]
+    if timeouts.get("inactivity_timeout") is not None:
+        _run_watched(arguments, timeouts, cwd=cwd, env=env)
+        return
+
+    _run_in_group(arguments, timeouts.get("timeout"), cwd=cwd, env=env)
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Resolve the sources of the copier templates."""
+
+from typing import Final
+
+
+__all__: Final = ["SOURCE_PREFIXES", "source_url"]
+"""Public module attributes."""
+
+
+SOURCE_PREFIXES: Final = {
+    "gh:": "https://github.com/",
+    "gl:": "https://gitlab.com/",
+}
+"""The copier shortcuts of the template sources."""
+
+
+def source_url(template: str) -> str:
+    """Expand the copier shortcuts of a template source.
+
+    Args:
+        template: the copier template (path, URL or shortcut).
+
+    Returns:
+        The source of the template.
+
+    Example:
+        >>> source_url("gh:whiteprints/template-python.git")
+        'https://github.com/whiteprints/template-python.git'
+    """
+    for prefix, url in SOURCE_PREFIXES.items():
+        if template.startswith(prefix):
+            return url + template[len(prefix) :]
+
+    return template
@@ -0,0 +1,328 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Manage the persistent tool environments.
+
+uvx resolves and materialises a new tool environment on every run. A tool
+environment is instead created once, in the user cache directory, and reused
+by every later run. It is keyed by its requirements, the uv version and the
+Python interpreter running whiteprints, on which it is built. It is locked:
+its requirements are compiled to a lock file, installed exactly. With a
+wheelhouse (see whiteprints.wheelhouse), the lock file of the wheelhouse is
+installed offline, from the wheels of the wheelhouse only.
+
+An environment is built in a temporary directory, then published by renaming
+it, so that a partially created environment is never used. Its Python
+interpreter is run directly, the environment does not rely on the console
+scripts, whose paths would be wrong after the renaming. Pruning leaves the
+environments being built, and removes those left by an interrupted build.
+"""
+
+import hashlib
+import json
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Collection, Iterable
+from contextlib import suppress
+from functools import cached_property
+from importlib import metadata
+from pathlib import Path
+from typing import Final, Optional
+
+from whiteprints import supervision
+from whiteprints import wheelhouse as wheelhouse_
+from whiteprints.cache_directory import cache_directory
+from whiteprints.uvx_run import UVX
+
+
+__all__: Final = [
+    "ENVIRONMENTS_DIRECTORY",
+    "ToolEnvironment",
+    "environments",
+    "prune",
+]
+"""Public module attributes."""
+
+
+ENVIRONMENTS_DIRECTORY: Final = "environments"
+"""The user cache subdirectory holding the tool environments."""
+
+KEY_LENGTH: Final = 16
+"""The number of hexadecimal digits of an environment key."""
+
+BUILD_TIMEOUT: Final = 60 * 60.0
+"""The age, in seconds, after which an environment being built is abandoned."""
+
+
+class ToolEnvironment:
+    """A persistent tool environment."""
+
+    def __init__(
+        self,
+        requirements: Iterable[str],
+        wheelhouse: Optional[Path] = None,
+    ) -> None:
+        """Initialize the tool environment.
+
+        Args:
+            requirements: the requirements installed in the environment.
+            wheelhouse: the wheelhouse to install the requirements from,
+                None to resolve them against the package indexes.
+        """
+        self.requirements = sorted(set(requirements))
+        self.wheelhouse = wheelhouse
+
+    @cached_property
+    def wheelhouse_lock(self) -> Optional[Path]:
+        """The lock file of the wheelhouse.
+
+        Returns:
+            The lock file of the wheelhouse, None without a wheelhouse.
+        """
+        if self.wheelhouse is None:
+            return None
+
+        return wheelhouse_.check(self.wheelhouse, self.requirements)
+
+    @cached_property
+    def key(self) -> str:
+        """The key of the environment.
+
+        Returns:
+            A digest of the requirements, the uv version, the Python
+            interpreter and the packages of the wheelhouse.
+        """
+        return hashlib.sha256(
+            json.dumps(
+                {
+                    "requirements": self.requirements,
+                    "uv": metadata.version("uv"),
+                    "python": sys.executable,
+                    "wheelhouse": (
+                        None
+                        if self.wheelhouse_lock is None
+                        else hashlib.sha256(
+                            self.wheelhouse_lock.read_bytes()
+                        ).hexdigest()
+                    ),
+                }
+            ).encode()
+        ).hexdigest()[:KEY_LENGTH]
+
+    @cached_property
+    def path(self) -> Path:
+        """The directory of the environment.
+
+        Returns:
+            The directory of the environment, in the user cache directory.
+        """
+        return cache_directory(ENVIRONMENTS_DIRECTORY, self.key)
+
+    @staticmethod
+    def interpreter(path: Path) -> Path:
+        """The Python interpreter of an environment.
+
+        Args:
+            path: the directory of the environment.
+
+        Returns:
+            The path of the Python interpreter.
+        """
+        if sys.platform == "win32":
+            return path / "Scripts" / "python.exe"
+
+        return path / "bin" / "python"
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the environment is created.
+
+        Returns:
+            True if the environment is created, False otherwise.
+        """
+        return (
+            self.path / wheelhouse_.LOCK_FILE
+        ).is_file() and self.interpreter(self.path).exists()
+
+    def _lock(self, path: Path) -> list[str]:
+        """Lock the requirements of the environment.
+
+        Args:
+            path: the directory of the environment.
+
+        Returns:
+            The additional arguments of `uv pip sync` installing the lock.
+        """
+        lock = path / wheelhouse_.LOCK_FILE
+        if self.wheelhouse_lock is not None:
+            shutil.copyfile(self.wheelhouse_lock, lock)
+            return wheelhouse_.install_arguments(self.wheelhouse_lock.parent)
+
+        UVX().uv(
+            [
+                "pip",
+                "compile",
+                "--quiet",
+                "--python",
+                str(self.interpreter(path)),
+                str(path / wheelhouse_.REQUIREMENTS_FILE),
+                "--output-file",
+                str(lock),
+            ]
+        )
+        return []
+
+    def _build(self, path: Path) -> None:
+        """Build the environment in a directory.
+
+        Args:
+            path: the directory to build the environment in.
+        """
+        uv = UVX()
+        (path / wheelhouse_.REQUIREMENTS_FILE).write_text(
+            wheelhouse_.requirements_text(self.requirements), encoding="utf-8"
+        )
+        uv.uv(
+            [
+                "venv",
+                "--quiet",
+                "--allow-existing",
+                "--no-project",
+                "--python",
+                sys.executable,
+                str(path),
+            ]
+        )
+        uv.uv(
+            [
+                "pip",
+                "sync",
+                "--quiet",
+                "--python",
+                str(self.interpreter(path)),
+                *self._lock(path),
+                str(path / wheelhouse_.LOCK_FILE),
+            ]
+        )
+
+    def create(self) -> Path:
+        """Create the environment, if it is not created yet.
+
+        Returns:
+            The directory of the environment.
+        """
+        if self.is_ready:
+            return self.path
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        build = Path(
+            tempfile.mkdtemp(prefix=f".{self.key}-", dir=self.path.parent)
+        )
+        try:
+            self._build(build)
+            # Another process may have published the environment meanwhile.
+            with suppress(OSError):
+                build.rename(self.path)
+        finally:
+            shutil.rmtree(build, ignore_errors=True)
+
+        return self.path
+
+    def command(self, module: str, arguments: Iterable[str]) -> list[str]:
+        """The command running a module of the environment.
+
+        Args:
+            module: the module to run.
+            arguments: the arguments of the module.
+
+        Returns:
+            The command line.
+        """
+        return [str(self.interpreter(self.path)), "-m", module, *arguments]
+
+    def script(self, path: Path, arguments: Iterable[str]) -> list[str]:
+        """The command running a script in the environment.
+
+        Args:
+            path: the script to run.
+            arguments: the arguments of the script.
+
+        Returns:
+            The command line.
+        """
+        return [str(self.interpreter(self.path)), str(path), *arguments]
+
+    def run(
+        self,
+        module: str,
+        arguments: Iterable[str],
+        timeouts: Optional[supervision.Timeouts] = None,
+    ) -> None:
+        """Run a module of the environment, creating it on first use.
+
+        Args:
+            module: the module to run.
+            arguments: the arguments of the module.
+            timeouts: the timeouts of the module.
+        """
+        self.create()
+        supervision.run(self.command(module, arguments), timeouts)
+
+
+def environments() -> list[Path]:
+    """The directories of the tool environments.
+
+    Returns:
+        The directories in the environments cache directory, including the
+        environments being created.
+    """
+    directory = cache_directory(ENVIRONMENTS_DIRECTORY)
+    if not directory.is_dir():
+        return []
+
+    return sorted(path for path in directory.iterdir() if path.is_dir())
+
+
+def _is_building(path: Path) -> bool:
+    """Whether a directory is an environment being built.
+
+    Args:
+        path: a directory of the environments cache directory.
+
+    Returns:
+        True if the directory is the temporary directory of a build, younger
+        than the build timeout, or was removed meanwhile.
+    """
+    try:
+        return path.name.startswith(".") and (
+            time.time() - path.stat().st_mtime < BUILD_TIMEOUT
+        )
+    except FileNotFoundError:
+        return True
+
+
+def prune(keep: Collection[ToolEnvironment] = ()) -> list[Path]:
+    """Remove the tool environments.
+
+    The environments being built, by another process, are left.
+
+    Args:
+        keep: the environments to keep.
+
+    Returns:
+        The directories removed.
+    """
+    kept = {environment.path for environment in keep}
+    removed = [
+        path
+        for path in environments()
+        if path not in kept and not _is_building(path)
+    ]
+    for path in removed:
+        shutil.rmtree(path)
+
+    return removed
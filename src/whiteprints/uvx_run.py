@@ -4,16 +4,19 @@
 
 """Run uvx commands.
 
-We use Python subprocesses.
+We use Python subprocesses, supervised in their own process group (see
+whiteprints.supervision).
 """
 
-import subprocess  # nosec
 from collections.abc import Iterable
 from functools import cached_property
 from pathlib import Path
+from typing import Optional
 
 import uv
 
+from whiteprints import supervision
+
 
 class UVX:
     """Manage the uv program."""
@@ -27,7 +30,24 @@ def bin(self) -> Path:
         """
         return Path(uv.find_uv_bin())
 
-    def run(self, command: Iterable[str]) -> None:
+    def uv(
+        self,
+        command: Iterable[str],
+        timeouts: Optional[supervision.Timeouts] = None,
+    ) -> None:
+        """Run a uv command.
+
+        Args:
+            command: The uv command to execute.
+            timeouts: The timeouts of the command.
+        """
+        supervision.run([str(self.bin), *command], timeouts)
+
+    def run(
+        self,
+        command: Iterable[str],
+        timeouts: Optional[supervision.Timeouts] = None,
+    ) -> None:
         """Run `uv tool run`.
 
         Note:
@@ -35,14 +55,6 @@ def run(self, command: Iterable[str]) -> None:
 
         Args:
             command: The `uv tool run` command to execute.
+            timeouts: The timeouts of the command.
         """
-        subprocess.run(  # nosec
-            [
-                self.bin,
-                "tool",
-                "run",
-                *command,
-            ],
-            shell=False,
-            check=True,
-        )
+        self.uv(["tool", "run", *command], timeouts)
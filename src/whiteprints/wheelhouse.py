@@ -0,0 +1,177 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Build and check wheelhouses.
+
+A wheelhouse is a directory holding the requirements of a tool environment,
+their lock file and every wheel the lock file pins. A tool environment is
+then installed from the wheelhouse only, without contacting a package index.
+"""
+
+import hashlib
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Final
+
+from whiteprints.uvx_run import UVX
+
+
+__all__: Final = [
+    "LOCK_FILE",
+    "REQUIREMENTS_FILE",
+    "WheelhouseError",
+    "build",
+    "check",
+    "digest",
+    "install_arguments",
+    "requirements_text",
+]
+"""Public module attributes."""
+
+
+REQUIREMENTS_FILE: Final = "requirements.in"
+"""The file listing the requirements."""
+
+LOCK_FILE: Final = "requirements.lock"
+"""The file pinning every package of the environment."""
+
+
+class WheelhouseError(ValueError):
+    """A wheelhouse cannot install an environment."""
+
+    def __init__(self, wheelhouse: Path, reason: str) -> None:
+        """Initialize the exception.
+
+        Args:
+            wheelhouse: the wheelhouse directory.
+            reason: why the wheelhouse cannot be used.
+        """
+        super().__init__(f"The wheelhouse '{wheelhouse}' {reason}.")
+
+
+def requirements_text(requirements: Iterable[str]) -> str:
+    """The content of a requirements file.
+
+    Args:
+        requirements: the requirements.
+
+    Returns:
+        The requirements, sorted, one per line.
+
+    Example:
+        >>> print(requirements_text(["copier", "context==1"]), end="")
+        context==1
+        copier
+    """
+    return "".join(
+        f"{requirement}\n" for requirement in sorted(set(requirements))
+    )
+
+
+def digest(wheelhouse: Path) -> str:
+    """Identify the packages of a wheelhouse.
+
+    Args:
+        wheelhouse: the wheelhouse directory.
+
+    Returns:
+        A digest of the lock file of the wheelhouse.
+    """
+    return hashlib.sha256((wheelhouse / LOCK_FILE).read_bytes()).hexdigest()
+
+
+def check(wheelhouse: Path, requirements: Iterable[str]) -> Path:
+    """Check that a wheelhouse was built for some requirements.
+
+    Args:
+        wheelhouse: the wheelhouse directory.
+        requirements: the requirements of the environment.
+
+    Returns:
+        The lock file of the wheelhouse.
+
+    Raises:
+        WheelhouseError: the wheelhouse was not built, or was built for other
+            requirements.
+    """
+    for name in (REQUIREMENTS_FILE, LOCK_FILE):
+        if not (wheelhouse / name).is_file():
+            raise WheelhouseError(
+                wheelhouse, reason=f"has no '{name}', build it first"
+            )
+
+    built = (wheelhouse / REQUIREMENTS_FILE).read_text(encoding="utf-8")
+    if built != requirements_text(requirements):
+        raise WheelhouseError(
+            wheelhouse,
+            reason=(
+                "was built for "
+                + (", ".join(built.split()) or "nothing")
+                + ", rebuild it"
+            ),
+        )
+
+    return wheelhouse / LOCK_FILE
+
+
+def build(wheelhouse: Path, requirements: Iterable[str]) -> Path:
+    """Build a wheelhouse.
+
+    The requirements are locked for the Python interpreter running
+    whiteprints, then the wheels pinned by the lock file are downloaded.
+
+    Args:
+        wheelhouse: the wheelhouse directory.
+        requirements: the requirements of the environment.
+
+    Returns:
+        The lock file of the wheelhouse.
+    """
+    uv = UVX()
+    wheelhouse.mkdir(parents=True, exist_ok=True)
+    (wheelhouse / REQUIREMENTS_FILE).write_text(
+        requirements_text(requirements), encoding="utf-8"
+    )
+    uv.uv(
+        [
+            "pip",
+            "compile",
+            "--quiet",
+            "--python",
+            sys.executable,
+            str(wheelhouse / REQUIREMENTS_FILE),
+            "--output-file",
+            str(wheelhouse / LOCK_FILE),
+        ]
+    )
+    uv.run(
+        [
+            "--python",
+            sys.executable,
+            "pip",
+            "download",
+            "--quiet",
+            "--only-binary",
+            ":all:",
+            "--no-deps",
+            "--requirement",
+            str(wheelhouse / LOCK_FILE),
+            "--dest",
+            str(wheelhouse),
+        ]
+    )
+    return wheelhouse / LOCK_FILE
+
+
+def install_arguments(wheelhouse: Path) -> list[str]:
+    """The uv arguments installing from a wheelhouse only.
+
+    Args:
+        wheelhouse: the wheelhouse directory.
+
+    Returns:
+        The arguments of `uv pip` disabling the network and the indexes.
+    """
+    return ["--offline", "--no-index", "--find-links", str(wheelhouse)]
@@ -0,0 +1,591 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Startup and import time benchmarks of the command line interface.
+
+Each scenario runs `python -X importtime -m whiteprints.cli <arguments>` in
+a subprocess, and records the wall time of the invocation and the cumulative
+import time of every module it imports. The modules already imported by a
+bare interpreter are left out.
+
+Each measured run starts from an empty cache directory, unless the scenario
+measures a warm cache: its runs then share a cache directory, filled by a
+first run (e.g. the rendered help screens, see whiteprints.cli.help_cache).
+
+The budgets of the scenarios and the non standard library modules they are
+allowed to import are configured in `startup_budgets.json`. The measurements
+are compared to a baseline stored in `startup_baseline.json`, which is
+refreshed with:
+
+    python -m tests.benchmarks.startup --update-baseline
+"""
+
+import argparse
+import fnmatch
+import importlib.util
+import json
+import os
+import subprocess  # nosec
+import sys
+import sysconfig
+import tempfile
+import time
+from collections.abc import Iterable, Mapping
+from functools import cache
+from pathlib import Path
+from typing import Final, Optional, TypedDict, cast
+
+from whiteprints.cache_directory import CACHE_DIRECTORY_VARIABLE
+
+
+__all__: Final = [
+    "BASELINE_FILE",
+    "BUDGETS_FILE",
+    "Budget",
+    "ImportRecord",
+    "Measurement",
+    "budget_violations",
+    "diff",
+    "load_baseline",
+    "load_budgets",
+    "main",
+    "measure",
+    "parse_importtime",
+    "scenario_environment",
+    "store_baseline",
+    "unexpected_imports",
+]
+"""Public module attributes."""
+
+
+BENCHMARKS_DIRECTORY: Final = Path(__file__).parent
+"""The directory holding the benchmarks configuration."""
+
+BUDGETS_FILE: Final = BENCHMARKS_DIRECTORY / "startup_budgets.json"
+"""The budgets of the startup scenarios."""
+
+BASELINE_FILE: Final = BENCHMARKS_DIRECTORY / "startup_baseline.json"
+"""The stored baseline of the startup scenarios."""
+
+IMPORTTIME_PREFIX: Final = "import time:"
+"""The prefix of the lines printed by `python -X importtime`."""
+
+PROBED_MODULES: Final = frozenset({"org", "org.python", "org.python.core"})
+"""Modules the standard library tries (and fails) to import on CPython."""
+
+DEFAULT_REPEAT: Final = 5
+"""The default number of runs of a scenario, the fastest run is kept."""
+
+DIFF_THRESHOLD_MS: Final = 1.0
+"""The smallest change of a module import time reported by the diff."""
+
+DIFF_LIMIT: Final = 10
+"""The largest number of modules reported by the diff of a scenario."""
+
+
+class ImportRecord(TypedDict):
+    """A module import, as reported by `python -X importtime`."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class Budget(TypedDict):
+    """The budget of a startup scenario."""
+
+    arguments: str
+    warm_cache: bool
+    wall_time_ms: float
+    import_time_ms: float
+    allowed_imports: list[str]
+
+
+class Measurement(TypedDict):
+    """The measurement of a startup scenario."""
+
+    wall_time_ms: float
+    import_time_ms: float
+    modules: dict[str, float]
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    r"""Parse the output of `python -X importtime`.
+
+    Args:
+        output: the standard error of the interpreter.
+
+    Returns:
+        The imports, in the order in which they completed.
+
+    Example:
+        >>> parse_importtime(
+        ...     "import time: self [us] | cumulative | imported package\n"
+        ...     "import time:        30 |         42 |   a.b\n"
+        ... )
+        [{'name': 'a.b', 'self_us': 30, 'cumulative_us': 42, 'depth': 1}]
+    """
+    records: list[ImportRecord] = []
+    for line in output.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+
+        self_us, cumulative_us, package = line[len(IMPORTTIME_PREFIX) :].split(
+            "|"
+        )
+        if not self_us.strip().isdigit():
+            continue
+
+        name = package.lstrip(" ")
+        records.append(
+            {
+                "name": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(package) - len(name) - 1) // 2,
+            }
+        )
+
+    return records
+
+
+def _run(
+    arguments: Iterable[str],
+    *,
+    importtime: bool,
+    env: Mapping[str, str],
+) -> tuple[float, str]:
+    """Run the interpreter.
+
+    Args:
+        arguments: the arguments of the interpreter.
+        importtime: whether to report the import times.
+        env: the environment of the interpreter.
+
+    Returns:
+        The wall time of the run, in milliseconds, and its standard error.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(  # nosec
+        [
+            sys.executable,
+            *(["-X", "importtime"] if importtime else []),
+            *arguments,
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=dict(env),
+        text=True,
+        check=True,
+    )
+    return (time.perf_counter() - start) * 1000, result.stderr
+
+
+@cache
+def _interpreter_modules() -> frozenset[str]:
+    """The modules imported by a bare interpreter.
+
+    Returns:
+        The names of the modules.
+    """
+    _, output = _run(["-c", "pass"], importtime=True, env=os.environ)
+    return frozenset(record["name"] for record in parse_importtime(output))
+
+
+def _import_times(output: str) -> dict[str, float]:
+    """The cumulative import times of the modules of a scenario.
+
+    Args:
+        output: the standard error of the scenario.
+
+    Returns:
+        A mapping from the modules to their cumulative import time, in
+        milliseconds.
+    """
+    return {
+        record["name"]: record["cumulative_us"] / 1000
+        for record in parse_importtime(output)
+        if record["name"] not in _interpreter_modules()
+    }
+
+
+def _import_time(output: str) -> float:
+    """The total import time of a scenario.
+
+    Args:
+        output: the standard error of the scenario.
+
+    Returns:
+        The sum of the cumulative import time of the outermost imports, in
+        milliseconds.
+    """
+    return sum(
+        record["cumulative_us"] / 1000
+        for record in parse_importtime(output)
+        if record["depth"] == 0
+        and record["name"] not in _interpreter_modules()
+    )
+
+
+def scenario_environment(cache_directory: Path) -> dict[str, str]:
+    """The environment in which the scenarios run.
+
+    Args:
+        cache_directory: the cache directory of the application.
+
+    Returns:
+        The environment.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    env[CACHE_DIRECTORY_VARIABLE] = str(cache_directory)
+    return env
+
+
+def _run_scenario(
+    arguments: Iterable[str],
+    *,
+    importtime: bool,
+    env: Mapping[str, str],
+    warm_cache: bool,
+) -> tuple[float, str]:
+    """Run a scenario.
+
+    Args:
+        arguments: the arguments of the interpreter.
+        importtime: whether to report the import times.
+        env: the environment of the interpreter.
+        warm_cache: whether to keep the cache directory of the environment,
+            instead of an empty one.
+
+    Returns:
+        The wall time of the run, in milliseconds, and its standard error.
+    """
+    if warm_cache:
+        return _run(arguments, importtime=importtime, env=env)
+
+    with tempfile.TemporaryDirectory() as cache_directory:
+        return _run(
+            arguments,
+            importtime=importtime,
+            env={**env, CACHE_DIRECTORY_VARIABLE: cache_directory},
+        )
+
+
+def measure(
+    budget: Budget,
+    *,
+    env: Mapping[str, str],
+    repeat: int = DEFAULT_REPEAT,
+) -> Measurement:
+    """Measure a scenario.
+
+    The scenario is run once to warm the bytecode, and the cache directory
+    of a warm cache scenario, then `repeat` times. The fastest run is kept.
+
+    Args:
+        budget: the budget of the scenario, giving its arguments and cache.
+        env: the environment of the interpreter.
+        repeat: the number of measured runs.
+
+    Returns:
+        The measurement.
+    """
+    arguments = ["-m", "whiteprints.cli", *budget["arguments"].split()]
+    _run(arguments, importtime=False, env=env)
+    wall_times: list[float] = []
+    import_times: list[float] = []
+    modules: dict[str, float] = {}
+    for _ in range(repeat):
+        wall_time, _ = _run_scenario(
+            arguments,
+            importtime=False,
+            env=env,
+            warm_cache=budget["warm_cache"],
+        )
+        wall_times.append(wall_time)
+        _, output = _run_scenario(
+            arguments,
+            importtime=True,
+            env=env,
+            warm_cache=budget["warm_cache"],
+        )
+        import_times.append(_import_time(output))
+        for name, cumulative in _import_times(output).items():
+            modules[name] = min(cumulative, modules.get(name, cumulative))
+
+    return {
+        "wall_time_ms": min(wall_times),
+        "import_time_ms": min(import_times),
+        "modules": modules,
+    }
+
+
+@cache
+def _standard_library_directory() -> Path:
+    """The directory of the standard library.
+
+    Returns:
+        The path of the directory.
+    """
+    return Path(sysconfig.get_paths()["stdlib"]).resolve()
+
+
+def _is_standard_library(name: str) -> bool:
+    """Check whether a module belongs to the standard library.
+
+    Args:
+        name: the name of the module.
+
+    Returns:
+        True if the module belongs to the standard library.
+    """
+    top_level = name.partition(".")[0]
+    if sys.version_info >= (3, 10):
+        return top_level in sys.stdlib_module_names
+
+    spec = importlib.util.find_spec(top_level)
+    return (
+        spec is None
+        or spec.origin in {None, "built-in", "frozen"}
+        or (
+            _standard_library_directory() in Path(str(spec.origin)).parents
+            and "site-packages" not in Path(str(spec.origin)).parts
+        )
+    )
+
+
+def unexpected_imports(
+    measurement: Measurement,
+    allowed_imports: Iterable[str],
+) -> list[str]:
+    """The modules imported by a scenario outside of its allowed imports.
+
+    Args:
+        measurement: the measurement of the scenario.
+        allowed_imports: the glob patterns of the modules the scenario is
+            allowed to import, beside the standard library.
+
+    Returns:
+        The names of the unexpected modules.
+    """
+    allowed_imports = list(allowed_imports)
+    return sorted(
+        name
+        for name in measurement["modules"]
+        if not _is_standard_library(name)
+        and name not in PROBED_MODULES
+        and not any(
+            fnmatch.fnmatchcase(name, pattern) for pattern in allowed_imports
+        )
+    )
+
+
+def budget_violations(
+    measurement: Measurement,
+    budget: Budget,
+) -> list[str]:
+    """The budgets exceeded by a scenario.
+
+    Args:
+        measurement: the measurement of the scenario.
+        budget: the budget of the scenario.
+
+    Returns:
+        A description of every exceeded budget.
+    """
+    violations = [
+        f"{key} is {measurement[key]:.1f} ms, over the {budget[key]} ms budget"
+        for key in ("wall_time_ms", "import_time_ms")
+        if measurement[key] > budget[key]
+    ]
+    violations.extend(
+        f"{name} is not an allowed import"
+        for name in unexpected_imports(measurement, budget["allowed_imports"])
+    )
+    return violations
+
+
+def _change(before: Optional[float], after: Optional[float]) -> str:
+    """Describe the change of a timing.
+
+    Args:
+        before: the timing of the baseline, in milliseconds.
+        after: the measured timing, in milliseconds.
+
+    Returns:
+        The description of the change.
+    """
+    if before is None:
+        return f"{after:8.1f} ms (new)"
+
+    if after is None:
+        return f"{before:8.1f} ms (removed)"
+
+    return f"{after:8.1f} ms ({after - before:+.1f} ms)"
+
+
+def _module_changes(
+    baseline: Mapping[str, float],
+    modules: Mapping[str, float],
+) -> list[str]:
+    """The modules whose import time changed the most.
+
+    Args:
+        baseline: the import times of the baseline, in milliseconds.
+        modules: the measured import times, in milliseconds.
+
+    Returns:
+        A description of the change of every module.
+    """
+    changes = sorted(
+        (
+            (abs(modules.get(name, 0) - baseline.get(name, 0)), name)
+            for name in {*baseline, *modules}
+        ),
+        reverse=True,
+    )
+    return [
+        f"    {name:<48} " + _change(baseline.get(name), modules.get(name))
+        for change, name in changes[:DIFF_LIMIT]
+        if change >= DIFF_THRESHOLD_MS
+    ]
+
+
+def diff(
+    scenario: str,
+    baseline: Optional[Measurement],
+    measurement: Measurement,
+) -> str:
+    """Compare a measurement to its baseline.
+
+    Args:
+        scenario: the name of the scenario.
+        baseline: the baseline of the scenario, if any.
+        measurement: the measurement of the scenario.
+
+    Returns:
+        A report of the timings, and of the modules whose import time
+        changed the most.
+    """
+    lines = [scenario]
+    lines.extend(
+        f"  {key:<16}"
+        + _change(
+            None if baseline is None else baseline[key],
+            measurement[key],
+        )
+        for key in ("wall_time_ms", "import_time_ms")
+    )
+    lines.extend(
+        _module_changes(
+            {} if baseline is None else baseline["modules"],
+            measurement["modules"],
+        )
+    )
+    return "\n".join(lines)
+
+
+def load_budgets() -> dict[str, Budget]:
+    """Load the budgets of the scenarios.
+
+    Returns:
+        A mapping from the scenarios to their budget.
+    """
+    return cast(
+        "dict[str, Budget]",
+        json.loads(BUDGETS_FILE.read_text(encoding="utf-8")),
+    )
+
+
+def load_baseline() -> dict[str, Measurement]:
+    """Load the stored baseline of the scenarios.
+
+    Returns:
+        A mapping from the scenarios to their baseline, empty if no baseline
+        is stored.
+    """
+    if not BASELINE_FILE.is_file():
+        return {}
+
+    return cast(
+        "dict[str, Measurement]",
+        json.loads(BASELINE_FILE.read_text(encoding="utf-8")),
+    )
+
+
+def store_baseline(measurements: Mapping[str, Measurement]) -> None:
+    """Store the baseline of the scenarios.
+
+    Args:
+        measurements: a mapping from the scenarios to their measurement.
+    """
+    BASELINE_FILE.write_text(
+        json.dumps(
+            {
+                scenario: {
+                    "wall_time_ms": round(measurement["wall_time_ms"], 1),
+                    "import_time_ms": round(measurement["import_time_ms"], 1),
+                    "modules": {
+                        name: round(cumulative, 3)
+                        for name, cumulative in sorted(
+                            measurement["modules"].items()
+                        )
+                    },
+                }
+                for scenario, measurement in measurements.items()
+            },
+            indent=2,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmarks and print their diff against the baseline.
+
+    Args:
+        argv: the command line arguments.
+
+    Returns:
+        The exit status, 1 if a budget is exceeded.
+    """
+    parser = argparse.ArgumentParser(description="Run the startup benchmarks.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--update-baseline", action="store_true")
+    arguments = parser.parse_args(argv)
+
+    baseline = load_baseline()
+    measurements: dict[str, Measurement] = {}
+    violations: list[str] = []
+    with tempfile.TemporaryDirectory() as cache_directory:
+        env = scenario_environment(Path(cache_directory))
+        for scenario, budget in load_budgets().items():
+            measurements[scenario] = measure(
+                budget, env=env, repeat=arguments.repeat
+            )
+            sys.stdout.write(
+                diff(scenario, baseline.get(scenario), measurements[scenario])
+                + "\n"
+            )
+            violations.extend(
+                f"{scenario}: {violation}"
+                for violation in budget_violations(
+                    measurements[scenario], budget
+                )
+            )
+
+    if arguments.update_baseline:
+        store_baseline(measurements)
+
+    sys.stderr.writelines(f"{violation}\n" for violation in violations)
+    return int(bool(violations))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the startup of the command line interface."""
+
+from pathlib import Path
+
+import pytest
+
+from tests.benchmarks import startup
+
+
+SCENARIOS = list(startup.load_budgets())
+
+
+class TestImports:
+    """Test the modules imported at startup."""
+
+    @staticmethod
+    @pytest.mark.parametrize("scenario", SCENARIOS)
+    def test_allowed_imports(scenario: str, tmp_path: Path) -> None:
+        """Check that a scenario only imports its allowed modules.
+
+        Args:
+            scenario: the name of the scenario.
+            tmp_path: a temporary directory.
+        """
+        measurement = startup.measure(
+            startup.load_budgets()[scenario],
+            env=startup.scenario_environment(tmp_path),
+            repeat=1,
+        )
+        unexpected = startup.unexpected_imports(
+            measurement,
+            startup.load_budgets()[scenario]["allowed_imports"],
+        )
+        assert not unexpected, (
+            f"'{scenario}' imports unexpected modules: {unexpected}."
+        )
+
+
+@pytest.mark.benchmark
+class TestBudgets:
+    """Test the startup time against the budgets."""
+
+    @staticmethod
+    @pytest.mark.parametrize("scenario", SCENARIOS)
+    def test_budget(
+        scenario: str,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Check that a scenario runs within its budget.
+
+        The diff against the stored baseline is printed, and reported when
+        the budget is exceeded.
+
+        Args:
+            scenario: the name of the scenario.
+            tmp_path: a temporary directory.
+            capsys: the pytest capture fixture.
+        """
+        measurement = startup.measure(
+            startup.load_budgets()[scenario],
+            env=startup.scenario_environment(tmp_path),
+        )
+        report = startup.diff(
+            scenario,
+            startup.load_baseline().get(scenario),
+            measurement,
+        )
+        with capsys.disabled():
+            print(f"\n{report}")  # noqa: T201
+
+        violations = startup.budget_violations(
+            measurement,
+            startup.load_budgets()[scenario],
+        )
+        assert not violations, "\n".join([*violations, report])
+
+
+class TestParser:
+    """Test the parser of the import times."""
+
+    @staticmethod
+    def test_nested_imports() -> None:
+        """Check the depth and timings of nested imports."""
+        records = startup.parse_importtime(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:         5 |          5 |     a.b.c\n"
+            "import time:        10 |         15 |   a.b\n"
+            "import time:        20 |         35 | a\n"
+        )
+        assert [(record["name"], record["depth"]) for record in records] == [
+            ("a.b.c", 2),
+            ("a.b", 1),
+            ("a", 0),
+        ], "The import tree is not parsed."
+        assert records[-1]["cumulative_us"] == 35, (  # noqa: PLR2004
+            "The cumulative import time is not parsed."
+        )
@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Cache directory fixture."""
+
+from pathlib import Path
+
+import pytest
+
+from whiteprints.cache_directory import CACHE_DIRECTORY_VARIABLE
+
+
+@pytest.fixture
+def cache_directory(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Use a temporary user cache directory.
+
+    Args:
+        monkeypatch: the pytest monkeypatch fixture.
+        tmp_path: a temporary directory.
+
+    Returns:
+        The temporary user cache directory.
+    """
+    directory = tmp_path / "cache"
+    monkeypatch.setenv(CACHE_DIRECTORY_VARIABLE, str(directory))
+    return directory
@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the async_run module."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from subprocess import CalledProcessError  # nosec
+from typing import Final
+
+import pytest
+
+from whiteprints import async_run
+
+
+SLEEP: Final = 0.2
+"""How long the test commands sleep, in seconds."""
+
+EXIT_CODE: Final = 3
+"""The exit code of the failing test command."""
+
+LONG_LINE: Final = 3 * async_run.CHUNK_SIZE + 1
+"""The length of a line longer than the limit of the output streams."""
+
+
+class TestAsyncRunner:
+    """Test the asynchronous runner."""
+
+    @staticmethod
+    def test_output(tmp_path: Path) -> None:
+        """Check that the output is logged and streamed to the callbacks.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        lines: list[bytes] = []
+        result = asyncio.run(
+            async_run.AsyncRunner(log_directory=tmp_path).run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import sys; print('out'); print('err', file=sys.stderr)",
+                ],
+                name="layer",
+                on_stdout=lines.append,
+            )
+        )
+        assert result["returncode"] == 0, "The command failed."
+        assert result["stdout"] == tmp_path / "layer.stdout.log", (
+            "The standard output was not logged."
+        )
+        assert (tmp_path / "layer.stdout.log").read_text() == "out\n", (
+            "The standard output log is wrong."
+        )
+        assert result["stderr"] is not None, "The standard error was lost."
+        assert result["stderr"].read_text().splitlines() == ["err"], (
+            "The standard error log is wrong."
+        )
+        assert [line.strip() for line in lines] == [b"out"], (
+            "The callback did not receive the standard output."
+        )
+
+    @staticmethod
+    def test_long_line(tmp_path: Path) -> None:
+        """Check that a line longer than the stream limit is drained.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        lines: list[bytes] = []
+        result = asyncio.run(
+            async_run.AsyncRunner(log_directory=tmp_path).run(
+                [sys.executable, "-c", f"print('0' * {LONG_LINE}, end='')"],
+                name="long",
+                on_stdout=lines.append,
+            )
+        )
+        assert result["returncode"] == 0, "The command failed."
+        assert b"".join(lines) == b"0" * LONG_LINE, (
+            "The callback did not receive the long line."
+        )
+        assert (tmp_path / "long.stdout.log").stat().st_size == LONG_LINE, (
+            "The long line was not logged."
+        )
+
+    @staticmethod
+    def test_limit() -> None:
+        """Check that the runner limits the commands running at once."""
+        runner = async_run.AsyncRunner(limit=1)
+        sleep = [sys.executable, "-c", f"import time; time.sleep({SLEEP})"]
+
+        async def run_both() -> tuple[async_run.ProcessResult, ...]:
+            return await asyncio.gather(
+                runner.run(sleep, name="first"),
+                runner.run(sleep, name="second"),
+            )
+
+        start = time.perf_counter()
+        asyncio.run(run_both())
+        assert time.perf_counter() - start >= 2 * SLEEP, (
+            "The commands ran concurrently."
+        )
+
+    @staticmethod
+    def test_failure() -> None:
+        """Check that a failing command is reported."""
+        result = asyncio.run(
+            async_run.AsyncRunner().run(
+                [sys.executable, "-c", f"raise SystemExit({EXIT_CODE})"],
+                name="failure",
+            )
+        )
+        assert result["returncode"] == EXIT_CODE, "The exit code was lost."
+        with pytest.raises(CalledProcessError):
+            async_run.check_returncode(result)
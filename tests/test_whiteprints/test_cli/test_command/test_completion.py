@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the completion command."""
+
+import os
+import shutil
+import subprocess  # nosec
+from pathlib import Path
+from typing import Final
+
+import pytest
+from click import testing
+
+from whiteprints.cli import completion, entrypoint
+
+
+COMPLETE: Final = (
+    'source "$0"; COMP_WORDS=("$@"); COMP_CWORD=$(($# - 1));'
+    ' _whiteprints_completion; echo "${COMPREPLY[*]}"'
+)
+"""A bash script completing its arguments with the completion script."""
+
+
+class TestCompletion:
+    """Test the shell completion."""
+
+    @staticmethod
+    @pytest.fixture
+    def script(
+        cli_runner: testing.CliRunner, cache_directory: Path, tmp_path: Path
+    ) -> Path:
+        """Install the bash completion script.
+
+        The index is written to the temporary user cache directory, which
+        must be set up first.
+
+        Args:
+            cli_runner: the CLI test runner provided by typer.testing or a
+                fixture.
+            cache_directory: a temporary user cache directory (fixture).
+            tmp_path: a temporary directory.
+
+        Returns:
+            The path to the completion script.
+        """
+        script = tmp_path / "whiteprints.bash"
+        result = cli_runner.invoke(
+            entrypoint.whiteprints,
+            [
+                "completion",
+                "install",
+                "--shell",
+                "bash",
+                "--path",
+                str(script),
+            ],
+        )
+        assert result.exit_code == 0, "The CLI did not exit properly."
+        assert completion.index_file().is_relative_to(cache_directory), (
+            "The completion index was written to the user cache."
+        )
+        return script
+
+    @staticmethod
+    def test_install(script: Path) -> None:
+        """Check that the script and its index are written.
+
+        Args:
+            script: the path to the completion script.
+        """
+        assert "_whiteprints_completion" in script.read_text(), (
+            "The completion script was not written."
+        )
+        index = completion.index_file().read_text()
+        for alias in ("-gh", "--github", "--GitHub", "-ga", "--github-all"):
+            assert f"whiteprints init\toption\t{alias}\n" in index, (
+                f"The '{alias}' alias is missing from the completion index."
+            )
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_index(cli_runner: testing.CliRunner) -> None:
+        """Check that the completion index can be regenerated.
+
+        Args:
+            cli_runner: the CLI test runner provided by typer.testing or a
+                fixture.
+        """
+        result = cli_runner.invoke(
+            entrypoint.whiteprints,
+            ["completion", "index"],
+        )
+        assert result.exit_code == 0, "The CLI did not exit properly."
+        assert "whiteprints\tcommand\tinit\n" in (
+            completion.index_file().read_text()
+        ), "The 'init' command is missing from the completion index."
+
+    @staticmethod
+    @pytest.mark.skipif(
+        shutil.which("bash") is None,
+        reason="bash is not available",
+    )
+    @pytest.mark.parametrize(
+        ("words", "expected"),
+        [
+            (["whiteprints", "in"], "init"),
+            (["whiteprints", "init", "--github-"], "--github-all"),
+            (["whiteprints", "--log-level", "DEB"], "DEBUG"),
+        ],
+    )
+    def test_bash_completion(
+        script: Path,
+        cache_directory: Path,
+        words: list[str],
+        expected: str,
+    ) -> None:
+        """Check that bash completes from the index.
+
+        Args:
+            script: the path to the completion script.
+            cache_directory: a temporary user cache directory (fixture).
+            words: the words of the command line being completed.
+            expected: the expected completion.
+        """
+        result = subprocess.run(  # nosec
+            [
+                shutil.which("bash") or "bash",
+                "-c",
+                COMPLETE,
+                script,
+                *words,
+            ],
+            env={**os.environ, "WHITEPRINTS_CACHE_DIR": str(cache_directory)},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.split() == [expected], (
+            f"Completing {words} did not give '{expected}'."
+        )
@@ -0,0 +1,46 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the env command."""
+
+from pathlib import Path
+
+from click import testing
+
+from whiteprints.cli import entrypoint
+from whiteprints.cli.env import template_environment
+
+
+class TestEnv:
+    """Test the env command."""
+
+    @staticmethod
+    def test_prune(
+        cli_runner: testing.CliRunner,
+        cache_directory: Path,
+    ) -> None:
+        """Check that only the environment in use survives a prune.
+
+        Args:
+            cli_runner: the CLI test runner provided by typer.testing or a
+                fixture.
+            cache_directory: a temporary user cache directory.
+        """
+        stale = cache_directory / "environments" / "stale"
+        stale.mkdir(parents=True)
+        template_environment().path.mkdir(parents=True)
+        result = cli_runner.invoke(entrypoint.whiteprints, ["env", "prune"])
+        assert result.exit_code == 0, "The CLI did not exit properly."
+        assert not stale.exists(), "The stale environment was not removed."
+        assert template_environment().path.exists(), (
+            "The environment in use was removed."
+        )
+
+        result = cli_runner.invoke(
+            entrypoint.whiteprints, ["env", "prune", "--all"]
+        )
+        assert result.exit_code == 0, "The CLI did not exit properly."
+        assert not template_environment().path.exists(), (
+            "The environment in use was not removed."
+        )
@@ -5,12 +5,17 @@
 """Test the CLI entrypoint."""
 
 from pathlib import Path
+from subprocess import CalledProcessError  # nosec
 from typing import Final
 
+import pytest
 from click import testing
 
-from whiteprints.cli import entrypoint
+from whiteprints.cli import entrypoint, init
+from whiteprints.copier_run import Copier
 from whiteprints.debug_info import gather_debug_info
+from whiteprints.layers import Layer
+from whiteprints.staging import STAGING_DIRECTORY_VARIABLE
 
 
 MISSING_COMMAND_EXIT_CODE: Final = 2
@@ -34,6 +39,65 @@ def test_init_help(cli_runner: testing.CliRunner) -> None:
         )
         assert result.exit_code == 0, "The CLI did not exit properly."
 
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    @pytest.mark.parametrize("failing", [False, True])
+    def test_staged(
+        cli_runner: testing.CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        *,
+        failing: bool,
+    ) -> None:
+        """Check that the project is staged by default, then published.
+
+        Args:
+            cli_runner: the CLI test runner provided by typer.testing or a
+                fixture.
+            monkeypatch: fixture to patch the copier manager.
+            tmp_path: a temporary directory.
+            failing: whether the template fails to render.
+        """
+        pytest.importorskip("copier")
+        rendered: list[Path] = []
+
+        def copy(_self: Copier, command: list[str], **_kwargs: object) -> None:
+            template, directory = command[:2]
+            rendered.append(Path(directory))
+            (Path(directory) / "README.md").write_text(template)
+            if failing:
+                raise CalledProcessError(1, command)
+
+        staging = tmp_path / "staging"
+        staging.mkdir()
+        monkeypatch.setenv(STAGING_DIRECTORY_VARIABLE, str(staging))
+        monkeypatch.setattr(Copier, "copy", copy)
+        monkeypatch.setattr(
+            init,
+            "PYTHON_LAYER",
+            Layer(name="python", template="python", requires=()),
+        )
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "python").mkdir()
+        project = tmp_path / "project"
+        result = cli_runner.invoke(
+            entrypoint.whiteprints,
+            ["init", str(project), "--skip-checks"],
+        )
+
+        assert (result.exit_code == 0) is not failing, (
+            "The CLI did not exit properly."
+        )
+        assert staging in rendered[0].parents, (
+            "The template was not rendered in the staging directory."
+        )
+        assert not list(staging.iterdir()), (
+            "The staging directory was not removed."
+        )
+        assert (project / "README.md").exists() is not failing, (
+            "The project was not published, or published though it failed."
+        )
+
     @staticmethod
     def test_init(cli_runner: testing.CliRunner) -> None:
         """Check if calling a non existing command fail gracely.
@@ -51,6 +115,7 @@ def test_init(cli_runner: testing.CliRunner) -> None:
         )
 
     @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
     def test_init_python(
         cli_runner: testing.CliRunner,
         *,
@@ -58,6 +123,9 @@ def test_init_python(
     ) -> None:
         """Check if the command called no arguments return propperly.
 
+        The mirrors of the templates are cloned in a temporary cache
+        directory, the pre-flight checks are skipped.
+
         Args:
             cli_runner: the CLI test runner provided by typer.testing or a
                 fixture.
@@ -77,6 +145,7 @@ def test_init_python(
             [
                 "init",
                 str(init_path),
+                "--skip-checks",
                 "--force",
                 "--data",
                 "project_name=My Awesome Project",
@@ -108,6 +177,7 @@ def test_init_python(
         assert result.exit_code == 0, "The CLI did not exit properly."
 
     @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
     def test_init_python_fail_on_unknown_flags(
         cli_runner: testing.CliRunner,
         *,
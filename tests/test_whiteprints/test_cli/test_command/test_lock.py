@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the lock command."""
+
+import subprocess  # nosec
+from pathlib import Path
+
+import pytest
+from click import testing
+
+from whiteprints import lockfile
+from whiteprints.cli import entrypoint, init, templates
+
+
+class TestLock:
+    """Test the lock command."""
+
+    @staticmethod
+    def test_lock(
+        cli_runner: testing.CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        """Check that the lockfile is written, and an error reported.
+
+        Args:
+            cli_runner: the CLI test runner provided by typer.testing or a
+                fixture.
+            monkeypatch: fixture to use a local template.
+            tmp_path: a temporary directory.
+        """
+        template = str(tmp_path / "template")
+        subprocess.run(  # nosec
+            ["git", "init", "--quiet", template], check=True
+        )
+        subprocess.run(  # nosec
+            [
+                "git",
+                "-C",
+                template,
+                "-c",
+                "user.name=Whiteprints",
+                "-c",
+                "user.email=whiteprints@example.com",
+                "-c",
+                "commit.gpgsign=false",
+                "commit",
+                "--quiet",
+                "--allow-empty",
+                "-m",
+                "first",
+            ],
+            check=True,
+        )
+        locked = [template]
+
+        def local_templates() -> list[str]:
+            return locked
+
+        monkeypatch.setattr(templates, "templates", local_templates)
+        path = tmp_path / lockfile.LOCK_FILE
+        result = cli_runner.invoke(
+            entrypoint.whiteprints, ["lock", "--lockfile", str(path)]
+        )
+        assert result.exit_code == 0, "The CLI did not exit properly."
+        assert list(
+            lockfile.read(path, init.WHITEPRINTS_TEMPLATE_CONTEXT_VERSION)[
+                "templates"
+            ]
+        ) == [template], "The template was not locked."
+        locked[:] = [str(tmp_path)]
+        result = cli_runner.invoke(
+            entrypoint.whiteprints, ["lock", "--lockfile", str(path)]
+        )
+        assert result.exit_code != 0, "The unresolved template was locked."
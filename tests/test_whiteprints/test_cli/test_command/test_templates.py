@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the templates command."""
+
+import subprocess  # nosec
+from pathlib import Path
+
+import pytest
+from click import testing
+
+from whiteprints import mirrors
+from whiteprints.cli import entrypoint, templates
+
+
+class TestTemplates:
+    """Test the templates command."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_sync(
+        cli_runner: testing.CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        """Check that the templates are mirrored, listed and collected.
+
+        Args:
+            cli_runner: the CLI test runner provided by typer.testing or a
+                fixture.
+            monkeypatch: fixture to use a local template repository.
+            tmp_path: a temporary directory.
+        """
+        upstream = tmp_path / "template.git"
+        subprocess.run(  # nosec
+            ["git", "init", "--quiet", "--bare", str(upstream)],
+            check=True,
+        )
+
+        def local_templates() -> list[str]:
+            return [upstream.as_uri()]
+
+        monkeypatch.setattr(templates, "templates", local_templates)
+        result = cli_runner.invoke(
+            entrypoint.whiteprints, ["templates", "sync"]
+        )
+        assert result.exit_code == 0, "The CLI did not exit properly."
+        assert "Synchronized" in result.stdout, "The mirror was not synced."
+        result = cli_runner.invoke(
+            entrypoint.whiteprints, ["templates", "list"]
+        )
+        assert upstream.as_uri() in result.stdout, "The mirror is not listed."
+        monkeypatch.setattr(templates, "templates", list)
+        result = cli_runner.invoke(entrypoint.whiteprints, ["templates", "gc"])
+        assert result.exit_code == 0, "The CLI did not exit properly."
+        assert not mirrors.mirrors(), "The unused mirror was not removed."
@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the CLI dispatcher."""
+
+import pytest
+from click import testing
+
+from whiteprints import package_metadata
+from whiteprints.cli import __app_name__, dispatch, entrypoint
+
+
+class TestFastPath:
+    """Test the invocations answered without the rich stack."""
+
+    @staticmethod
+    @pytest.mark.parametrize("flag", ["--version", "--copyright"])
+    def test_fast_path_matches_entrypoint(
+        flag: str,
+        cli_runner: testing.CliRunner,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Check that the fast path prints the same output as the entrypoint.
+
+        Args:
+            flag: the eager flag to check.
+            cli_runner: the CLI test runner provided by typer.testing or a
+                fixture.
+            capsys: the pytest capture fixture.
+        """
+        dispatch.main([flag])
+        result = cli_runner.invoke(entrypoint.whiteprints, [flag])
+        assert capsys.readouterr().out == result.stdout, (
+            f"The fast path output differs for '{flag}'."
+        )
+
+    @staticmethod
+    def test_version(capsys: pytest.CaptureFixture[str]) -> None:
+        """Check the version printed by the fast path.
+
+        Args:
+            capsys: the pytest capture fixture.
+        """
+        dispatch.main(["--version"])
+        assert capsys.readouterr().out == (
+            f"{__app_name__}, version {package_metadata.__version__}\n"
+        ), "The version printed by the fast path is wrong."
+
+    @staticmethod
+    def test_license(capsys: pytest.CaptureFixture[str]) -> None:
+        """Check that the license texts are printed verbatim.
+
+        Args:
+            capsys: the pytest capture fixture.
+        """
+        dispatch.main(["--license"])
+        output = capsys.readouterr().out
+        for license_path in package_metadata.__license_file__:
+            assert license_path.read_text() in output, (
+                f"The license '{license_path.stem}' is not printed verbatim."
+            )
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_forward_to_entrypoint() -> None:
+        """Check that other invocations are forwarded to the entrypoint."""
+        with pytest.raises(SystemExit) as exit_info:
+            dispatch.main(["--help"])
+
+        assert exit_info.value.code == 0, "The CLI did not exit properly."
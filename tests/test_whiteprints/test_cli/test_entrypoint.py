@@ -67,6 +67,46 @@ def test_help_flag_exists(cli_runner: testing.CliRunner) -> None:
         )
         assert result.exit_code == 0, "The CLI did not exit properly."
 
+    @staticmethod
+    def test_help_lists_commands(cli_runner: testing.CliRunner) -> None:
+        """Check that the help lists the available commands."""
+        result = cli_runner.invoke(
+            entrypoint.whiteprints,
+            ["--help"],
+        )
+        assert "init" in result.stdout, "The 'init' command is not listed."
+
+    @staticmethod
+    def test_help_does_not_import_commands(
+        cli_runner: testing.CliRunner,
+    ) -> None:
+        """Check that the help summarizes the commands without importing them.
+
+        Args:
+            cli_runner: the CLI test runner provided by typer.testing or a
+                fixture.
+        """
+        loader = entrypoint.LazyCommandLoader(name="test")
+        loader.command_lookup = {
+            "missing": entrypoint.CommandEntry(
+                module="whiteprints.cli.command.missing",
+                function_name="missing",
+                short_help="A command that cannot be imported.",
+            )
+        }
+        result = cli_runner.invoke(loader, ["--help"])
+        assert result.exit_code == 0, "The CLI did not exit properly."
+        assert "A command that cannot be imported." in result.stdout, (
+            "The command summary is not listed."
+        )
+
+    @staticmethod
+    def test_command_lookup_matches_scan() -> None:
+        """Check that the command lookup table lists every command module."""
+        assert set(entrypoint.whiteprints.command_lookup) == set(
+            entrypoint.LazyCommandLoader.scan_commands()
+        ), "The command lookup table is out of date."
+
     @staticmethod
     def test_default(cli_runner: testing.CliRunner) -> None:
         """Check if the CLI called with default arguments return prpperly.
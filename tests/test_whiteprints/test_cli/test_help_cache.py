@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the help cache."""
+
+import subprocess  # nosec
+import sys
+from pathlib import Path
+
+import pytest
+
+from whiteprints.cli import dispatch
+
+
+def _help() -> str:
+    """Print the help screen in a new interpreter.
+
+    Returns:
+        The help screen printed.
+    """
+    return subprocess.run(  # nosec
+        [
+            sys.executable,
+            "-c",
+            "from whiteprints.cli import dispatch; dispatch.main(['--help'])",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+
+class TestHelpCache:
+    """Test the persistent cache of the rendered help screens."""
+
+    @staticmethod
+    def test_cache_hit(
+        cache_directory: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Check that a cached help screen is printed verbatim.
+
+        Args:
+            cache_directory: a temporary user cache directory (fixture).
+            capsys: the pytest capture fixture.
+        """
+        with pytest.raises(SystemExit):
+            dispatch.main(["init", "--help"])
+        rendered = capsys.readouterr().out
+
+        dispatch.main(["init", "--help"])
+        assert capsys.readouterr().out == rendered, (
+            "The cached help screen differs from the rendered one."
+        )
+        assert len(list((cache_directory / "help" / "init").iterdir())) == 1, (
+            "The help screen was not cached."
+        )
+
+    @staticmethod
+    def test_cache_invalidation(
+        cache_directory: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Check that a help screen is rendered again when the width changes.
+
+        Args:
+            cache_directory: a temporary user cache directory (fixture).
+            monkeypatch: the pytest monkeypatch fixture.
+        """
+        monkeypatch.setenv("COLUMNS", "80")
+        with pytest.raises(SystemExit):
+            dispatch.main(["--help"])
+        (stale,) = (cache_directory / "help" / "whiteprints").iterdir()
+
+        monkeypatch.setenv("COLUMNS", "120")
+        with pytest.raises(SystemExit):
+            dispatch.main(["--help"])
+        (fresh,) = (cache_directory / "help" / "whiteprints").iterdir()
+        assert fresh != stale, "The stale help screen was not replaced."
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_environment_invalidation(
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Check that a help screen is rendered again when a default changes.
+
+        The defaults of the options are read when the CLI is imported, each
+        help screen is printed by a new interpreter.
+
+        Args:
+            monkeypatch: the pytest monkeypatch fixture.
+        """
+        monkeypatch.setenv("COLUMNS", "200")
+        monkeypatch.delenv("WHITEPRINTS_LOG_LEVEL", raising=False)
+        assert "[default: ERROR]" in _help(), (
+            "The default log level is not shown."
+        )
+
+        monkeypatch.setenv("WHITEPRINTS_LOG_LEVEL", "DEBUG")
+        assert "[default: DEBUG]" in _help(), (
+            "The help screen of another environment was printed."
+        )
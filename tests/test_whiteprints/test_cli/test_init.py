@@ -0,0 +1,473 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the init module."""
+
+import json
+import sys
+from pathlib import Path
+from subprocess import CalledProcessError  # nosec
+
+import pytest
+
+from whiteprints import checkpoint, lockfile
+from whiteprints.cli import init
+from whiteprints.cli.init_interface import InitKwargs
+from whiteprints.copier_run import Copier
+from whiteprints.layers import Layer
+from whiteprints.staging import STAGING_DIRECTORY_VARIABLE
+from whiteprints.supervision import ProcessTimeoutError
+
+
+FLAGS = InitKwargs(
+    command_line=False,
+    github=False,
+    pypi=False,
+    codecov=False,
+    readthedocs=False,
+    protect_repository=False,
+    github_all=False,
+    copier_engine="subprocess",
+    compose=False,
+    jobs=1,
+    wheelhouse=None,
+    timeout=None,
+    inactivity_timeout=None,
+    defer_tasks=False,
+    in_place=False,
+    resume=False,
+    check=False,
+    skip_checks=True,
+    mirror_ttl=None,
+    render_cache="off",
+    remote_cache=None,
+    locked=False,
+    lockfile=Path("whiteprints.lock"),
+)
+"""The default command line flags."""
+
+LAYERS = (
+    Layer(name="python", template="python", requires=()),
+    Layer(name="github", template="github", requires=("python",)),
+)
+"""Local layers, rendered by a fake copier."""
+
+
+class TestLayers:
+    """Test the selection of the template layers."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("flags", "names"),
+        [
+            ({}, ["python"]),
+            ({"command_line": True}, ["python", "command_line"]),
+            ({"github": True}, ["python", "github"]),
+            ({"codecov": True}, ["python", "github", "codecov"]),
+            (
+                {"github_all": True},
+                [
+                    "python",
+                    "github",
+                    "pypi",
+                    "codecov",
+                    "readthedocs",
+                    "protect_repository",
+                ],
+            ),
+        ],
+    )
+    def test_selected_layers(flags: InitKwargs, names: list[str]) -> None:
+        """Check the layers selected by the command line flags.
+
+        Args:
+            flags: the command line flags set.
+            names: the names of the expected layers, in order.
+        """
+        layers = init.selected_layers(**{**FLAGS, **flags})
+        assert [layer["name"] for layer in layers] == names, (
+            "The selected layers are wrong."
+        )
+
+
+class TestRenderLayer:
+    """Test the rendering of a layer."""
+
+    @staticmethod
+    def test_timeout(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """Check that a timed out layer is reported by its name.
+
+        Args:
+            monkeypatch: fixture to patch the copier manager.
+            tmp_path: a temporary directory.
+        """
+
+        def copy(*_args: object, **_kwargs: object) -> None:
+            raise ProcessTimeoutError(kind="wall-clock", seconds=1)
+
+        monkeypatch.setattr(Copier, "copy", copy)
+        with pytest.raises(init.CopierCopyError, match="Layer 'python'"):
+            init.render_layer(
+                init.PYTHON_LAYER,
+                tmp_path,
+                copier=Copier(),
+                copier_args=[],
+            )
+
+    @staticmethod
+    @pytest.mark.parametrize("skip_tasks", [False, True])
+    def test_skip_tasks(
+        monkeypatch: pytest.MonkeyPatch, tmp_path: Path, *, skip_tasks: bool
+    ) -> None:
+        """Check that the tasks of a deferred layer are skipped.
+
+        Args:
+            monkeypatch: fixture to patch the copier manager.
+            tmp_path: a temporary directory.
+            skip_tasks: whether the tasks of the layer are deferred.
+        """
+        commands: list[list[str]] = []
+
+        def copy(_self: Copier, command: list[str], **_kwargs: object) -> None:
+            commands.append(command)
+
+        monkeypatch.setattr(Copier, "copy", copy)
+        init.render_layer(
+            init.Layer(
+                name="python", template="", requires=(), skip_tasks=skip_tasks
+            ),
+            tmp_path,
+            copier=Copier(),
+            copier_args=[],
+        )
+        assert ("--skip-tasks" in commands[0]) == skip_tasks, (
+            "The tasks of the layer were not deferred."
+        )
+        assert "--vcs-ref" not in commands[0], (
+            "An unlocked layer was not rendered at the version copier picks."
+        )
+
+
+class TestResume:
+    """Test resuming a failed initialization."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_resume(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """Check that a failed layer is resumed, the others are skipped.
+
+        Args:
+            monkeypatch: fixture to patch the copier manager.
+            tmp_path: a temporary directory.
+        """
+        pytest.importorskip("copier")
+        rendered: list[str] = []
+        failing = {"github"}
+
+        def copy(_self: Copier, command: list[str], **_kwargs: object) -> None:
+            template, directory = command[:2]
+            if template in failing:
+                raise CalledProcessError(1, command)
+
+            rendered.append(template)
+            (Path(directory) / template).write_text(template)
+
+        monkeypatch.setenv(STAGING_DIRECTORY_VARIABLE, str(tmp_path / "tmp"))
+        monkeypatch.setattr(Copier, "copy", copy)
+        monkeypatch.setattr(init, "GITHUB_LAYER", LAYERS[1])
+        monkeypatch.setattr(init, "PYTHON_LAYER", LAYERS[0])
+        monkeypatch.chdir(tmp_path)
+        for layer in LAYERS:
+            (tmp_path / layer["template"]).mkdir()
+
+        project = tmp_path / "project"
+        flags = FLAGS.copy()
+        flags["github"] = True
+        with pytest.raises(init.CopierCopyError):
+            init.init(project, [], **flags)
+
+        assert not project.exists(), "A failed project was published."
+        failing.clear()
+        flags["resume"] = True
+        init.init(project, [], **flags)
+        assert rendered == ["python", "github"], (
+            "The completed layer was rendered again."
+        )
+        assert sorted(path.name for path in project.iterdir()) == [
+            "github",
+            "python",
+        ], "The resumed project is wrong."
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_changed(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """Check that a project changed since its checkpoint is not resumed.
+
+        Args:
+            monkeypatch: fixture to set the staging directory.
+            tmp_path: a temporary directory.
+        """
+        monkeypatch.setenv(STAGING_DIRECTORY_VARIABLE, str(tmp_path / "tmp"))
+        project = tmp_path / "project"
+        project.mkdir()
+        progress = checkpoint.start(project, answers="answers")
+        checkpoint.record(project, progress, [LAYERS[0]], project)
+        (project / "README.md").write_text("changed\n")
+        with pytest.raises(checkpoint.CheckpointError, match="changed"):
+            checkpoint.resume(project, "answers", in_place=True)
+
+
+class TestPreflight:
+    """Test the pre-flight checks of an initialization."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_check(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """Check that `--check` fails on a missing template, writing nothing.
+
+        Args:
+            monkeypatch: fixture to use local layers.
+            tmp_path: a temporary directory.
+        """
+        monkeypatch.setenv(STAGING_DIRECTORY_VARIABLE, str(tmp_path / "tmp"))
+        monkeypatch.setattr(init, "PYTHON_LAYER", LAYERS[0])
+        monkeypatch.chdir(tmp_path)
+        project = tmp_path / "project"
+        flags = FLAGS.copy()
+        flags["check"] = True
+        with pytest.raises(init.PreflightCheckError, match="python template"):
+            init.init(project, [], **flags)
+
+        assert not project.exists(), "The check created the project."
+        (tmp_path / "python").mkdir()
+        init.init(project, [], **flags)
+        assert not project.exists(), "The check created the project."
+
+
+def _fake_templates(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    *,
+    skip_tasks: bool,
+) -> list[str]:
+    """Render the local layers with a fake copier, recording the renders.
+
+    Args:
+        monkeypatch: fixture to patch the copier manager.
+        tmp_path: a temporary directory, holding the templates.
+        skip_tasks: whether the layers skip their tasks.
+
+    Returns:
+        The templates rendered, in order.
+    """
+    rendered: list[str] = []
+
+    def copy(_self: Copier, command: list[str], **_kwargs: object) -> None:
+        template, directory = command[:2]
+        rendered.append(template)
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        (Path(directory) / template).write_text(
+            (tmp_path / template / "content").read_text()
+        )
+
+    monkeypatch.setenv(STAGING_DIRECTORY_VARIABLE, str(tmp_path / "tmp"))
+    monkeypatch.setattr(Copier, "copy", copy)
+    python, github = (
+        Layer(**layer, skip_tasks=skip_tasks)  # type: ignore[misc]
+        for layer in LAYERS
+    )
+    monkeypatch.setattr(init, "PYTHON_LAYER", python)
+    monkeypatch.setattr(init, "GITHUB_LAYER", github)
+    monkeypatch.chdir(tmp_path)
+    for layer in LAYERS:
+        (tmp_path / layer["template"]).mkdir()
+        (tmp_path / layer["template"] / "content").write_text("first")
+
+    return rendered
+
+
+def _task_template(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, task: list[str]
+) -> list[Path]:
+    """Render a local template holding a task, with a fake copier.
+
+    Args:
+        monkeypatch: fixture to patch the copier manager.
+        tmp_path: a temporary directory, holding the template.
+        task: the task of the template.
+
+    Returns:
+        The directories the template is rendered in.
+    """
+    pytest.importorskip("copier")
+    directories: list[Path] = []
+
+    def copy(_self: Copier, command: list[str], **_kwargs: object) -> None:
+        directories.append(Path(command[1]))
+
+    monkeypatch.setenv(STAGING_DIRECTORY_VARIABLE, str(tmp_path / "tmp"))
+    monkeypatch.setattr(Copier, "copy", copy)
+    monkeypatch.setattr(init, "PYTHON_LAYER", LAYERS[0])
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "python").mkdir()
+    (tmp_path / "python" / "copier.yml").write_text(
+        json.dumps({"_tasks": [task]})
+    )
+    return directories
+
+
+class TestStaging:
+    """Test the staging of an initialization."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_deferred(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """Check that the tasks of a staged layer run in the project.
+
+        Args:
+            monkeypatch: fixture to patch the copier manager.
+            tmp_path: a temporary directory.
+        """
+        directories = _task_template(
+            monkeypatch,
+            tmp_path,
+            [
+                sys.executable,
+                "-c",
+                "import os; open('location', 'w').write(os.getcwd())",
+            ],
+        )
+        project = tmp_path / "project"
+        init.init(project, [], **FLAGS)
+
+        assert project not in directories, "The layer was not staged."
+        assert Path((project / "location").read_text()).samefile(project), (
+            "The task did not run in the published project."
+        )
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_templated(
+        monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Check that a layer whose tasks cannot be deferred is not staged.
+
+        Args:
+            monkeypatch: fixture to patch the copier manager.
+            tmp_path: a temporary directory.
+        """
+        directories = _task_template(
+            monkeypatch, tmp_path, ["echo", "{{ project_name }}"]
+        )
+        project = tmp_path / "project"
+        init.init(project, [], **FLAGS)
+
+        assert directories == [project], (
+            "A layer running its own tasks was staged."
+        )
+
+
+class TestRenderCache:
+    """Test the render cache of an initialization."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    @pytest.mark.parametrize("in_place", [False, True])
+    def test_cached(
+        monkeypatch: pytest.MonkeyPatch, tmp_path: Path, *, in_place: bool
+    ) -> None:
+        """Check that a step rendered before is materialised from the cache.
+
+        Args:
+            monkeypatch: fixture to patch the copier manager.
+            tmp_path: a temporary directory.
+            in_place: whether the templates render into the project.
+        """
+        rendered = _fake_templates(monkeypatch, tmp_path, skip_tasks=True)
+        flags = FLAGS.copy()
+        flags["github"] = True
+        flags["render_cache"] = "hardlink"
+        flags["in_place"] = in_place
+        init.init(tmp_path / "first", ["--defaults"], **flags)
+        (tmp_path / "github" / "content").write_text("changed")
+        init.init(tmp_path / "second", ["--defaults"], **flags)
+        init.init(tmp_path / "third", ["--defaults"], **flags)
+
+        assert rendered == ["python", "github", "github"], (
+            "Only the changed template should be rendered again."
+        )
+        assert (tmp_path / "second" / "python").read_text() == "first", (
+            "The cached layer was not materialised."
+        )
+        assert (tmp_path / "second" / "github").read_text() == "changed", (
+            "The changed layer was materialised from the cache."
+        )
+        assert (tmp_path / "third" / "github").stat().st_nlink == 1, (
+            "The project is hard linked to the render cache."
+        )
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_tasks_not_cached(
+        monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Check that a layer running its tasks is rendered every time.
+
+        Args:
+            monkeypatch: fixture to patch the copier manager.
+            tmp_path: a temporary directory.
+        """
+        rendered = _fake_templates(monkeypatch, tmp_path, skip_tasks=False)
+        flags = FLAGS.copy()
+        flags["render_cache"] = "copy"
+        flags["in_place"] = True
+        init.init(tmp_path / "first", ["--defaults"], **flags)
+        init.init(tmp_path / "second", ["--defaults"], **flags)
+
+        assert rendered == ["python", "python"], (
+            "A layer running its tasks was materialised from the cache."
+        )
+
+
+class TestLocked:
+    """Test the initialization from a lockfile."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_locked(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """Check that the layers render at their locked commit.
+
+        Args:
+            monkeypatch: fixture to patch the copier manager.
+            tmp_path: a temporary directory.
+        """
+        commands: list[list[str]] = []
+
+        def copy(_self: Copier, command: list[str], **_kwargs: object) -> None:
+            commands.append(command)
+
+        monkeypatch.setenv(STAGING_DIRECTORY_VARIABLE, str(tmp_path / "tmp"))
+        monkeypatch.setattr(Copier, "copy", copy)
+        monkeypatch.setattr(init, "PYTHON_LAYER", LAYERS[0])
+        monkeypatch.setattr(init, "GITHUB_LAYER", LAYERS[1])
+        flags = FLAGS.copy()
+        flags["in_place"] = True
+        flags["locked"] = True
+        flags["lockfile"] = tmp_path / lockfile.LOCK_FILE
+        lockfile.write(
+            flags["lockfile"],
+            lockfile.Lock(
+                version=lockfile.LOCK_VERSION,
+                template_context=init.WHITEPRINTS_TEMPLATE_CONTEXT_VERSION,
+                templates={"python": "0" * 40},
+            ),
+        )
+        init.init(tmp_path / "project", [], **flags)
+
+        assert commands[0][-2:] == ["--vcs-ref", "0" * 40], (
+            "The layer was not rendered at its locked commit."
+        )
+        flags["github"] = True
+        with pytest.raises(init.LockfileError, match="github not locked"):
+            init.init(tmp_path / "project", [], **flags)
@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the composition module."""
+
+import filecmp
+from pathlib import Path
+
+import pytest
+
+from whiteprints import composition
+from whiteprints.copier_run import Copier
+
+
+ANSWERS_TEMPLATE = (
+    "# Changes here will be overwritten by Copier\n"
+    "{{ _copier_answers|to_nice_yaml -}}\n"
+)
+
+
+@pytest.fixture
+def layers(tmp_path: Path) -> list[str]:
+    """Two local template layers, overlapping on a file and a question.
+
+    Args:
+        tmp_path: a temporary directory.
+
+    Returns:
+        The paths of the layers.
+    """
+    base = tmp_path / "base"
+    base.mkdir()
+    (base / "copier.yml").write_text(
+        "_answers_file: .copier-answers.base.yml\n"
+        "name:\n  type: str\n  default: World\n"
+    )
+    (base / "{{_copier_conf.answers_file}}.jinja").write_text(ANSWERS_TEMPLATE)
+    (base / "README.md.jinja").write_text("Hello {{ name }}\n")
+    (base / "base.txt").write_text("base\n")
+
+    feature = tmp_path / "feature"
+    template = feature / "template"
+    (template / "src").mkdir(parents=True)
+    (feature / "copier.yml").write_text(
+        "_answers_file: .copier-answers.feature.yml\n"
+        "_subdirectory: template\n"
+        "name:\n  type: str\n"
+        "flavour:\n  type: str\n  default: vanilla\n"
+    )
+    (
+        feature / "template" / "{{ _copier_conf.answers_file }}.jinja"
+    ).write_text(ANSWERS_TEMPLATE)
+    (feature / "template" / "README.md.jinja").write_text(
+        "Hello {{ name }}, {{ flavour }}\n"
+    )
+    (template / "src" / "feature.txt.jinja").write_text("{{ flavour }}\n")
+    return [str(base), str(feature)]
+
+
+def _same_tree(left: Path, right: Path) -> bool:
+    """Check whether two directories hold the same files.
+
+    Args:
+        left: a directory.
+        right: another directory.
+
+    Returns:
+        True if the directories hold the same files, False otherwise.
+    """
+    comparison = filecmp.dircmp(left, right)
+    return (
+        not comparison.left_only
+        and not comparison.right_only
+        and not filecmp.cmpfiles(
+            left, right, comparison.common_files, shallow=False
+        )[1]
+        and all(
+            _same_tree(left / directory, right / directory)
+            for directory in comparison.common_dirs
+        )
+    )
+
+
+@pytest.mark.usefixtures("cache_directory")
+class TestCompose:
+    """Test the composition of template layers."""
+
+    @staticmethod
+    def test_same_as_sequential(layers: list[str], tmp_path: Path) -> None:
+        """Check that a composition renders as the sequential layers.
+
+        Args:
+            layers: two local template layers.
+            tmp_path: a temporary directory.
+        """
+        pytest.importorskip("copier")
+        copier = Copier(engine="in-process")
+        arguments = ["--defaults", "--overwrite", "--data", "name=Whiteprints"]
+        for layer in layers:
+            copier.copy([layer, str(tmp_path / "sequential"), *arguments])
+
+        composition.compose(layers, tmp_path / "composed")
+        copier.copy(
+            [
+                str(tmp_path / "composed"),
+                str(tmp_path / "project"),
+                *arguments,
+            ]
+        )
+        assert _same_tree(tmp_path / "sequential", tmp_path / "project"), (
+            "The composition differs from the sequential layers."
+        )
+
+    @staticmethod
+    def test_not_composable(layers: list[str], tmp_path: Path) -> None:
+        """Check that layers rendering differently are not composed.
+
+        Args:
+            layers: two local template layers.
+            tmp_path: a temporary directory.
+        """
+        pytest.importorskip("copier")
+        with (Path(layers[1]) / "copier.yml").open("a") as configuration:
+            configuration.write("_templates_suffix: .tmpl\n")
+
+        with pytest.raises(composition.NotComposableError):
+            composition.compose(layers, tmp_path / "composed")
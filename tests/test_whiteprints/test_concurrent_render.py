@@ -0,0 +1,172 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the concurrent_render module."""
+
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Final
+
+import pytest
+
+from whiteprints import concurrent_render
+
+
+FILES: Final = 64
+"""The number of templated files of the test template."""
+
+JOBS: Final = 8
+"""The number of files rendered concurrently."""
+
+
+def _template(path: Path) -> Path:
+    """Create a template with templated, binary and executable files.
+
+    Args:
+        path: the template directory.
+
+    Returns:
+        The template directory.
+    """
+    path.mkdir()
+    (path / "copier.yml").write_text(
+        "name:\n  type: str\n  default: World\n"
+        "items:\n  type: yaml\n  default: [first, second]\n"
+        "_exclude: [copier.yml, excluded.txt]\n"
+        "_envops: {undefined: jinja2.StrictUndefined}\n"
+    )
+    for index in range(FILES):
+        nested = path / f"directory_{index % 4}"
+        nested.mkdir(exist_ok=True)
+        (nested / f"file_{index}.txt.jinja").write_text(
+            f"{{{{ name }}}} {index}\n{{{{ items | join(', ') }}}}\n" * index
+        )
+
+    (path / "{{ name }}_directory").mkdir()
+    (path / "{{ name }}_directory" / "{{ name }}.txt.jinja").write_text(
+        "{{ name | upper }}\n"
+    )
+    (
+        path / "{% yield item from items %}{{ item }}{% endyield %}.jinja"
+    ).write_text("{{ item }} of {{ name }}\n")
+    (path / "asset.bin").write_bytes(bytes(range(256)) * 1024)
+    (path / "script.sh.jinja").write_text("#!/bin/sh\necho {{ name }}\n")
+    (path / "script.sh.jinja").chmod(0o755)
+    (path / "excluded.txt").write_text("excluded\n")
+    return path
+
+
+def _tree(path: Path) -> dict[str, tuple[int, bytes]]:
+    """Snapshot a project.
+
+    Args:
+        path: the project directory.
+
+    Returns:
+        The mode and content of each file, by relative path.
+    """
+    return {
+        str(file.relative_to(path)): (file.stat().st_mode, file.read_bytes())
+        for file in sorted(path.rglob("*"))
+        if file.is_file()
+    }
+
+
+def _copy(template: Path, project: Path, *, concurrent: bool) -> None:
+    """Render a template, sequentially or concurrently.
+
+    Args:
+        template: the template directory.
+        project: the project directory.
+        concurrent: whether the files are rendered concurrently.
+    """
+    copier: Any = pytest.importorskip("copier")
+    with concurrent_render.installed(JOBS) if concurrent else nullcontext():
+        copier.run_copy(
+            str(template),
+            str(project),
+            data={"name": "Whiteprints"},
+            defaults=True,
+            unsafe=True,
+        )
+
+
+class TestInstalled:
+    """Test the concurrent rendering of the files of a template."""
+
+    @staticmethod
+    def test_identical(
+        tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Check that the project is identical to the sequential rendering.
+
+        Args:
+            tmp_path: a temporary directory.
+            capsys: fixture capturing copier's report of the files.
+        """
+        template = _template(tmp_path / "template")
+        _copy(template, tmp_path / "sequential", concurrent=False)
+        sequential = capsys.readouterr().err
+        _copy(template, tmp_path / "concurrent", concurrent=True)
+        concurrent = capsys.readouterr().err
+
+        assert _tree(tmp_path / "concurrent") == _tree(
+            tmp_path / "sequential"
+        ), "The project differs from the sequential rendering."
+        assert concurrent == sequential, (
+            "The files were not written in the order of the walk."
+        )
+        assert len(_tree(tmp_path / "concurrent")) == FILES + 5, (
+            "Files of the template were not rendered."
+        )
+
+    @staticmethod
+    # Copier leaves its walk of the template unclosed on error.
+    @pytest.mark.filterwarnings(
+        "ignore::pytest.PytestUnraisableExceptionWarning"
+    )
+    @pytest.mark.parametrize(
+        "content",
+        ["{{ missing }}", "{% yield item from items %}{% endyield %}"],
+    )
+    def test_error(tmp_path: Path, content: str) -> None:
+        """Check that a failing file raises, after the files walked before.
+
+        Args:
+            tmp_path: a temporary directory.
+            content: the content of the failing file.
+        """
+        template = _template(tmp_path / "template")
+        (template / "directory_2" / "file_0.txt.jinja").write_text(content)
+        errors: list[type[BaseException]] = []
+        trees: list[dict[str, tuple[int, bytes]]] = []
+        for concurrent in (False, True):
+            project = tmp_path / str(concurrent)
+            project.mkdir()
+            with pytest.raises(Exception) as error:  # noqa: PT011
+                _copy(template, project, concurrent=concurrent)
+
+            errors.append(error.type)
+            trees.append(_tree(project))
+
+        assert errors[0] is errors[1], "The error differs."
+        assert trees[0] == trees[1], (
+            "The files written before the error differ."
+        )
+
+    @staticmethod
+    def test_uninstalled() -> None:
+        """Check that copier's worker is restored."""
+        worker: Any = pytest.importorskip(
+            concurrent_render.COPIER_WORKERS[0]
+        ).Worker
+        render_template = worker._render_template  # noqa: SLF001
+        with concurrent_render.installed():
+            assert worker._render_template is not render_template, (  # noqa: SLF001
+                "The rendering is not installed."
+            )
+
+        assert worker._render_template is render_template, (  # noqa: SLF001
+            "Copier's worker was not restored."
+        )
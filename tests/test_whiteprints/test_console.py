@@ -17,3 +17,13 @@ def test_default_stdout_console() -> None:
 def test_default_stderr_console() -> None:
     """Check that the STDERR console is a rich console instance."""
     assert isinstance(whiteprint_console.STDERR, rich_console.Console)
+
+
+def test_consoles_are_singletons() -> None:
+    """Check that the consoles are only created once."""
+    assert whiteprint_console.STDOUT is whiteprint_console.STDOUT, (
+        "The STDOUT console is created on every access."
+    )
+    assert whiteprint_console.STDOUT is not whiteprint_console.STDERR, (
+        "The STDOUT and STDERR consoles are the same."
+    )
@@ -0,0 +1,176 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the copier_run module."""
+
+import asyncio
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from subprocess import CalledProcessError  # nosec
+
+import pytest
+
+from whiteprints import copier_run
+from whiteprints.tool_environment import ToolEnvironment
+
+
+@pytest.fixture
+def template(tmp_path: Path) -> Path:
+    """A minimal local copier template.
+
+    Args:
+        tmp_path: a temporary directory.
+
+    Returns:
+        The path of the template.
+    """
+    template = tmp_path / "template"
+    template.mkdir()
+    (template / "copier.yml").write_text(
+        "name:\n  type: str\n  default: World\n"
+    )
+    (template / "hello.txt.jinja").write_text("Hello {{ name }}\n")
+    return template
+
+
+@pytest.mark.usefixtures("cache_directory")
+class TestInProcess:
+    """Test the in-process copier engine."""
+
+    @staticmethod
+    def test_copy(template: Path, tmp_path: Path) -> None:
+        """Check that a template is rendered in the current process.
+
+        Args:
+            template: a minimal local copier template.
+            tmp_path: a temporary directory.
+        """
+        pytest.importorskip("copier")
+        copier_run.Copier(engine="in-process").copy(
+            [
+                str(template),
+                str(tmp_path / "project"),
+                "--defaults",
+                "--data",
+                "name=Whiteprints",
+            ]
+        )
+        assert (tmp_path / "project" / "hello.txt").read_text() == (
+            "Hello Whiteprints\n"
+        ), "The template was not rendered."
+
+    @staticmethod
+    def test_failure(template: Path, tmp_path: Path) -> None:
+        """Check that a copier failure raises a CalledProcessError.
+
+        Args:
+            template: a minimal local copier template.
+            tmp_path: a temporary directory.
+        """
+        pytest.importorskip("copier")
+        (template / "copier.yml").write_text("_tasks:\n  - 'true'\n")
+        with pytest.raises(CalledProcessError):
+            copier_run.Copier(engine="in-process").copy(
+                [
+                    str(template),
+                    str(tmp_path / "project"),
+                    "--defaults",
+                ]
+            )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("engine", "application", "context"),
+        [
+            ("subprocess", True, []),
+            ("in-process", False, []),
+            ("in-process", True, ["30a212ea-815d-4659-bf8a-9cb467a11de1"]),
+        ],
+    )
+    def test_fallback(
+        engine: copier_run.CopierEngine,
+        *,
+        application: bool,
+        context: list[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Check that copier runs in its environment when not in-process.
+
+        Args:
+            engine: the engine running copier.
+            application: whether copier is importable.
+            context: the context packages of the template.
+            monkeypatch: the pytest monkeypatch fixture.
+        """
+        commands: list[tuple[list[str], str, list[str]]] = []
+
+        def run(
+            self: ToolEnvironment,
+            module: str,
+            arguments: Iterable[str],
+            _timeouts: object = None,
+        ) -> None:
+            commands.append((self.requirements, module, list(arguments)))
+
+        monkeypatch.setattr(ToolEnvironment, "run", run)
+        if not application:
+            monkeypatch.setattr(
+                copier_run, "_copier_application", lambda: None
+            )
+
+        copier_run.Copier(engine=engine).copy(
+            ["template", "project"],
+            context=context,
+            trust=True,
+        )
+        assert commands == [
+            (
+                sorted(["copier", *context]),
+                "copier",
+                ["copy", "template", "project", "--trust"],
+            )
+        ], "Copier did not run in its tool environment."
+
+
+class TestAsync:
+    """Test the asynchronous copier commands."""
+
+    @staticmethod
+    def test_copy_async(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Check that copier runs in its environment, output captured.
+
+        Args:
+            monkeypatch: the pytest monkeypatch fixture.
+        """
+        lines: list[bytes] = []
+
+        def command(
+            _self: ToolEnvironment, module: str, arguments: Iterable[str]
+        ) -> list[str]:
+            return [
+                sys.executable,
+                "-c",
+                "import sys; print(sys.argv[1:])",
+                module,
+                *arguments,
+            ]
+
+        def create(_self: ToolEnvironment) -> None:
+            pass
+
+        monkeypatch.setattr(ToolEnvironment, "create", create)
+        monkeypatch.setattr(ToolEnvironment, "command", command)
+        result = asyncio.run(
+            copier_run.Copier().copy_async(
+                ["template", "project"],
+                name="layer",
+                trust=True,
+                on_stdout=lines.append,
+            )
+        )
+        assert result["returncode"] == 0, "Copier failed."
+        assert lines == [
+            b"['copier', 'copy', 'template', 'project', '--trust']\n"
+        ], "Copier did not run in its tool environment."
@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the deferred_tasks module."""
+
+import sys
+from pathlib import Path
+from typing import Final
+
+import pytest
+
+from whiteprints import deferred_tasks
+
+
+STAGE_SCRIPT: Final = (
+    "import os; open('stage', 'w').write(os.environ['STAGE'])"
+)
+"""A task writing the copier stage it runs in."""
+
+
+class TestPlan:
+    """Test the planning of the deferred tasks."""
+
+    @staticmethod
+    def test_plan() -> None:
+        """Check that the identical tasks run once, in layer order."""
+        tasks = deferred_tasks.plan(
+            [
+                ("python", {"_tasks": ["uv lock", ["git", "init"]]}),
+                ("templated", {"_tasks": ["uv lock", "echo {{ name }}"]}),
+                (
+                    "command_line",
+                    {
+                        "_tasks": [
+                            {"command": "uv lock", "working_directory": "./"},
+                            "uv run pre-commit install",
+                        ]
+                    },
+                ),
+            ]
+        )
+        assert tasks["deferred"] == ["python", "command_line"], (
+            "A layer with a templated task was deferred."
+        )
+        assert [task["command"] for task in tasks["tasks"]] == [
+            "uv lock",
+            ["git", "init"],
+            "uv run pre-commit install",
+        ], "The deferred tasks are wrong."
+        assert [task["layer"] for task in tasks["redundant"]] == [
+            "command_line"
+        ], "The redundant task was not reported."
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "task",
+        [
+            "echo {{ name }}",
+            ["echo", "{% if name %}name{% endif %}"],
+            {"command": "git init", "when": "{{ git }}"},
+            {"command": "ls", "working_directory": "{{ name }}"},
+        ],
+    )
+    def test_templated(task: object) -> None:
+        """Check that the templated tasks are not deferred.
+
+        Args:
+            task: a templated task.
+        """
+        assert deferred_tasks.parse_task(task, "layer") is None, (
+            "A templated task was deferred."
+        )
+
+    @staticmethod
+    def test_read_configuration(tmp_path: Path) -> None:
+        """Check that the tasks of a local template are read.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        pytest.importorskip("copier")
+        (tmp_path / "copier.yml").write_text("_tasks:\n  - uv lock\n")
+        configuration = deferred_tasks.read_configuration(str(tmp_path))
+        assert configuration["_tasks"] == ["uv lock"], (
+            "The tasks of the template were not read."
+        )
+
+
+class TestRun:
+    """Test running the deferred tasks."""
+
+    @staticmethod
+    def test_run(tmp_path: Path) -> None:
+        """Check that the tasks run in their working directory, as copier's.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        (tmp_path / "src").mkdir()
+        deferred_tasks.run(
+            [
+                deferred_tasks.Task(
+                    command=[
+                        sys.executable,
+                        "-c",
+                        STAGE_SCRIPT,
+                    ],
+                    working_directory="src",
+                    layer="python",
+                )
+            ],
+            tmp_path,
+        )
+        assert (tmp_path / "src" / "stage").read_text() == "task", (
+            "The task did not run as copier would."
+        )
@@ -7,7 +7,9 @@
 import os
 from pathlib import Path
 
-from whiteprints.environment import load_dotenv
+import pytest
+
+from whiteprints.environment import ENVIRONMENT_FILE, initialize, load_dotenv
 
 
 def test_load_dotenv(tmp_path: Path) -> None:
@@ -20,3 +22,28 @@ def test_load_dotenv(tmp_path: Path) -> None:
     dotenv.write_text("TEST=TEST")
     load_dotenv(dotenv)
     assert os.environ["TEST"] == "TEST", "Failed to load '.env' dotenv."
+
+
+def test_initialize_loads_once(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the default dotenv file is only loaded once.
+
+    Args:
+        tmp_path: a temporary directory path (fixture).
+        monkeypatch: the pytest monkeypatch fixture.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("TEST_INITIALIZE", raising=False)
+    initialize.cache_clear()
+    (tmp_path / ENVIRONMENT_FILE).write_text("TEST_INITIALIZE=TEST")
+    initialize()
+    assert os.environ["TEST_INITIALIZE"] == "TEST", (
+        "Failed to load the default dotenv file."
+    )
+    monkeypatch.delenv("TEST_INITIALIZE")
+    initialize()
+    assert "TEST_INITIALIZE" not in os.environ, (
+        "The dotenv file was loaded more than once."
+    )
@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the file_tree module."""
+
+import hashlib
+import shutil
+import stat
+import sys
+from pathlib import Path
+from typing import Final
+
+import pytest
+
+from whiteprints import file_tree
+
+
+JOBS: Final = 4
+"""The number of concurrent jobs of the tests."""
+
+LARGE_FILE_SIZE: Final = 3 * file_tree.CHUNK_SIZE + 1
+"""The size of a file streamed in several chunks."""
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    """A directory tree with files, directories and a symbolic link.
+
+    Args:
+        tmp_path: a temporary directory.
+
+    Returns:
+        The root of the tree.
+    """
+    root = tmp_path / "tree"
+    (root / "docs" / "empty").mkdir(parents=True)
+    (root / "README.md").write_text("Hello\n")
+    (root / "docs" / "asset.bin").write_bytes(bytes(LARGE_FILE_SIZE))
+    (root / "run.sh").write_text("#!/bin/sh\n")
+    (root / "run.sh").chmod(0o755)
+    if sys.platform != "win32":
+        (root / "link").symlink_to("README.md")
+
+    return root
+
+
+class TestDigest:
+    """Test the digests of the trees."""
+
+    @staticmethod
+    def test_file_digest(tree: Path) -> None:
+        """Check that a streamed digest is the digest of the content.
+
+        Args:
+            tree: a directory tree.
+        """
+        path = tree / "docs" / "asset.bin"
+        assert (
+            file_tree.file_digest(path)
+            == hashlib.sha256(path.read_bytes()).hexdigest()
+        ), "The streamed digest is wrong."
+
+    @staticmethod
+    def test_tree_digests(tree: Path) -> None:
+        """Check that the concurrent digests are sorted as the paths.
+
+        Args:
+            tree: a directory tree.
+        """
+        digests = file_tree.tree_digests(tree, jobs=JOBS)
+        assert list(digests) == sorted(digests), "The digests are not sorted."
+        assert digests == {
+            path.relative_to(tree).as_posix(): file_tree.digest(path)
+            for path in tree.rglob("*")
+        }, "The concurrent digests differ from the sequential ones."
+
+
+class TestCopyTree:
+    """Test copying the trees."""
+
+    @staticmethod
+    def test_copy_tree(tree: Path, tmp_path: Path) -> None:
+        """Check that the concurrent copy is identical to `copytree`.
+
+        Args:
+            tree: a directory tree.
+            tmp_path: a temporary directory.
+        """
+        shutil.copytree(tree, tmp_path / "sequential", symlinks=True)
+        file_tree.copy_tree(tree, tmp_path / "concurrent", jobs=JOBS)
+        assert file_tree.tree_digests(
+            tmp_path / "concurrent"
+        ) == file_tree.tree_digests(tmp_path / "sequential"), (
+            "The concurrent copy differs from the sequential one."
+        )
+        assert stat.S_IMODE(
+            (tmp_path / "concurrent" / "run.sh").stat().st_mode
+        ) == stat.S_IMODE((tree / "run.sh").stat().st_mode), (
+            "The permissions were not copied."
+        )
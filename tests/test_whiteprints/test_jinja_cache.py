@@ -0,0 +1,162 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the jinja_cache module."""
+
+import os
+import subprocess  # nosec
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+import pytest
+
+from whiteprints import jinja_cache
+from whiteprints.copier_run import Copier
+
+
+if TYPE_CHECKING:
+    import jinja2.bccache
+
+
+ENTRY_SIZE: Final = 10
+"""The size of the fake cache entries, in bytes."""
+
+
+@pytest.fixture
+def template(tmp_path: Path) -> Path:
+    """A minimal local copier template.
+
+    Args:
+        tmp_path: a temporary directory.
+
+    Returns:
+        The path of the template.
+    """
+    template = tmp_path / "template"
+    template.mkdir()
+    (template / "copier.yml").write_text(
+        "name:\n  type: str\n  default: World\n"
+    )
+    (template / "hello.txt.jinja").write_text("Hello {{ name }}\n")
+    return template
+
+
+def _entries(root: Path) -> list[Path]:
+    """The entries of a cache.
+
+    Args:
+        root: the root of the cache.
+
+    Returns:
+        The entries, sorted.
+    """
+    return sorted(root.glob(f"*/*{jinja_cache.SUFFIX}"))
+
+
+class TestInstalled:
+    """Test the cache of the in-process copier engine."""
+
+    @staticmethod
+    def test_reused(
+        cache_directory: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        template: Path,
+        tmp_path: Path,
+    ) -> None:
+        """Check that a cached template is not compiled again.
+
+        Args:
+            cache_directory: a temporary user cache directory.
+            monkeypatch: fixture to count the compiled templates.
+            template: a minimal local copier template.
+            tmp_path: a temporary directory.
+        """
+        pytest.importorskip("copier")
+        compiled: list[str] = []
+        set_bucket = jinja_cache.BytecodeCache.set_bucket
+
+        def set_bucket_counted(
+            self: jinja_cache.BytecodeCache, bucket: "jinja2.bccache.Bucket"
+        ) -> None:
+            compiled.append(bucket.key)
+            set_bucket(self, bucket)
+
+        monkeypatch.setattr(
+            jinja_cache.BytecodeCache, "set_bucket", set_bucket_counted
+        )
+        cache = cache_directory / jinja_cache.JINJA_CACHE_DIRECTORY
+        copier = Copier(engine="in-process", jinja_cache=cache)
+        for project in ("first", "second"):
+            copier.copy([str(template), str(tmp_path / project), "--defaults"])
+
+        assert compiled == ["hello.txt.jinja"], (
+            "The cached template was compiled again."
+        )
+        assert len(_entries(cache)) == 1, "The template was not cached."
+        assert (tmp_path / "second" / "hello.txt").read_text() == (
+            "Hello World\n"
+        ), "The cached template was not rendered."
+
+    @staticmethod
+    def test_script(
+        cache_directory: Path, template: Path, tmp_path: Path
+    ) -> None:
+        """Check that the script runs copier with the cache.
+
+        Args:
+            cache_directory: a temporary user cache directory.
+            template: a minimal local copier template.
+            tmp_path: a temporary directory.
+        """
+        pytest.importorskip("copier")
+        cache = cache_directory / jinja_cache.JINJA_CACHE_DIRECTORY
+        subprocess.run(  # nosec
+            [
+                sys.executable,
+                str(jinja_cache.SCRIPT),
+                "copy",
+                str(template),
+                str(tmp_path / "project"),
+                "--defaults",
+            ],
+            check=True,
+            env={
+                **os.environ,
+                jinja_cache.CACHE_VARIABLE: str(cache),
+                jinja_cache.TEMPLATE_VARIABLE: str(template),
+            },
+        )
+
+        assert (tmp_path / "project" / "hello.txt").is_file(), (
+            "Copier did not run."
+        )
+        assert _entries(cache)[0].parent.name == jinja_cache.namespace(
+            str(template), jinja_cache.WORKTREE
+        ), "The template was not cached in its namespace."
+
+
+class TestEvict:
+    """Test the eviction of the cache entries."""
+
+    @staticmethod
+    def test_least_recently_used(tmp_path: Path) -> None:
+        """Check that the least recently used entries are evicted first.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        for used, name in enumerate(["oldest", "older", "newest"]):
+            path = tmp_path / "namespace" / f"{name}{jinja_cache.SUFFIX}"
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(b"0" * ENTRY_SIZE)
+            os.utime(path, (used, used))
+
+        assert jinja_cache.evict(tmp_path, 2 * ENTRY_SIZE) == 2 * ENTRY_SIZE, (
+            "The cache size is wrong."
+        )
+        assert [path.stem for path in _entries(tmp_path)] == [
+            "newest",
+            "older",
+        ], "The wrong entry was evicted."
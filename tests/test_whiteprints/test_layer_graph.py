@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the layer_graph module."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from whiteprints import layer_graph
+from whiteprints.layers import Layer
+
+
+BASE = Layer(name="base", template="base", requires=())
+"""A layer every other layer requires."""
+
+FILES = {
+    "base": {"README.md": "base\n", "removed.txt": "removed\n"},
+    "left": {"left.txt": "left\n", "shared/same.txt": "same\n"},
+    "right": {"right.txt": "right\n", "shared/same.txt": "same\n"},
+    "conflict": {"left.txt": "conflict\n"},
+}
+"""The files each test layer writes."""
+
+
+def _feature(name: str) -> Layer:
+    """A layer requiring the base layer.
+
+    Args:
+        name: the name of the layer.
+
+    Returns:
+        The layer.
+    """
+    return Layer(name=name, template=name, requires=(BASE["name"],))
+
+
+def _render(layer: Layer, directory: Path) -> None:
+    """Write the files of a test layer.
+
+    Args:
+        layer: the layer to render.
+        directory: the directory to render the layer into.
+    """
+    for name, content in FILES[layer["template"]].items():
+        (directory / name).parent.mkdir(parents=True, exist_ok=True)
+        (directory / name).write_text(content)
+
+    if layer["name"] == "right":
+        (directory / "removed.txt").unlink()
+
+
+class TestApplyLayerGraph:
+    """Test applying layers following their dependencies."""
+
+    @staticmethod
+    def test_merge(tmp_path: Path) -> None:
+        """Check that independent layers render concurrently and merge.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        barrier = threading.Barrier(2, timeout=10)
+
+        def render(layer: Layer, directory: Path) -> None:
+            if layer["requires"]:
+                barrier.wait()
+
+            _render(layer, directory)
+
+        layer_graph.apply_layer_graph(
+            [BASE, _feature("left"), _feature("right")], render, tmp_path
+        )
+        assert sorted(
+            path.relative_to(tmp_path).as_posix()
+            for path in tmp_path.rglob("*")
+        ) == [
+            "README.md",
+            "left.txt",
+            "right.txt",
+            "shared",
+            "shared/same.txt",
+        ], "The layers were not merged."
+
+    @staticmethod
+    def test_conflict(tmp_path: Path) -> None:
+        """Check that independent layers changing a file conflict.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        conflict = Layer(
+            name="other", template="conflict", requires=(BASE["name"],)
+        )
+        with pytest.raises(layer_graph.LayerConflictError) as error:
+            layer_graph.apply_layer_graph(
+                [BASE, _feature("left"), conflict], _render, tmp_path
+            )
+
+        assert error.value.conflicts == {"left.txt": ["left", "other"]}, (
+            "The conflict was not detected."
+        )
+        assert not (tmp_path / "left.txt").exists(), (
+            "Conflicting layers were merged."
+        )
+
+    @staticmethod
+    def test_dependent_layers(tmp_path: Path) -> None:
+        """Check that a layer overwrites the files of the layers it requires.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        conflict = Layer(name="other", template="conflict", requires=("left",))
+        layer_graph.apply_layer_graph(
+            [BASE, _feature("left"), conflict], _render, tmp_path
+        )
+        assert (tmp_path / "left.txt").read_text() == "conflict\n", (
+            "The dependent layer did not overwrite the file."
+        )
@@ -4,8 +4,15 @@
 
 """Test the loc module."""
 
+import gettext
+import marshal
+import subprocess  # nosec
+import sys
 from pathlib import Path
 
+from babel.messages.catalog import Catalog
+from babel.messages.mofile import write_mo
+
 from whiteprints import loc
 
 
@@ -29,3 +36,98 @@ def test_translation_functions_are_available() -> None:
             "Translation function `TRANSLATION` not found."
         )
         assert hasattr(loc, "_"), "Translation function `_` not found."
+
+
+class TestCompiledCatalog:
+    """Test the catalogs compiled at build time."""
+
+    @staticmethod
+    def test_compiled_catalog_is_preferred(tmp_path: Path) -> None:
+        """Test whether the marshal dump is loaded instead of the `.mo`."""
+        catalog_file = tmp_path / f"{loc.DOMAIN}.mo"
+        catalog_file.with_suffix(loc.COMPILED_CATALOG_SUFFIX).write_bytes(
+            marshal.dumps({"init": "initialiser"})
+        )
+        translation = loc._load_catalog(catalog_file)  # noqa: SLF001 # pyright: ignore[reportPrivateUsage]
+
+        assert isinstance(translation, loc.CompiledTranslations), (
+            "The compiled catalog has not been loaded."
+        )
+        assert translation.gettext("init") == "initialiser", (
+            "The message has not been translated."
+        )
+        assert translation.gettext("other") == "other", (
+            "A missing message is not returned untranslated."
+        )
+
+    @staticmethod
+    def test_mo_file_is_a_fallback(tmp_path: Path) -> None:
+        """Test whether the `.mo` file is loaded without a marshal dump."""
+        catalog_file = tmp_path / f"{loc.DOMAIN}.mo"
+        catalog = Catalog(locale="fr")
+        catalog.add("init", "initialiser")
+        with catalog_file.open("wb") as mo_file:
+            write_mo(mo_file, catalog)
+
+        translation = loc._load_catalog(catalog_file)  # noqa: SLF001 # pyright: ignore[reportPrivateUsage]
+
+        assert isinstance(translation, gettext.GNUTranslations), (
+            "The `.mo` file has not been loaded."
+        )
+        assert translation.gettext("init") == "initialiser", (
+            "The message has not been translated."
+        )
+
+
+class TestDeferredTranslation:
+    """Test that messages are only translated when needed."""
+
+    @staticmethod
+    def test_marked_message_is_untranslated() -> None:
+        """Test whether `N_` returns the message unchanged."""
+        assert loc.N_("Logging verbosity.") == "Logging verbosity.", (
+            "`N_` must not translate the message."
+        )
+
+    @staticmethod
+    def test_importing_does_not_load_catalogs() -> None:
+        """Test whether importing a module loads no catalog."""
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                (
+                    "import whiteprints.cli.entrypoint, whiteprints.loc as l;"
+                    "print(l.translation.cache_info().currsize)"
+                ),
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+
+        assert output.strip() == "0", "A catalog is loaded at import."
+
+    @staticmethod
+    def test_logging_formats_are_deferred() -> None:
+        """Test whether the log formats are translated once configured."""
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                (
+                    "import sys, whiteprints.cli.logs as g;"
+                    "import whiteprints.loc as l;"
+                    "print(l.translation.cache_info().currsize);"
+                    "g.configure_logging('INFO', file=sys.stderr);"
+                    "print(l.translation.cache_info().currsize)"
+                ),
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+
+        assert output.split() == ["0", "1"], (
+            "The log formats are not translated when logging is configured."
+        )
@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the lockfile module."""
+
+import subprocess  # nosec
+from pathlib import Path
+
+import pytest
+
+from whiteprints import lockfile
+
+
+def _git(path: Path, *arguments: str) -> str:
+    """Run a git command in a repository.
+
+    Args:
+        path: the repository.
+        arguments: the arguments of the git command.
+
+    Returns:
+        The output of the command.
+    """
+    return subprocess.run(  # nosec
+        [
+            "git",
+            "-C",
+            str(path),
+            "-c",
+            "user.name=Whiteprints",
+            "-c",
+            "user.email=whiteprints@example.com",
+            "-c",
+            "commit.gpgsign=false",
+            "-c",
+            "tag.gpgsign=false",
+            *arguments,
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.strip()
+
+
+def _commit(path: Path, message: str) -> str:
+    """Commit to a template repository.
+
+    Args:
+        path: the repository.
+        message: the commit message.
+
+    Returns:
+        The commit.
+    """
+    _git(path, "commit", "--quiet", "--allow-empty", "-m", message)
+    return _git(path, "rev-parse", "HEAD")
+
+
+def _repository(path: Path) -> str:
+    """Create a template repository with one commit.
+
+    Args:
+        path: the repository.
+
+    Returns:
+        The commit.
+    """
+    path.mkdir()
+    (path / "copier.yml").write_text("_subdirectory: template\n")
+    _git(path, "init", "--quiet")
+    _git(path, "add", "copier.yml")
+    return _commit(path, "first")
+
+
+class TestLock:
+    """Test locking the templates."""
+
+    @staticmethod
+    def test_round_trip(tmp_path: Path) -> None:
+        """Check that untagged templates are locked at their head.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        commits = {
+            str(tmp_path / name): _repository(tmp_path / name)
+            for name in ("first", "second")
+        }
+        path = tmp_path / lockfile.LOCK_FILE
+        lockfile.write(path, lockfile.lock([*commits, *commits], "1.0.0"))
+
+        assert lockfile.read(path, "1.0.0")["templates"] == commits, (
+            "The templates are not locked at their head."
+        )
+        with pytest.raises(lockfile.LockError, match="lock the templates"):
+            lockfile.read(path, "2.0.0")
+
+    @staticmethod
+    def test_unresolved(tmp_path: Path) -> None:
+        """Check that a template which is not a repository is reported.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        with pytest.raises(lockfile.LockError, match="cannot be resolved"):
+            lockfile.lock([str(tmp_path)], "1.0.0")
+
+    @staticmethod
+    def test_latest_tag(tmp_path: Path) -> None:
+        """Check that a template is locked at its latest release tag.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        template = tmp_path / "template"
+        _repository(template)
+        _git(template, "tag", "0.9.0")
+        release = _commit(template, "release")
+        _git(template, "tag", "--annotate", "-m", "release", "v1.0.0")
+        _commit(template, "prerelease")
+        _git(template, "tag", "2.0.0rc1")
+        _commit(template, "unreleased")
+        _git(template, "tag", "latest")
+
+        assert lockfile.resolve(str(template)) == release, (
+            "The template is not locked at its latest release."
+        )
@@ -0,0 +1,185 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the mirrors module."""
+
+import os
+import shutil
+import subprocess  # nosec
+from pathlib import Path
+
+import pytest
+
+from whiteprints import mirrors
+
+
+GIT_IDENTITY = [
+    "-c",
+    "user.name=Whiteprints",
+    "-c",
+    "user.email=whiteprints@example.com",
+    "-c",
+    "commit.gpgsign=false",
+]
+"""The identity of the test commits."""
+
+
+def _git(*arguments: str) -> str:
+    """Run a git command.
+
+    Args:
+        arguments: the arguments of git.
+
+    Returns:
+        The output of the command.
+    """
+    return subprocess.run(  # nosec
+        ["git", *GIT_IDENTITY, *arguments],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.strip()
+
+
+def _commit(repository: Path, message: str) -> str:
+    """Commit a change in a repository.
+
+    Args:
+        repository: the repository.
+        message: the content of the changed file, and the commit message.
+
+    Returns:
+        The commit.
+    """
+    (repository / "copier.yml").write_text(f"# {message}\n")
+    _git("-C", str(repository), "add", "copier.yml")
+    _git("-C", str(repository), "commit", "--quiet", "-m", message)
+    return _git("-C", str(repository), "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def upstream(tmp_path: Path) -> Path:
+    """A template repository standing in for a remote one.
+
+    Args:
+        tmp_path: a temporary directory.
+
+    Returns:
+        The repository.
+    """
+    repository = tmp_path / "upstream"
+    _git("init", "--quiet", str(repository))
+    _commit(repository, "first")
+    return repository
+
+
+def _head(mirror: Path) -> str:
+    """The head of a mirror.
+
+    Args:
+        mirror: the mirror.
+
+    Returns:
+        The commit of the head of the mirror.
+    """
+    return _git("--git-dir", str(mirror), "rev-parse", "HEAD")
+
+
+@pytest.mark.usefixtures("cache_directory")
+class TestSync:
+    """Test the synchronization of the mirrors."""
+
+    @staticmethod
+    def test_ttl(upstream: Path) -> None:
+        """Check that a mirror is only refreshed once stale.
+
+        Args:
+            upstream: a template repository standing in for a remote one.
+        """
+        source = upstream.as_uri()
+        mirror = mirrors.sync(source)
+        assert mirror is not None, "The mirror was not cloned."
+        commit = _commit(upstream, "second")
+        mirrors.sync(source)
+        assert _head(mirror) != commit, "A fresh mirror was refreshed."
+        mirrors.sync(source, ttl=0)
+        assert _head(mirror) == commit, "A stale mirror was not refreshed."
+        assert [listed["source"] for listed in mirrors.mirrors()] == [
+            source
+        ], "The mirrors are not listed."
+
+    @staticmethod
+    def test_locked_commit(upstream: Path) -> None:
+        """Check that a fresh mirror missing a locked commit is refreshed.
+
+        Args:
+            upstream: a template repository standing in for a remote one.
+        """
+        source = upstream.as_uri()
+        mirror = mirrors.sync(source)
+        commit = _commit(upstream, "second")
+        assert mirror is not None, "The mirror was not cloned."
+        mirrors.sync_all([source], ttl=float("inf"))
+        assert _head(mirror) != commit, "A fresh mirror was refreshed."
+        mirrors.sync_all([source], ttl=float("inf"), commits={source: commit})
+        assert _head(mirror) == commit, (
+            "The mirror missing the locked commit was not refreshed."
+        )
+
+    @staticmethod
+    def test_offline(upstream: Path) -> None:
+        """Check that git clones an unreachable source from its mirror.
+
+        Args:
+            upstream: a template repository standing in for a remote one.
+        """
+        source = upstream.as_uri()
+        synced = mirrors.sync_all([source, str(upstream)])
+        assert list(synced) == [source], "A local template was mirrored."
+        commit = _git("-C", str(upstream), "rev-parse", "HEAD")
+        shutil.rmtree(upstream)
+        assert mirrors.sync(source, ttl=0) == synced[source], (
+            "The stale mirror was not kept."
+        )
+        environment = {**os.environ, **mirrors.git_environment(synced)}
+        assert subprocess.run(  # nosec
+            ["git", "ls-remote", source, "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            env=environment,
+        ).stdout.startswith(commit), "The source was not rewritten."
+
+    @staticmethod
+    def test_gc(upstream: Path) -> None:
+        """Check that only the mirrors in use survive a gc.
+
+        Args:
+            upstream: a template repository standing in for a remote one.
+        """
+        kept = mirrors.sync(upstream.as_uri())
+        removed = mirrors.sync((upstream / ".git").as_uri())
+        assert mirrors.gc(keep=[upstream.as_uri()]) == [removed], (
+            "The wrong mirrors were removed."
+        )
+        assert kept is not None, "The mirror in use was not cloned."
+        assert kept.is_dir(), "The mirror in use was removed."
+
+    @staticmethod
+    def test_gc_clones(cache_directory: Path) -> None:
+        """Check that a gc leaves the clones in progress.
+
+        Args:
+            cache_directory: the temporary user cache directory.
+        """
+        directory = cache_directory / mirrors.MIRRORS_DIRECTORY
+        cloning = directory / ".cloning-1234"
+        interrupted = directory / ".interrupted-1234"
+        cloning.mkdir(parents=True)
+        interrupted.mkdir()
+        os.utime(interrupted, (0, 0))
+        assert mirrors.gc() == [interrupted], (
+            "The wrong temporary directories were removed."
+        )
+        assert cloning.is_dir(), "A clone in progress was removed."
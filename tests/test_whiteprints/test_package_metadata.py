@@ -5,7 +5,12 @@
 """Test the package_metadata module."""
 
 import re
+import subprocess  # nosec
+import sys
+from importlib import metadata
+from types import ModuleType
 
+import whiteprints
 from whiteprints import package_metadata
 
 
@@ -87,3 +92,80 @@ def test___license__() -> None:
     def test___license_file__() -> None:
         """Test if the license files are found."""
         assert package_metadata.__license_file__, "No license file found."
+
+
+class TestBuildInfo:
+    """Test the metadata generated at build time."""
+
+    @staticmethod
+    def test_from_build_info() -> None:
+        """Test that the generated metadata is read without importlib."""
+        build_info = ModuleType(package_metadata.BUILD_INFO)
+        build_info.__dict__.update(
+            VERSION="1.0.0",
+            LICENSE_EXPRESSION="GPL-3.0-or-later",
+            LICENSE_FILES=["whiteprints-1.0.0.dist-info/licenses/LICENSE"],
+        )
+        package_info = package_metadata._from_build_info(  # noqa: SLF001 # pyright: ignore[reportPrivateUsage]
+            build_info
+        )
+        assert package_info["license_files"] == [
+            package_metadata.INSTALLATION_DIRECTORY
+            / "whiteprints-1.0.0.dist-info/licenses/LICENSE"
+        ], "The license files are not resolved from the installation path."
+
+    @staticmethod
+    def test_fallback_matches_importlib_metadata() -> None:
+        """Test that the fallback reads the installed distribution."""
+        package_info = package_metadata._from_importlib_metadata()  # noqa: SLF001 # pyright: ignore[reportPrivateUsage]
+        assert package_info["version"] == metadata.version("whiteprints"), (
+            "The fallback version differs from importlib metadata."
+        )
+        assert all(path.is_file() for path in package_info["license_files"]), (
+            "The fallback license files do not exist."
+        )
+
+    @staticmethod
+    def test___metadata__() -> None:
+        """Test that the full metadata is available lazily."""
+        assert package_metadata.__metadata__["Name"] == "whiteprints", (
+            "The package metadata is not available."
+        )
+
+
+class TestLazyAttributes:
+    """Test the metadata exposed lazily by the top-level package."""
+
+    @staticmethod
+    def test_top_level_attributes() -> None:
+        """Test that the package exposes the package metadata."""
+        for name in whiteprints.__all__:
+            assert getattr(whiteprints, name) is getattr(
+                package_metadata, name
+            ), f"`whiteprints.{name}` differs from the package metadata."
+
+    @staticmethod
+    def test_leaf_import_is_lightweight() -> None:
+        """Test that importing a leaf module does not read the metadata."""
+        modules = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                (
+                    "import sys, whiteprints.cli.exception;"
+                    "print(*sys.modules, sep='\\n')"
+                ),
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.splitlines()
+        for module in (
+            "dotenv",
+            "rich",
+            "whiteprints.environment",
+            "whiteprints.package_metadata",
+        ):
+            assert module not in modules, (
+                f"Importing a leaf module imports `{module}`."
+            )
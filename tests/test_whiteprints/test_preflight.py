@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the preflight module."""
+
+import subprocess  # nosec
+from pathlib import Path
+from typing import Final
+
+import pytest
+
+from whiteprints import preflight
+
+
+TIMEOUT: Final = 0.5
+"""The timeout of the failing check, in seconds."""
+
+
+def _passing() -> str:
+    """A passing check.
+
+    Returns:
+        What the check found.
+    """
+    return "found"
+
+
+def _failing() -> str:
+    """A failing check.
+
+    Raises:
+        CheckError: always.
+    """
+    raise preflight.CheckError(reason="missing")
+
+
+def _timing_out() -> str:
+    """A check timing out.
+
+    Raises:
+        TimeoutExpired: always.
+    """
+    raise subprocess.TimeoutExpired(["sleep"], TIMEOUT)
+
+
+class TestRunChecks:
+    """Test the concurrent checks."""
+
+    @staticmethod
+    def test_results() -> None:
+        """Check that the results keep the order of the checks."""
+        assert preflight.run_checks(
+            {
+                "passing": _passing,
+                "failing": _failing,
+                "timing out": _timing_out,
+            }
+        ) == [
+            {"name": "passing", "passed": True, "detail": "found"},
+            {"name": "failing", "passed": False, "detail": "missing"},
+            {
+                "name": "timing out",
+                "passed": False,
+                "detail": "timed out after 0.5 seconds",
+            },
+        ], "The results are wrong."
+
+
+class TestPreflight:
+    """Test the pre-flight checks."""
+
+    @staticmethod
+    def test_templates(cache_directory: Path, tmp_path: Path) -> None:
+        """Check the local templates, and the cached tool versions.
+
+        Args:
+            cache_directory: a temporary user cache directory.
+            tmp_path: a temporary directory.
+        """
+        results = {
+            result["name"]: result
+            for result in preflight.preflight(
+                tmp_path / "project",
+                {
+                    "present": str(tmp_path),
+                    "missing": str(tmp_path / "missing"),
+                },
+            )
+        }
+
+        assert results["present template"]["passed"], (
+            "The local template was not found."
+        )
+        assert not results["missing template"]["passed"], (
+            "The missing template was found."
+        )
+        assert results["project directory"]["passed"], (
+            "The project directory is not writable."
+        )
+        assert "staging directory" not in results, (
+            "The staging directory was checked when rendering in place."
+        )
+        assert results["git"]["passed"], "git was not found."
+        assert (cache_directory / preflight.STATE_FILE).is_file(), (
+            "The tool versions were not cached."
+        )
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_cached_versions(
+        monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Check that the cached tool versions are not run again.
+
+        Args:
+            monkeypatch: fixture to count the commands run.
+            tmp_path: a temporary directory.
+        """
+        preflight.preflight(tmp_path, {})
+        commands: list[list[str]] = []
+
+        def run(command: list[str], _timeout: float) -> str:
+            commands.append(command)
+            return ""
+
+        monkeypatch.setattr(preflight, "_run", run)
+        results = preflight.preflight(tmp_path, {})
+
+        assert all(result["passed"] for result in results), (
+            "The cached checks failed."
+        )
+        assert not commands, "The cached tool versions were run again."
+
+    @staticmethod
+    def test_error() -> None:
+        """Check the message of the failed checks."""
+        assert (
+            str(
+                preflight.PreflightError(
+                    [
+                        preflight.CheckResult(
+                            name="git", passed=False, detail="not installed"
+                        )
+                    ]
+                )
+            )
+            == "Pre-flight checks failed: git (not installed)"
+        ), "The message is wrong."
@@ -0,0 +1,172 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the remote_cache module, and its reference server."""
+
+import hashlib
+import json
+import shutil
+import threading
+import urllib.error
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from whiteprints import cache_server, remote_cache, render_cache
+from whiteprints.file_tree import tree_digests
+
+
+@pytest.fixture
+def server_url(tmp_path: Path) -> Generator[str, None, None]:
+    """A reference server of the remote tier.
+
+    Args:
+        tmp_path: a temporary directory.
+
+    Yields:
+        The URL of the server, serving the `served` temporary subdirectory.
+    """
+    with cache_server.serve(tmp_path / "served", port=0) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        thread.join()
+
+
+def _round_trip(
+    cache_directory: Path, tmp_path: Path, remote: remote_cache.Backend
+) -> Path:
+    """Store a tree through a remote tier, then materialise it cold.
+
+    Args:
+        cache_directory: a temporary user cache directory.
+        tmp_path: a temporary directory.
+        remote: the remote tier.
+
+    Returns:
+        The tree stored.
+    """
+    tree = tmp_path / "tree"
+    (tree / "package").mkdir(parents=True)
+    (tree / "package" / "module.py").write_text("print('module')\n")
+    render_cache.store("0" * 64, tree, remote=remote)
+    shutil.rmtree(cache_directory / render_cache.RENDERS_DIRECTORY)
+    return tree
+
+
+class TestReadThrough:
+    """Test the read-through remote tier."""
+
+    @staticmethod
+    @pytest.mark.parametrize("kind", ["directory", "http"])
+    def test_read_through(
+        cache_directory: Path, tmp_path: Path, server_url: str, kind: str
+    ) -> None:
+        """Check that a cold cache materialises a tree from the remote tier.
+
+        Args:
+            cache_directory: a temporary user cache directory.
+            tmp_path: a temporary directory.
+            server_url: the URL of a reference server.
+            kind: the kind of remote tier.
+        """
+        remote = remote_cache.backend(
+            server_url if kind == "http" else (tmp_path / "shared").as_uri()
+        )
+        tree = _round_trip(cache_directory, tmp_path, remote)
+        manifest = render_cache.lookup("0" * 64, remote=remote)
+
+        assert manifest is not None, (
+            "The tree was not found in the remote tier."
+        )
+        render_cache.materialize(manifest, tmp_path / "target")
+        assert tree_digests(tmp_path / "target") == tree_digests(tree), (
+            "The materialised tree is wrong."
+        )
+        assert render_cache.lookup("0" * 64) is not None, (
+            "The tree was not kept in the local cache."
+        )
+
+    @staticmethod
+    def test_corrupted(cache_directory: Path, tmp_path: Path) -> None:
+        """Check that a corrupted file of the remote tier is a miss.
+
+        Args:
+            cache_directory: a temporary user cache directory.
+            tmp_path: a temporary directory.
+        """
+        shared = tmp_path / "shared"
+        remote = remote_cache.backend(str(shared))
+        _round_trip(cache_directory, tmp_path, remote)
+        for path in (shared / "objects").iterdir():
+            path.write_text("corrupted\n")
+
+        assert render_cache.lookup("0" * 64, remote=remote) is None, (
+            "A corrupted tree was found."
+        )
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    @pytest.mark.parametrize(
+        "path", ["../escape", "{root}/escape", "link/escape", "a/../../escape"]
+    )
+    def test_poisoned(tmp_path: Path, path: str) -> None:
+        """Check that a manifest writing outside of its tree is a miss.
+
+        Args:
+            tmp_path: a temporary directory.
+            path: the path of the poisoned entry, below `{root}` for an
+                absolute path.
+        """
+        shared = tmp_path / "shared"
+        remote = remote_cache.backend(str(shared))
+        digest = hashlib.sha256(b"poison\n").hexdigest()
+        remote.put(f"objects/{digest}", b"poison\n")
+        manifest = {
+            "link": render_cache.Entry(kind="symlink", target=str(tmp_path)),
+            path.format(root=tmp_path): render_cache.Entry(
+                kind="file", target=digest
+            ),
+        }
+        remote.put(f"trees/{'0' * 64}.json", json.dumps(manifest).encode())
+
+        assert render_cache.lookup("0" * 64, remote=remote) is None, (
+            "A poisoned tree was found."
+        )
+        with pytest.raises(render_cache.UnsafeTreeError):
+            render_cache.materialize(manifest, tmp_path / "target")
+        assert not (tmp_path / "escape").exists(), (
+            "A poisoned tree wrote outside of its directory."
+        )
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_unreachable() -> None:
+        """Check that an unreachable remote tier is a miss."""
+        remote = remote_cache.HTTPBackend("http://127.0.0.1:9", timeout=1)
+
+        assert render_cache.lookup("0" * 64, remote=remote) is None, (
+            "An unreachable remote tier was a hit."
+        )
+
+
+class TestServer:
+    """Test the reference server."""
+
+    @staticmethod
+    def test_rejected_upload(server_url: str) -> None:
+        """Check that the server rejects a file not matching its digest.
+
+        Args:
+            server_url: the URL of a reference server.
+        """
+        remote = remote_cache.HTTPBackend(server_url)
+        digest = hashlib.sha256(b"data").hexdigest()
+        remote.put(f"objects/{digest}", b"data")
+
+        assert remote.exists(f"objects/{digest}"), "The file was not uploaded."
+        with pytest.raises(urllib.error.HTTPError, match="400"):
+            remote.put(f"objects/{digest}", b"corrupted")
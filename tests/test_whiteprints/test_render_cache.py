@@ -0,0 +1,173 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the render_cache module."""
+
+import os
+from pathlib import Path
+from typing import Final, Optional, get_args
+
+import pytest
+
+from whiteprints import render_cache
+from whiteprints.file_tree import tree_digests
+
+
+FILE_SIZE: Final = 10
+"""The size of the files of the cached trees, in bytes."""
+
+
+def _tree(root: Path) -> Path:
+    """Create a rendered tree.
+
+    Args:
+        root: the root of the tree.
+
+    Returns:
+        The root of the tree.
+    """
+    (root / "package").mkdir(parents=True)
+    (root / "package" / "module.py").write_text("print('module')\n")
+    (root / "script.sh").write_text("#!/bin/sh\n")
+    (root / "script.sh").chmod(0o755)
+    (root / "link").symlink_to("script.sh")
+    return root
+
+
+@pytest.mark.usefixtures("cache_directory")
+class TestMaterialize:
+    """Test storing and materialising the rendered trees."""
+
+    @staticmethod
+    @pytest.mark.parametrize("how", get_args(render_cache.Materialization))
+    def test_round_trip(
+        tmp_path: Path, how: render_cache.Materialization
+    ) -> None:
+        """Check that a materialised tree is identical to the cached one.
+
+        Args:
+            tmp_path: a temporary directory.
+            how: how the files are materialised.
+        """
+        tree = _tree(tmp_path / "tree")
+        render_cache.store("key", tree)
+        target = tmp_path / "target"
+        (target / "script.sh").mkdir(parents=True)
+        (target / "stale").write_text("stale\n")
+        manifest = render_cache.lookup("key")
+
+        assert manifest is not None, "The tree was not cached."
+        render_cache.materialize(manifest, target, how)
+        assert tree_digests(target) == tree_digests(tree), (
+            "The materialised tree is wrong."
+        )
+        assert os.access(target / "script.sh", os.X_OK), (
+            "The executable file lost its mode."
+        )
+
+    @staticmethod
+    def test_unshare(tmp_path: Path) -> None:
+        """Check that editing an unshared file leaves the cache unchanged.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        render_cache.store("key", _tree(tmp_path / "tree"))
+        manifest = render_cache.lookup("key")
+
+        assert manifest is not None, "The tree was not cached."
+        target = tmp_path / "target"
+        render_cache.materialize(manifest, target, "hardlink")
+        render_cache.unshare(target)
+        (target / "script.sh").write_text("edited\n")
+        render_cache.materialize(manifest, tmp_path / "other", "copy")
+        assert (tmp_path / "other" / "script.sh").read_text() == (
+            "#!/bin/sh\n"
+        ), "The edit changed the cache."
+
+    @staticmethod
+    def test_missing_object(tmp_path: Path) -> None:
+        """Check that a tree missing an object is not a hit.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        render_cache.store("key", _tree(tmp_path / "tree"))
+        render_cache.evict(0)
+
+        assert render_cache.lookup("key") is None, "An evicted tree was found."
+
+
+class TestEvict:
+    """Test the eviction of the cached trees."""
+
+    @staticmethod
+    def test_least_recently_used(
+        cache_directory: Path, tmp_path: Path
+    ) -> None:
+        """Check that the least recently used trees are evicted first.
+
+        Args:
+            cache_directory: a temporary user cache directory.
+            tmp_path: a temporary directory.
+        """
+        for used, name in enumerate(["oldest", "older", "newest"]):
+            tree = tmp_path / name
+            tree.mkdir()
+            (tree / "file").write_text(name.ljust(FILE_SIZE))
+            render_cache.store(name, tree)
+            os.utime(
+                cache_directory
+                / render_cache.RENDERS_DIRECTORY
+                / "trees"
+                / f"{name}.json",
+                (used, used),
+            )
+
+        assert render_cache.evict(2 * FILE_SIZE) == 2 * FILE_SIZE, (
+            "The cache size is wrong."
+        )
+        assert render_cache.lookup("oldest") is None, (
+            "The least recently used tree was kept."
+        )
+        assert render_cache.lookup("newest") is not None, (
+            "The most recently used tree was evicted."
+        )
+
+
+class TestStepKey:
+    """Test the keys of the rendered steps."""
+
+    @staticmethod
+    @pytest.mark.parametrize("style", ["separate", "joined"])
+    def test_data_file(tmp_path: Path, style: str) -> None:
+        """Check that the key changes with the content of an answers file.
+
+        Args:
+            tmp_path: a temporary directory.
+            style: whether the path is a separate argument of the flag.
+        """
+        answers = tmp_path / "answers.yml"
+        copier_args = (
+            ["--defaults", "--data-file", str(answers)]
+            if style == "separate"
+            else ["--defaults", f"--data-file={answers}"]
+        )
+
+        def key() -> Optional[str]:
+            return render_cache.step_key(
+                "tree",
+                [("template", "v1", True)],
+                copier_args,
+                [],
+                compose=False,
+            )
+
+        assert key() is None, "A missing answers file was cached."
+        answers.write_text("name: first\n")
+        first = key()
+        answers.write_text("name: second\n")
+
+        assert first is not None, "The step was not cached."
+        assert key() != first, "The key ignores the answers file."
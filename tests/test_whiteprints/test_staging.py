@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the staging module."""
+
+from collections.abc import Callable
+from itertools import count
+from pathlib import Path
+
+import pytest
+
+from whiteprints import staging
+from whiteprints.file_tree import tree_digests
+
+
+@pytest.fixture(params=[True, False], ids=["rename", "copy"])
+def staging_directory(
+    request: pytest.FixtureRequest,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> Path:
+    """A staging directory, on the filesystem of the project or not.
+
+    Args:
+        request: whether the staging directory is on the filesystem of the
+            project.
+        monkeypatch: fixture to set the staging directory.
+        tmp_path: a temporary directory.
+
+    Returns:
+        The staging directory.
+    """
+    directory = tmp_path / "staging"
+    monkeypatch.setenv(staging.STAGING_DIRECTORY_VARIABLE, str(directory))
+    if not request.param:
+        devices = count()
+
+        def filesystem(_path: Path) -> int:
+            return next(devices)
+
+        monkeypatch.setattr(staging, "_filesystem", filesystem)
+
+    return directory
+
+
+def _render_staged(project: Path, render: Callable[[Path], None]) -> None:
+    """Render a project in its staging directory.
+
+    Args:
+        project: the project directory.
+        render: render the project into a directory.
+    """
+    with staging.staged(project) as directory:
+        render(directory)
+
+
+class TestStaged:
+    """Test the staged projects."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("staging_directory")
+    def test_new_project(tmp_path: Path) -> None:
+        """Check that a new project is published once rendered.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        project = tmp_path / "parent" / "project"
+        with staging.staged(project) as directory:
+            (directory / "src").mkdir()
+            (directory / "src" / "module.py").write_text("pass\n")
+            assert not project.exists(), "The project was published early."
+
+        assert (project / "src" / "module.py").read_text() == "pass\n", (
+            "The project was not published."
+        )
+
+    @staticmethod
+    def test_existing_project(tmp_path: Path, staging_directory: Path) -> None:
+        """Check that an existing project is updated in place.
+
+        Args:
+            tmp_path: a temporary directory.
+            staging_directory: the staging directory.
+        """
+        project = tmp_path / "project"
+        (project / "docs").mkdir(parents=True)
+        (project / "README.md").write_text("old\n")
+        (project / "obsolete.txt").write_text("obsolete\n")
+        (project / "docs" / "index.md").write_text("index\n")
+        inode = project.stat().st_ino
+        with staging.staged(project) as directory:
+            assert (directory / "docs" / "index.md").exists(), (
+                "The project was not copied in the staging directory."
+            )
+            (directory / "README.md").write_text("new\n")
+            (directory / "obsolete.txt").unlink()
+
+        assert project.stat().st_ino == inode, "The project was replaced."
+        assert sorted(path.name for path in project.iterdir()) == [
+            "README.md",
+            "docs",
+        ], "The project entries are wrong."
+        assert (project / "README.md").read_text() == "new\n", (
+            "The project was not updated."
+        )
+        assert not list(staging_directory.iterdir()), (
+            "The staging directory was not cleaned up."
+        )
+
+    @staticmethod
+    @pytest.mark.usefixtures("staging_directory")
+    def test_failure(tmp_path: Path) -> None:
+        """Check that a failed rendering leaves the project untouched.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "README.md").write_text("old\n")
+
+        def render(directory: Path) -> None:
+            (directory / "README.md").write_text("new\n")
+            raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            _render_staged(project, render)
+
+        assert (project / "README.md").read_text() == "old\n", (
+            "A failed rendering changed the project."
+        )
+
+    @staticmethod
+    @pytest.mark.usefixtures("staging_directory")
+    def test_failed_publication(
+        monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Check that a publication failing partway restores the project.
+
+        Args:
+            monkeypatch: fixture to fail a rename of the publication.
+            tmp_path: a temporary directory.
+        """
+        project = tmp_path / "project"
+        (project / "b").mkdir(parents=True)
+        (project / "a").write_text("old a\n")
+        (project / "b" / "file").write_text("old b\n")
+        (project / "old.txt").write_text("old\n")
+        before = tree_digests(project)
+        rename = Path.rename
+        landing: list[Path] = []
+
+        def failing_rename(self: Path, target: Path) -> Path:
+            if target == project / "b" and not landing:
+                landing.append(self)
+                raise OSError
+
+            return rename(self, target)
+
+        # Fail once the entry "a" was replaced, while replacing "b".
+        monkeypatch.setattr(Path, "rename", failing_rename)
+
+        def render(directory: Path) -> None:
+            (directory / "a").write_text("new a\n")
+            (directory / "b" / "file").write_text("new b\n")
+            (directory / "old.txt").unlink()
+
+        with pytest.raises(OSError):  # noqa: PT011
+            _render_staged(project, render)
+
+        assert tree_digests(project) == before, (
+            "A failed publication changed the project."
+        )
@@ -0,0 +1,216 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the supervision module."""
+
+import os
+import signal
+import subprocess  # nosec
+import sys
+import time
+from pathlib import Path
+from typing import Final
+
+import pytest
+
+from whiteprints import supervision
+
+
+TIMEOUT: Final = 0.5
+"""The timeout of the test commands, in seconds."""
+
+SLEEP: Final = 60
+"""How long the test commands would run without timeout, in seconds."""
+
+EXIT_CODE: Final = 3
+"""The exit code of the failing test command."""
+
+REAPED: Final = 5.0
+"""How long a killed process may take to disappear, in seconds."""
+
+
+def _is_running(pid: int) -> bool:
+    """Whether a process is running (and not a zombie).
+
+    Args:
+        pid: the process identifier.
+
+    Returns:
+        True if the process is running, False otherwise.
+    """
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1]
+    except FileNotFoundError:
+        return False
+
+    return state.split()[0] != "Z"
+
+
+class TestRun:
+    """Test the supervised commands."""
+
+    @staticmethod
+    @pytest.mark.skipif(
+        not sys.platform.startswith("linux"), reason="Reads /proc."
+    )
+    def test_timeout_kills_group(tmp_path: Path) -> None:
+        """Check that a timeout terminates the grandchildren too.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        pid_file = tmp_path / "grandchild.pid"
+        script = (
+            "import subprocess, sys, time\n"
+            "grandchild = subprocess.Popen("
+            f"[sys.executable, '-c', 'import time; time.sleep({SLEEP})'])\n"
+            f"open({str(pid_file)!r}, 'w').write(str(grandchild.pid))\n"
+            f"time.sleep({SLEEP})\n"
+        )
+        with pytest.raises(supervision.ProcessTimeoutError) as error:
+            supervision.run(
+                [sys.executable, "-c", script],
+                supervision.Timeouts(timeout=TIMEOUT),
+            )
+
+        assert error.value.kind == "wall-clock", "The wrong timeout expired."
+        grandchild = int(pid_file.read_text())
+        deadline = time.monotonic() + REAPED
+        while _is_running(grandchild) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert not _is_running(grandchild), "The grandchild was not killed."
+
+    @staticmethod
+    def test_inactivity_timeout() -> None:
+        """Check that a silent command is terminated."""
+        start = time.perf_counter()
+        with pytest.raises(supervision.ProcessTimeoutError) as error:
+            supervision.run(
+                [sys.executable, "-c", f"import time; time.sleep({SLEEP})"],
+                supervision.Timeouts(inactivity_timeout=TIMEOUT),
+            )
+
+        assert error.value.kind == "inactivity", "The wrong timeout expired."
+        assert time.perf_counter() - start < SLEEP, (
+            "The command was not terminated."
+        )
+
+    @staticmethod
+    def test_failure() -> None:
+        """Check that a failing command raises an error."""
+        with pytest.raises(subprocess.CalledProcessError) as error:
+            supervision.run(
+                [sys.executable, "-c", f"raise SystemExit({EXIT_CODE})"],
+                supervision.Timeouts(timeout=SLEEP),
+            )
+
+        assert error.value.returncode == EXIT_CODE, "The exit code is lost."
+
+    @staticmethod
+    @pytest.mark.skipif(
+        sys.platform == "win32", reason="Uses a pseudo-terminal."
+    )
+    def test_interactive_foreground() -> None:
+        """Check that an interactive command prompts in its own group."""
+        leader, follower = os.openpty()
+        os.write(leader, b"answer\n")
+        child = "import os; print(os.getpgrp() == os.getpid(), input())"
+        script = (
+            "import fcntl, sys, termios\n"
+            "from whiteprints import supervision\n"
+            "fcntl.ioctl(0, termios.TIOCSCTTY, 0)\n"
+            f"supervision.run([sys.executable, '-c', {child!r}])\n"
+        )
+        try:
+            result = subprocess.run(  # nosec
+                [sys.executable, "-c", script],
+                stdin=follower,
+                capture_output=True,
+                check=True,
+                start_new_session=True,
+                text=True,
+                timeout=SLEEP,
+            )
+        finally:
+            os.close(follower)
+            os.close(leader)
+
+        assert result.stdout == "True answer\n", (
+            "The command did not read the terminal in its own group."
+        )
+
+    @staticmethod
+    @pytest.mark.skipif(
+        sys.platform == "win32", reason="Uses a pseudo-terminal."
+    )
+    def test_concurrent_foreground() -> None:
+        """Check that concurrent interactive commands take turns to prompt."""
+        leader, follower = os.openpty()
+        os.write(leader, b"first\nsecond\n")
+        child = "import time; time.sleep(0.2); print(input())"
+        script = (
+            "import fcntl, sys, termios\n"
+            "from concurrent.futures import ThreadPoolExecutor\n"
+            "from whiteprints import supervision\n"
+            "fcntl.ioctl(0, termios.TIOCSCTTY, 0)\n"
+            "with ThreadPoolExecutor() as executor:\n"
+            "    list(executor.map(supervision.run, "
+            f"[[sys.executable, '-c', {child!r}]] * 2))\n"
+        )
+        try:
+            result = subprocess.run(  # nosec
+                [sys.executable, "-c", script],
+                stdin=follower,
+                capture_output=True,
+                check=True,
+                start_new_session=True,
+                text=True,
+                timeout=SLEEP,
+            )
+        finally:
+            os.close(follower)
+            os.close(leader)
+
+        assert sorted(result.stdout.split()) == ["first", "second"], (
+            "A concurrent command did not read the terminal."
+        )
+
+
+class TestSignals:
+    """Test the signals forwarded to the command groups."""
+
+    @staticmethod
+    @pytest.mark.skipif(
+        not sys.platform.startswith("linux"), reason="Reads /proc."
+    )
+    def test_terminate_forwarded() -> None:
+        """Check that terminating whiteprints terminates its commands."""
+        child = (
+            "import os, time\n"
+            "print(os.getpid(), flush=True)\n"
+            f"time.sleep({SLEEP})\n"
+        )
+        script = (
+            "import sys\n"
+            "from whiteprints import supervision\n"
+            f"supervision.run([sys.executable, '-c', {child!r}])\n"
+        )
+        with subprocess.Popen(  # nosec
+            [sys.executable, "-c", script],
+            stdout=subprocess.PIPE,
+            start_new_session=True,
+            text=True,
+        ) as whiteprints:
+            assert whiteprints.stdout is not None, "The output is not piped."
+            pid = int(whiteprints.stdout.readline())
+            os.killpg(whiteprints.pid, signal.SIGTERM)
+            returncode = whiteprints.wait(SLEEP)
+
+        deadline = time.monotonic() + REAPED
+        while _is_running(pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert returncode == -signal.SIGTERM, "whiteprints was not terminated."
+        assert not _is_running(pid), "The command was left running."
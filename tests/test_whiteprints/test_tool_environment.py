@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the tool_environment module."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from whiteprints import tool_environment
+
+
+class TestToolEnvironment:
+    """Test the persistent tool environments."""
+
+    @staticmethod
+    def test_key() -> None:
+        """Check that the key identifies the requirements."""
+        assert (
+            tool_environment.ToolEnvironment(["copier", "context==1"]).key
+            == tool_environment.ToolEnvironment(["context==1", "copier"]).key
+        ), "The key depends on the order of the requirements."
+        assert (
+            tool_environment.ToolEnvironment(["copier", "context==1"]).key
+            != tool_environment.ToolEnvironment(["copier", "context==2"]).key
+        ), "The key does not depend on the requirements."
+
+    @staticmethod
+    def test_create(cache_directory: Path, tmp_path: Path) -> None:
+        """Check that an environment is created once and runs modules.
+
+        Args:
+            cache_directory: a temporary user cache directory.
+            tmp_path: a temporary directory.
+        """
+        environment = tool_environment.ToolEnvironment([])
+        path = environment.create()
+        assert environment.is_ready, "The environment was not created."
+        assert tool_environment.environments() == [path], (
+            "The environment is not in the cache directory."
+        )
+        assert path.parent == cache_directory / "environments", (
+            "The environment is not in the cache directory."
+        )
+        assert environment.create() == path, "The environment was recreated."
+
+        (tmp_path / "data.json").write_text("[]")
+        environment.run(
+            "json.tool",
+            [str(tmp_path / "data.json"), str(tmp_path / "copy.json")],
+        )
+        assert (tmp_path / "copy.json").read_text() == "[]\n", (
+            "The environment did not run the module."
+        )
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_prune() -> None:
+        """Check that pruning keeps only the environments in use."""
+        kept = tool_environment.ToolEnvironment([])
+        kept.path.mkdir(parents=True)
+        removed = tool_environment.ToolEnvironment(["copier"])
+        removed.path.mkdir(parents=True)
+        assert tool_environment.prune(keep=[kept]) == [removed.path], (
+            "The unused environment was not removed."
+        )
+        assert tool_environment.environments() == [kept.path], (
+            "The environment in use was removed."
+        )
+
+    @staticmethod
+    def test_prune_builds(cache_directory: Path) -> None:
+        """Check that pruning leaves the environments being built.
+
+        Args:
+            cache_directory: the temporary user cache directory.
+        """
+        directory = cache_directory / tool_environment.ENVIRONMENTS_DIRECTORY
+        building = directory / ".building-1234"
+        interrupted = directory / ".interrupted-1234"
+        building.mkdir(parents=True)
+        interrupted.mkdir()
+        os.utime(interrupted, (0, 0))
+        assert tool_environment.prune() == [interrupted], (
+            "The wrong temporary directories were removed."
+        )
+        assert building.is_dir(), "An environment being built was removed."
@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Test the wheelhouse module."""
+
+from pathlib import Path
+
+import pytest
+
+from whiteprints import wheelhouse
+from whiteprints.tool_environment import ToolEnvironment
+
+
+@pytest.fixture
+def empty_wheelhouse(tmp_path: Path) -> Path:
+    """A wheelhouse locking no requirement.
+
+    Args:
+        tmp_path: a temporary directory.
+
+    Returns:
+        The wheelhouse directory.
+    """
+    directory = tmp_path / "wheelhouse"
+    directory.mkdir()
+    (directory / wheelhouse.REQUIREMENTS_FILE).write_text("")
+    (directory / wheelhouse.LOCK_FILE).write_text("")
+    return directory
+
+
+class TestWheelhouse:
+    """Test the wheelhouses."""
+
+    @staticmethod
+    def test_missing(tmp_path: Path) -> None:
+        """Check that a wheelhouse not built is rejected.
+
+        Args:
+            tmp_path: a temporary directory.
+        """
+        with pytest.raises(wheelhouse.WheelhouseError, match="build it"):
+            wheelhouse.check(tmp_path, ["copier"])
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_other_requirements(empty_wheelhouse: Path) -> None:
+        """Check that a wheelhouse built for other requirements fails fast.
+
+        Args:
+            empty_wheelhouse: a wheelhouse locking no requirement.
+        """
+        environment = ToolEnvironment(["copier"], wheelhouse=empty_wheelhouse)
+        with pytest.raises(wheelhouse.WheelhouseError, match="rebuild it"):
+            environment.create()
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_directory")
+    def test_offline(empty_wheelhouse: Path) -> None:
+        """Check that an environment is installed from a wheelhouse.
+
+        Args:
+            empty_wheelhouse: a wheelhouse locking no requirement.
+        """
+        environment = ToolEnvironment([], wheelhouse=empty_wheelhouse)
+        assert environment.key != ToolEnvironment([]).key, (
+            "The wheelhouse does not change the environment key."
+        )
+        environment.create()
+        assert environment.is_ready, "The environment was not created."